@@ -60,6 +60,39 @@ CREATE TABLE IF NOT EXISTS `document_chunk`
     KEY            `idx_document_id` (`document_id`) COMMENT 'index:document_id'
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COMMENT='knowledge document chunk detail';
 
+CREATE TABLE IF NOT EXISTS `knowledge_sync_job`
+(
+    `id`              int          NOT NULL AUTO_INCREMENT COMMENT 'auto increment id',
+    `doc_id`          int          NOT NULL COMMENT 'document id',
+    `space_id`        varchar(100) NOT NULL COMMENT 'knowledge space id',
+    `embedding_model` varchar(255) NOT NULL COMMENT 'embedding model name',
+    `status`          varchar(50)  NOT NULL COMMENT 'status TODO,RUNNING,FAILED,FINISHED',
+    `chunk_parameters` TEXT NULL COMMENT 'chunk parameters in json',
+    `total_chunks`    int          DEFAULT 0 COMMENT 'number of the document chunks',
+    `synced_chunks`   int          DEFAULT 0 COMMENT 'number of the chunks persisted, the checkpoint',
+    `vector_ids`      LONGTEXT NULL COMMENT 'vector ids of the persisted chunks',
+    `retry_times`     int          DEFAULT 0 COMMENT 'retry times',
+    `result`          TEXT NULL COMMENT 'job result',
+    `gmt_created`     TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT 'created time',
+    `gmt_modified`    TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT 'update time',
+    PRIMARY KEY (`id`),
+    KEY               `idx_doc_id` (`doc_id`) COMMENT 'index:doc_id',
+    KEY               `idx_status` (`status`) COMMENT 'index:status'
+) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COMMENT='knowledge document sync job';
+
+CREATE TABLE IF NOT EXISTS `knowledge_chunk_vector`
+(
+    `id`              int          NOT NULL AUTO_INCREMENT COMMENT 'auto increment id',
+    `doc_id`          int          NOT NULL COMMENT 'document id',
+    `chunk_hash`      varchar(64)  NOT NULL COMMENT 'fingerprint of the chunk content and chunk parameters',
+    `vector_id`       varchar(255) NOT NULL COMMENT 'vector id in the vector store',
+    `sync_job_id`     int          NOT NULL COMMENT 'the sync job which last confirmed the vector',
+    `gmt_created`     TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT 'created time',
+    `gmt_modified`    TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT 'update time',
+    PRIMARY KEY (`id`),
+    KEY               `idx_doc_id` (`doc_id`) COMMENT 'index:doc_id'
+) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COMMENT='vectors of the knowledge document chunks';
+
 
 
 CREATE TABLE IF NOT EXISTS `connect_config`
@@ -79,6 +112,19 @@ CREATE TABLE IF NOT EXISTS `connect_config`
     KEY        `idx_q_db_type` (`db_type`)
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COMMENT 'Connection confi';
 
+CREATE TABLE IF NOT EXISTS `db_schema_profile`
+(
+    `id`           int          NOT NULL AUTO_INCREMENT COMMENT 'autoincrement id',
+    `db_name`      varchar(255) NOT NULL COMMENT 'db name',
+    `table_name`   varchar(255) NOT NULL COMMENT 'table name',
+    `fingerprint`  varchar(64)  NOT NULL COMMENT 'fingerprint of the DDL',
+    `vector_id`    varchar(255) DEFAULT NULL COMMENT 'vector id of the summary',
+    `gmt_created`  timestamp DEFAULT CURRENT_TIMESTAMP COMMENT 'Record creation time',
+    `gmt_modified` timestamp DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT 'Record update time',
+    PRIMARY KEY (`id`),
+    KEY `idx_q_db_name` (`db_name`)
+) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COMMENT 'Embedded schema profile of the db tables';
+
 CREATE TABLE IF NOT EXISTS `chat_history`
 (
     `id`        int                                     NOT NULL AUTO_INCREMENT COMMENT 'autoincrement id',
@@ -176,6 +176,8 @@ class Config(metaclass=Singleton):
         self.NATIVE_SQL_CAN_RUN_WRITE = (
             os.getenv("NATIVE_SQL_CAN_RUN_WRITE", "True").lower() == "true"
         )
+        # The seconds to keep the cached datasource connectors, 0 to disable the cache
+        self.CONNECTOR_CACHE_TTL = float(os.getenv("CONNECTOR_CACHE_TTL", 600))
 
         # dbgpt meta info database connection configuration
         self.LOCAL_DB_HOST = os.getenv("LOCAL_DB_HOST")
@@ -247,6 +249,16 @@ class Config(metaclass=Singleton):
 
         # EMBEDDING Configuration
         self.EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text2vec")
+        # Embedding cache configuration
+        self.EMBEDDING_CACHE_ENABLE: bool = (
+            os.getenv("EMBEDDING_CACHE_ENABLE", "False").lower() == "true"
+        )
+        self.EMBEDDING_CACHE_MAX_MEMORY_ITEMS: int = int(
+            os.getenv("EMBEDDING_CACHE_MAX_MEMORY_ITEMS", 10000)
+        )
+        self.EMBEDDING_CACHE_STORAGE_DISK_DIR: Optional[str] = os.getenv(
+            "EMBEDDING_CACHE_STORAGE_DISK_DIR"
+        )
         # Rerank model configuration
         self.RERANK_MODEL = os.getenv("RERANK_MODEL")
         self.RERANK_MODEL_PATH = os.getenv("RERANK_MODEL_PATH")
@@ -301,6 +313,10 @@ class Config(metaclass=Singleton):
         self.MODEL_CACHE_STORAGE_DISK_DIR: Optional[str] = os.getenv(
             "MODEL_CACHE_STORAGE_DISK_DIR"
         )
+        # The minimum cosine similarity of the prompts to hit the semantic cache
+        self.MODEL_CACHE_SIMILARITY_THRESHOLD: float = float(
+            os.getenv("MODEL_CACHE_SIMILARITY_THRESHOLD", 0.95)
+        )
         # global dbgpt api key
         self.API_KEYS = os.getenv("API_KEYS", None)
 
@@ -1,66 +1,125 @@
-"""Default memory for storing plans and messages."""
+"""Default memory for storing plans and messages.
 
-from dataclasses import fields
-from typing import List, Optional
+The records are kept in the insertion order, and indexed by the conversation id, the
+task number and the agents, so every append and lookup does not scan all the records.
+"""
 
-import pandas as pd
+import threading
+from collections import defaultdict
+from dataclasses import fields
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from ...schema import Status
 from .base import GptsMessage, GptsMessageMemory, GptsPlan, GptsPlansMemory
 
+_PLAN_FIELDS = tuple(field.name for field in fields(GptsPlan))
+_MESSAGE_FIELDS = tuple(field.name for field in fields(GptsMessage))
+
+
+class _PlanRecord:
+    """The stored plan, a copy of the saved plan."""
+
+    __slots__ = _PLAN_FIELDS + ("seq",)
+    sub_task_num: int
+    sub_task_agent: Optional[str]
+    agent_model: Optional[str]
+    retry_times: int
+    state: Optional[str]
+    result: Optional[str]
+    seq: int
+
+    def __init__(self, plan: GptsPlan, seq: int):
+        for name in _PLAN_FIELDS:
+            setattr(self, name, getattr(plan, name))
+        self.seq = seq
+
+    def to_plan(self) -> GptsPlan:
+        return GptsPlan(**{name: getattr(self, name) for name in _PLAN_FIELDS})
+
+
+class _MessageRecord:
+    """The stored message, a copy of the appended message."""
+
+    __slots__ = _MESSAGE_FIELDS
+    sender: str
+    receiver: str
+    current_goal: Optional[str]
+
+    def __init__(self, message: GptsMessage):
+        for name in _MESSAGE_FIELDS:
+            setattr(self, name, getattr(message, name))
+
+    def to_message(self) -> GptsMessage:
+        return GptsMessage(**{name: getattr(self, name) for name in _MESSAGE_FIELDS})
+
+
+class _ConvPlans:
+    """The plans of one conversation, indexed by the task number."""
+
+    __slots__ = ("records", "by_task_num")
+
+    def __init__(self):
+        self.records: List[_PlanRecord] = []
+        self.by_task_num: Dict[int, List[_PlanRecord]] = defaultdict(list)
+
 
 class DefaultGptsPlansMemory(GptsPlansMemory):
     """Default memory for storing plans."""
 
     def __init__(self):
         """Create a memory to store plans."""
-        self.df = pd.DataFrame(columns=[field.name for field in fields(GptsPlan)])
+        self._convs: Dict[str, _ConvPlans] = {}
+        self._seq = 0
+        self._lock = threading.RLock()
 
     def batch_save(self, plans: list[GptsPlan]):
         """Save plans in batch."""
-        new_rows = pd.DataFrame([item.to_dict() for item in plans])
-        self.df = pd.concat([self.df, new_rows], ignore_index=True)
+        with self._lock:
+            for plan in plans:
+                conv = self._convs.get(plan.conv_id)
+                if conv is None:
+                    conv = self._convs[plan.conv_id] = _ConvPlans()
+                record = _PlanRecord(plan, self._seq)
+                self._seq += 1
+                conv.records.append(record)
+                conv.by_task_num[record.sub_task_num].append(record)
 
     def get_by_conv_id(self, conv_id: str) -> List[GptsPlan]:
         """Get plans by conv_id."""
-        result = self.df.query(f"conv_id==@conv_id")  # noqa: F541
-        plans = []
-        for row in result.itertuples(index=False, name=None):
-            row_dict = dict(zip(self.df.columns, row))
-            plans.append(GptsPlan.from_dict(row_dict))
-        return plans
+        with self._lock:
+            conv = self._convs.get(conv_id)
+            return _to_plans(conv.records) if conv else []
 
     def get_by_conv_id_and_num(
         self, conv_id: str, task_nums: List[int]
     ) -> List[GptsPlan]:
         """Get plans by conv_id and task number."""
-        task_nums_int = [int(num) for num in task_nums]  # noqa:F841
-        result = self.df.query(  # noqa
-            f"conv_id==@conv_id and sub_task_num in @task_nums_int"  # noqa
-        )
-        plans = []
-        for row in result.itertuples(index=False, name=None):
-            row_dict = dict(zip(self.df.columns, row))
-            plans.append(GptsPlan.from_dict(row_dict))
-        return plans
+        with self._lock:
+            conv = self._convs.get(conv_id)
+            if not conv:
+                return []
+            records = [
+                record
+                for num in {int(num) for num in task_nums}
+                for record in conv.by_task_num.get(num, [])
+            ]
+            return _to_plans(sorted(records, key=lambda r: r.seq))
 
     def get_todo_plans(self, conv_id: str) -> List[GptsPlan]:
         """Get unfinished planning steps."""
-        todo_states = [Status.TODO.value, Status.RETRYING.value]  # noqa: F841
-        result = self.df.query(f"conv_id==@conv_id and state in @todo_states")  # noqa
-        plans = []
-        for row in result.itertuples(index=False, name=None):
-            row_dict = dict(zip(self.df.columns, row))
-            plans.append(GptsPlan.from_dict(row_dict))
-        return plans
+        todo_states = {Status.TODO.value, Status.RETRYING.value}
+        with self._lock:
+            conv = self._convs.get(conv_id)
+            if not conv:
+                return []
+            return _to_plans(r for r in conv.records if r.state in todo_states)
 
     def complete_task(self, conv_id: str, task_num: int, result: str):
         """Set the planning step to complete."""
-        condition = (self.df["conv_id"] == conv_id) & (
-            self.df["sub_task_num"] == task_num
-        )
-        self.df.loc[condition, "state"] = Status.COMPLETE.value
-        self.df.loc[condition, "result"] = result
+        with self._lock:
+            for record in self._get_task_records(conv_id, task_num):
+                record.state = Status.COMPLETE.value
+                record.result = result
 
     def update_task(
         self,
@@ -73,22 +132,44 @@ class DefaultGptsPlansMemory(GptsPlansMemory):
         result: Optional[str] = None,
     ):
         """Update the state of the planning step."""
-        condition = (self.df["conv_id"] == conv_id) & (
-            self.df["sub_task_num"] == task_num
-        )
-        self.df.loc[condition, "state"] = state
-        self.df.loc[condition, "retry_times"] = retry_times
-        self.df.loc[condition, "result"] = result
-
-        if agent:
-            self.df.loc[condition, "sub_task_agent"] = agent
-
-        if model:
-            self.df.loc[condition, "agent_model"] = model
+        with self._lock:
+            for record in self._get_task_records(conv_id, task_num):
+                record.state = state
+                record.retry_times = retry_times
+                record.result = result
+                if agent:
+                    record.sub_task_agent = agent
+                if model:
+                    record.agent_model = model
 
     def remove_by_conv_id(self, conv_id: str):
         """Remove all plans in the conversation."""
-        self.df.drop(self.df[self.df["conv_id"] == conv_id].index, inplace=True)
+        with self._lock:
+            self._convs.pop(conv_id, None)
+
+    def _get_task_records(self, conv_id: str, task_num: int) -> List[_PlanRecord]:
+        conv = self._convs.get(conv_id)
+        if not conv:
+            return []
+        return conv.by_task_num.get(task_num, [])
+
+
+class _ConvMessages:
+    """The messages of one conversation, indexed by the agents."""
+
+    __slots__ = ("records", "by_agent", "by_agent_pair")
+
+    def __init__(self):
+        self.records: List[_MessageRecord] = []
+        self.by_agent: Dict[str, List[_MessageRecord]] = defaultdict(list)
+        self.by_agent_pair: Dict[Tuple[str, str], List[_MessageRecord]] = defaultdict(
+            list
+        )
+
+
+def _agent_pair(agent1: str, agent2: str) -> Tuple[str, str]:
+    """Return the key of the messages between two agents, in any direction."""
+    return (agent1, agent2) if agent1 <= agent2 else (agent2, agent1)
 
 
 class DefaultGptsMessageMemory(GptsMessageMemory):
@@ -96,22 +177,31 @@ class DefaultGptsMessageMemory(GptsMessageMemory):
 
     def __init__(self):
         """Create a memory to store messages."""
-        self.df = pd.DataFrame(columns=[field.name for field in fields(GptsMessage)])
+        self._convs: Dict[str, _ConvMessages] = {}
+        self._lock = threading.RLock()
 
     def append(self, message: GptsMessage):
         """Append a message to the memory."""
-        self.df.loc[len(self.df)] = message.to_dict()
+        record = _MessageRecord(message)
+        with self._lock:
+            conv = self._convs.get(message.conv_id)
+            if conv is None:
+                conv = self._convs[message.conv_id] = _ConvMessages()
+            conv.records.append(record)
+            conv.by_agent[record.sender].append(record)
+            if record.receiver != record.sender:
+                conv.by_agent[record.receiver].append(record)
+            conv.by_agent_pair[_agent_pair(record.sender, record.receiver)].append(
+                record
+            )
 
     def get_by_agent(self, conv_id: str, agent: str) -> Optional[List[GptsMessage]]:
         """Get all messages sent or received by the agent in the conversation."""
-        result = self.df.query(
-            f"conv_id==@conv_id and (sender==@agent or receiver==@agent)"  # noqa: F541
-        )
-        messages = []
-        for row in result.itertuples(index=False, name=None):
-            row_dict = dict(zip(self.df.columns, row))
-            messages.append(GptsMessage.from_dict(row_dict))
-        return messages
+        with self._lock:
+            conv = self._convs.get(conv_id)
+            if not conv:
+                return []
+            return _to_messages(conv.by_agent.get(agent, []))
 
     def get_between_agents(
         self,
@@ -121,29 +211,35 @@ class DefaultGptsMessageMemory(GptsMessageMemory):
         current_goal: Optional[str] = None,
     ) -> List[GptsMessage]:
         """Get all messages between two agents in the conversation."""
-        if current_goal:
-            result = self.df.query(
-                f"conv_id==@conv_id and ((sender==@agent1 and receiver==@agent2) or (sender==@agent2 and receiver==@agent1)) and current_goal==@current_goal"  # noqa
-            )
-        else:
-            result = self.df.query(
-                f"conv_id==@conv_id and ((sender==@agent1 and receiver==@agent2) or (sender==@agent2 and receiver==@agent1))"  # noqa
+        with self._lock:
+            conv = self._convs.get(conv_id)
+            if not conv:
+                return []
+            records: Iterable[_MessageRecord] = conv.by_agent_pair.get(
+                _agent_pair(agent1, agent2), []
             )
-        messages = []
-        for row in result.itertuples(index=False, name=None):
-            row_dict = dict(zip(self.df.columns, row))
-            messages.append(GptsMessage.from_dict(row_dict))
-        return messages
+            if current_goal:
+                records = (r for r in records if r.current_goal == current_goal)
+            return _to_messages(records)
 
     def get_by_conv_id(self, conv_id: str) -> List[GptsMessage]:
         """Get all messages in the conversation."""
-        result = self.df.query(f"conv_id==@conv_id")  # noqa: F541
-        messages = []
-        for row in result.itertuples(index=False, name=None):
-            row_dict = dict(zip(self.df.columns, row))
-            messages.append(GptsMessage.from_dict(row_dict))
-        return messages
+        with self._lock:
+            conv = self._convs.get(conv_id)
+            return _to_messages(conv.records) if conv else []
 
     def get_last_message(self, conv_id: str) -> Optional[GptsMessage]:
         """Get the last message in the conversation."""
-        return None
+        with self._lock:
+            conv = self._convs.get(conv_id)
+            if not conv or not conv.records:
+                return None
+            return conv.records[-1].to_message()
+
+
+def _to_plans(records: Iterable[_PlanRecord]) -> List[GptsPlan]:
+    return [record.to_plan() for record in records]
+
+
+def _to_messages(records: Iterable[_MessageRecord]) -> List[GptsMessage]:
+    return [record.to_message() for record in records]
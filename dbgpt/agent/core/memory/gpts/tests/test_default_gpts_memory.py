@@ -0,0 +1,83 @@
+from dbgpt.agent.core.memory.gpts import (
+    DefaultGptsMessageMemory,
+    DefaultGptsPlansMemory,
+    GptsMessage,
+    GptsPlan,
+)
+from dbgpt.agent.core.schema import Status
+
+
+def _message(conv_id: str, sender: str, receiver: str, content: str, **kwargs):
+    return GptsMessage(
+        conv_id=conv_id,
+        sender=sender,
+        receiver=receiver,
+        role="assistant",
+        content=content,
+        rounds=0,
+        **kwargs,
+    )
+
+
+def _contents(messages):
+    return [m.content for m in messages]
+
+
+def test_message_memory():
+    memory = DefaultGptsMessageMemory()
+    memory.append(_message("c1", "user", "planner", "1", current_goal="g1"))
+    memory.append(_message("c1", "planner", "coder", "2", current_goal="g1"))
+    memory.append(_message("c1", "coder", "planner", "3", current_goal="g2"))
+    memory.append(_message("c2", "user", "coder", "4"))
+
+    assert _contents(memory.get_by_conv_id("c1")) == ["1", "2", "3"]
+    assert _contents(memory.get_by_agent("c1", "planner")) == ["1", "2", "3"]
+    assert _contents(memory.get_by_agent("c1", "coder")) == ["2", "3"]
+    assert _contents(memory.get_between_agents("c1", "coder", "planner")) == [
+        "2",
+        "3",
+    ]
+    assert _contents(memory.get_between_agents("c1", "planner", "coder", "g2")) == ["3"]
+    assert memory.get_between_agents("c1", "user", "coder") == []
+    assert memory.get_by_agent("unknown", "user") == []
+    assert memory.get_last_message("c1").content == "3"
+    assert memory.get_last_message("unknown") is None
+
+
+def test_message_memory_returns_copies():
+    memory = DefaultGptsMessageMemory()
+    memory.append(_message("c1", "user", "planner", "1"))
+    memory.get_by_conv_id("c1")[0].content = "changed"
+    assert _contents(memory.get_by_conv_id("c1")) == ["1"]
+
+
+def test_plans_memory():
+    memory = DefaultGptsPlansMemory()
+    memory.batch_save(
+        [
+            GptsPlan(conv_id="c1", sub_task_num=i, sub_task_content=f"task{i}")
+            for i in (1, 2, 3)
+        ]
+        + [GptsPlan(conv_id="c2", sub_task_num=1, sub_task_content="other")]
+    )
+    assert [p.sub_task_num for p in memory.get_by_conv_id("c1")] == [1, 2, 3]
+    assert [p.sub_task_num for p in memory.get_by_conv_id_and_num("c1", ["3", 1])] == [
+        1,
+        3,
+    ]
+
+    memory.complete_task("c1", 1, "done")
+    memory.update_task(
+        "c1", 2, Status.RETRYING.value, 1, agent="coder", model="gpt", result="err"
+    )
+    memory.update_task("c1", 3, Status.RUNNING.value, 0)
+    plans = memory.get_by_conv_id("c1")
+    assert (plans[0].state, plans[0].result) == (Status.COMPLETE.value, "done")
+    assert (plans[1].sub_task_agent, plans[1].agent_model) == ("coder", "gpt")
+    assert plans[1].retry_times == 1
+    assert [p.sub_task_num for p in memory.get_todo_plans("c1")] == [2]
+
+    memory.remove_by_conv_id("c1")
+    assert memory.get_by_conv_id("c1") == []
+    assert memory.get_todo_plans("c1") == []
+    assert [p.sub_task_content for p in memory.get_todo_plans("c2")] == ["other"]
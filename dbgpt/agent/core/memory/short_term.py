@@ -3,12 +3,13 @@
 import random
 from concurrent.futures import Executor
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import List, Optional, Tuple
+
+import numpy as np
 
 from dbgpt.core import Embeddings
 from dbgpt.util.annotations import immutable, mutable
 from dbgpt.util.executor_utils import blocking_func_to_async
-from dbgpt.util.similarity_util import cosine_similarity, sigmoid_function
 
 from .base import (
     DiscardedMemoryFragments,
@@ -34,7 +35,9 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
         super().__init__(buffer_size=buffer_size)
         self._executor = executor
         self._embeddings = embeddings
-        self.short_embeddings: List[List[float]] = []
+        # The embeddings of the short-term memories, one row per memory
+        self._embedding_matrix: Optional[np.ndarray] = None
+        self._embedding_norms: Optional[np.ndarray] = None
         self.enhance_cnt: List[int] = [0 for _ in range(self._buffer_size)]
         self.enhance_memories: List[List[T]] = [[] for _ in range(self._buffer_size)]
         self.enhance_similarity_threshold = enhance_similarity_threshold
@@ -55,6 +58,47 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
         m._copy_from(self)
         return m
 
+    @property
+    def short_embeddings(self) -> List[List[float]]:
+        """Return the embeddings of the short-term memories."""
+        if self._embedding_matrix is None:
+            return []
+        return self._embedding_matrix.tolist()
+
+    def _enhance_probabilities(self, embeddings: List[float]) -> np.ndarray:
+        """Return the enhancement probabilities of the short-term memories.
+
+        The cosine similarities between the new embeddings and all the short-term
+        memories are transformed to [0, 1] by the sigmoid function in one vectorized
+        operation.
+        """
+        if self._embedding_matrix is None or not len(self._embedding_matrix):
+            return np.empty(0)
+        vector = np.asarray(embeddings, dtype=self._embedding_matrix.dtype)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similarities = (self._embedding_matrix @ vector) / (
+                self._embedding_norms * np.linalg.norm(vector)
+            )
+        return 1 / (1 + np.exp(-similarities))
+
+    def _append_embeddings(self, embeddings: List[float]) -> None:
+        row = np.asarray(embeddings, dtype=np.float64).reshape(1, -1)
+        norm = np.linalg.norm(row, axis=1)
+        if self._embedding_matrix is None or not len(self._embedding_matrix):
+            self._embedding_matrix = row
+            self._embedding_norms = norm
+        else:
+            self._embedding_matrix = np.vstack([self._embedding_matrix, row])
+            self._embedding_norms = np.concatenate(
+                [self._embedding_norms, norm]  # type: ignore
+            )
+
+    def _keep_embeddings(self, keep: np.ndarray) -> None:
+        """Keep the embeddings selected by the boolean mask or indexes."""
+        if self._embedding_matrix is not None:
+            self._embedding_matrix = self._embedding_matrix[keep]
+            self._embedding_norms = self._embedding_norms[keep]  # type: ignore
+
     @mutable
     async def write(
         self,
@@ -73,27 +117,15 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
             self._embeddings.embed_documents,
         )
         memory_fragment.update_embeddings(memory_fragment_embeddings)
-        for idx, memory_embedding in enumerate(self.short_embeddings):
-            similarity = await blocking_func_to_async(
-                self._executor,
-                cosine_similarity,
-                memory_embedding,
-                memory_fragment_embeddings,
-            )
-            # Sigmoid probability, transform similarity to [0, 1]
-            sigmoid_prob: float = await blocking_func_to_async(
-                self._executor, sigmoid_function, similarity
-            )
-            if (
-                sigmoid_prob >= self.enhance_similarity_threshold
-                and random.random() < sigmoid_prob
-            ):
+        sigmoid_probs = self._enhance_probabilities(memory_fragment_embeddings)
+        for idx in np.flatnonzero(sigmoid_probs >= self.enhance_similarity_threshold):
+            if random.random() < sigmoid_probs[idx]:
                 self.enhance_cnt[idx] += 1
                 self.enhance_memories[idx].append(memory_fragment)
         discard_memories = await self.transfer_to_long_term(memory_fragment)
         if op == WriteOperation.ADD:
             self._fragments.append(memory_fragment)
-            self.short_embeddings.append(memory_fragment_embeddings)
+            self._append_embeddings(memory_fragment_embeddings)
             await self.handle_overflow(self._fragments)
         return discard_memories
 
@@ -138,7 +170,6 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
             # re-construct the indexes of short-term memories after removing summarized
             # memories
             new_memories: List[T] = []
-            new_embeddings: List[List[float]] = []
             new_enhance_memories: List[List[T]] = [[] for _ in range(self._buffer_size)]
             new_enhance_cnt: List[int] = [0 for _ in range(self._buffer_size)]
             for idx, memory in enumerate(self.short_term_memories):
@@ -147,9 +178,8 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
                     new_enhance_memories[len(new_memories)] = self.enhance_memories[idx]
                     new_enhance_cnt[len(new_memories)] = self.enhance_cnt[idx]
                     new_memories.append(memory)
-                    new_embeddings.append(self.short_embeddings[idx])
             self._fragments = new_memories
-            self.short_embeddings = new_embeddings
+            self._keep_embeddings(np.asarray(existing_memory, dtype=bool))
             self.enhance_memories = new_enhance_memories
             self.enhance_cnt = new_enhance_cnt
         return DiscardedMemoryFragments(enhance_memories, enhance_insights)
@@ -163,23 +193,13 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
         Discard the least important memory fragment if the buffer size exceeds.
         """
         if len(self.short_term_memories) > self._buffer_size:
-            id2fragments: Dict[int, Dict] = {}
-            for idx in range(len(self.short_term_memories) - 1):
-                # Not discard the last one
-                memory = self.short_term_memories[idx]
-                id2fragments[idx] = {
-                    "enhance_count": self.enhance_cnt[idx],
-                    "importance": memory.importance,
-                }
-            # Sort by importance and enhance count, first discard the least important
-            sorted_ids = sorted(
-                id2fragments.keys(),
-                key=lambda x: (
-                    id2fragments[x]["importance"],
-                    id2fragments[x]["enhance_count"],
-                ),
+            # Sort by importance and enhance count, first discard the least important,
+            # but not discard the last one
+            candidates = self.short_term_memories[:-1]
+            pop_id = min(
+                range(len(candidates)),
+                key=lambda x: (candidates[x].importance, self.enhance_cnt[x]),
             )
-            pop_id = sorted_ids[0]
             pop_raw_observation = self.short_term_memories[pop_id].raw_observation
             self.enhance_cnt.pop(pop_id)
             self.enhance_cnt.append(0)
@@ -187,18 +207,22 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
             self.enhance_memories.append([])
 
             discard_memory = self._fragments.pop(pop_id)
-            self.short_embeddings.pop(pop_id)
+            self._keep_embeddings(
+                np.delete(np.arange(len(self._fragments) + 1), pop_id)
+            )
 
             # remove the discard_memory from other short-term memory's enhanced list
             for idx in range(len(self.short_term_memories)):
                 current_enhance_memories: List[T] = self.enhance_memories[idx]
-                to_remove_idx = []
-                for i, ehf in enumerate(current_enhance_memories):
-                    if ehf.raw_observation == pop_raw_observation:
-                        to_remove_idx.append(i)
-                for i in to_remove_idx:
-                    current_enhance_memories.pop(i)
-                self.enhance_cnt[idx] -= len(to_remove_idx)
+                kept_memories = [
+                    ehf
+                    for ehf in current_enhance_memories
+                    if ehf.raw_observation != pop_raw_observation
+                ]
+                self.enhance_cnt[idx] -= len(current_enhance_memories) - len(
+                    kept_memories
+                )
+                self.enhance_memories[idx] = kept_memories
 
             return memory_fragments, [discard_memory]
         return memory_fragments, []
@@ -0,0 +1,93 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+import pytest
+
+from dbgpt.agent.core.memory.agent_memory import AgentMemoryFragment
+from dbgpt.agent.core.memory.short_term import EnhancedShortTermMemory
+from dbgpt.core import Embeddings
+
+_WORDS = ["apple", "banana", "cherry", "dog", "egg", "fish"]
+
+
+class _MockEmbeddings(Embeddings):
+    """Each word is a direction, the text is the sum of its words."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = np.zeros(len(_WORDS))
+        for word in text.split():
+            vector[_WORDS.index(word)] += 1.0
+        return vector.tolist()
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+@pytest.fixture(autouse=True)
+def always_enhance(monkeypatch):
+    monkeypatch.setattr("random.random", lambda: 0.0)
+
+
+def _new_memory(executor, **kwargs) -> EnhancedShortTermMemory:
+    return EnhancedShortTermMemory(
+        embeddings=_MockEmbeddings(), executor=executor, **kwargs
+    )
+
+
+def _observations(memory: EnhancedShortTermMemory) -> List[str]:
+    return [m.raw_observation for m in memory.short_term_memories]
+
+
+@pytest.mark.asyncio
+async def test_write_enhances_similar_memories(executor):
+    memory = _new_memory(executor, buffer_size=3, enhance_threshold=10)
+    for observation in ["apple", "dog", "apple apple"]:
+        await memory.write(AgentMemoryFragment(observation))
+
+    assert _observations(memory) == ["apple", "dog", "apple apple"]
+    # sigmoid(cos) >= 0.7 only for the similar memory
+    assert memory.enhance_cnt == [1, 0, 0]
+    assert [m.raw_observation for m in memory.enhance_memories[0]] == ["apple apple"]
+    assert memory.short_embeddings == [
+        _MockEmbeddings().embed_query(o) for o in _observations(memory)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_transfer_to_long_term(executor):
+    memory = _new_memory(executor, buffer_size=3, enhance_threshold=1)
+    await memory.write(AgentMemoryFragment("dog"))
+    await memory.write(AgentMemoryFragment("apple"))
+    discarded = await memory.write(AgentMemoryFragment("apple apple"))
+
+    assert [m.raw_observation for m in discarded.discarded_memory_fragments] == [
+        "apple;apple apple"
+    ]
+    assert _observations(memory) == ["dog", "apple apple"]
+    assert memory.short_embeddings == [
+        _MockEmbeddings().embed_query(o) for o in _observations(memory)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_handle_overflow(executor):
+    memory = _new_memory(executor, buffer_size=2, enhance_threshold=10)
+    await memory.write(AgentMemoryFragment("apple", importance=0.9))
+    await memory.write(AgentMemoryFragment("dog", importance=0.1))
+    await memory.write(AgentMemoryFragment("fish", importance=0.5))
+
+    assert _observations(memory) == ["apple", "fish"]
+    assert memory.short_embeddings == [
+        _MockEmbeddings().embed_query(o) for o in _observations(memory)
+    ]
+    # The embeddings are reused by the following writes
+    await memory.write(AgentMemoryFragment("fish egg", importance=0.8))
+    assert _observations(memory) == ["apple", "fish egg"]
+    assert memory.enhance_cnt == [0, 0]
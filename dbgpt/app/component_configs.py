@@ -38,7 +38,7 @@ def initialize_components(
     )
     system_app.register(DefaultScheduler)
     system_app.register_instance(controller)
-    system_app.register(ConnectorManager)
+    system_app.register(ConnectorManager, connector_cache_ttl=CFG.CONNECTOR_CACHE_TTL)
 
     from dbgpt.serve.agent.hub.controller import module_plugin
 
@@ -72,7 +72,25 @@ def _initialize_model_cache(system_app: SystemApp):
     storage_type = CFG.MODEL_CACHE_STORAGE_TYPE or "disk"
     max_memory_mb = CFG.MODEL_CACHE_MAX_MEMORY_MB or 256
     persist_dir = CFG.MODEL_CACHE_STORAGE_DISK_DIR or MODEL_DISK_CACHE_DIR
-    initialize_cache(system_app, storage_type, max_memory_mb, persist_dir)
+    embeddings = None
+    if storage_type == "semantic":
+        from dbgpt.configs.model_config import EMBEDDING_MODEL_CONFIG
+        from dbgpt.rag.embedding.embedding_factory import EmbeddingFactory
+
+        embedding_factory = system_app.get_component(
+            "embedding_factory", EmbeddingFactory
+        )
+        embeddings = embedding_factory.create(
+            model_name=EMBEDDING_MODEL_CONFIG[CFG.EMBEDDING_MODEL]
+        )
+    initialize_cache(
+        system_app,
+        storage_type,
+        max_memory_mb,
+        persist_dir,
+        embeddings=embeddings,
+        similarity_threshold=CFG.MODEL_CACHE_SIMILARITY_THRESHOLD,
+    )
 
 
 def _initialize_awel(system_app: SystemApp, param: WebServerParameters):
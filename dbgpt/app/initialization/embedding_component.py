@@ -36,6 +36,35 @@ def _initialize_embedding_model(
         )
 
 
+def _wrap_embedding_cache(embeddings: "Embeddings", model_name: str) -> "Embeddings":
+    """Wrap the embeddings with cache if the embedding cache is enabled."""
+    from dbgpt._private.config import Config
+    from dbgpt.configs.model_config import EMBEDDING_DISK_CACHE_DIR
+    from dbgpt.storage.cache.embedding_cache import CachedEmbeddings
+
+    cfg = Config()
+    if not cfg.EMBEDDING_CACHE_ENABLE:
+        return embeddings
+    persist_dir = cfg.EMBEDDING_CACHE_STORAGE_DISK_DIR or EMBEDDING_DISK_CACHE_DIR
+    try:
+        return CachedEmbeddings(
+            embeddings,
+            model_name=model_name,
+            max_memory_items=cfg.EMBEDDING_CACHE_MAX_MEMORY_ITEMS,
+            persist_dir=persist_dir,
+        )
+    except ImportError as e:
+        logger.warning(
+            f"Can't import rocksdict, only cache embeddings in memory, import error "
+            f"message: {str(e)}"
+        )
+        return CachedEmbeddings(
+            embeddings,
+            model_name=model_name,
+            max_memory_items=cfg.EMBEDDING_CACHE_MAX_MEMORY_ITEMS,
+        )
+
+
 def _initialize_rerank_model(
     param: "WebServerParameters",
     system_app: SystemApp,
@@ -62,6 +91,7 @@ class RemoteEmbeddingFactory(EmbeddingFactory):
         self._default_model_name = model_name
         self.kwargs = kwargs
         self.system_app = system_app
+        self._cached_model: Optional["Embeddings"] = None
 
     def init_app(self, system_app):
         self.system_app = system_app
@@ -74,11 +104,18 @@ class RemoteEmbeddingFactory(EmbeddingFactory):
 
         if embedding_cls:
             raise NotImplementedError
+        if self._cached_model:
+            return self._cached_model
         worker_manager = self.system_app.get_component(
             ComponentType.WORKER_MANAGER_FACTORY, WorkerManagerFactory
         ).create()
         # Ignore model_name args
-        return RemoteEmbeddings(self._default_model_name, worker_manager)
+        embeddings = RemoteEmbeddings(self._default_model_name, worker_manager)
+        cached_embeddings = _wrap_embedding_cache(embeddings, self._default_model_name)
+        if cached_embeddings is not embeddings:
+            # The cache is shared by all the remote embeddings
+            self._cached_model = cached_embeddings
+        return cached_embeddings
 
 
 class LocalEmbeddingFactory(EmbeddingFactory):
@@ -128,7 +165,10 @@ class LocalEmbeddingFactory(EmbeddingFactory):
         logger.info(model_params)
         loader = EmbeddingLoader()
         # Ignore model_name args
-        return loader.load(self._default_model_name, model_params)
+        return _wrap_embedding_cache(
+            loader.load(self._default_model_name, model_params),
+            self._default_model_name,
+        )
 
 
 class RemoteRerankEmbeddingFactory(RerankEmbeddingFactory):
@@ -138,3 +138,26 @@ class DocumentChunkDao(BaseDao):
         chunks.delete()
         session.commit()
         session.close()
+
+    def truncate_document_chunks(self, document_id: int, keep: int):
+        """Delete the chunks of the document except the first ``keep`` chunks."""
+        session = self.get_raw_session()
+        if document_id is None:
+            raise Exception("document_id is None")
+        kept_ids = (
+            session.query(DocumentChunkEntity.id)
+            .filter(DocumentChunkEntity.document_id == document_id)
+            .order_by(DocumentChunkEntity.id.asc())
+            .limit(max(keep, 0))
+            .all()
+        )
+        chunks = session.query(DocumentChunkEntity).filter(
+            DocumentChunkEntity.document_id == document_id
+        )
+        if kept_ids:
+            chunks = chunks.filter(
+                DocumentChunkEntity.id.notin_([row[0] for row in kept_ids])
+            )
+        chunks.delete(synchronize_session=False)
+        session.commit()
+        session.close()
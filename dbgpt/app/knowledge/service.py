@@ -34,7 +34,11 @@ from dbgpt.rag.embedding.embedding_factory import EmbeddingFactory
 from dbgpt.rag.knowledge.base import KnowledgeType
 from dbgpt.rag.knowledge.factory import KnowledgeFactory
 from dbgpt.serve.rag.connector import VectorStoreConnector
-from dbgpt.serve.rag.models.models import KnowledgeSpaceDao, KnowledgeSpaceEntity
+from dbgpt.serve.rag.models.models import (
+    KnowledgeChunkVectorDao,
+    KnowledgeSpaceDao,
+    KnowledgeSpaceEntity,
+)
 from dbgpt.serve.rag.service.service import SyncStatus
 from dbgpt.storage.vector_store.base import VectorStoreConfig
 from dbgpt.util.executor_utils import ExecutorFactory, blocking_func_to_async
@@ -43,6 +47,7 @@ from dbgpt.util.tracer import root_tracer, trace
 knowledge_space_dao = KnowledgeSpaceDao()
 knowledge_document_dao = KnowledgeDocumentDao()
 document_chunk_dao = DocumentChunkDao()
+chunk_vector_dao = KnowledgeChunkVectorDao()
 
 logger = logging.getLogger(__name__)
 CFG = Config()
@@ -336,8 +341,11 @@ class KnowledgeService:
             raise Exception(f"invalid space name:{space_name}")
         space = spaces[0]
 
-        vector_ids = documents[0].vector_ids
-        if vector_ids is not None:
+        # the vectors synced by the knowledge serve are saved in the chunk vector table
+        vector_ids = chunk_vector_dao.get_vector_ids(documents[0].id)
+        if documents[0].vector_ids:
+            vector_ids.extend(documents[0].vector_ids.split(","))
+        if vector_ids:
             embedding_factory = CFG.SYSTEM_APP.get_component(
                 "embedding_factory", EmbeddingFactory
             )
@@ -354,7 +362,8 @@ class KnowledgeService:
                 vector_store_type=space.vector_type, vector_store_config=config
             )
             # delete vector by ids
-            vector_store_connector.delete_by_ids(vector_ids)
+            vector_store_connector.delete_by_ids(",".join(vector_ids))
+        chunk_vector_dao.delete_chunk_vectors(documents[0].id)
         # delete chunks
         document_chunk_dao.raw_delete(documents[0].id)
         # delete document
@@ -1,6 +1,8 @@
 import asyncio
+import json
 import logging
 import os
+import re
 import time
 import uuid
 from concurrent.futures import Executor
@@ -21,6 +23,10 @@ from dbgpt.app.openapi.api_view_model import (
     Result,
 )
 from dbgpt.app.scene import BaseChat, ChatFactory, ChatScene
+from dbgpt.app.scene.chat_db.auto_execute.critic_prompt import (
+    _DEFAULT_TEMPLATE_FOR_CRITIC_ZH,
+    API_KEY_ZHIPU,
+)
 from dbgpt.component import ComponentType
 from dbgpt.configs import TAG_KEY_KNOWLEDGE_CHAT_DOMAIN_TYPE
 from dbgpt.configs.model_config import KNOWLEDGE_UPLOAD_ROOT_PATH
@@ -45,9 +51,6 @@ from dbgpt.util.executor_utils import (
 )
 from dbgpt.util.tracer import SpanType, root_tracer
 
-import re
-import json
-from dbgpt.app.scene.chat_db.auto_execute.critic_prompt import _DEFAULT_TEMPLATE_FOR_CRITIC_ZH, API_KEY_ZHIPU
 # from dbgpt.app.scene.chat_db.auto_execute.critic_prompt_v2 import _DEFAULT_TEMPLATE_FOR_CRITIC_ZH, API_KEY_ZHIPU
 
 
@@ -448,11 +451,10 @@ async def model_supports(worker_manager: WorkerManager = Depends(get_worker_mana
         return Result.succ(FlatSupportedModel.from_supports(models))
     except Exception as e:
         return Result.failed(code="E000X", msg=f"Fetch supportd models error {e}")
-    
 
 
 async def no_stream_generator(chat):
-    #TODO: for循环两次接收nostream_call的两阶段yield值
+    # TODO: for循环两次接收nostream_call的两阶段yield值
     with root_tracer.start_span("no_stream_generator"):
         data_model_msg = await chat.nostream_call()
         print(f"data_model_msg:{data_model_msg}")
@@ -478,29 +480,30 @@ async def stream_generator(chat, incremental: bool, model_name: str):
     span = root_tracer.start_span("stream_generator")
     msg = "[LLM_ERROR]: llm server has no output, maybe your prompt template is wrong."
 
-    previous_response = ""
-    async for chunk in chat.stream_call():
-        if chunk:
-            msg = chunk.replace("\ufffd", "")
-            if incremental:
-                incremental_output = msg[len(previous_response) :]
-                choice_data = ChatCompletionResponseStreamChoice(
-                    index=0,
-                    delta=DeltaMessage(role="assistant", content=incremental_output),
-                )
-                chunk = ChatCompletionStreamResponse(
-                    id=chat.chat_session_id, choices=[choice_data], model=model_name
-                )
-                json_chunk = model_to_json(
-                    chunk, exclude_unset=True, ensure_ascii=False
-                )
-                yield f"data: {json_chunk}\n\n"
-            else:
+    if incremental:
+        # Only the new text is generated and sent
+        async for delta in chat.stream_call_incremental():
+            delta = delta.replace("\ufffd", "")
+            if not delta:
+                continue
+            choice_data = ChatCompletionResponseStreamChoice(
+                index=0,
+                delta=DeltaMessage(role="assistant", content=delta),
+            )
+            chunk = ChatCompletionStreamResponse(
+                id=chat.chat_session_id, choices=[choice_data], model=model_name
+            )
+            json_chunk = model_to_json(chunk, exclude_unset=True, ensure_ascii=False)
+            yield f"data: {json_chunk}\n\n"
+            await asyncio.sleep(0.02)
+    else:
+        async for chunk in chat.stream_call():
+            if chunk:
+                msg = chunk.replace("\ufffd", "")
                 # TODO generate an openai-compatible streaming responses
                 msg = msg.replace("\n", "\\n")
                 yield f"data:{msg}\n\n"
-            previous_response = msg
-            await asyncio.sleep(0.02)
+                await asyncio.sleep(0.02)
     if incremental:
         yield "data: [DONE]\n\n"
     span.end()
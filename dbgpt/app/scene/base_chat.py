@@ -15,8 +15,15 @@ from dbgpt.app.scene.operators.app_operator import (
     build_cached_chat_operator,
 )
 from dbgpt.component import ComponentType
-from dbgpt.core import LLMClient, ModelOutput, ModelRequest, ModelRequestContext
+from dbgpt.core import (
+    LLMClient,
+    ModelOutput,
+    ModelOutputAccumulator,
+    ModelRequest,
+    ModelRequestContext,
+)
 from dbgpt.core.interface.message import StorageConversation
+from dbgpt.core.interface.output_parser import StreamTextParser
 from dbgpt.model import DefaultLLMClient
 from dbgpt.model.cluster import WorkerManagerFactory
 from dbgpt.serve.conversation.serve import Serve as ConversationServe
@@ -268,27 +275,92 @@ class BaseChat(ABC):
         return metadata
 
     async def stream_call(self):
+        """Stream the full view message generated so far."""
+        async for view_msg in self._stream_view(incremental=False):
+            yield view_msg
+
+    async def stream_call_incremental(self):
+        """Stream the new text of the view message.
+
+        The scene which shows the parsed model output as it is streams the new text
+        directly, the others show a view built from the full output, the new text is
+        taken from :meth:`stream_call`.
+        """
+        cls = type(self)
+        if (
+            cls.stream_call is not BaseChat.stream_call
+            or cls.stream_plugin_call is not BaseChat.stream_plugin_call
+        ):
+            previous_view = ""
+            async for view_msg in self.stream_call():
+                yield view_msg[len(previous_view) :]
+                previous_view = view_msg
+            return
+        async for delta in self._stream_view(incremental=True):
+            yield delta
+
+    async def _stream_view(self, incremental: bool) -> AsyncIterator[str]:
         # TODO Retry when server connection error
         payload = await self._build_model_request()
 
         logger.info(f"payload request: \n{payload}")
         ai_response_text = ""
+        # Only the new text is transferred from the model and parsed, the full text
+        # is accumulated here
+        payload.incremental = True
+        accumulator = ModelOutputAccumulator()
+        text_parser = StreamTextParser()
+        view_msg = ""
         span = root_tracer.start_span(
             "BaseChat.stream_call", metadata=payload.to_dict()
         )
         payload.span_id = span.span_id
         try:
             async for output in self.call_streaming_operator(payload):
+                new_text = accumulator.add(output)
+                if output.error_code != 0:
+                    # The error message replaces the view
+                    msg = self.prompt_template.output_parser.parse_model_stream_resp_ex(
+                        accumulator.output, 0
+                    )
+                    view_msg = self.stream_plugin_call(msg).replace("\n", "\\n")
+                    yield view_msg
+                    continue
+                new_text = text_parser.feed(new_text)
+                if incremental:
+                    if new_text:
+                        yield new_text.replace("\n", "\\n")
+                    continue
                 # Plugin research in result generation
-                msg = self.prompt_template.output_parser.parse_model_stream_resp_ex(
-                    output, 0
-                )
-                view_msg = self.stream_plugin_call(msg)
+                view_msg = self.stream_plugin_call(text_parser.text)
                 view_msg = view_msg.replace("\n", "\\n")
                 yield view_msg
+            if accumulator.output is None:
+                raise ValueError("The model has no output")
+            msg = self.prompt_template.output_parser.parse_model_stream_resp_ex(
+                accumulator.output, 0
+            )
             self.current_message.add_ai_message(msg)
-            view_msg = self.stream_call_reinforce_fn(view_msg)
-            self.current_message.add_view_message(view_msg)
+            if accumulator.output.error_code != 0:
+                # The view message is the error message
+                pass
+            elif incremental:
+                # The view message is the parsed text as it is, send the text held
+                # back by the stream parser
+                streamed_text = text_parser.text
+                if msg != streamed_text and msg.startswith(streamed_text):
+                    yield msg[len(streamed_text) :].replace("\n", "\\n")
+                view_msg = msg.replace("\n", "\\n")
+            elif msg != text_parser.text:
+                view_msg = self.stream_plugin_call(msg).replace("\n", "\\n")
+                yield view_msg
+            reinforced_view_msg = self.stream_call_reinforce_fn(view_msg)
+            if reinforced_view_msg != view_msg:
+                if incremental and reinforced_view_msg.startswith(view_msg):
+                    yield reinforced_view_msg[len(view_msg) :]
+                else:
+                    yield reinforced_view_msg
+            self.current_message.add_view_message(reinforced_view_msg)
             span.end()
         except Exception as e:
             print(traceback.format_exc())
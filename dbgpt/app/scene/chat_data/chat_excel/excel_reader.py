@@ -1,5 +1,9 @@
+import csv
+import hashlib
 import logging
 import os
+import typing
+import uuid
 
 import chardet
 import duckdb
@@ -17,6 +21,7 @@ from pyparsing import (
     delimitedList,
 )
 
+from dbgpt.configs.model_config import EXCEL_SNAPSHOT_CACHE_DIR
 from dbgpt.util.pd_utils import csv_colunm_foramt
 from dbgpt.util.string_utils import is_chinese_include_number
 
@@ -29,10 +34,10 @@ def excel_colunm_format(old_name: str) -> str:
     return new_column
 
 
-def detect_encoding(file_path):
+def detect_encoding(file_path, max_bytes: int = -1):
     # 读取文件的二进制数据
     with open(file_path, "rb") as f:
-        data = f.read()
+        data = f.read(max_bytes)
     # 使用 chardet 来检测文件编码
     result = chardet.detect(data)
     encoding = result["encoding"]
@@ -226,73 +231,180 @@ def is_chinese(text):
     return False
 
 
-class ExcelReader:
-    def __init__(self, file_path):
-        file_name = os.path.basename(file_path)
-        self.file_name_without_extension = os.path.splitext(file_name)[0]
-        encoding, confidence = detect_encoding(file_path)
-        logger.info(f"Detected Encoding: {encoding} (Confidence: {confidence})")
-        self.excel_file_name = file_name
-        self.extension = os.path.splitext(file_name)[1]
-        # read excel file
-        if file_path.endswith(".xlsx") or file_path.endswith(".xls"):
-            df_tmp = pd.read_excel(file_path, index_col=False)
-            self.df = pd.read_excel(
-                file_path,
-                index_col=False,
-                converters={i: csv_colunm_foramt for i in range(df_tmp.shape[1])},
-            )
-        elif file_path.endswith(".csv"):
-            df_tmp = pd.read_csv(file_path, index_col=False, encoding=encoding)
-            self.df = pd.read_csv(
-                file_path,
-                index_col=False,
-                encoding=encoding,
-                # csv_colunm_foramt 可以修改更多，只是针对美元人民币符号，假如是“你好¥¥¥”则会报错！
-                converters={i: csv_colunm_foramt for i in range(df_tmp.shape[1])},
-            )
-        else:
-            raise ValueError("Unsupported file format.")
+_SNAPSHOT_SUFFIX = ".duckdb"
+_SNAPSHOT_META = "excel_columns"
+# Bump it when the normalization changes, the old snapshots will not be used
+_SNAPSHOT_VERSION = "2"
+# Detect the encoding by the head of the file, detect the whole file is very slow
+_ENCODING_SAMPLE_SIZE = 1024 * 1024
+_DUCKDB_CSV_ENCODINGS = {"ascii": "utf-8", "utf-8": "utf-8", "utf-8-sig": "utf-8"}
 
-        self.df.replace("", np.nan, inplace=True)
 
-        # 修改的部分
+def _file_hash(file_path: str) -> str:
+    hasher = hashlib.sha256(_SNAPSHOT_VERSION.encode())
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _dedup_names(names: typing.List[str]) -> typing.List[str]:
+    """Rename the duplicate names as pandas does, e.g. ``a, a`` to ``a, a.1``."""
+    counts: typing.Dict[str, int] = {}
+    new_names = []
+    for name in names:
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[name] = count + 1
+            name = f"{name}.{count}"
+            count = counts.get(name, 0)
+        counts[name] = count + 1
+        new_names.append(name)
+    return new_names
+
+
+def _read_raw(file_path: str) -> pd.DataFrame:
+    """Read the file once, all the cells are kept as the raw values."""
+    if file_path.endswith(".xlsx") or file_path.endswith(".xls"):
+        return pd.read_excel(file_path, index_col=False, dtype=object)
+    encoding, confidence = detect_encoding(file_path, _ENCODING_SAMPLE_SIZE)
+    logger.info(f"Detected Encoding: {encoding} (Confidence: {confidence})")
+    duckdb_encoding = _DUCKDB_CSV_ENCODINGS.get((encoding or "ascii").lower())
+    if duckdb_encoding:
+        try:
+            # The native CSV reader of DuckDB is much faster than pandas
+            with duckdb.connect(database=":memory:") as conn:
+                df = conn.execute(
+                    "SELECT * FROM read_csv(?, header = true, all_varchar = true, "
+                    "encoding = ?)",
+                    [file_path, duckdb_encoding],
+                ).df()
+            # Keep the same names of the columns without header as pandas
+            with open(file_path, encoding="utf-8-sig", newline="") as f:
+                header = next(csv.reader(f), [])
+            if len(header) == len(df.columns):
+                df.columns = _dedup_names(
+                    [
+                        name if name.strip() else f"Unnamed: {i}"
+                        for i, name in enumerate(header)
+                    ]
+                )
+            return df
+        except duckdb.Error as e:
+            logger.warning(f"Read csv with DuckDB failed, fallback to pandas: {e}")
+            # The text after the head may be in another encoding, e.g. an ASCII head
+            # followed by GBK text, detect it from the whole file
+            encoding, confidence = detect_encoding(file_path)
+            logger.info(f"Detected Encoding: {encoding} (Confidence: {confidence})")
+    # The bytes which can't be decoded are replaced, as TXTKnowledge does
+    return pd.read_csv(
+        file_path,
+        index_col=False,
+        encoding=encoding,
+        encoding_errors="replace",
+        dtype=object,
+    )
 
-        unnamed_columns_tmp = [
-            col
-            for col in df_tmp.columns
-            if col.startswith("Unnamed") and df_tmp[col].isnull().all()
-        ]
-        df_tmp.drop(columns=unnamed_columns_tmp, inplace=True)
 
-        self.df = self.df[df_tmp.columns.values]
-        #
+def _read_normalized(file_path: str, columns_map: dict) -> pd.DataFrame:
+    df = _read_raw(file_path)
+    unnamed_columns = [
+        col
+        for col in df.columns
+        if str(col).startswith("Unnamed") and df[col].isnull().all()
+    ]
+    df = df.drop(columns=unnamed_columns)
 
-        self.columns_map = {}
-        for column_name in df_tmp.columns:
-            self.df[column_name] = self.df[column_name].astype(str)
-            self.columns_map.update({column_name: excel_colunm_format(column_name)})
+    for column_name in df.columns:
+        # csv_colunm_foramt 可以修改更多，只是针对美元人民币符号，假如是“你好¥¥¥”则会报错！
+        df[column_name] = df[column_name].map(csv_colunm_foramt)
+    df.replace("", np.nan, inplace=True)
+
+    for column_name in df.columns:
+        df[column_name] = df[column_name].astype(str)
+        try:
+            df[column_name] = pd.to_datetime(df[column_name]).dt.strftime("%Y-%m-%d")
+        except ValueError:
             try:
-                self.df[column_name] = pd.to_datetime(self.df[column_name]).dt.strftime(
-                    "%Y-%m-%d"
-                )
+                df[column_name] = pd.to_numeric(df[column_name])
             except ValueError:
                 try:
-                    self.df[column_name] = pd.to_numeric(self.df[column_name])
-                except ValueError:
-                    try:
-                        self.df[column_name] = self.df[column_name].astype(str)
-                    except Exception:
-                        print("Can't transform column: " + column_name)
+                    df[column_name] = df[column_name].astype(str)
+                except Exception:
+                    print("Can't transform column: " + column_name)
+
+    # The formatted names may be duplicated too, e.g. "a b" and "a_b"
+    new_columns = _dedup_names([excel_colunm_format(str(c)) for c in df.columns])
+    columns_map.update(zip(df.columns, new_columns))
+    df.columns = new_columns
+    return df
+
+
+def _write_snapshot(
+    snapshot_path: str, table_name: str, df: pd.DataFrame, columns_map: dict
+) -> None:
+    """Write the table to a DuckDB file, the file is replaced atomically."""
+    os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+    tmp_path = f"{snapshot_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with duckdb.connect(database=tmp_path) as conn:
+            conn.register("_excel_df", df)
+            conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM _excel_df")
+            conn.execute(
+                f"CREATE TABLE {_SNAPSHOT_META} "
+                "(original_name VARCHAR, column_name VARCHAR)"
+            )
+            if columns_map:
+                conn.executemany(
+                    f"INSERT INTO {_SNAPSHOT_META} VALUES (?, ?)",
+                    list(columns_map.items()),
+                )
+        os.replace(tmp_path, snapshot_path)
+    finally:
+        for path in (tmp_path, f"{tmp_path}.wal"):
+            if os.path.exists(path):
+                os.remove(path)
+
 
-        self.df = self.df.rename(columns=lambda x: x.strip().replace(" ", "_"))
+class ExcelReader:
+    """Read the Excel(or CSV) file into a DuckDB table.
 
-        # connect DuckDB
-        self.db = duckdb.connect(database=":memory:", read_only=False)
+    The normalized table is persisted as a DuckDB file keyed by the hash of the file
+    content, the following chat turns open the snapshot read-only instead of parsing
+    the file again.
+    """
 
+    def __init__(
+        self, file_path, cache_dir: typing.Optional[str] = EXCEL_SNAPSHOT_CACHE_DIR
+    ):
+        file_name = os.path.basename(file_path)
+        self.file_name_without_extension = os.path.splitext(file_name)[0]
+        self.excel_file_name = file_name
+        self.extension = os.path.splitext(file_name)[1]
         self.table_name = "excel_data"
-        # write data in duckdb
-        self.db.register(self.table_name, self.df)
+        self.columns_map = {}
+        if not file_path.endswith((".xlsx", ".xls", ".csv")):
+            raise ValueError("Unsupported file format.")
+
+        snapshot_path = None
+        if cache_dir:
+            snapshot_path = os.path.join(
+                cache_dir, f"{_file_hash(file_path)}{_SNAPSHOT_SUFFIX}"
+            )
+        if snapshot_path and os.path.exists(snapshot_path):
+            try:
+                self.db = duckdb.connect(database=snapshot_path, read_only=True)
+                self.columns_map = dict(
+                    self.db.execute(
+                        f"SELECT original_name, column_name FROM {_SNAPSHOT_META}"
+                    ).fetchall()
+                )
+                logger.info(f"Load excel snapshot {snapshot_path} of {file_name}")
+            except Exception as e:
+                logger.warning(f"Invalid excel snapshot {snapshot_path}: {e}")
+                snapshot_path = self._build(file_path, snapshot_path)
+        else:
+            snapshot_path = self._build(file_path, snapshot_path)
 
         # 获取结果并打印表结构信息
         result = self.db.execute(f"DESCRIBE {self.table_name}")
@@ -300,6 +412,25 @@ class ExcelReader:
         for column in columns:
             print(column)
 
+    def _build(self, file_path: str, snapshot_path: typing.Optional[str]):
+        self.df = _read_normalized(file_path, self.columns_map)
+        if not snapshot_path:
+            # connect DuckDB
+            self.db = duckdb.connect(database=":memory:", read_only=False)
+            # write data in duckdb
+            self.db.register(self.table_name, self.df)
+            return None
+        try:
+            _write_snapshot(snapshot_path, self.table_name, self.df, self.columns_map)
+            self.db = duckdb.connect(database=snapshot_path, read_only=True)
+            logger.info(f"Save excel snapshot {snapshot_path} of {file_path}")
+            return snapshot_path
+        except Exception as e:
+            logger.warning(f"Failed to save excel snapshot {snapshot_path}: {e}")
+            self.db = duckdb.connect(database=":memory:", read_only=False)
+            self.db.register(self.table_name, self.df)
+            return None
+
     def run(self, sql):
         try:
             if f'"{self.table_name}"' in sql:
@@ -0,0 +1,94 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from dbgpt.app.scene.chat_data.chat_excel import excel_reader
+from dbgpt.app.scene.chat_data.chat_excel.excel_reader import ExcelReader
+
+
+def _write_csv(tmp_path, content: str, encoding: str = "utf-8") -> str:
+    file_path = str(tmp_path / "data.csv")
+    with open(file_path, "w", encoding=encoding, newline="") as f:
+        f.write(content)
+    return file_path
+
+
+def _rows(reader: ExcelReader):
+    return reader.run(f"SELECT * FROM {reader.table_name}")
+
+
+def test_snapshot_reused(tmp_path):
+    file_path = _write_csv(tmp_path, "name,age\nTom,10\nJerry,12\n")
+    cache_dir = str(tmp_path / "cache")
+    reader = ExcelReader(file_path, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    columns, values = _rows(reader)
+
+    with patch.object(
+        excel_reader, "_read_normalized", side_effect=AssertionError("reparsed")
+    ):
+        cached = ExcelReader(file_path, cache_dir=cache_dir)
+    assert _rows(cached) == (columns, values)
+    assert cached.columns_map == reader.columns_map
+
+
+def test_snapshot_invalid_rebuild(tmp_path):
+    file_path = _write_csv(tmp_path, "name,age\nTom,10\n")
+    cache_dir = str(tmp_path / "cache")
+    ExcelReader(file_path, cache_dir=cache_dir)
+    (snapshot,) = os.listdir(cache_dir)
+    with open(os.path.join(cache_dir, snapshot), "wb") as f:
+        f.write(b"broken")
+    reader = ExcelReader(file_path, cache_dir=cache_dir)
+    assert _rows(reader) == (["name", "age"], [("Tom", 10)])
+
+
+@pytest.mark.parametrize(
+    "encoding, content",
+    [
+        ("utf-8", "name,city\nTom,北京\n"),
+        ("utf-8-sig", "name,city\nTom,北京\n"),
+        ("gbk", "名字,城市\n汤姆,北京\n"),
+        ("ascii", "name,city\nTom,Paris\n"),
+    ],
+)
+def test_csv_encodings(tmp_path, encoding, content):
+    file_path = _write_csv(tmp_path, content, encoding)
+    reader = ExcelReader(file_path, cache_dir=None)
+    header, row = content.splitlines()
+    assert _rows(reader) == (header.split(","), [tuple(row.split(","))])
+
+
+def test_csv_ascii_head_utf8_tail(tmp_path):
+    content = "name,city\n" + "Tom,Paris\n" * 100 + "Tom,北京\n"
+    file_path = _write_csv(tmp_path, content)
+    with patch.object(excel_reader, "_ENCODING_SAMPLE_SIZE", 64):
+        reader = ExcelReader(file_path, cache_dir=None)
+    _, values = _rows(reader)
+    assert values[-1] == ("Tom", "北京")
+
+
+def test_csv_ascii_head_gbk_tail(tmp_path):
+    content = "name,city\n" + "Tom,Paris\n" * 100 + "汤姆,北京市朝阳区\n" * 20
+    file_path = _write_csv(tmp_path, content, "gbk")
+    with patch.object(excel_reader, "_ENCODING_SAMPLE_SIZE", 64):
+        reader = ExcelReader(file_path, cache_dir=None)
+    _, values = _rows(reader)
+    assert len(values) == 120
+    assert values[-1] == ("汤姆", "北京市朝阳区")
+
+
+def test_duplicate_headers(tmp_path):
+    file_path = _write_csv(tmp_path, "a,a,a.1,b c,b_c\n1,2,3,4,5\n")
+    reader = ExcelReader(file_path, cache_dir=None)
+    columns, values = _rows(reader)
+    assert columns == ["a", "a.1", "a.1.1", "b_c", "b_c.1"]
+    assert values == [(1, 2, 3, 4, 5)]
+    assert reader.columns_map == {
+        "a": "a",
+        "a.1": "a.1",
+        "a.1.1": "a.1.1",
+        "b c": "b_c",
+        "b_c": "b_c.1",
+    }
@@ -0,0 +1,97 @@
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+
+from dbgpt.app.scene.base_chat import BaseChat
+from dbgpt.core import ModelOutput, ModelRequest
+from dbgpt.core.interface.output_parser import BaseOutputParser
+
+_CHUNKS = ["  Hello", ",\n", "wor", "ld!\n`", "``\na\\", "_b\n```", "  \n"]
+_FULL_TEXT = "Hello,\nworld!\n```\na_b\n```"
+
+
+class _StubChat(BaseChat):
+    """The chat streams the chunks without a model."""
+
+    def __new__(cls, chunks: List[str]):
+        chat = object.__new__(cls)
+        chat._chunks = chunks
+        chat.prompt_template = MagicMock(output_parser=BaseOutputParser())
+        chat.current_message = MagicMock()
+        chat._executor = None
+        return chat
+
+    def __init__(self, chunks: List[str]):
+        pass
+
+    @property
+    def chat_type(self) -> str:
+        return "stub"
+
+    async def generate_input_values(self):
+        return {}
+
+    async def _build_model_request(self) -> ModelRequest:
+        return ModelRequest(model="stub", messages=[])
+
+    async def call_streaming_operator(self, request: ModelRequest):
+        assert request.incremental
+        for chunk in self._chunks:
+            yield ModelOutput(text=chunk, error_code=0, incremental=True)
+
+
+class _ReinforcedChat(_StubChat):
+    def stream_call_reinforce_fn(self, text):
+        return text + "\n\nreference"
+
+
+class _PluginChat(_StubChat):
+    def stream_plugin_call(self, text):
+        return f"<view>{text}</view>"
+
+
+@pytest.fixture(autouse=True)
+def _patch_blocking(monkeypatch):
+    async def _run(executor, func, *args):
+        return func(*args)
+
+    monkeypatch.setattr("dbgpt.app.scene.base_chat.blocking_func_to_async", _run)
+
+
+async def _collect(gen) -> List[str]:
+    return [item async for item in gen]
+
+
+@pytest.mark.asyncio
+async def test_stream_call_incremental():
+    chat = _ReinforcedChat(_CHUNKS)
+    deltas = await _collect(chat.stream_call_incremental())
+    escaped = _FULL_TEXT.replace("\n", "\\n")
+    assert "".join(deltas) == escaped + "\n\nreference"
+    chat.current_message.add_ai_message.assert_called_once_with(_FULL_TEXT)
+    chat.current_message.add_view_message.assert_called_once_with(
+        escaped + "\n\nreference"
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_call_cumulative():
+    chat = _ReinforcedChat(_CHUNKS)
+    views = await _collect(chat.stream_call())
+    escaped = _FULL_TEXT.replace("\n", "\\n")
+    assert views[-2] == escaped
+    assert views[-1] == escaped + "\n\nreference"
+    for previous, current in zip(views, views[1:]):
+        assert current.startswith(previous)
+
+
+@pytest.mark.asyncio
+async def test_stream_call_incremental_custom_view():
+    chat = _PluginChat(_CHUNKS)
+    views = await _collect(chat.stream_call())
+    deltas = await _collect(_PluginChat(_CHUNKS).stream_call_incremental())
+    # The new text is cut from the full views by the previous length
+    previous = [""] + views[:-1]
+    assert deltas == [view[len(prev) :] for prev, view in zip(previous, views)]
+    assert views[-1] == f"<view>{_FULL_TEXT}</view>".replace("\n", "\\n")
@@ -17,6 +17,7 @@ from dbgpt.core.interface.llm import (  # noqa: F401
     ModelInferenceMetrics,
     ModelMetadata,
     ModelOutput,
+    ModelOutputAccumulator,
     ModelRequest,
     ModelRequestContext,
 )
@@ -64,6 +65,7 @@ __ALL__ = [
     "ModelRequest",
     "ModelRequestContext",
     "ModelOutput",
+    "ModelOutputAccumulator",
     "ModelMetadata",
     "ModelMessage",
     "LLMClient",
@@ -11,7 +11,18 @@ import uuid
 from abc import ABC, abstractmethod
 from collections import deque
 from concurrent.futures import Executor
-from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 from dbgpt.component import SystemApp
 
@@ -455,6 +466,14 @@ def _build_task_key(task_name: str, key: str) -> str:
     return f"{task_name}___$$$$$$___{key}"
 
 
+# The task context of the operator running in the current asyncio task, it is keyed by
+# the DAGContext so that nested DAGs(e.g. sub DAG in composer operators) never see the
+# task context of another DAG run.
+_current_task_ctx_var: contextvars.ContextVar[
+    Optional[Tuple["DAGContext", TaskContext]]
+] = contextvars.ContextVar("awel_current_task_ctx", default=None)
+
+
 class DAGContext:
     """The context of current DAG, created when the DAG is running.
 
@@ -499,7 +518,15 @@ class DAGContext:
 
     @property
     def current_task_context(self) -> TaskContext:
-        """Return the current task context."""
+        """Return the current task context.
+
+        When the operators run concurrently, every operator runs in its own asyncio
+        task, so the task context is looked up from the context of the current
+        asyncio task first.
+        """
+        local_ctx = _current_task_ctx_var.get()
+        if local_ctx is not None and local_ctx[0] is self:
+            return local_ctx[1]
         if not self._curr_task_ctx:
             raise RuntimeError("Current task context not set")
         return self._curr_task_ctx
@@ -515,9 +542,11 @@ class DAGContext:
         When the task is running, the current task context
         will be set to the task context.
 
-        TODO: We should support parallel task running in the future.
+        The task context is also bound to the current asyncio task, so the operators
+        running in parallel will not overwrite the task context of each other.
         """
         self._curr_task_ctx = _curr_task_ctx
+        _current_task_ctx_var.set((self, _curr_task_ctx))
 
     def get_task_output(self, task_name: str) -> TaskOutput:
         """Get the task output by task name.
@@ -619,11 +648,32 @@ class DAG:
         resource_group: Optional[ResourceGroup] = None,
         tags: Optional[Dict[str, str]] = None,
         description: Optional[str] = None,
+        concurrent: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
     ) -> None:
-        """Initialize a DAG."""
+        """Initialize a DAG.
+
+        Args:
+            dag_id (str): The DAG id.
+            resource_group (Optional[ResourceGroup], optional): The resource group.
+            tags (Optional[Dict[str, str]], optional): The tags of the DAG.
+            description (Optional[str], optional): The description of the DAG.
+            concurrent (Optional[bool], optional): Whether to run the independent
+                upstream branches concurrently. If None, use the setting of the
+                workflow runner. Defaults to None.
+            max_concurrency (Optional[int], optional): The maximum number of operators
+                running at the same time in one DAG run. If None, use the setting of
+                the workflow runner. Defaults to None.
+        """
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError(
+                f"max_concurrency must be greater than 0, but got {max_concurrency}"
+            )
         self._dag_id = dag_id
         self._tags: Dict[str, str] = tags or {}
         self._description = description
+        self._concurrent = concurrent
+        self._max_concurrency = max_concurrency
         self.node_map: Dict[str, DAGNode] = {}
         self.node_name_to_node: Dict[str, DAGNode] = {}
         self._root_nodes: List[DAGNode] = []
@@ -668,6 +718,16 @@ class DAG:
         """Return the description of current DAG."""
         return self._description
 
+    @property
+    def concurrent(self) -> Optional[bool]:
+        """Whether to run the independent branches of current DAG concurrently."""
+        return self._concurrent
+
+    @property
+    def max_concurrency(self) -> Optional[int]:
+        """Return the maximum number of operators running at the same time."""
+        return self._max_concurrency
+
     @property
     def dev_mode(self) -> bool:
         """Whether the current DAG is in dev mode.
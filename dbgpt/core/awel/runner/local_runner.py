@@ -4,9 +4,10 @@ This runner will run the workflow in the current process.
 """
 
 import asyncio
+import contextlib
 import logging
 import traceback
-from typing import Any, Dict, List, Optional, Set, cast
+from typing import Any, AsyncContextManager, Dict, List, Optional, Set, cast
 
 from dbgpt.component import SystemApp
 from dbgpt.util.tracer import root_tracer
@@ -24,8 +25,23 @@ logger = logging.getLogger(__name__)
 class DefaultWorkflowRunner(WorkflowRunner):
     """The default workflow runner."""
 
-    def __init__(self):
-        """Init the default workflow runner."""
+    def __init__(self, concurrent: bool = False, max_concurrency: Optional[int] = None):
+        """Init the default workflow runner.
+
+        Args:
+            concurrent (bool, optional): Whether to run the independent upstream
+                branches concurrently, it can be overwritten by the DAG. Defaults to
+                False.
+            max_concurrency (Optional[int], optional): The default maximum number of
+                operators running at the same time in one DAG run, it can be
+                overwritten by the DAG. Defaults to None(no limit).
+        """
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError(
+                f"max_concurrency must be greater than 0, but got {max_concurrency}"
+            )
+        self._concurrent = concurrent
+        self._max_concurrency = max_concurrency
         self._running_dag_ctx: Dict[str, DAGContext] = {}
         self._task_log_index_map: Dict[str, int] = {}
         self._lock = asyncio.Lock()
@@ -102,9 +118,14 @@ class DefaultWorkflowRunner(WorkflowRunner):
                 "awel_node_name": node.node_name,
             },
         ):
-            await self._execute_node(
-                job_manager, node, dag_ctx, node_outputs, skip_node_ids, system_app
-            )
+            if self._is_concurrent(node):
+                await self._execute_dag_concurrently(
+                    job_manager, node, dag_ctx, node_outputs, skip_node_ids, system_app
+                )
+            else:
+                await self._execute_node(
+                    job_manager, node, dag_ctx, node_outputs, skip_node_ids, system_app
+                )
         if not streaming_call and node.dag and exist_dag_ctx is None:
             # streaming call not work for dag end
             # if exist_dag_ctx is not None, it means current dag is a sub dag
@@ -126,9 +147,7 @@ class DefaultWorkflowRunner(WorkflowRunner):
         if node.node_id in node_outputs:
             return
 
-        # Run all upstream nodes
-        # TODO: run in parallel, there are some code to be changed:
-        #  dag_ctx.set_current_task_context(task_ctx)
+        # Run all upstream nodes one by one
         for upstream_node in node.upstream:
             if isinstance(upstream_node, BaseOperator):
                 await self._execute_node(
@@ -139,7 +158,109 @@ class DefaultWorkflowRunner(WorkflowRunner):
                     skip_node_ids,
                     system_app,
                 )
+        await self._run_node(
+            job_manager, node, dag_ctx, node_outputs, skip_node_ids, system_app
+        )
+
+    def _is_concurrent(self, node: BaseOperator) -> bool:
+        if node.dag and node.dag.concurrent is not None:
+            return node.dag.concurrent
+        return self._concurrent
+
+    def _get_max_concurrency(self, node: BaseOperator) -> Optional[int]:
+        if node.dag and node.dag.max_concurrency is not None:
+            return node.dag.max_concurrency
+        return self._max_concurrency
+
+    async def _execute_dag_concurrently(
+        self,
+        job_manager: JobManager,
+        node: BaseOperator,
+        dag_ctx: DAGContext,
+        node_outputs: Dict[str, TaskContext],
+        skip_node_ids: Set[str],
+        system_app: Optional[SystemApp],
+    ):
+        """Run the DAG ending with the node, independent branches run in parallel."""
+        max_concurrency = self._get_max_concurrency(node)
+        limiter: AsyncContextManager = (
+            asyncio.Semaphore(max_concurrency)
+            if max_concurrency
+            else contextlib.nullcontext()
+        )
+        scheduled: Dict[str, asyncio.Task] = {}
+        try:
+            await self._execute_node_concurrently(
+                job_manager,
+                node,
+                dag_ctx,
+                node_outputs,
+                skip_node_ids,
+                system_app,
+                scheduled,
+                limiter,
+            )
+        except BaseException:
+            for task in scheduled.values():
+                if not task.done():
+                    task.cancel()
+            raise
+
+    async def _execute_node_concurrently(
+        self,
+        job_manager: JobManager,
+        node: BaseOperator,
+        dag_ctx: DAGContext,
+        node_outputs: Dict[str, TaskContext],
+        skip_node_ids: Set[str],
+        system_app: Optional[SystemApp],
+        scheduled: Dict[str, asyncio.Task],
+        limiter: AsyncContextManager,
+    ):
+        # Skip run node
+        if node.node_id in node_outputs:
+            return
+
+        # Every upstream node is scheduled only once in a DAG run, the downstream
+        # nodes which share the same upstream node will wait the same asyncio task.
+        upstream_tasks = []
+        for upstream_node in node.upstream:
+            if not isinstance(upstream_node, BaseOperator):
+                continue
+            if upstream_node.node_id not in scheduled:
+                scheduled[upstream_node.node_id] = asyncio.create_task(
+                    self._execute_node_concurrently(
+                        job_manager,
+                        upstream_node,
+                        dag_ctx,
+                        node_outputs,
+                        skip_node_ids,
+                        system_app,
+                        scheduled,
+                        limiter,
+                    )
+                )
+            upstream_tasks.append(scheduled[upstream_node.node_id])
+        if upstream_tasks:
+            await asyncio.gather(*upstream_tasks)
+
+        # Only hold the limiter when running current node, waiting for the upstream
+        # nodes should not take up the concurrency slots.
+        async with limiter:
+            await self._run_node(
+                job_manager, node, dag_ctx, node_outputs, skip_node_ids, system_app
+            )
 
+    async def _run_node(
+        self,
+        job_manager: JobManager,
+        node: BaseOperator,
+        dag_ctx: DAGContext,
+        node_outputs: Dict[str, TaskContext],
+        skip_node_ids: Set[str],
+        system_app: Optional[SystemApp],
+    ):
+        """Run the node, all the upstream nodes must be finished."""
         inputs = [
             node_outputs[upstream_node.node_id] for upstream_node in node.upstream
         ]
@@ -1,4 +1,5 @@
-from typing import List
+import asyncio
+from typing import List, Optional
 
 import pytest
 
@@ -6,6 +7,7 @@ from .. import (
     DAG,
     BranchOperator,
     DAGContext,
+    DefaultWorkflowRunner,
     InputOperator,
     JoinOperator,
     MapOperator,
@@ -143,3 +145,72 @@ async def test_branch_node(
         assert res.current_task_context.current_state == TaskState.SUCCESS
         expect_res = 999 if is_odd else 888
         assert res.current_task_context.task_output.output == expect_res
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "input_nodes, max_concurrency, expect_max_running",
+    [
+        ({"outputs": [0, 1, 2]}, None, 3),
+        ({"outputs": [0, 1, 2]}, 2, 2),
+        ({"outputs": [0, 1, 2]}, 1, 1),
+    ],
+    indirect=["input_nodes"],
+)
+async def test_concurrent_join_node(
+    input_nodes: List[InputOperator],
+    max_concurrency: Optional[int],
+    expect_max_running: int,
+):
+    running = 0
+    max_running = 0
+
+    async def slow_map(x: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        return x * 10
+
+    def join_func(p1, p2, p3) -> int:
+        return p1 + p2 + p3
+
+    runner = DefaultWorkflowRunner(concurrent=True)
+    with DAG("test_concurrent_join_node", max_concurrency=max_concurrency) as dag:
+        join_node = JoinOperator(join_func)
+        for input_node in input_nodes:
+            input_node >> MapOperator(slow_map) >> join_node
+        res: DAGContext[int] = await runner.execute_workflow(join_node)
+        assert res.current_task_context.current_state == TaskState.SUCCESS
+        assert res.current_task_context.task_output.output == 30
+        assert max_running == expect_max_running
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "input_node",
+    [({"outputs": [1]})],
+    indirect=["input_node"],
+)
+async def test_concurrent_shared_upstream(input_node: InputOperator):
+    call_count = 0
+
+    async def shared_map(x: int) -> int:
+        nonlocal call_count
+        call_count += 1
+        await asyncio.sleep(0.01)
+        return x + 1
+
+    runner = DefaultWorkflowRunner()
+    with DAG("test_concurrent_shared_upstream", concurrent=True) as dag:
+        shared_node = MapOperator(shared_map)
+        left_node = MapOperator(lambda x: x * 2)
+        right_node = MapOperator(lambda x: x * 3)
+        join_node = JoinOperator(lambda l, r: (l, r))
+        input_node >> shared_node
+        shared_node >> left_node >> join_node
+        shared_node >> right_node >> join_node
+        res: DAGContext = await runner.execute_workflow(join_node)
+        assert res.current_task_context.task_output.output == (4, 6)
+        assert call_count == 1
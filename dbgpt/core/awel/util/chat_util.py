@@ -4,7 +4,7 @@ import json
 import traceback
 from typing import Any, AsyncIterator, Dict, Optional
 
-from ...interface.llm import ModelInferenceMetrics, ModelOutput
+from ...interface.llm import ModelInferenceMetrics, ModelOutput, ModelOutputAccumulator
 from ...schema.api import ChatCompletionResponseStreamChoice
 from ..operators.base import BaseOperator
 from ..trigger.http_trigger import CommonLLMHttpResponseBody
@@ -148,31 +148,20 @@ async def chat_stream_with_dag_task(
                 if not model_output.success:
                     break
         else:
-            full_text = ""
-            previous_text = ""
+            accumulator = ModelOutputAccumulator()
             async for output in await task.call_stream(request):
                 model_output = parse_single_output(
                     output, is_sse, covert_to_str=covert_to_str
                 )
+                # The output is incremental if the task declares it, or the model
+                # output is incremental, otherwise the output is the full text
+                model_output.incremental = task.incremental_output or (
+                    isinstance(output, ModelOutput) and output.incremental
+                )
+                delta_text = accumulator.add(model_output)
                 model_output.incremental = incremental
-                if task.incremental_output:
-                    # Output is incremental, append the text
-                    full_text += model_output.text
-                else:
-                    # Output is not incremental, last output is the full text
-                    full_text = model_output.text
-                if not incremental:
-                    # Return the full text
-                    model_output.text = full_text
-                else:
-                    # Return the incremental text
-                    delta_text = full_text[len(previous_text) :]
-                    previous_text = (
-                        full_text
-                        if len(full_text) > len(previous_text)
-                        else previous_text
-                    )
-                    model_output.text = delta_text
+                # Return the incremental text or the full text
+                model_output.text = delta_text if incremental else accumulator.text
                 yield model_output
                 if not model_output.success:
                     break
@@ -27,6 +27,7 @@ class CachePolicy(str, Enum):
     """The cache policy of the cache."""
 
     LRU = "lru"
+    LFU = "lfu"
     FIFO = "fifo"
 
 
@@ -36,6 +37,8 @@ class CacheConfig:
 
     retrieval_policy: Optional[RetrievalPolicy] = RetrievalPolicy.EXACT_MATCH
     cache_policy: Optional[CachePolicy] = CachePolicy.LRU
+    # The time to live of the cache entry in seconds, None means never expire
+    ttl: Optional[float] = None
 
 
 class CacheKey(Serializable, ABC, Generic[K]):
@@ -2,6 +2,7 @@
 
 import collections
 import copy
+import dataclasses
 import logging
 import time
 from abc import ABC, abstractmethod
@@ -162,6 +163,8 @@ class ModelOutput:
     """The error code of the model inference. If the model inference is successful,
     the error code is 0."""
     incremental: bool = False
+    """Whether the text is the new text of a stream output, otherwise it is the full
+    text generated so far."""
     model_context: Optional[Dict] = None
     finish_reason: Optional[str] = None
     usage: Optional[Dict[str, Any]] = None
@@ -178,6 +181,63 @@ class ModelOutput:
         return self.error_code == 0
 
 
+class ModelOutputAccumulator:
+    """Accumulate the stream outputs of a model.
+
+    It accepts both the incremental outputs and the cumulative outputs, see
+    :attr:`ModelRequest.incremental`.
+
+    Examples:
+        .. code-block:: python
+
+            accumulator = ModelOutputAccumulator()
+            async for output in llm_client.generate_stream(request):
+                delta = accumulator.add(output)
+            full_output = accumulator.output
+    """
+
+    def __init__(self):
+        """Create a new ModelOutputAccumulator."""
+        self._chunks: List[str] = []
+        self._length = 0
+        self._last: Optional[ModelOutput] = None
+
+    def add(self, output: ModelOutput) -> str:
+        """Add a stream output.
+
+        Args:
+            output (ModelOutput): The stream output.
+
+        Returns:
+            str: The new text of the output.
+        """
+        self._last = output
+        text = output.text or ""
+        if output.incremental:
+            self._chunks.append(text)
+            self._length += len(text)
+            return text
+        # The full text so far
+        delta = text[self._length :]
+        self._chunks = [text]
+        self._length = len(text)
+        return delta
+
+    @property
+    def text(self) -> str:
+        """Return the full text generated so far."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    @property
+    def output(self) -> Optional[ModelOutput]:
+        """Return the full output so far, None if there is no output."""
+        if self._last is None or not self._last.incremental:
+            return self._last
+        return dataclasses.replace(self._last, text=self.text, incremental=False)
+
+
 _ModelMessageType = Union[List[ModelMessage], List[Dict[str, Any]]]
 
 
@@ -208,6 +268,13 @@ class ModelRequest:
     """Whether to echo the input messages."""
     span_id: Optional[str] = None
     """The span id of the model inference."""
+    incremental: bool = False
+    """Whether to return the incremental outputs in the stream.
+
+    If True, the text of every stream output is the new text, and the last output is
+    the full output(its ``incremental`` is False). Otherwise, the text of every stream
+    output is the full text generated so far.
+    """
 
     context: Optional[ModelRequestContext] = field(
         default_factory=lambda: ModelRequestContext()
@@ -28,6 +28,7 @@ from dbgpt.core.awel.flow import (
 from dbgpt.core.interface.llm import (
     LLMClient,
     ModelOutput,
+    ModelOutputAccumulator,
     ModelRequest,
     ModelRequestContext,
 )
@@ -177,8 +178,12 @@ class RequestBuilderOperator(MapOperator[RequestInput, ModelRequest]):
             if has_stream:
                 context_dict["stream"] = stream
             req_dict["context"] = ModelRequestContext(**context_dict)
-        # Just keep fields in ModelRequest
-        all_field_names = {f.name for f in dataclasses.fields(ModelRequest)}
+        # Just keep fields in ModelRequest, the incremental of the http request body is
+        # for the http response, the stream mode of the model is decided by the LLM
+        # operator.
+        all_field_names = {f.name for f in dataclasses.fields(ModelRequest)} - {
+            "incremental"
+        }
         filter_req_dict = {k: v for k, v in req_dict.items() if k in all_field_names}
         if "temperature" not in filter_req_dict:
             filter_req_dict["temperature"] = self._temperature
@@ -302,6 +307,11 @@ class BaseStreamingLLMOperator(
         llm_client (LLMClient, optional): The LLM client. Defaults to None.
 
     This operator will generate streaming response.
+
+    If the operator is created with ``incremental_output=True``, it requests the
+    incremental outputs from the model and every output only contains the new text.
+    Otherwise, the outputs are returned as the model generates them, see
+    :attr:`ModelRequest.incremental`.
     """
 
     def __init__(self, llm_client: Optional[LLMClient] = None, **kwargs):
@@ -320,10 +330,17 @@ class BaseStreamingLLMOperator(
         await self.current_dag_context.save_to_share_data(
             self.SHARE_DATA_KEY_MODEL_NAME, request.model
         )
-        model_output = None
+        if self.incremental_output and not request.incremental:
+            request = dataclasses.replace(request, incremental=True)
+        accumulator = ModelOutputAccumulator()
         async for output in self.llm_client.generate_stream(request):  # type: ignore
-            model_output = output
-            yield output
+            delta = accumulator.add(output)
+            if not self.incremental_output or not output.success:
+                yield output
+            elif delta or output.finish_reason:
+                # The LLM client may not support the incremental outputs
+                yield dataclasses.replace(output, text=delta, incremental=True)
+        model_output = accumulator.output
         if model_output:
             await self.save_model_output(self.current_dag_context, model_output)
 
@@ -499,6 +516,7 @@ class CommonStreamingOutputOperator(TransformStreamAbsOperator[ModelOutput, str]
 
     async def transform_stream(self, output_iter: AsyncIterator[ModelOutput]):
         """Transform upstream output iter to string foramt."""
+        accumulator = ModelOutputAccumulator()
         async for model_output in output_iter:
             if model_output.error_code != 0:
                 error_msg = (
@@ -507,7 +525,9 @@ class CommonStreamingOutputOperator(TransformStreamAbsOperator[ModelOutput, str]
                 )
                 yield f"data:{error_msg}"
                 return
-            decoded_unicode = model_output.text.replace("\ufffd", "")
+            # Every output is the full text
+            accumulator.add(model_output)
+            decoded_unicode = accumulator.text.replace("\ufffd", "")
             # msg = decoded_unicode.replace("\n", "\\n")
             yield f"data:{decoded_unicode}\n\n"
 
@@ -9,7 +9,7 @@ import json
 import logging
 from abc import ABC
 from dataclasses import asdict
-from typing import Any, TypeVar, Union
+from typing import Any, List, TypeVar, Union
 
 from dbgpt.core import ModelOutput
 from dbgpt.core.awel import MapOperator
@@ -274,6 +274,86 @@ class BaseOutputParser(MapOperator[ModelOutput, Any], ABC):
             return self.parse_model_nostream_resp(input_value, "###")
 
 
+class StreamTextParser:
+    """Parse the text of a model stream incrementally.
+
+    Feeding the new text of every stream output gives the same text as
+    :meth:`BaseOutputParser.parse_model_stream_resp_ex` on the full text, but only the
+    new text is processed: the leading whitespace is skipped, the trailing whitespace
+    is held back until more text comes, and the escaped underscores in the code blocks
+    are restored.
+
+    Unlike the full parse, the underscores in an unclosed code block are restored too,
+    because the code block may be still streaming.
+
+    Examples:
+        .. code-block:: python
+
+            parser = StreamTextParser()
+            async for output in llm_client.generate_stream(request):
+                new_text = parser.feed(accumulator.add(output))
+            new_text = parser.feed("", final=True)
+            full_text = parser.text
+    """
+
+    _CODE_SEP = "\n```"
+
+    def __init__(self):
+        """Create a new StreamTextParser."""
+        self._started = False
+        self._in_code = False
+        self._pending = ""
+        self._parts: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """Return the parsed text so far."""
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def feed(self, text: str, final: bool = False) -> str:
+        """Feed the new text of the model output.
+
+        Args:
+            text (str): The new text.
+            final (bool): Whether it is the end of the stream, the held back text is
+                parsed.
+
+        Returns:
+            str: The new parsed text.
+        """
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self._started = True
+        data = self._pending + text
+        end = len(data.rstrip())
+        if final:
+            self._pending = ""
+        else:
+            # Hold back a code separator or an escaped underscore which may be split
+            # by the outputs
+            if data.endswith("\\", 0, end):
+                end -= 1
+            elif data.endswith("\n``", 0, end):
+                end -= 3
+            elif data.endswith("\n`", 0, end):
+                end -= 2
+            self._pending = data[end:]
+        blocks = data[:end].split(self._CODE_SEP)
+        for i, block in enumerate(blocks):
+            if i > 0:
+                self._in_code = not self._in_code
+            if self._in_code:
+                blocks[i] = block.replace("\\_", "_")
+        new_text = self._CODE_SEP.join(blocks)
+        if new_text:
+            self._parts.append(new_text)
+        return new_text
+
+
 def _parse_model_response(response: ResponseTye):
     if response is None:
         resp_obj_ex = ""
@@ -0,0 +1,103 @@
+from typing import AsyncIterator, List
+
+import pytest
+
+from dbgpt.core import (
+    LLMClient,
+    ModelMessage,
+    ModelMetadata,
+    ModelOutput,
+    ModelOutputAccumulator,
+    ModelRequest,
+)
+from dbgpt.core.awel import DAG
+from dbgpt.core.operators import BaseStreamingLLMOperator
+
+
+class _IncrementalLLMClient(LLMClient):
+    def __init__(self, chunks: List[str]):
+        self.chunks = chunks
+        self.requests: List[ModelRequest] = []
+
+    async def generate(self, request, message_converter=None) -> ModelOutput:
+        return ModelOutput(text="".join(self.chunks), error_code=0)
+
+    async def generate_stream(
+        self, request, message_converter=None
+    ) -> AsyncIterator[ModelOutput]:
+        self.requests.append(request)
+        text = ""
+        for chunk in self.chunks:
+            text += chunk
+            if request.incremental:
+                yield ModelOutput(text=chunk, error_code=0, incremental=True)
+            else:
+                yield ModelOutput(text=text, error_code=0)
+        if request.incremental:
+            yield ModelOutput(text=text, error_code=0, finish_reason="stop")
+
+    async def models(self) -> List[ModelMetadata]:
+        return []
+
+    async def count_token(self, model: str, prompt: str) -> int:
+        return len(prompt)
+
+
+def _new_request(incremental: bool = False) -> ModelRequest:
+    return ModelRequest.build_request(
+        "test",
+        [ModelMessage.build_human_message("hello")],
+        stream=True,
+        incremental=incremental,
+    )
+
+
+def test_accumulate_incremental_outputs():
+    accumulator = ModelOutputAccumulator()
+    assert accumulator.output is None
+    assert accumulator.add(ModelOutput(text="Hello", error_code=0, incremental=True))
+    delta = accumulator.add(ModelOutput(text=" world", error_code=0, incremental=True))
+    assert delta == " world"
+    assert accumulator.text == "Hello world"
+    output = accumulator.output
+    assert output.text == "Hello world"
+    assert not output.incremental
+
+    # The last full output
+    assert accumulator.add(ModelOutput(text="Hello world", error_code=0)) == ""
+    assert accumulator.text == "Hello world"
+
+
+def test_accumulate_full_outputs():
+    accumulator = ModelOutputAccumulator()
+    assert accumulator.add(ModelOutput(text="Hello", error_code=0)) == "Hello"
+    assert accumulator.add(ModelOutput(text="Hello world", error_code=0)) == " world"
+    assert accumulator.text == "Hello world"
+    assert accumulator.output.text == "Hello world"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "incremental_output, request_incremental, expected",
+    [
+        (False, False, ["Hello", "Hello world"]),
+        (True, False, ["Hello", " world", ""]),
+        (False, True, ["Hello", " world", "Hello world"]),
+    ],
+)
+async def test_streaming_llm_operator(
+    incremental_output: bool, request_incremental: bool, expected: List[str]
+):
+    client = _IncrementalLLMClient(["Hello", " world"])
+    with DAG("test_streaming_llm_operator"):
+        task = BaseStreamingLLMOperator(
+            llm_client=client, incremental_output=incremental_output
+        )
+    outputs = [
+        out
+        async for out in await task.call_stream(
+            call_data=_new_request(request_incremental)
+        )
+    ]
+    assert [out.text for out in outputs] == expected
+    assert client.requests[0].incremental == (incremental_output or request_incremental)
@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from dbgpt.core import ModelOutput
+from dbgpt.core.interface.output_parser import BaseOutputParser, StreamTextParser
+
+_TEXTS = [
+    "  Hello, world!  \n",
+    "Use the code:\n```python\nprint(a\\_b)\n```\nand a\\_b outside.\n\n",
+    "```sql\nSELECT * FROM t\\_1\n```\n",
+    "\n\n line1\n\n  line2 \t\n```\ncode\\_1\\\\_2\n```\n`x`\n``y``   ",
+    "",
+    "   \n  ",
+]
+
+
+def _split(text: str, seed: int):
+    rnd = random.Random(seed)
+    chunks, i = [], 0
+    while i < len(text):
+        size = rnd.randint(1, 4)
+        chunks.append(text[i : i + size])
+        i += size
+    return chunks
+
+
+@pytest.mark.parametrize("text", _TEXTS)
+@pytest.mark.parametrize("seed", range(5))
+def test_stream_text_parser(text, seed):
+    expected = BaseOutputParser().parse_model_stream_resp_ex(
+        ModelOutput(text=text, error_code=0), 0
+    )
+    parser = StreamTextParser()
+    streamed = [parser.feed(chunk) for chunk in _split(text, seed)]
+    streamed.append(parser.feed("", final=True))
+    assert "".join(streamed) == expected
+    assert parser.text == expected
+
+
+def test_stream_text_parser_hold_back():
+    parser = StreamTextParser()
+    assert parser.feed("  a ") == "a"
+    assert parser.feed(" b\n`") == "  b"
+    assert parser.feed("``\nx\\") == "\n```\nx"
+    assert parser.feed("_y") == "_y"
+    assert parser.text == "a  b\n```\nx_y"
@@ -1,6 +1,8 @@
 """Connection manager."""
 import logging
-from typing import TYPE_CHECKING, List, Optional, Type
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
 
 from dbgpt.component import BaseComponent, ComponentType, SystemApp
 from dbgpt.storage.schema import DBType
@@ -8,6 +10,7 @@ from dbgpt.util.executor_utils import ExecutorFactory
 
 from ..base import BaseConnector
 from ..db_conn_info import DBConfig
+from ..rdbms.base import RDBMSConnector
 from .connect_config_db import ConnectConfigDao
 
 if TYPE_CHECKING:
@@ -16,17 +19,45 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# The engine arguments of the cached connectors, check the pooled connections before
+# using them and recycle them before the server closes them.
+_POOL_ENGINE_ARGS = {"pool_pre_ping": True, "pool_recycle": 3600}
+
+
+class _CachedConnector:
+    __slots__ = ("config_key", "connector", "created_at")
+
+    def __init__(self, config_key: Tuple, connector: BaseConnector):
+        self.config_key = config_key
+        self.connector = connector
+        self.created_at = time.monotonic()
+
 
 class ConnectorManager(BaseComponent):
-    """Connector manager."""
+    """Connector manager.
+
+    The RDBMS connectors are cached by the datasource config, so the requests to the
+    same datasource share the connection pool and the reflected tables. Every request
+    gets its own clone of the cached connector, see :meth:`RDBMSConnector.clone`.
+    """
 
     name = ComponentType.CONNECTOR_MANAGER
 
-    def __init__(self, system_app: SystemApp):
-        """Create a new ConnectorManager."""
+    def __init__(self, system_app: SystemApp, connector_cache_ttl: float = 600):
+        """Create a new ConnectorManager.
+
+        Args:
+            system_app (SystemApp): The system app.
+            connector_cache_ttl (float): The seconds to keep a cached connector, the
+                table names are refreshed when it expires. Disable the cache if it is
+                not positive.
+        """
         self.storage = ConnectConfigDao()
         self.system_app = system_app
         self._db_summary_client: Optional["DBSummaryClient"] = None
+        self._connector_cache_ttl = connector_cache_ttl
+        self._connector_cache: Dict[str, _CachedConnector] = {}
+        self._cache_lock = threading.Lock()
         super().__init__(system_app)
 
     def init_app(self, system_app: SystemApp):
@@ -109,12 +140,55 @@ class ConnectorManager(BaseComponent):
         return result
 
     def get_connector(self, db_name: str):
-        """Create a new connection instance.
+        """Get a connection instance.
+
+        The RDBMS connector is cached, a clone of the cached connector is returned.
 
         Args:
             db_name (str): database name
         """
         db_config = self.storage.get_db_config(db_name)
+        config_key = tuple(
+            db_config.get(key)
+            for key in ("db_type", "db_path", "db_host", "db_port", "db_user", "db_pwd")
+        )
+        cached = self._get_cached_connector(db_name, config_key)
+        if cached:
+            return cached.clone()
+        connector = self._create_connector(db_name, db_config)
+        if self._connector_cache_ttl <= 0 or not isinstance(connector, RDBMSConnector):
+            return connector
+        with self._cache_lock:
+            current = self._connector_cache.get(db_name)
+            if current and current.config_key == config_key:
+                # Created by another request at the same time
+                expired: Optional[BaseConnector] = connector
+                connector = current.connector
+            else:
+                expired = current.connector if current else None
+                self._connector_cache[db_name] = _CachedConnector(config_key, connector)
+        if expired:
+            _dispose_connector(expired)
+        return connector.clone()
+
+    def _get_cached_connector(
+        self, db_name: str, config_key: Tuple
+    ) -> Optional["RDBMSConnector"]:
+        with self._cache_lock:
+            cached = self._connector_cache.get(db_name)
+            if not cached:
+                return None
+            if (
+                cached.config_key == config_key
+                and time.monotonic() - cached.created_at < self._connector_cache_ttl
+            ):
+                return cached.connector  # type: ignore
+            # The config is changed or the cache is expired
+            del self._connector_cache[db_name]
+        _dispose_connector(cached.connector)
+        return None
+
+    def _create_connector(self, db_name: str, db_config: Dict) -> BaseConnector:
         db_type = DBType.of_db_type(db_config.get("db_type"))
         if not db_type:
             raise ValueError("Unsupported Db Type！" + db_config.get("db_type"))
@@ -127,10 +201,29 @@ class ConnectorManager(BaseComponent):
             db_port = db_config.get("db_port")
             db_user = db_config.get("db_user")
             db_pwd = db_config.get("db_pwd")
+            kwargs = {}
+            if issubclass(connect_instance, RDBMSConnector):
+                kwargs["engine_args"] = dict(_POOL_ENGINE_ARGS)
             return connect_instance.from_uri_db(  # type: ignore
-                host=db_host, port=db_port, user=db_user, pwd=db_pwd, db_name=db_name
+                host=db_host,
+                port=db_port,
+                user=db_user,
+                pwd=db_pwd,
+                db_name=db_name,
+                **kwargs,
             )
 
+    def invalidate_connector(self, db_name: str) -> None:
+        """Remove the cached connector of the database.
+
+        Args:
+            db_name (str): database name
+        """
+        with self._cache_lock:
+            cached = self._connector_cache.pop(db_name, None)
+        if cached:
+            _dispose_connector(cached.connector)
+
     def test_connect(self, db_info: DBConfig) -> BaseConnector:
         """Test connectivity.
 
@@ -174,10 +267,12 @@ class ConnectorManager(BaseComponent):
 
     def delete_db(self, db_name: str):
         """Delete db connect info."""
+        self.invalidate_connector(db_name)
         return self.storage.delete_db(db_name)
 
     def edit_db(self, db_info: DBConfig):
         """Edit db connect info."""
+        self.invalidate_connector(db_info.db_name)
         return self.storage.update_db_info(
             db_info.db_name,
             db_info.db_type,
@@ -235,3 +330,14 @@ class ConnectorManager(BaseComponent):
             raise ValueError("Add db connect info error!" + str(e))
 
         return True
+
+
+def _dispose_connector(connector: BaseConnector) -> None:
+    """Close the pooled connections of the connector."""
+    engine = getattr(connector, "_engine", None)
+    if engine is None:
+        return
+    try:
+        engine.dispose()
+    except Exception as e:
+        logger.warning(f"Dispose the engine of {connector.db_type} error: {e}")
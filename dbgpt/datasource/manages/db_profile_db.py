@@ -0,0 +1,80 @@
+"""DB Model for db_schema_profile."""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, Index, Integer, String
+
+from dbgpt.storage.metadata import BaseDao, Model
+
+
+class DBSchemaProfileEntity(Model):
+    """The embedded schema profile of a table."""
+
+    __tablename__ = "db_schema_profile"
+    id = Column(
+        Integer, primary_key=True, autoincrement=True, comment="autoincrement id"
+    )
+    db_name = Column(String(255), nullable=False, comment="db name")
+    table_name = Column(String(255), nullable=False, comment="table name")
+    fingerprint = Column(String(64), nullable=False, comment="fingerprint of the DDL")
+    vector_id = Column(String(255), nullable=True, comment="vector id of the summary")
+    gmt_created = Column(DateTime, default=datetime.now, comment="Record creation time")
+    gmt_modified = Column(DateTime, default=datetime.now, comment="Record update time")
+
+    __table_args__ = (Index("idx_q_db_name", "db_name"),)
+
+
+class DBSchemaProfileDao(BaseDao):
+    """The dao of the embedded schema profiles."""
+
+    def get_profiles(self, db_name: str) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Get the fingerprint and vector id of the tables of the database."""
+        with self.session(commit=False) as session:
+            rows = session.query(
+                DBSchemaProfileEntity.table_name,
+                DBSchemaProfileEntity.fingerprint,
+                DBSchemaProfileEntity.vector_id,
+            ).filter(DBSchemaProfileEntity.db_name == db_name)
+            return {row.table_name: (row.fingerprint, row.vector_id) for row in rows}
+
+    def save_profiles(
+        self, db_name: str, profiles: List[Tuple[str, str, Optional[str]]]
+    ) -> None:
+        """Save the table name, fingerprint and vector id of the tables.
+
+        The saved profiles of the tables are replaced.
+        """
+        if not profiles:
+            return
+        now = datetime.now()
+        with self.session() as session:
+            session.query(DBSchemaProfileEntity).filter(
+                DBSchemaProfileEntity.db_name == db_name,
+                DBSchemaProfileEntity.table_name.in_([p[0] for p in profiles]),
+            ).delete(synchronize_session=False)
+            session.add_all(
+                [
+                    DBSchemaProfileEntity(
+                        db_name=db_name,
+                        table_name=table_name,
+                        fingerprint=fingerprint,
+                        vector_id=vector_id,
+                        gmt_created=now,
+                        gmt_modified=now,
+                    )
+                    for table_name, fingerprint, vector_id in profiles
+                ]
+            )
+
+    def delete_profiles(
+        self, db_name: str, table_names: Optional[List[str]] = None
+    ) -> None:
+        """Delete the profiles of the tables, or all the tables of the database."""
+        with self.session() as session:
+            query = session.query(DBSchemaProfileEntity).filter(
+                DBSchemaProfileEntity.db_name == db_name
+            )
+            if table_names is not None:
+                query = query.filter(DBSchemaProfileEntity.table_name.in_(table_names))
+            query.delete(synchronize_session=False)
@@ -0,0 +1,98 @@
+import os
+import tempfile
+from typing import Dict
+from unittest.mock import patch
+
+import pytest
+
+from dbgpt.component import SystemApp
+from dbgpt.datasource.db_conn_info import DBConfig
+from dbgpt.datasource.manages.connector_manager import ConnectorManager
+from dbgpt.datasource.rdbms.conn_sqlite import SQLiteConnector
+
+
+class _MemoryConfigStorage:
+    def __init__(self):
+        self.configs: Dict[str, Dict] = {}
+
+    def get_db_config(self, db_name: str) -> Dict:
+        return dict(self.configs[db_name])
+
+    def delete_db(self, db_name: str):
+        self.configs.pop(db_name, None)
+        return True
+
+    def update_db_info(self, db_name, db_type, db_path, *args):
+        self.configs[db_name].update(db_type=db_type, db_path=db_path)
+        return True
+
+
+@pytest.fixture
+def db_path():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield os.path.join(temp_dir, "test.db")
+
+
+@pytest.fixture
+def manager(db_path):
+    manager = ConnectorManager(SystemApp())
+    manager.storage = _MemoryConfigStorage()
+    manager.storage.configs["test"] = {"db_type": "sqlite", "db_path": db_path}
+    return manager
+
+
+def test_get_connector_shares_engine(manager):
+    with patch.object(
+        SQLiteConnector, "from_file_path", wraps=SQLiteConnector.from_file_path
+    ) as create:
+        conn1 = manager.get_connector("test")
+        conn2 = manager.get_connector("test")
+    assert create.call_count == 1
+    assert conn1 is not conn2
+    assert conn1._engine is conn2._engine
+    assert conn1._metadata is conn2._metadata
+    assert conn1.session is not conn2.session
+
+
+def test_cached_connector_reflects_new_table(manager):
+    conn1 = manager.get_connector("test")
+    conn1.run("CREATE TABLE user (id INTEGER);")
+    conn2 = manager.get_connector("test")
+    conn2._sync_tables_from_db()
+    assert "CREATE TABLE user" in conn2.get_table_info(["user"])
+    assert "user" in conn1._metadata.tables
+
+
+def test_get_connector_expired(manager):
+    manager._connector_cache_ttl = 0.01
+    conn1 = manager.get_connector("test")
+    manager._connector_cache["test"].created_at -= 1
+    conn2 = manager.get_connector("test")
+    assert conn1._engine is not conn2._engine
+
+
+def test_edit_and_delete_db_invalidate_cache(manager, db_path):
+    conn1 = manager.get_connector("test")
+    manager.edit_db(DBConfig(db_name="test", db_type="sqlite", file_path=db_path))
+    assert "test" not in manager._connector_cache
+    conn2 = manager.get_connector("test")
+    assert conn1._engine is not conn2._engine
+
+    manager.delete_db("test")
+    assert "test" not in manager._connector_cache
+
+
+def test_config_changed(manager, db_path):
+    conn1 = manager.get_connector("test")
+    manager.storage.configs["test"]["db_path"] = db_path + ".new"
+    conn2 = manager.get_connector("test")
+    assert conn1._engine is not conn2._engine
+    assert str(conn2._engine.url).endswith(".new")
+
+
+def test_cache_disabled(manager):
+    manager._connector_cache_ttl = 0
+    conn1 = manager.get_connector("test")
+    conn2 = manager.get_connector("test")
+    assert conn1._engine is not conn2._engine
+    assert not manager._connector_cache
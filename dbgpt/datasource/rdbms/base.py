@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import copy
 import logging
 import re
+import threading
 from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, cast
 from urllib.parse import quote
 from urllib.parse import quote_plus as urlquote
@@ -79,8 +81,9 @@ class RDBMSConnector(BaseConnector):
         self._sample_rows_in_table_info = sample_rows_in_table_info
         self._indexes_in_table_info = indexes_in_table_info
 
+        # The tables are reflected lazily, only the tables which are used
         self._metadata = metadata or MetaData()
-        self._metadata.reflect(bind=self._engine)
+        self._reflect_lock = threading.Lock()
 
         self._all_tables: Set[str] = cast(Set[str], self._sync_tables_from_db())
 
@@ -118,6 +121,32 @@ class RDBMSConnector(BaseConnector):
         _engine_args = engine_args or {}
         return cls(create_engine(database_uri, **_engine_args), **kwargs)
 
+    def clone(self) -> RDBMSConnector:
+        """Create a connector which shares the engine with this connector.
+
+        The clone shares the connection pool, the reflected tables and the table
+        names, but has its own sessions, so it can be used by another request safely.
+        """
+        connector = copy.copy(self)
+        connector._inspector = inspect(self._engine)
+        connector._db_sessions = scoped_session(sessionmaker(bind=self._engine))
+        connector.session = connector.get_session()
+        connector._all_tables = set(self._all_tables)
+        return connector
+
+    def _get_tables(self, table_names: Iterable[str]) -> List[Table]:
+        """Get the reflected tables, the missing tables are reflected first."""
+        names = set(table_names)
+        with self._reflect_lock:
+            missing = names.difference(self._metadata.tables.keys())
+            if missing:
+                self._metadata.reflect(
+                    bind=self._engine,
+                    views=self.view_support,
+                    only=lambda name, _: name in missing,
+                )
+            return [tbl for tbl in self._metadata.sorted_tables if tbl.name in names]
+
     @property
     def dialect(self) -> str:
         """Return string representation of dialect to use."""
@@ -202,9 +231,8 @@ class RDBMSConnector(BaseConnector):
 
         meta_tables = [
             tbl
-            for tbl in self._metadata.sorted_tables
-            if tbl.name in set(all_table_names)
-            and not (self.dialect == "sqlite" and tbl.name.startswith("sqlite_"))
+            for tbl in self._get_tables(all_table_names)
+            if not (self.dialect == "sqlite" and tbl.name.startswith("sqlite_"))
         ]
 
         tables = []
@@ -42,6 +42,10 @@ class ClickhouseConnector(RDBMSConnector):
 
         self._metadata = MetaData()
 
+    def clone(self) -> "ClickhouseConnector":
+        """Create a connector which shares the client with this connector."""
+        return ClickhouseConnector(self.client)
+
     @classmethod
     def from_uri_db(
         cls,
@@ -51,7 +51,6 @@ class PostgreSQLConnector(RDBMSConnector):
         table_results = set(row[0] for row in table_results)  # noqa: C401
         view_results = set(row[0] for row in view_results)  # noqa: C401
         self._all_tables = table_results.union(view_results)
-        self._metadata.reflect(bind=self._engine)
         return self._all_tables
 
     def get_grants(self):
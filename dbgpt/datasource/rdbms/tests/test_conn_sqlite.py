@@ -138,3 +138,23 @@ def test_db_dir_exist_dir():
         db = SQLiteConnector.from_file_path(file_path)
         assert os.path.exists(existing_dir) == True
         assert list(db.get_table_names()) == []
+
+
+def test_lazy_reflect_tables(db):
+    db.run("CREATE TABLE test1 (id INTEGER);")
+    db.run("CREATE TABLE test2 (id INTEGER);")
+    db._sync_tables_from_db()
+    assert not db._metadata.tables
+    assert "CREATE TABLE test1" in db.get_table_info(["test1"])
+    assert set(db._metadata.tables.keys()) == {"test1"}
+
+
+def test_clone(db):
+    db.run("CREATE TABLE test (id INTEGER);")
+    db._sync_tables_from_db()
+    cloned = db.clone()
+    assert cloned._engine is db._engine
+    assert cloned.session is not db.session
+    assert list(cloned.get_table_names()) == ["test"]
+    assert "CREATE TABLE test" in cloned.get_table_info()
+    assert "test" in db._metadata.tables
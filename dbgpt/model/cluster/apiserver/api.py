@@ -18,7 +18,7 @@ from fastapi.security.http import HTTPAuthorizationCredentials, HTTPBearer
 
 from dbgpt._private.pydantic import BaseModel, model_to_dict, model_to_json
 from dbgpt.component import BaseComponent, ComponentType, SystemApp
-from dbgpt.core import ModelOutput
+from dbgpt.core import ModelOutput, ModelOutputAccumulator
 from dbgpt.core.interface.message import ModelMessage
 from dbgpt.core.schema.api import (
     APIChatCompletionRequest,
@@ -43,6 +43,11 @@ from dbgpt.model.base import ModelInstance
 from dbgpt.model.cluster.manager_base import WorkerManager, WorkerManagerFactory
 from dbgpt.model.cluster.registry import ModelRegistry
 from dbgpt.model.parameter import ModelAPIServerParameters, WorkerType
+from dbgpt.util.embedding_utils import (
+    EMBEDDING_ENCODING_BASE64,
+    EMBEDDING_ENCODING_FLOAT,
+    encode_embedding_base64,
+)
 from dbgpt.util.fastapi import create_app
 from dbgpt.util.parameter_utils import EnvArgumentParser
 from dbgpt.util.tracer import initialize_tracer, root_tracer
@@ -275,20 +280,17 @@ class APIServer(BaseComponent):
             json_data = model_to_json(chunk, exclude_unset=True, ensure_ascii=False)
             yield f"data: {json_data}\n\n"
 
-            previous_text = ""
+            # Only the new text is transferred from the model worker
+            params["incremental"] = True
+            accumulator = ModelOutputAccumulator()
+            finished = False
             async for model_output in worker_manager.generate_stream(params):
                 model_output: ModelOutput = model_output
                 if model_output.error_code != 0:
                     yield f"data: {json.dumps(model_output.to_dict(), ensure_ascii=False)}\n\n"
                     yield "data: [DONE]\n\n"
                     return
-                decoded_unicode = model_output.text.replace("\ufffd", "")
-                delta_text = decoded_unicode[len(previous_text) :]
-                previous_text = (
-                    decoded_unicode
-                    if len(decoded_unicode) > len(previous_text)
-                    else previous_text
-                )
+                delta_text = accumulator.add(model_output).replace("\ufffd", "")
 
                 if len(delta_text) == 0:
                     delta_text = None
@@ -301,9 +303,13 @@ class APIServer(BaseComponent):
                     id=id, choices=[choice_data], model=model_name
                 )
                 if delta_text is None:
-                    if model_output.finish_reason is not None:
+                    # The last full output repeats the finish reason of the last
+                    # incremental output
+                    if model_output.finish_reason is not None and not finished:
                         finish_stream_events.append(chunk)
+                        finished = True
                     continue
+                finished = finished or model_output.finish_reason is not None
                 json_data = model_to_json(chunk, exclude_unset=True, ensure_ascii=False)
                 yield f"data: {json_data}\n\n"
 
@@ -480,6 +486,13 @@ async def create_embeddings(
     request: EmbeddingsRequest, api_server: APIServer = Depends(get_api_server)
 ):
     await api_server.get_model_instances_or_raise(request.model, worker_type="text2vec")
+    encoding_format = request.encoding_format or EMBEDDING_ENCODING_FLOAT
+    if encoding_format not in (EMBEDDING_ENCODING_FLOAT, EMBEDDING_ENCODING_BASE64):
+        return create_error_response(
+            ErrorCode.PARAM_OUT_OF_RANGE,
+            f"Unsupported encoding_format {encoding_format}, "
+            f"supported: {EMBEDDING_ENCODING_FLOAT}, {EMBEDDING_ENCODING_BASE64}",
+        )
     texts = request.input
     if isinstance(texts, str):
         texts = [texts]
@@ -503,7 +516,11 @@ async def create_embeddings(
         data += [
             {
                 "object": "embedding",
-                "embedding": emb,
+                "embedding": (
+                    encode_embedding_base64(emb)
+                    if encoding_format == EMBEDDING_ENCODING_BASE64
+                    else emb
+                ),
                 "index": num_batch * batch_size + i,
             }
             for i, emb in enumerate(embeddings)
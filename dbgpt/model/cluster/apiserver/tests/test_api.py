@@ -9,8 +9,15 @@ from dbgpt.model.cluster.apiserver.api import (
     api_settings,
     initialize_apiserver,
 )
-from dbgpt.model.cluster.tests.conftest import _new_cluster
+from dbgpt.model.cluster.tests.conftest import (
+    _create_model_registry,
+    _create_workers,
+    _new_cluster,
+    _start_worker_manager,
+)
 from dbgpt.model.cluster.worker.manager import _DefaultWorkerManagerFactory
+from dbgpt.model.parameter import WorkerType
+from dbgpt.util.embedding_utils import decode_embedding_base64
 from dbgpt.util.fastapi import create_app
 from dbgpt.util.openai_utils import chat_completion, chat_completion_stream
 
@@ -263,3 +270,35 @@ async def test_chat_completions_with_api_keys(
             await chat_completion("/api/v1/chat/completions", chat_data, client)
             == expected_messages
         )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding_format", [None, "float", "base64"])
+async def test_embeddings(system_app: SystemApp, encoding_format: str):
+    embeddings = [[0.5, -1.25, 2.0]]
+    workers = _create_workers(
+        1, worker_type=WorkerType.TEXT2VEC.value, embeddings=embeddings
+    )
+    registry = await _create_model_registry(workers)
+    if api_settings:
+        api_settings.api_keys = []
+    async with AsyncClient(
+        transport=ASGITransport(app), base_url="http://test"
+    ) as client:
+        async with _start_worker_manager(workers=workers) as worker_manager:
+            system_app.register(_DefaultWorkerManagerFactory, worker_manager)
+            system_app.register_instance(registry)
+            initialize_apiserver(None, None, app, system_app, api_keys=[])
+            body = {"model": "test-model-name-0", "input": "hello"}
+            if encoding_format:
+                body["encoding_format"] = encoding_format
+            res = await client.post("/api/v1/embeddings", json=body)
+            assert res.status_code == 200
+            embedding = res.json()["data"][0]["embedding"]
+            if encoding_format == "base64":
+                embedding = decode_embedding_base64(embedding)
+            assert embedding == embeddings[0]
+
+            body["encoding_format"] = "unknown"
+            res = await client.post("/api/v1/embeddings", json=body)
+            assert res.status_code == 400
@@ -26,6 +26,8 @@ class PromptRequest(BaseModel):
     """Message version, default to v2"""
     context: Dict[str, Any] = None
     """Context information for the model"""
+    incremental: bool = False
+    """Whether to return the incremental outputs in the stream"""
 
 
 class EmbeddingsRequest(BaseModel):
@@ -34,6 +36,8 @@ class EmbeddingsRequest(BaseModel):
     span_id: Optional[str] = None
     query: Optional[str] = None
     """For rerank model, query is required"""
+    encoding_format: Optional[str] = None
+    """The encoding format of the response, "binary" for the compact binary format"""
 
 
 class CountTokenRequest(BaseModel):
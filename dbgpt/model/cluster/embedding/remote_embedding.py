@@ -25,7 +25,7 @@ class RemoteEmbeddings(Embeddings):
 
     async def aembed_query(self, text: str) -> List[float]:
         """Asynchronous Embed query text."""
-        return await self.aembed_documents([text])[0]
+        return (await self.aembed_documents([text]))[0]
 
 
 class RemoteRerankEmbeddings(RerankEmbeddings):
@@ -25,6 +25,8 @@ class WorkerRunData:
     stop_event: asyncio.Event
     semaphore: asyncio.Semaphore = None
     command_args: List[str] = None
+    # The capacity weight of the instance, used by the routing strategies
+    weight: Optional[float] = None
     _heartbeat_future: Optional[Future] = None
     _last_heartbeat: Optional[datetime] = None
 
@@ -0,0 +1,161 @@
+"""Dynamic micro-batching for the model workers.
+
+The concurrent small requests are coalesced into one batch, so the model runs one
+forward pass for all of them.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class _BatchRequest(Generic[T, R]):
+    __slots__ = ("items", "future")
+
+    def __init__(self, items: List[T]):
+        self.items = items
+        self.future: "Future[List[R]]" = Future()
+
+
+class MicroBatcher(Generic[T, R]):
+    """Coalesce the concurrent requests into batches.
+
+    The requests are collected by a background thread, until the number of the items
+    reaches ``max_batch_size`` or ``max_wait_ms`` has passed since the first request of
+    the batch arrived. Then ``batch_func`` is called with all the items, and the results
+    are scattered back to the callers.
+
+    A request is never split, so a request which is larger than ``max_batch_size`` is
+    run in its own batch.
+
+    Examples:
+        .. code-block:: python
+
+            batcher = MicroBatcher(embeddings.embed_documents, max_batch_size=64)
+            # Called in the threads of the callers
+            vectors = batcher.submit(["hello", "world"])
+    """
+
+    def __init__(
+        self,
+        batch_func: Callable[[List[T]], List[R]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        name: str = "micro-batcher",
+    ):
+        """Create a new MicroBatcher.
+
+        Args:
+            batch_func (Callable[[List[T]], List[R]]): The function to run one batch,
+                it must return one result for each item.
+            max_batch_size (int): The max number of the items in one batch.
+            max_wait_ms (float): The max time in milliseconds to wait for more
+                requests after the first request of the batch arrived.
+            name (str): The name of the background thread.
+        """
+        self._batch_func = batch_func
+        self._max_batch_size = max(max_batch_size, 1)
+        self._max_wait = max(max_wait_ms, 0.0) / 1000
+        self._name = name
+        self._queue: "queue.Queue[Optional[_BatchRequest[T, R]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, items: List[T]) -> List[R]:
+        """Submit the items and wait for the results.
+
+        Args:
+            items (List[T]): The items of the request.
+
+        Returns:
+            List[R]: The results of the items, in the same order.
+        """
+        if not items:
+            return []
+        request: _BatchRequest[T, R] = _BatchRequest(items)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self._name} is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=self._name, daemon=True
+                )
+                self._thread.start()
+            self._queue.put(request)
+        return request.future.result()
+
+    def close(self) -> None:
+        """Stop the background thread after the submitted requests are finished."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            request = self._queue.get()
+            if request is None:
+                break
+            batch = [request]
+            size = len(request.items)
+            deadline = time.monotonic() + self._max_wait
+            while size < self._max_batch_size:
+                try:
+                    # Take the requests arrived during the last batch without waiting
+                    timeout = deadline - time.monotonic()
+                    if timeout > 0:
+                        request = self._queue.get(timeout=timeout)
+                    else:
+                        request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                if size + len(request.items) > self._max_batch_size:
+                    # Run it in the next batch
+                    self._run_batch(batch)
+                    batch, size = [], 0
+                batch.append(request)
+                size += len(request.items)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[_BatchRequest[T, R]]) -> None:
+        if not batch:
+            return
+        items = [item for request in batch for item in request.items]
+        try:
+            results = self._batch_func(items)
+            if len(results) != len(items):
+                raise ValueError(
+                    f"The batch function returned {len(results)} results for "
+                    f"{len(items)} items"
+                )
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].future.set_exception(e)
+                return
+            # Run the requests separately, so a bad request does not fail the others
+            logger.warning(f"{self._name} batch failed, retry one by one: {e}")
+            for request in batch:
+                self._run_batch([request])
+            return
+        start = 0
+        for request in batch:
+            end = start + len(request.items)
+            request.future.set_result(list(results[start:end]))
+            start = end
@@ -1,8 +1,9 @@
+import dataclasses
 import logging
 import os
 import time
 import traceback
-from typing import Dict, Iterator, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from dbgpt.configs.model_config import get_device
 from dbgpt.core import (
@@ -141,6 +142,7 @@ class DefaultModelWorker(ModelWorker):
         span = root_tracer.start_span(
             "DefaultModelWorker.generate_stream", params.get("span_id")
         )
+        incremental = bool(params.get("incremental"))
         try:
             (
                 params,
@@ -155,6 +157,8 @@ class DefaultModelWorker(ModelWorker):
             previous_response = ""
             last_metrics = ModelInferenceMetrics.create_metrics()
             is_first_generate = True
+            last_output: Optional[ModelOutput] = None
+            sent_len = 0
 
             context_len = params.get("context_len") or self.context_len
             for output in generate_stream_func(
@@ -176,7 +180,16 @@ class DefaultModelWorker(ModelWorker):
                     is_first_generate = False
                 previous_response = output_str
                 last_metrics = current_metrics
-                yield model_output
+                last_output = model_output
+                if not incremental or not model_output.success:
+                    yield model_output
+                    continue
+                delta_output, sent_len = _to_incremental_output(model_output, sent_len)
+                if delta_output.text or delta_output.finish_reason:
+                    yield delta_output
+            if incremental and last_output:
+                # The last output is the full output
+                yield last_output
             print(
                 f"\n\nfull stream output:\n{previous_response}\n\nmodel generate_stream params:\n{params}"
             )
@@ -229,6 +242,7 @@ class DefaultModelWorker(ModelWorker):
         span = root_tracer.start_span(
             "DefaultModelWorker.async_generate_stream", params.get("span_id")
         )
+        incremental = bool(params.get("incremental"))
         try:
             (
                 params,
@@ -245,6 +259,8 @@ class DefaultModelWorker(ModelWorker):
 
             last_metrics = ModelInferenceMetrics.create_metrics()
             is_first_generate = True
+            last_output: Optional[ModelOutput] = None
+            sent_len = 0
             async for output in generate_stream_func(
                 self.model, self.tokenizer, params, get_device(), context_len
             ):
@@ -262,10 +278,18 @@ class DefaultModelWorker(ModelWorker):
                 )
                 if is_first_generate:
                     is_first_generate = False
-
                 previous_response = output_str
                 last_metrics = current_metrics
-                yield model_output
+                last_output = model_output
+                if not incremental or not model_output.success:
+                    yield model_output
+                    continue
+                delta_output, sent_len = _to_incremental_output(model_output, sent_len)
+                if delta_output.text or delta_output.finish_reason:
+                    yield delta_output
+            if incremental and last_output:
+                # The last output is the full output
+                yield last_output
             print(
                 f"\n\nfull stream output:\n{previous_response}\n\nmodel generate_stream params:\n{params}"
             )
@@ -385,6 +409,25 @@ class DefaultModelWorker(ModelWorker):
         return model_output
 
 
+def _to_incremental_output(
+    output: ModelOutput, sent_len: int
+) -> Tuple[ModelOutput, int]:
+    """Convert the full output to the incremental output.
+
+    Args:
+        output (ModelOutput): The full output generated so far.
+        sent_len (int): The length of the text which has been sent.
+
+    Returns:
+        Tuple[ModelOutput, int]: The incremental output and the new sent length.
+    """
+    # The replacement characters at the end may be the incomplete bytes of the next
+    # character, hold them until the character is decoded completely.
+    text = output.text.rstrip("\ufffd")
+    delta_output = dataclasses.replace(output, text=text[sent_len:], incremental=True)
+    return delta_output, max(sent_len, len(text))
+
+
 def _parse_model_max_length(model, tokenizer) -> Optional[int]:
     if not (tokenizer or model):
         return None
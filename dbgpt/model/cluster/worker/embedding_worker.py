@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, List, Type, Union
+from typing import Dict, List, Optional, Tuple, Type, Union
 
 from dbgpt.core import Embeddings, ModelMetadata, RerankEmbeddings
 from dbgpt.model.adapter.embeddings_loader import (
@@ -7,6 +7,7 @@ from dbgpt.model.adapter.embeddings_loader import (
     _parse_embedding_params,
 )
 from dbgpt.model.adapter.loader import _get_model_real_path
+from dbgpt.model.cluster.worker.batching import MicroBatcher
 from dbgpt.model.cluster.worker_base import ModelWorker
 from dbgpt.model.parameter import (
     EMBEDDING_NAME_TO_PARAMETER_CLASS_CONFIG,
@@ -27,6 +28,9 @@ class EmbeddingsModelWorker(ModelWorker):
         self.model_path = None
         self._rerank_model = rerank_model
         self._loader = EmbeddingLoader()
+        self._max_batch_size = 64
+        self._max_batch_wait_ms = 5.0
+        self._batcher: Optional[MicroBatcher] = None
 
     def load_worker(self, model_name: str, model_path: str, **kwargs) -> None:
         if model_path.endswith("/"):
@@ -35,6 +39,12 @@ class EmbeddingsModelWorker(ModelWorker):
 
         self.model_name = model_name
         self.model_path = model_path
+        max_batch_size = kwargs.get("embedding_max_batch_size")
+        if max_batch_size is not None:
+            self._max_batch_size = max_batch_size
+        max_batch_wait_ms = kwargs.get("embedding_max_batch_wait_ms")
+        if max_batch_wait_ms is not None:
+            self._max_batch_wait_ms = max_batch_wait_ms
 
     def worker_type(self) -> WorkerType:
         return WorkerType.TEXT2VEC
@@ -74,11 +84,30 @@ class EmbeddingsModelWorker(ModelWorker):
         else:
             logger.info(f"Load embeddings model: {self.model_name}")
             self._embeddings_impl = self._loader.load(self.model_name, model_params)
+        self._init_batcher()
+
+    def _init_batcher(self) -> None:
+        """Create the batcher to coalesce the concurrent requests."""
+        if self._max_batch_size <= 1:
+            return
+        if isinstance(self._embeddings_impl, RerankEmbeddings):
+            batch_func = self._rerank_batch
+        else:
+            batch_func = self._embeddings_impl.embed_documents
+        self._batcher = MicroBatcher(
+            batch_func,
+            max_batch_size=self._max_batch_size,
+            max_wait_ms=self._max_batch_wait_ms,
+            name=f"{self.model_name}-batcher",
+        )
 
     def __del__(self):
         self.stop()
 
     def stop(self) -> None:
+        if self._batcher:
+            self._batcher.close()
+            self._batcher = None
         if not self._embeddings_impl:
             return
         del self._embeddings_impl
@@ -107,7 +136,31 @@ class EmbeddingsModelWorker(ModelWorker):
         textx: List[str] = params["input"]
         if isinstance(self._embeddings_impl, RerankEmbeddings):
             query = params["query"]
-            scores: List[float] = self._embeddings_impl.predict(query, textx)
+            if self._batcher:
+                scores = self._batcher.submit([(query, text) for text in textx])
+            else:
+                scores = self._embeddings_impl.predict(query, textx)
             return [scores]
+        elif self._batcher:
+            return self._batcher.submit(textx)
         else:
             return self._embeddings_impl.embed_documents(textx)
+
+    def _rerank_batch(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Score the query and candidate pairs of multiple requests."""
+        from dbgpt.rag.embedding.rerank import CrossEncoderRerankEmbeddings
+
+        if isinstance(self._embeddings_impl, CrossEncoderRerankEmbeddings):
+            return self._embeddings_impl.predict_pairs(pairs)
+        # Only one query can be scored at a time
+        candidates: Dict[str, List[int]] = {}
+        for i, (query, _) in enumerate(pairs):
+            candidates.setdefault(query, []).append(i)
+        scores: List[float] = [0.0] * len(pairs)
+        for query, positions in candidates.items():
+            query_scores = self._embeddings_impl.predict(
+                query, [pairs[i][1] for i in positions]
+            )
+            for i, score in zip(positions, query_scores):
+                scores[i] = score
+        return scores
@@ -0,0 +1,215 @@
+"""Shared HTTP connection pool for the remote model workers.
+
+The remote model workers are created for every request by the worker manager, so the
+HTTP clients are kept in a process-wide pool, the TCP/TLS connections to the model
+workers can be reused by all the requests.
+"""
+import asyncio
+import logging
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator, Iterator, Optional
+
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HttpClientPoolMetrics:
+    """The metrics of the HTTP client pool."""
+
+    max_connections: int
+    # The number of requests which are waiting for the response now
+    in_flight_requests: int = 0
+    total_requests: int = 0
+    failed_requests: int = 0
+    # The number of the opened connections and the idle ones in them
+    connections: int = 0
+    idle_connections: int = 0
+
+    @property
+    def utilization(self) -> float:
+        """Return the ratio of the busy connections to the max connections."""
+        if not self.max_connections:
+            return 0.0
+        return (self.connections - self.idle_connections) / self.max_connections
+
+
+class HttpClientPool:
+    """A pool of keep-alive HTTP clients.
+
+    The async clients are bound to the event loop, so one async client is created for
+    each event loop, and a ``requests.Session`` is shared by the sync requests.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+        http2: bool = True,
+    ):
+        """Create a new HttpClientPool.
+
+        Args:
+            max_connections (int): The max number of the connections of one client.
+            max_keepalive_connections (int): The max number of the idle connections
+                kept alive of one client.
+            keepalive_expiry (float): The time in seconds to close the idle
+                connections.
+            http2 (bool): Whether to enable HTTP/2, it only works when the ``h2``
+                package is installed.
+        """
+        self._max_connections = max_connections
+        self._max_keepalive_connections = max_keepalive_connections
+        self._keepalive_expiry = keepalive_expiry
+        self._http2 = http2 and _h2_available()
+        # Event loop to its async client
+        self._async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._session: Optional["requests.Session"] = None
+        self._lock = threading.Lock()
+        self._in_flight_requests = 0
+        self._total_requests = 0
+        self._failed_requests = 0
+
+    def get_async_client(self) -> "httpx.AsyncClient":
+        """Get the async client of the current event loop."""
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self._max_connections,
+                        max_keepalive_connections=self._max_keepalive_connections,
+                        keepalive_expiry=self._keepalive_expiry,
+                    ),
+                    http2=self._http2,
+                )
+                self._async_clients[loop] = client
+            return client
+
+    def get_session(self) -> "requests.Session":
+        """Get the shared session for the sync requests."""
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self._max_keepalive_connections,
+                    pool_maxsize=self._max_connections,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    @asynccontextmanager
+    async def async_client(self) -> AsyncIterator["httpx.AsyncClient"]:
+        """Get the async client and record the request metrics."""
+        client = self.get_async_client()
+        with self._track_request():
+            yield client
+
+    @contextmanager
+    def session(self) -> Iterator["requests.Session"]:
+        """Get the sync session and record the request metrics."""
+        session = self.get_session()
+        with self._track_request():
+            yield session
+
+    def metrics(self) -> HttpClientPoolMetrics:
+        """Return the metrics of the pool."""
+        connections = 0
+        idle_connections = 0
+        with self._lock:
+            clients = list(self._async_clients.values())
+            metrics = HttpClientPoolMetrics(
+                max_connections=self._max_connections * max(len(clients), 1),
+                in_flight_requests=self._in_flight_requests,
+                total_requests=self._total_requests,
+                failed_requests=self._failed_requests,
+            )
+        for client in clients:
+            # The connections are not public in httpx, just for observability
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            for conn in getattr(pool, "connections", []):
+                connections += 1
+                if conn.is_idle():
+                    idle_connections += 1
+        metrics.connections = connections
+        metrics.idle_connections = idle_connections
+        return metrics
+
+    async def aclose(self) -> None:
+        """Close all the clients in the pool."""
+        with self._lock:
+            clients = list(self._async_clients.items())
+            self._async_clients.clear()
+            session, self._session = self._session, None
+        current_loop = asyncio.get_running_loop()
+        for loop, client in clients:
+            if loop is current_loop:
+                await client.aclose()
+            elif not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        if session:
+            session.close()
+
+    @contextmanager
+    def _track_request(self) -> Iterator[None]:
+        with self._lock:
+            self._in_flight_requests += 1
+            self._total_requests += 1
+        try:
+            yield
+        except Exception:
+            with self._lock:
+                self._failed_requests += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight_requests -= 1
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+_default_pool: Optional[HttpClientPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_http_client_pool() -> HttpClientPool:
+    """Get the process-wide default HTTP client pool."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = HttpClientPool()
+        return _default_pool
+
+
+def initialize_http_client_pool(**kwargs) -> HttpClientPool:
+    """Initialize the default HTTP client pool with the given limits.
+
+    The clients in the old default pool are not closed, they will be closed when they
+    are garbage collected.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        _default_pool = HttpClientPool(**kwargs)
+        return _default_pool
@@ -3,7 +3,6 @@ import itertools
 import json
 import logging
 import os
-import random
 import sys
 import time
 import traceback
@@ -12,7 +11,7 @@ from dataclasses import asdict
 from typing import Awaitable, Callable, Iterator
 
 from fastapi import APIRouter
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
 from dbgpt.component import SystemApp
 from dbgpt.configs.model_config import LOGDIR
@@ -25,9 +24,20 @@ from dbgpt.model.cluster.manager_base import (
     WorkerRunData,
 )
 from dbgpt.model.cluster.registry import ModelRegistry
+from dbgpt.model.cluster.worker.routing import (
+    InstanceStatsRegistry,
+    RoutingStrategy,
+    create_routing_strategy,
+    parse_model_routing_strategies,
+)
 from dbgpt.model.cluster.worker_base import ModelWorker
 from dbgpt.model.parameter import ModelWorkerParameters, WorkerType
 from dbgpt.model.utils.llm_utils import list_supported_models
+from dbgpt.util.embedding_utils import (
+    EMBEDDING_BINARY_MEDIA_TYPE,
+    EMBEDDING_ENCODING_BINARY,
+    encode_embeddings,
+)
 from dbgpt.util.fastapi import create_app, register_event_handler
 from dbgpt.util.parameter_utils import (
     EnvArgumentParser,
@@ -70,6 +80,8 @@ class LocalWorkerManager(WorkerManager):
         model_registry: ModelRegistry = None,
         host: str = None,
         port: int = None,
+        routing_strategy: str = "random",
+        model_routing_strategies: Optional[Dict[str, str]] = None,
     ) -> None:
         self.workers: Dict[str, List[WorkerRunData]] = dict()
         self.executor = ThreadPoolExecutor(max_workers=os.cpu_count() * 5)
@@ -80,6 +92,13 @@ class LocalWorkerManager(WorkerManager):
         self.host = host
         self.port = port
         self.start_listeners = []
+        # The live metrics of the instances, used to route the requests
+        self.instance_stats = InstanceStatsRegistry()
+        self._default_routing_strategy = create_routing_strategy(routing_strategy)
+        self._routing_strategies: Dict[str, RoutingStrategy] = {
+            model_name: create_routing_strategy(strategy)
+            for model_name, strategy in (model_routing_strategies or {}).items()
+        }
 
         self.run_data = WorkerRunData(
             host=self.host,
@@ -294,8 +313,10 @@ class LocalWorkerManager(WorkerManager):
             raise Exception(
                 f"Cound not found worker instances for model name {model_name} and worker type {worker_type}"
             )
-        worker_run_data = random.choice(worker_instances)
-        return worker_run_data
+        strategy = self._routing_strategies.get(
+            model_name, self._default_routing_strategy
+        )
+        return strategy.select(worker_instances, self.instance_stats)
 
     async def select_one_instance(
         self, worker_type: str, model_name: str, healthy_only: bool = True
@@ -341,20 +362,23 @@ class LocalWorkerManager(WorkerManager):
                     error_code=1,
                 )
                 return
-            async with worker_run_data.semaphore:
-                if worker_run_data.worker.support_async():
-                    async for outout in worker_run_data.worker.async_generate_stream(
-                        params
-                    ):
-                        yield outout
-                else:
-                    if not async_wrapper:
-                        from starlette.concurrency import iterate_in_threadpool
+            with self.instance_stats.track(worker_run_data) as timer:
+                async with worker_run_data.semaphore:
+                    if worker_run_data.worker.support_async():
+                        output_iter = worker_run_data.worker.async_generate_stream(
+                            params
+                        )
+                    else:
+                        if not async_wrapper:
+                            from starlette.concurrency import iterate_in_threadpool
 
-                        async_wrapper = iterate_in_threadpool
-                    async for output in async_wrapper(
-                        worker_run_data.worker.generate_stream(params)
-                    ):
+                            async_wrapper = iterate_in_threadpool
+                        output_iter = async_wrapper(
+                            worker_run_data.worker.generate_stream(params)
+                        )
+                    async for output in output_iter:
+                        # The latency of the stream is the time to the first token
+                        timer.stop()
                         yield output
 
     async def generate(self, params: Dict) -> ModelOutput:
@@ -370,13 +394,14 @@ class LocalWorkerManager(WorkerManager):
                     text=f"**LLMServer Generate Error, Please CheckErrorInfo.**: {e}",
                     error_code=1,
                 )
-            async with worker_run_data.semaphore:
-                if worker_run_data.worker.support_async():
-                    return await worker_run_data.worker.async_generate(params)
-                else:
-                    return await self.run_blocking_func(
-                        worker_run_data.worker.generate, params
-                    )
+            with self.instance_stats.track(worker_run_data):
+                async with worker_run_data.semaphore:
+                    if worker_run_data.worker.support_async():
+                        return await worker_run_data.worker.async_generate(params)
+                    else:
+                        return await self.run_blocking_func(
+                            worker_run_data.worker.generate, params
+                        )
 
     async def embeddings(self, params: Dict) -> List[List[float]]:
         """Embed input"""
@@ -388,17 +413,19 @@ class LocalWorkerManager(WorkerManager):
                 worker_run_data = await self._get_model(params, worker_type="text2vec")
             except Exception as e:
                 raise e
-            async with worker_run_data.semaphore:
-                if worker_run_data.worker.support_async():
-                    return await worker_run_data.worker.async_embeddings(params)
-                else:
-                    return await self.run_blocking_func(
-                        worker_run_data.worker.embeddings, params
-                    )
+            with self.instance_stats.track(worker_run_data):
+                async with worker_run_data.semaphore:
+                    if worker_run_data.worker.support_async():
+                        return await worker_run_data.worker.async_embeddings(params)
+                    else:
+                        return await self.run_blocking_func(
+                            worker_run_data.worker.embeddings, params
+                        )
 
     def sync_embeddings(self, params: Dict) -> List[List[float]]:
         worker_run_data = self._sync_get_model(params, worker_type="text2vec")
-        return worker_run_data.worker.embeddings(params)
+        with self.instance_stats.track(worker_run_data):
+            return worker_run_data.worker.embeddings(params)
 
     async def count_token(self, params: Dict) -> int:
         """Count token of prompt"""
@@ -767,10 +794,17 @@ async def api_generate(request: PromptRequest):
 @router.post("/worker/embeddings")
 async def api_embeddings(request: EmbeddingsRequest):
     params = request.dict(exclude_none=True)
+    encoding_format = params.pop("encoding_format", None)
     span_id = root_tracer.get_current_span_id()
     if "span_id" not in params and span_id:
         params["span_id"] = span_id
-    return await worker_manager.embeddings(params)
+    embeddings = await worker_manager.embeddings(params)
+    if encoding_format == EMBEDDING_ENCODING_BINARY:
+        return Response(
+            content=encode_embeddings(embeddings),
+            media_type=EMBEDDING_BINARY_MEDIA_TYPE,
+        )
+    return embeddings
 
 
 @router.post("/worker/count_token")
@@ -910,6 +944,23 @@ def _parse_worker_params(
     return worker_params
 
 
+def _model_instance(
+    worker_run_data: WorkerRunData, host: str, port: int
+) -> ModelInstance:
+    """Build the registry instance of the local worker.
+
+    Its weight is the concurrency limit of the worker, so the routing strategies of
+    the remote worker managers weigh the instances by their capacity.
+    """
+    instance = ModelInstance(
+        model_name=worker_run_data.worker_key, host=host, port=port
+    )
+    limit = getattr(worker_run_data.worker_params, "limit_model_concurrency", None)
+    if limit:
+        instance.weight = float(limit)
+    return instance
+
+
 def _create_local_model_manager(
     worker_params: ModelWorkerParameters,
 ) -> LocalWorkerManager:
@@ -921,32 +972,34 @@ def _create_local_model_manager(
         else _get_ip_address()
     )
     port = worker_params.port
+    model_routing_strategies = parse_model_routing_strategies(
+        worker_params.model_routing_strategies
+    )
     if not worker_params.register or not worker_params.controller_addr:
         logger.info(
             f"Not register current to controller, register: {worker_params.register}, controller_addr: {worker_params.controller_addr}"
         )
-        return LocalWorkerManager(host=host, port=port)
+        return LocalWorkerManager(
+            host=host,
+            port=port,
+            routing_strategy=worker_params.routing_strategy,
+            model_routing_strategies=model_routing_strategies,
+        )
     else:
         from dbgpt.model.cluster.controller.controller import ModelRegistryClient
 
         client = ModelRegistryClient(worker_params.controller_addr)
 
         async def register_func(worker_run_data: WorkerRunData):
-            instance = ModelInstance(
-                model_name=worker_run_data.worker_key, host=host, port=port
-            )
+            instance = _model_instance(worker_run_data, host, port)
             return await client.register_instance(instance)
 
         async def deregister_func(worker_run_data: WorkerRunData):
-            instance = ModelInstance(
-                model_name=worker_run_data.worker_key, host=host, port=port
-            )
+            instance = _model_instance(worker_run_data, host, port)
             return await client.deregister_instance(instance)
 
         async def send_heartbeat_func(worker_run_data: WorkerRunData):
-            instance = ModelInstance(
-                model_name=worker_run_data.worker_key, host=host, port=port
-            )
+            instance = _model_instance(worker_run_data, host, port)
             return await client.send_heartbeat(instance)
 
         return LocalWorkerManager(
@@ -955,6 +1008,8 @@ def _create_local_model_manager(
             send_heartbeat_func=send_heartbeat_func,
             host=host,
             port=port,
+            routing_strategy=worker_params.routing_strategy,
+            model_routing_strategies=model_routing_strategies,
         )
 
 
@@ -1097,13 +1152,28 @@ def initialize_worker_manager_in_client(
             ModelRegistryClient,
             initialize_controller,
         )
+        from dbgpt.model.cluster.worker.http_client_pool import (
+            initialize_http_client_pool,
+        )
         from dbgpt.model.cluster.worker.remote_manager import RemoteWorkerManager
 
         if not worker_params.controller_addr:
             raise ValueError("Controller can`t be None")
         logger.info(f"Worker params: {worker_params}")
         client = ModelRegistryClient(worker_params.controller_addr)
-        worker_manager.worker_manager = RemoteWorkerManager(client)
+        http_pool = initialize_http_client_pool(
+            max_connections=worker_params.http_pool_max_connections,
+            max_keepalive_connections=worker_params.http_pool_max_keepalive_connections,
+            keepalive_expiry=worker_params.http_pool_keepalive_expiry,
+        )
+        worker_manager.worker_manager = RemoteWorkerManager(
+            client,
+            http_pool=http_pool,
+            routing_strategy=worker_params.routing_strategy,
+            model_routing_strategies=parse_model_routing_strategies(
+                worker_params.model_routing_strategies
+            ),
+        )
         worker_manager.after_start(start_listener)
         initialize_controller(
             app=app,
@@ -4,13 +4,28 @@ from typing import Any, Callable
 from dbgpt.model.base import ModelInstance, WorkerApplyOutput, WorkerSupportedModel
 from dbgpt.model.cluster.base import *
 from dbgpt.model.cluster.registry import ModelRegistry
+from dbgpt.model.cluster.worker.http_client_pool import (
+    HttpClientPool,
+    get_default_http_client_pool,
+)
 from dbgpt.model.cluster.worker.manager import LocalWorkerManager, WorkerRunData, logger
 from dbgpt.model.cluster.worker.remote_worker import RemoteModelWorker
 
 
 class RemoteWorkerManager(LocalWorkerManager):
-    def __init__(self, model_registry: ModelRegistry = None) -> None:
-        super().__init__(model_registry=model_registry)
+    def __init__(
+        self,
+        model_registry: ModelRegistry = None,
+        http_pool: Optional[HttpClientPool] = None,
+        routing_strategy: str = "random",
+        model_routing_strategies: Optional[Dict[str, str]] = None,
+    ) -> None:
+        super().__init__(
+            model_registry=model_registry,
+            routing_strategy=routing_strategy,
+            model_routing_strategies=model_routing_strategies,
+        )
+        self.http_pool = http_pool or get_default_http_client_pool()
 
     async def start(self):
         for listener in self.start_listeners:
@@ -20,7 +35,12 @@ class RemoteWorkerManager(LocalWorkerManager):
                 listener(self)
 
     async def stop(self, ignore_exception: bool = False):
-        pass
+        try:
+            await self.http_pool.aclose()
+        except Exception as e:
+            if not ignore_exception:
+                raise e
+            logger.warning(f"Close http client pool error: {str(e)}")
 
     async def _fetch_from_worker(
         self,
@@ -33,14 +53,11 @@ class RemoteWorkerManager(LocalWorkerManager):
         success_handler: Callable = None,
         error_handler: Callable = None,
     ) -> Any:
-        # Lazy import to avoid high time cost
-        import httpx
-
         url = worker_run_data.worker.worker_addr + endpoint
         headers = {**worker_run_data.worker.headers, **(additional_headers or {})}
         timeout = worker_run_data.worker.timeout
 
-        async with httpx.AsyncClient() as client:
+        async with self.http_pool.async_client() as client:
             request = client.build_request(
                 method,
                 url,
@@ -140,7 +157,7 @@ class RemoteWorkerManager(LocalWorkerManager):
         return worker_instances
 
     def _build_single_worker_instance(self, model_name: str, instance: ModelInstance):
-        worker = RemoteModelWorker()
+        worker = RemoteModelWorker(http_pool=self.http_pool)
         worker.load_worker(
             model_name, model_name, host=instance.host, port=instance.port
         )
@@ -153,6 +170,7 @@ class RemoteWorkerManager(LocalWorkerManager):
             model_params=None,
             stop_event=asyncio.Event(),
             semaphore=asyncio.Semaphore(100),  # Not limit in client
+            weight=instance.weight,
         )
         return wr
 
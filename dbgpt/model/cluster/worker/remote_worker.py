@@ -1,22 +1,33 @@
 import json
 import logging
-from typing import Dict, Iterator, List
+from typing import Dict, Iterator, List, Optional
 
 from dbgpt.core import ModelMetadata, ModelOutput
+from dbgpt.model.cluster.worker.http_client_pool import (
+    HttpClientPool,
+    get_default_http_client_pool,
+)
 from dbgpt.model.cluster.worker_base import ModelWorker
 from dbgpt.model.parameter import ModelParameters
+from dbgpt.util.embedding_utils import (
+    EMBEDDING_BINARY_MEDIA_TYPE,
+    EMBEDDING_ENCODING_BINARY,
+    decode_embeddings,
+)
 from dbgpt.util.tracer import DBGPT_TRACER_SPAN_ID, root_tracer
 
 logger = logging.getLogger(__name__)
 
 
 class RemoteModelWorker(ModelWorker):
-    def __init__(self) -> None:
+    def __init__(self, http_pool: Optional[HttpClientPool] = None) -> None:
         self.headers = {}
         # TODO Configured by ModelParameters
         self.timeout = 3600
         self.host = None
         self.port = None
+        # The connections are shared by all the remote workers
+        self.http_pool = http_pool or get_default_http_client_pool()
 
     @property
     def worker_addr(self) -> str:
@@ -48,9 +59,7 @@ class RemoteModelWorker(ModelWorker):
 
     async def async_generate_stream(self, params: Dict) -> Iterator[ModelOutput]:
         """Asynchronous generate stream"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self.http_pool.async_client() as client:
             delimiter = b"\0"
             buffer = b""
             url = self.worker_addr + "/generate_stream"
@@ -78,9 +87,7 @@ class RemoteModelWorker(ModelWorker):
 
     async def async_generate(self, params: Dict) -> ModelOutput:
         """Asynchronous generate non stream"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self.http_pool.async_client() as client:
             url = self.worker_addr + "/generate"
             logger.debug(f"Send async_generate to url {url}, params: {params}")
             response = await client.post(
@@ -95,9 +102,7 @@ class RemoteModelWorker(ModelWorker):
         raise NotImplementedError
 
     async def async_count_token(self, prompt: str) -> int:
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self.http_pool.async_client() as client:
             url = self.worker_addr + "/count_token"
             logger.debug(f"Send async_count_token to url {url}, params: {prompt}")
             response = await client.post(
@@ -110,9 +115,7 @@ class RemoteModelWorker(ModelWorker):
 
     async def async_get_model_metadata(self, params: Dict) -> ModelMetadata:
         """Asynchronously get model metadata"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self.http_pool.async_client() as client:
             url = self.worker_addr + "/model_metadata"
             logger.debug(
                 f"Send async_get_model_metadata to url {url}, params: {params}"
@@ -131,32 +134,29 @@ class RemoteModelWorker(ModelWorker):
 
     def embeddings(self, params: Dict) -> List[List[float]]:
         """Get embeddings for input"""
-        import requests
-
         url = self.worker_addr + "/embeddings"
         logger.debug(f"Send embeddings to url {url}, params: {params}")
-        response = requests.post(
-            url,
-            headers=self._get_trace_headers(),
-            json=params,
-            timeout=self.timeout,
-        )
-        return response.json()
+        with self.http_pool.session() as session:
+            response = session.post(
+                url,
+                headers=self._get_trace_headers(),
+                json=_binary_embeddings_params(params),
+                timeout=self.timeout,
+            )
+            return _parse_embeddings_response(response)
 
     async def async_embeddings(self, params: Dict) -> List[List[float]]:
         """Asynchronous get embeddings for input"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self.http_pool.async_client() as client:
             url = self.worker_addr + "/embeddings"
             logger.debug(f"Send async_embeddings to url {url}")
             response = await client.post(
                 url,
                 headers=self._get_trace_headers(),
-                json=params,
+                json=_binary_embeddings_params(params),
                 timeout=self.timeout,
             )
-            return response.json()
+            return _parse_embeddings_response(response)
 
     def _get_trace_headers(self):
         span_id = root_tracer.get_current_span_id()
@@ -164,3 +164,19 @@ class RemoteModelWorker(ModelWorker):
         if span_id:
             headers.update({DBGPT_TRACER_SPAN_ID: span_id})
         return headers
+
+
+def _binary_embeddings_params(params: Dict) -> Dict:
+    """Ask the worker to return the embeddings in the binary format."""
+    return {**params, "encoding_format": EMBEDDING_ENCODING_BINARY}
+
+
+def _parse_embeddings_response(response) -> List[List[float]]:
+    """Parse the embeddings response of the worker.
+
+    The old workers ignore the encoding format and return the JSON list.
+    """
+    content_type = response.headers.get("content-type", "")
+    if content_type.startswith(EMBEDDING_BINARY_MEDIA_TYPE):
+        return decode_embeddings(response.content)
+    return response.json()
@@ -0,0 +1,306 @@
+"""Routing strategies to select a model instance for the request.
+
+The strategies are driven by the live metrics of the instances which are recorded by
+the worker manager, such as the in-flight requests and the recent latency.
+"""
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from dbgpt.model.cluster.manager_base import WorkerRunData
+
+
+class InstanceStats:
+    """The live metrics of one model instance."""
+
+    __slots__ = ("in_flight", "total", "failed", "latency_ewma", "current_weight")
+
+    def __init__(self):
+        self.in_flight = 0
+        self.total = 0
+        self.failed = 0
+        # Exponentially weighted moving average of the latency in seconds
+        self.latency_ewma: Optional[float] = None
+        # Used by smooth weighted round robin
+        self.current_weight = 0.0
+
+
+class InstanceStatsRegistry:
+    """Record the live metrics of the model instances.
+
+    The worker run data of the remote instances are rebuilt for every request, so the
+    metrics are keyed by the worker key and the address of the instance.
+    """
+
+    def __init__(self, latency_decay: float = 0.3):
+        """Create a new InstanceStatsRegistry.
+
+        Args:
+            latency_decay (float): The weight of the newest latency in the moving
+                average.
+        """
+        self._latency_decay = latency_decay
+        self._stats: Dict[str, InstanceStats] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Return the lock which guards all the metrics."""
+        return self._lock
+
+    @staticmethod
+    def instance_key(instance: WorkerRunData) -> str:
+        """Return the key of the instance."""
+        return f"{instance.worker_key}@{instance.host}:{instance.port}"
+
+    def get(self, instance: WorkerRunData) -> InstanceStats:
+        """Get the metrics of the instance."""
+        key = self.instance_key(instance)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = InstanceStats()
+            return stats
+
+    def load_metrics(self, instance: WorkerRunData) -> Tuple[int, Optional[float]]:
+        """Return the in-flight requests and the latency average of the instance."""
+        with self._lock:
+            stats = self.get(instance)
+            return stats.in_flight, stats.latency_ewma
+
+    def begin(self, instance: WorkerRunData) -> None:
+        """Record the beginning of a request."""
+        with self._lock:
+            stats = self.get(instance)
+            stats.in_flight += 1
+            stats.total += 1
+
+    def end(
+        self, instance: WorkerRunData, latency: Optional[float], failed: bool = False
+    ) -> None:
+        """Record the end of a request.
+
+        Args:
+            instance (WorkerRunData): The instance.
+            latency (Optional[float]): The latency of the request in seconds, None if
+                it is not measured.
+            failed (bool): Whether the request is failed.
+        """
+        with self._lock:
+            stats = self.get(instance)
+            stats.in_flight -= 1
+            if failed:
+                stats.failed += 1
+            if latency is not None:
+                if stats.latency_ewma is None:
+                    stats.latency_ewma = latency
+                else:
+                    stats.latency_ewma += self._latency_decay * (
+                        latency - stats.latency_ewma
+                    )
+
+    @contextmanager
+    def track(self, instance: WorkerRunData) -> Iterator["_LatencyTimer"]:
+        """Track a request to the instance.
+
+        The latency is measured from the beginning of the request to the end of the
+        context, or to the time when :meth:`_LatencyTimer.stop` is called(e.g. the
+        first token of the stream output).
+        """
+        timer = _LatencyTimer()
+        self.begin(instance)
+        failed = False
+        try:
+            yield timer
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.end(instance, timer.stop(), failed)
+
+
+class _LatencyTimer:
+    __slots__ = ("_start", "_latency")
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._latency: Optional[float] = None
+
+    def stop(self) -> float:
+        if self._latency is None:
+            self._latency = time.perf_counter() - self._start
+        return self._latency
+
+
+def instance_weight(instance: WorkerRunData) -> float:
+    """Return the capacity weight of the instance.
+
+    Use the weight registered in the model registry first, then the concurrency limit
+    of the local worker.
+    """
+    if instance.weight:
+        return instance.weight
+    if instance.worker_params and instance.worker_params.limit_model_concurrency:
+        return float(instance.worker_params.limit_model_concurrency)
+    return 1.0
+
+
+def instance_load(instance: WorkerRunData, in_flight: int) -> float:
+    """Return the load of the instance, the outstanding requests per capacity."""
+    semaphore = instance.semaphore
+    if semaphore is not None and instance.worker_params:
+        # The requests of the local worker may be not tracked(e.g. called by the
+        # worker directly), the occupancy of its semaphore is more accurate.
+        limit = instance.worker_params.limit_model_concurrency or 0
+        in_flight = max(in_flight, limit - getattr(semaphore, "_value", limit))
+    return in_flight / instance_weight(instance)
+
+
+class RoutingStrategy(ABC):
+    """The strategy to select one instance from the instances of a model."""
+
+    name: str
+
+    @abstractmethod
+    def select(
+        self, instances: List[WorkerRunData], registry: InstanceStatsRegistry
+    ) -> WorkerRunData:
+        """Select one instance.
+
+        Args:
+            instances (List[WorkerRunData]): The instances of the model, not empty.
+            registry (InstanceStatsRegistry): The live metrics of the instances.
+
+        Returns:
+            WorkerRunData: The selected instance.
+        """
+
+
+class RandomStrategy(RoutingStrategy):
+    """Select an instance randomly."""
+
+    name = "random"
+
+    def select(
+        self, instances: List[WorkerRunData], registry: InstanceStatsRegistry
+    ) -> WorkerRunData:
+        """Select an instance randomly."""
+        return random.choice(instances)
+
+
+class LeastOutstandingRequestsStrategy(RoutingStrategy):
+    """Select the instance with the least outstanding requests per capacity.
+
+    The instance with lower recent latency wins when the loads are the same.
+    """
+
+    name = "least_outstanding"
+
+    def select(
+        self, instances: List[WorkerRunData], registry: InstanceStatsRegistry
+    ) -> WorkerRunData:
+        """Select the least loaded instance."""
+        return min(instances, key=lambda ins: _load_key(ins, registry))
+
+
+class PowerOfTwoChoicesStrategy(RoutingStrategy):
+    """Sample two instances randomly and select the less loaded one.
+
+    It is almost as good as the least outstanding requests strategy, but avoids all the
+    concurrent requests rushing to the same idle instance when the metrics are stale.
+    """
+
+    name = "power_of_two"
+
+    def select(
+        self, instances: List[WorkerRunData], registry: InstanceStatsRegistry
+    ) -> WorkerRunData:
+        """Select the less loaded one of two random instances."""
+        if len(instances) == 1:
+            return instances[0]
+        first, second = random.sample(instances, 2)
+        if _load_key(second, registry) < _load_key(first, registry):
+            return second
+        return first
+
+
+class WeightedRoundRobinStrategy(RoutingStrategy):
+    """Smooth weighted round robin by the capacity weights of the instances."""
+
+    name = "weighted_round_robin"
+
+    def select(
+        self, instances: List[WorkerRunData], registry: InstanceStatsRegistry
+    ) -> WorkerRunData:
+        """Select the instance with the max current weight."""
+        # The current weights are the metrics of the registry, guarded by its lock
+        with registry.lock:
+            total_weight = 0.0
+            best: Optional[WorkerRunData] = None
+            best_stats: Optional[InstanceStats] = None
+            for instance in instances:
+                weight = instance_weight(instance)
+                stats = registry.get(instance)
+                stats.current_weight += weight
+                total_weight += weight
+                if (
+                    best_stats is None
+                    or stats.current_weight > best_stats.current_weight
+                ):
+                    best, best_stats = instance, stats
+            best_stats.current_weight -= total_weight  # type: ignore
+            return best  # type: ignore
+
+
+def _load_key(instance: WorkerRunData, registry: InstanceStatsRegistry):
+    in_flight, latency = registry.load_metrics(instance)
+    return instance_load(instance, in_flight), latency if latency is not None else 0.0
+
+
+_STRATEGIES: Dict[str, Type[RoutingStrategy]] = {
+    cls.name: cls
+    for cls in (
+        RandomStrategy,
+        LeastOutstandingRequestsStrategy,
+        PowerOfTwoChoicesStrategy,
+        WeightedRoundRobinStrategy,
+    )
+}
+
+
+def create_routing_strategy(name: str) -> RoutingStrategy:
+    """Create the routing strategy by name."""
+    if name not in _STRATEGIES:
+        raise ValueError(
+            f"Unknown routing strategy {name}, supported: {list(_STRATEGIES.keys())}"
+        )
+    return _STRATEGIES[name]()
+
+
+def parse_model_routing_strategies(value: Optional[str]) -> Dict[str, str]:
+    """Parse the routing strategies of the models.
+
+    Examples:
+        .. code-block:: python
+
+            parse_model_routing_strategies("vicuna-13b:power_of_two,text2vec:random")
+            # {"vicuna-13b": "power_of_two", "text2vec": "random"}
+    """
+    strategies: Dict[str, str] = {}
+    if not value:
+        return strategies
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        model_name, sep, strategy = item.rpartition(":")
+        model_name, strategy = model_name.strip(), strategy.strip()
+        if not sep or not model_name:
+            raise ValueError(f"Invalid model routing strategy: {item}")
+        if strategy not in _STRATEGIES:
+            raise ValueError(f"Unknown routing strategy {strategy} of {model_name}")
+        strategies[model_name] = strategy
+    return strategies
@@ -0,0 +1,145 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import pytest
+
+from dbgpt.core import Embeddings, RerankEmbeddings
+from dbgpt.model.cluster.worker.batching import MicroBatcher
+from dbgpt.model.cluster.worker.embedding_worker import EmbeddingsModelWorker
+
+
+class _RecordingFunc:
+    def __init__(self, delay: float = 0.0):
+        self.batches: List[List[str]] = []
+        self._delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, items: List[str]) -> List[str]:
+        with self._lock:
+            self.batches.append(list(items))
+        if any(item == "bad" for item in items):
+            raise ValueError("bad item")
+        return [item.upper() for item in items]
+
+
+class _MockEmbeddings(Embeddings):
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        return [[float(len(text))] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class _MockRerankEmbeddings(RerankEmbeddings):
+    def __init__(self):
+        self.calls: List[Tuple[str, List[str]]] = []
+
+    def predict(self, query: str, candidates: List[str]) -> List[float]:
+        self.calls.append((query, candidates))
+        return [float(len(query) + len(c)) for c in candidates]
+
+
+def _submit_concurrently(batcher: MicroBatcher, requests: List[List[str]]):
+    with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+        futures = [executor.submit(batcher.submit, items) for items in requests]
+        return [f.result() for f in futures]
+
+
+def test_coalesce_concurrent_requests():
+    func = _RecordingFunc()
+    batcher = MicroBatcher(func, max_batch_size=100, max_wait_ms=200)
+    requests = [[f"text{i}", f"other{i}"] for i in range(8)]
+    results = _submit_concurrently(batcher, requests)
+    batcher.close()
+    assert results == [[t.upper() for t in items] for items in requests]
+    assert len(func.batches) < len(requests)
+    assert sum(len(b) for b in func.batches) == 16
+
+
+def test_max_batch_size():
+    func = _RecordingFunc()
+    batcher = MicroBatcher(func, max_batch_size=3, max_wait_ms=50)
+    requests = [["a", "b"], ["c", "d"], ["e"], ["f", "g", "h", "i"]]
+    results = _submit_concurrently(batcher, requests)
+    batcher.close()
+    assert results == [[t.upper() for t in items] for items in requests]
+    # The request larger than max_batch_size is not split
+    assert all(len(b) <= 3 or len(b) == 4 for b in func.batches)
+    assert ["f", "g", "h", "i"] in func.batches
+
+
+def test_bad_request_does_not_fail_others():
+    func = _RecordingFunc()
+    batcher = MicroBatcher(func, max_batch_size=100, max_wait_ms=200)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        good = executor.submit(batcher.submit, ["a"])
+        bad = executor.submit(batcher.submit, ["bad"])
+        good2 = executor.submit(batcher.submit, ["b", "c"])
+        assert good.result() == ["A"]
+        assert good2.result() == ["B", "C"]
+        with pytest.raises(ValueError):
+            bad.result()
+    batcher.close()
+
+
+def test_submit_after_close():
+    batcher = MicroBatcher(_RecordingFunc())
+    assert batcher.submit([]) == []
+    assert batcher.submit(["a"]) == ["A"]
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.submit(["a"])
+
+
+def _new_worker(impl, rerank: bool = False) -> EmbeddingsModelWorker:
+    worker = EmbeddingsModelWorker(rerank_model=rerank)
+    worker.load_worker(
+        "mock",
+        "/tmp/mock",
+        embedding_max_batch_size=64,
+        embedding_max_batch_wait_ms=100,
+    )
+    worker._embeddings_impl = impl
+    worker._init_batcher()
+    return worker
+
+
+def _stop_worker(worker: EmbeddingsModelWorker) -> None:
+    # The mock model is not loaded by the loader, nothing to clear
+    worker._embeddings_impl = None
+    worker.stop()
+    assert worker._batcher is None
+
+
+def test_embedding_worker_batching():
+    impl = _MockEmbeddings()
+    worker = _new_worker(impl)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(worker.embeddings, {"input": ["a" * i, "b"]})
+            for i in range(1, 5)
+        ]
+        results = [f.result() for f in futures]
+    _stop_worker(worker)
+    assert results == [[[float(i)], [1.0]] for i in range(1, 5)]
+    assert impl.calls < 4
+
+
+def test_rerank_worker_batching():
+    impl = _MockRerankEmbeddings()
+    worker = _new_worker(impl, rerank=True)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(worker.embeddings, {"query": "q" * i, "input": ["x", "yy"]})
+            for i in range(1, 4)
+        ]
+        results = [f.result() for f in futures]
+    _stop_worker(worker)
+    assert results == [[[float(i + 1), float(i + 2)]] for i in range(1, 4)]
+    # The candidates of each query are scored together
+    assert all(candidates == ["x", "yy"] for _, candidates in impl.calls)
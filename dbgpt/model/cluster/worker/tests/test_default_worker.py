@@ -0,0 +1,16 @@
+from dbgpt.core import ModelOutput
+from dbgpt.model.cluster.worker.default_worker import _to_incremental_output
+
+
+def test_to_incremental_output():
+    sent_len = 0
+    deltas = []
+    for text in ["Hello", "Hello �", "Hello 世界", "Hello 世界"]:
+        output, sent_len = _to_incremental_output(
+            ModelOutput(text=text, error_code=0), sent_len
+        )
+        assert output.incremental
+        deltas.append(output.text)
+    # The incomplete character is held until it is decoded
+    assert deltas == ["Hello", " ", "世界", ""]
+    assert sent_len == len("Hello 世界")
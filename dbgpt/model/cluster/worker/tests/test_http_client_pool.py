@@ -0,0 +1,36 @@
+import pytest
+
+from ..http_client_pool import HttpClientPool
+
+
+@pytest.mark.asyncio
+async def test_reuse_async_client():
+    pool = HttpClientPool(max_connections=10, http2=False)
+    client = pool.get_async_client()
+    assert pool.get_async_client() is client
+
+    async with pool.async_client() as c1:
+        async with pool.async_client() as c2:
+            assert c1 is c2 is client
+            assert pool.metrics().in_flight_requests == 2
+    metrics = pool.metrics()
+    assert metrics.in_flight_requests == 0
+    assert metrics.total_requests == 2
+    assert metrics.max_connections == 10
+
+    with pytest.raises(ValueError):
+        async with pool.async_client():
+            raise ValueError("request error")
+    assert pool.metrics().failed_requests == 1
+
+    await pool.aclose()
+    assert client.is_closed
+    assert pool.get_async_client() is not client
+    await pool.aclose()
+
+
+def test_reuse_session():
+    pool = HttpClientPool()
+    with pool.session() as session:
+        assert pool.get_session() is session
+    assert pool.metrics().total_requests == 1
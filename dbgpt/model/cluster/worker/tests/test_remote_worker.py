@@ -0,0 +1,49 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from dbgpt.model.cluster.tests.conftest import _create_workers, _start_worker_manager
+from dbgpt.model.cluster.worker import manager
+from dbgpt.model.cluster.worker.remote_worker import _parse_embeddings_response
+from dbgpt.model.parameter import WorkerType
+from dbgpt.util.embedding_utils import EMBEDDING_BINARY_MEDIA_TYPE, encode_embeddings
+
+_EMBEDDINGS = [[0.5, -1.25, 2.0], [3.0, 0.0, -0.125]]
+
+
+def test_parse_embeddings_response():
+    binary_response = httpx.Response(
+        200,
+        content=encode_embeddings(_EMBEDDINGS),
+        headers={"content-type": EMBEDDING_BINARY_MEDIA_TYPE},
+    )
+    assert _parse_embeddings_response(binary_response) == _EMBEDDINGS
+    # The old workers return the JSON list
+    json_response = httpx.Response(200, json=_EMBEDDINGS)
+    assert _parse_embeddings_response(json_response) == _EMBEDDINGS
+
+
+@pytest.mark.asyncio
+async def test_api_embeddings_encoding_format():
+    app = FastAPI()
+    app.include_router(manager.router, prefix="/api")
+    workers = _create_workers(
+        1, worker_type=WorkerType.TEXT2VEC.value, embeddings=_EMBEDDINGS
+    )
+    async with _start_worker_manager(workers=workers) as worker_manager:
+        manager.worker_manager.worker_manager = worker_manager
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app), base_url="http://test"
+            ) as client:
+                body = {"model": "test-model-name-0", "input": ["hello", "world"]}
+                res = await client.post("/api/worker/embeddings", json=body)
+                assert res.json() == _EMBEDDINGS
+
+                body["encoding_format"] = "binary"
+                res = await client.post("/api/worker/embeddings", json=body)
+                assert res.headers["content-type"] == EMBEDDING_BINARY_MEDIA_TYPE
+                assert _parse_embeddings_response(res) == _EMBEDDINGS
+        finally:
+            manager.worker_manager.worker_manager = None
@@ -0,0 +1,149 @@
+import asyncio
+from collections import Counter
+from typing import List, Optional
+
+import pytest
+
+from dbgpt.model.cluster.manager_base import WorkerRunData
+from dbgpt.model.cluster.worker.routing import (
+    InstanceStatsRegistry,
+    LeastOutstandingRequestsStrategy,
+    PowerOfTwoChoicesStrategy,
+    WeightedRoundRobinStrategy,
+    create_routing_strategy,
+    parse_model_routing_strategies,
+)
+
+
+def _new_instance(port: int, weight: Optional[float] = None) -> WorkerRunData:
+    return WorkerRunData(
+        host="127.0.0.1",
+        port=port,
+        worker_key="vicuna-13b-v1.5@llm",
+        worker=None,
+        worker_params=None,
+        model_params=None,
+        stop_event=asyncio.Event(),
+        semaphore=asyncio.Semaphore(100),
+        weight=weight,
+    )
+
+
+def _new_instances(n: int) -> List[WorkerRunData]:
+    return [_new_instance(8000 + i) for i in range(n)]
+
+
+def test_least_outstanding_strategy():
+    registry = InstanceStatsRegistry()
+    instances = _new_instances(3)
+    registry.begin(instances[0])
+    registry.begin(instances[1])
+    strategy = LeastOutstandingRequestsStrategy()
+    assert strategy.select(instances, registry) is instances[2]
+
+    registry.begin(instances[2])
+    registry.begin(instances[2])
+    registry.end(instances[0], 0.1)
+    assert strategy.select(instances, registry) is instances[0]
+
+
+def test_least_outstanding_strategy_by_latency():
+    registry = InstanceStatsRegistry()
+    instances = _new_instances(2)
+    for instance, latency in zip(instances, [2.0, 0.5]):
+        registry.begin(instance)
+        registry.end(instance, latency)
+    strategy = LeastOutstandingRequestsStrategy()
+    assert strategy.select(instances, registry) is instances[1]
+
+
+def test_least_outstanding_strategy_rebuilt_instances():
+    # The remote instances are rebuilt for every request
+    registry = InstanceStatsRegistry()
+    registry.begin(_new_instance(8000))
+    strategy = LeastOutstandingRequestsStrategy()
+    instances = [_new_instance(8000), _new_instance(8001)]
+    assert strategy.select(instances, registry) is instances[1]
+
+
+def test_power_of_two_strategy():
+    registry = InstanceStatsRegistry()
+    instances = _new_instances(2)
+    for _ in range(3):
+        registry.begin(instances[0])
+    strategy = PowerOfTwoChoicesStrategy()
+    for _ in range(10):
+        assert strategy.select(instances, registry) is instances[1]
+    assert strategy.select(instances[:1], registry) is instances[0]
+
+
+def test_weighted_round_robin_strategy():
+    registry = InstanceStatsRegistry()
+    instances = [_new_instance(8000, weight=3), _new_instance(8001, weight=1)]
+    strategy = WeightedRoundRobinStrategy()
+    selected = [strategy.select(instances, registry).port for _ in range(8)]
+    assert Counter(selected) == {8000: 6, 8001: 2}
+    # Smooth, the heavier instance is not selected three times in a row
+    assert selected[:4] == [8000, 8000, 8001, 8000]
+
+
+def test_track_records_failure_and_latency():
+    registry = InstanceStatsRegistry()
+    instance = _new_instance(8000)
+    with pytest.raises(ValueError):
+        with registry.track(instance):
+            raise ValueError("error")
+    with registry.track(instance) as timer:
+        latency = timer.stop()
+    stats = registry.get(instance)
+    assert stats.in_flight == 0
+    assert stats.total == 2
+    assert stats.failed == 1
+    assert stats.latency_ewma is not None
+    assert latency >= 0
+
+
+def test_create_routing_strategy():
+    assert create_routing_strategy("power_of_two").name == "power_of_two"
+    with pytest.raises(ValueError):
+        create_routing_strategy("unknown")
+
+
+def test_parse_model_routing_strategies():
+    assert parse_model_routing_strategies(None) == {}
+    assert parse_model_routing_strategies(
+        "vicuna-13b-v1.5:power_of_two, text2vec:random,"
+    ) == {"vicuna-13b-v1.5": "power_of_two", "text2vec": "random"}
+    with pytest.raises(ValueError):
+        parse_model_routing_strategies("vicuna-13b-v1.5")
+    with pytest.raises(ValueError):
+        parse_model_routing_strategies("vicuna-13b-v1.5:unknown")
+
+
+@pytest.mark.asyncio
+async def test_weighted_round_robin_remote_instances():
+    from dbgpt.model.cluster.registry import EmbeddedModelRegistry
+    from dbgpt.model.cluster.worker.manager import _model_instance
+    from dbgpt.model.cluster.worker.remote_manager import RemoteWorkerManager
+    from dbgpt.model.parameter import ModelWorkerParameters
+
+    model_registry = EmbeddedModelRegistry()
+    # Two workers of different sizes register with their concurrency limits
+    for port, limit in [(8000, 12), (8001, 4)]:
+        local = _new_instance(port)
+        local.worker_params = ModelWorkerParameters(
+            model_name="vicuna-13b-v1.5",
+            model_path="",
+            limit_model_concurrency=limit,
+        )
+        await model_registry.register_instance(
+            _model_instance(local, "127.0.0.1", port)
+        )
+
+    manager = RemoteWorkerManager(model_registry)
+    instances = await manager.get_model_instances("llm", "vicuna-13b-v1.5")
+    assert {ins.port: ins.weight for ins in instances} == {8000: 12.0, 8001: 4.0}
+    strategy = WeightedRoundRobinStrategy()
+    registry = InstanceStatsRegistry()
+    selected = [strategy.select(instances, registry).port for _ in range(8)]
+    assert Counter(selected) == {8000: 6, 8001: 2}
@@ -245,6 +245,58 @@ class ModelWorkerParameters(BaseServerParameters, BaseModelParameters):
     heartbeat_interval: Optional[int] = field(
         default=20, metadata={"help": "The interval for sending heartbeats (seconds)"}
     )
+    http_pool_max_connections: Optional[int] = field(
+        default=100,
+        metadata={
+            "help": "The max number of the HTTP connections to the remote model "
+            "workers"
+        },
+    )
+    http_pool_max_keepalive_connections: Optional[int] = field(
+        default=20,
+        metadata={
+            "help": "The max number of the idle keep-alive HTTP connections to the "
+            "remote model workers"
+        },
+    )
+    http_pool_keepalive_expiry: Optional[float] = field(
+        default=60.0,
+        metadata={"help": "The time to close the idle HTTP connections (seconds)"},
+    )
+    embedding_max_batch_size: Optional[int] = field(
+        default=64,
+        metadata={
+            "help": "The max number of the texts in one batch of the embedding "
+            "worker, the concurrent requests are coalesced into one batch, 1 to "
+            "disable it"
+        },
+    )
+    embedding_max_batch_wait_ms: Optional[float] = field(
+        default=5.0,
+        metadata={
+            "help": "The max time to wait for more requests to coalesce into one "
+            "batch of the embedding worker (milliseconds)"
+        },
+    )
+    routing_strategy: Optional[str] = field(
+        default="random",
+        metadata={
+            "help": "The strategy to select a model instance for the request",
+            "valid_values": [
+                "random",
+                "least_outstanding",
+                "power_of_two",
+                "weighted_round_robin",
+            ],
+        },
+    )
+    model_routing_strategies: Optional[str] = field(
+        default=None,
+        metadata={
+            "help": "The routing strategies of the specified models, override the "
+            "routing_strategy, e.g. 'vicuna-13b-v1.5:power_of_two,text2vec:random'"
+        },
+    )
 
     log_file: Optional[str] = field(
         default="dbgpt_model_worker_manager.log",
@@ -1,12 +1,13 @@
 """Embedding Assembler."""
+import itertools
 from concurrent.futures import ThreadPoolExecutor
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional
 
 from dbgpt.core import Chunk, Embeddings
 
 from ...util.executor_utils import blocking_func_to_async
 from ..assembler.base import BaseAssembler
-from ..chunk_manager import ChunkParameters
+from ..chunk_manager import ChunkManager, ChunkParameters
 from ..index.base import IndexStoreBase
 from ..knowledge.base import Knowledge
 from ..retriever import BaseRetriever, RetrieverStrategy
@@ -124,6 +125,61 @@ class EmbeddingAssembler(BaseAssembler):
             retrieve_strategy,
         )
 
+    @classmethod
+    async def apersist_stream(
+        cls,
+        knowledge: Knowledge,
+        index_store: IndexStoreBase,
+        chunk_parameters: Optional[ChunkParameters] = None,
+        batch_size: int = 100,
+        max_chunks_once_load: int = 10,
+        max_threads: int = 1,
+        skip_chunks: int = 0,
+        on_batch: Optional[Callable[[List[Chunk], List[str]], None]] = None,
+        select: Optional[Callable[[List[Chunk]], List[Chunk]]] = None,
+    ) -> List[str]:
+        """Load the knowledge into the index store in a streaming pipeline.
+
+        The knowledge is read lazily, split document by document and persisted batch
+        by batch, the reading and splitting of the next batch overlap with the
+        embedding of the current batch. So the memory is bounded by the batch size
+        instead of the size of the knowledge.
+
+        Args:
+            knowledge: (Knowledge) Knowledge datasource.
+            index_store: (IndexStoreBase) Index store to use.
+            chunk_parameters: (Optional[ChunkParameters]) ChunkManager to use for
+                chunking.
+            batch_size: (int) The number of the chunks in one batch.
+            max_chunks_once_load: (int) Max number of chunks to load at once.
+            max_threads: (int) Max number of threads to use.
+            skip_chunks: (int) The number of the leading chunks to skip, e.g. the
+                chunks persisted before the loading was interrupted.
+            on_batch: (Optional[Callable[[List[Chunk], List[str]], None]]) Called
+                with the chunks and their ids after every batch is persisted.
+            select: (Optional[Callable[[List[Chunk]], List[Chunk]]]) Select the
+                chunks of a batch to persist, e.g. to skip the unchanged chunks.
+
+        Returns:
+            List[str]: List of chunk ids.
+        """
+        if knowledge is None:
+            raise ValueError("knowledge datasource must be provided.")
+        chunk_manager = ChunkManager(
+            knowledge=knowledge, chunk_parameter=chunk_parameters or ChunkParameters()
+        )
+        chunks = chunk_manager.iter_split(knowledge.iter_load())
+        if skip_chunks > 0:
+            chunks = itertools.islice(chunks, skip_chunks, None)
+        return await index_store.aload_document_stream(
+            chunks,
+            batch_size=batch_size,
+            max_chunks_once_load=max_chunks_once_load,
+            max_threads=max_threads,
+            on_batch=on_batch,
+            select=select,
+        )
+
     def persist(self, **kwargs) -> List[str]:
         """Persist chunks into store.
 
@@ -4,8 +4,11 @@ import pytest
 
 from dbgpt.datasource.rdbms.conn_sqlite import SQLiteTempConnector
 from dbgpt.rag.assembler.db_schema import DBSchemaAssembler
-from dbgpt.rag.chunk_manager import ChunkParameters, SplitterType
+from dbgpt.rag.assembler.embedding import EmbeddingAssembler
+from dbgpt.rag.chunk_manager import ChunkManager, ChunkParameters, SplitterType
 from dbgpt.rag.embedding.embedding_factory import EmbeddingFactory
+from dbgpt.rag.index.base import IndexStoreBase
+from dbgpt.rag.knowledge.txt import TXTKnowledge
 from dbgpt.rag.text_splitter.text_splitter import CharacterTextSplitter
 from dbgpt.storage.vector_store.chroma_store import ChromaStore
 
@@ -66,3 +69,80 @@ def test_load_knowledge(
         index_store=mock_vector_store_connector,
     )
     assert len(assembler._chunks) == 1
+
+
+class _MemoryIndexStore(IndexStoreBase):
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+
+    def load_document(self, chunks):
+        self.chunks.extend(chunks)
+        return [chunk.chunk_id for chunk in chunks]
+
+    async def aload_document(self, chunks):
+        return self.load_document(chunks)
+
+    def similar_search_with_scores(self, text, topk, score_threshold, filters=None):
+        return []
+
+    def delete_by_ids(self, ids):
+        return []
+
+    def delete_vector_name(self, index_name):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_persist_stream(tmp_path):
+    file_path = tmp_path / "test_document.txt"
+    file_path.write_text("".join(f"line {i}\n" for i in range(20)))
+    chunk_parameters = ChunkParameters(
+        chunk_strategy="CHUNK_BY_SIZE", chunk_size=10, chunk_overlap=0
+    )
+    expected = ChunkManager(
+        knowledge=TXTKnowledge(file_path=str(file_path)),
+        chunk_parameter=chunk_parameters,
+    ).split(TXTKnowledge(file_path=str(file_path)).load())
+
+    index_store = _MemoryIndexStore()
+    batches = []
+    ids = await EmbeddingAssembler.apersist_stream(
+        TXTKnowledge(file_path=str(file_path)),
+        index_store,
+        chunk_parameters=chunk_parameters,
+        batch_size=3,
+        skip_chunks=2,
+        on_batch=lambda batch, batch_ids: batches.append(len(batch)),
+    )
+    assert [chunk.content for chunk in index_store.chunks] == [
+        chunk.content for chunk in expected[2:]
+    ]
+    assert ids == [chunk.chunk_id for chunk in index_store.chunks]
+    assert sum(batches) == len(expected) - 2
+    assert max(batches) == 3
+
+
+@pytest.mark.asyncio
+async def test_persist_stream_with_select(tmp_path):
+    file_path = tmp_path / "test_document.txt"
+    file_path.write_text("".join(f"line {i}\n" for i in range(20)))
+    chunk_parameters = ChunkParameters(
+        chunk_strategy="CHUNK_BY_SIZE", chunk_size=10, chunk_overlap=0
+    )
+    index_store = _MemoryIndexStore()
+    batches = []
+    ids = await EmbeddingAssembler.apersist_stream(
+        TXTKnowledge(file_path=str(file_path)),
+        index_store,
+        chunk_parameters=chunk_parameters,
+        batch_size=4,
+        select=lambda batch: [chunk for chunk in batch if "1" in chunk.content],
+        on_batch=lambda batch, batch_ids: batches.append((batch, batch_ids)),
+    )
+    assert index_store.chunks
+    assert all("1" in chunk.content for chunk in index_store.chunks)
+    assert ids == [chunk.chunk_id for chunk in index_store.chunks]
+    # The whole batches are passed to on_batch, with the ids of the selected chunks
+    assert sum(len(batch) for batch, _ in batches) == 20
+    assert [i for _, batch_ids in batches for i in batch_ids] == ids
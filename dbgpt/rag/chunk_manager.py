@@ -1,7 +1,7 @@
 """Module for ChunkManager."""
 
 from enum import Enum
-from typing import Any, List, Optional
+from typing import Any, Iterable, Iterator, List, Optional
 
 from dbgpt._private.pydantic import BaseModel, Field
 from dbgpt.core import Chunk, Document
@@ -11,6 +11,10 @@ from dbgpt.rag.knowledge.base import ChunkStrategy, Knowledge
 from dbgpt.rag.text_splitter import TextSplitter
 from dbgpt.util.i18n_utils import _
 
+# The documents larger than it in total are split in processes, the time saved pays
+# off the cost to start the processes and to transfer the documents
+_SPLIT_IN_PROCESSES_MIN_SIZE = 8 * 1024 * 1024
+
 
 class SplitterType(str, Enum):
     """The type of splitter."""
@@ -149,8 +153,32 @@ class ChunkManager:
         self._splitter_type = self._chunk_parameters.splitter_type
 
     def split(self, documents: List[Document]) -> List[Chunk]:
-        """Split a document into chunks."""
+        """Split a document into chunks.
+
+        The large documents, e.g. the pages of a big PDF, are split in processes.
+        """
         text_splitter = self._select_text_splitter()
+        if (
+            SplitterType.USER_DEFINE == self._splitter_type
+            and isinstance(text_splitter, TextSplitter)
+            and len(documents) > 1
+            and sum(len(document.content) for document in documents)
+            >= _SPLIT_IN_PROCESSES_MIN_SIZE
+        ):
+            return text_splitter.split_documents_in_processes(documents)
+        return self._split(text_splitter, documents)
+
+    def iter_split(self, documents: Iterable[Document]) -> Iterator[Chunk]:
+        """Split the documents into chunks lazily, one document at a time.
+
+        The text splitters split every document separately, so the chunks are the
+        same as :meth:`split`.
+        """
+        text_splitter = self._select_text_splitter()
+        for document in documents:
+            yield from self._split(text_splitter, [document])
+
+    def _split(self, text_splitter: Any, documents: List[Document]) -> List[Chunk]:
         if SplitterType.LANGCHAIN == self._splitter_type:
             documents = text_splitter.split_documents(documents)
             return [Chunk.langchain2chunk(document) for document in documents]
@@ -8,6 +8,7 @@ import requests
 from dbgpt._private.pydantic import EXTRA_FORBID, BaseModel, ConfigDict, Field
 from dbgpt.core import Embeddings
 from dbgpt.core.awel.flow import Parameter, ResourceCategory, register_resource
+from dbgpt.util.embedding_utils import decode_embedding_base64
 from dbgpt.util.i18n_utils import _
 from dbgpt.util.tracer import DBGPT_TRACER_SPAN_ID, root_tracer
 
@@ -443,7 +444,14 @@ def _handle_request_result(res: requests.Response) -> List[List[float]]:
     # Sort resulting embeddings by index
     sorted_embeddings = sorted(embeddings, key=lambda e: e["index"])  # type: ignore
     # Return just the embeddings
-    return [result["embedding"] for result in sorted_embeddings]
+    return [_parse_embedding(result["embedding"]) for result in sorted_embeddings]
+
+
+def _parse_embedding(embedding: Any) -> List[float]:
+    """Parse the embedding, it is a base64 string if encoding_format is base64."""
+    if isinstance(embedding, str):
+        return decode_embedding_base64(embedding)
+    return embedding
 
 
 @register_resource(
@@ -659,6 +667,11 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
     pass_trace_id: bool = Field(
         default=True, description="Whether to pass the trace ID to the API."
     )
+    encoding_format: Optional[str] = Field(
+        default=None,
+        description="The encoding format of the embeddings, 'float' or 'base64'. "
+        "'base64' is much smaller, but the API must support it.",
+    )
 
     session: Optional[requests.Session] = None
 
@@ -699,12 +712,18 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
             headers[DBGPT_TRACER_SPAN_ID] = current_span_id
         res = self.session.post(  # type: ignore
             self.api_url,
-            json={"input": texts, "model": self.model_name},
+            json=self._build_request(texts),
             timeout=self.timeout,
             headers=headers,
         )
         return _handle_request_result(res)
 
+    def _build_request(self, texts: List[str]) -> Dict[str, Any]:
+        request: Dict[str, Any] = {"input": texts, "model": self.model_name}
+        if self.encoding_format:
+            request["encoding_format"] = self.encoding_format
+        return request
+
     def embed_query(self, text: str) -> List[float]:
         """Compute query embeddings using a OpenAPI embedding model.
 
@@ -735,7 +754,7 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
             headers=headers, timeout=aiohttp.ClientTimeout(total=self.timeout)
         ) as session:
             async with session.post(
-                self.api_url, json={"input": texts, "model": self.model_name}
+                self.api_url, json=self._build_request(texts)
             ) as resp:
                 resp.raise_for_status()
                 data = await resp.json()
@@ -743,7 +762,10 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
                     raise RuntimeError(data["detail"])
                 embeddings = data["data"]
                 sorted_embeddings = sorted(embeddings, key=lambda e: e["index"])
-                return [result["embedding"] for result in sorted_embeddings]
+                return [
+                    _parse_embedding(result["embedding"])
+                    for result in sorted_embeddings
+                ]
 
     async def aembed_query(self, text: str) -> List[float]:
         """Asynchronous Embed query text."""
@@ -1,6 +1,6 @@
 """Re-rank embeddings."""
 
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Tuple, cast
 
 import aiohttp
 import numpy as np
@@ -51,9 +51,23 @@ class CrossEncoderRerankEmbeddings(BaseModel, RerankEmbeddings):
         Returns:
             List[float]: The rank scores of the candidates.
         """
+        return self.predict_pairs([(query, candidate) for candidate in candidates])
+
+    def predict_pairs(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Predict the rank scores of the query and candidate pairs.
+
+        The pairs may have different queries, so the candidates of multiple queries
+        can be scored in one batch.
+
+        Args:
+            pairs: The list of the query and candidate pairs.
+
+        Returns:
+            List[float]: The rank scores of the pairs.
+        """
         from sentence_transformers import CrossEncoder
 
-        query_content_pairs = [[query, candidate] for candidate in candidates]
+        query_content_pairs = [[query, candidate] for query, candidate in pairs]
         _model = cast(CrossEncoder, self.client)
         rank_scores = _model.predict(sentences=query_content_pairs)
         if isinstance(rank_scores, np.ndarray):
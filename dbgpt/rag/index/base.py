@@ -1,9 +1,11 @@
 """Index store base class."""
+import asyncio
+import itertools
 import logging
 import time
 from abc import ABC, abstractmethod
 from concurrent.futures import Executor, ThreadPoolExecutor
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from dbgpt._private.pydantic import BaseModel, ConfigDict, Field, model_to_dict
 from dbgpt.core import Chunk, Embeddings
@@ -176,6 +178,73 @@ class IndexStoreBase(ABC):
             max_threads,
         )
 
+    async def aload_document_stream(
+        self,
+        chunks: Iterable[Chunk],
+        batch_size: int = 100,
+        max_chunks_once_load: int = 10,
+        max_threads: int = 1,
+        on_batch: Optional[Callable[[List[Chunk], List[str]], None]] = None,
+        select: Optional[Callable[[List[Chunk]], List[Chunk]]] = None,
+    ) -> List[str]:
+        """Load the chunks from an iterable in index database batch by batch.
+
+        The next batch is pulled from the iterable in a thread while the current
+        batch is being loaded, so a lazy pipeline(e.g. reading and splitting a
+        document) overlaps with the embedding and the writing. Only one batch is
+        pulled ahead, so at most two batches of the chunks are in memory.
+
+        Args:
+            chunks(Iterable[Chunk]): The chunks, it can be a generator.
+            batch_size(int): The number of the chunks in one batch.
+            max_chunks_once_load(int): Max number of chunks to load at once.
+            max_threads(int): Max number of threads to use.
+            on_batch(Optional[Callable[[List[Chunk], List[str]], None]]): Called
+                with the chunks and their ids after every batch is loaded.
+            select(Optional[Callable[[List[Chunk]], List[Chunk]]]): Select the
+                chunks of a batch to load, e.g. to skip the unchanged chunks, the
+                ``on_batch`` is still called with the whole batch.
+
+        Return:
+            List[str]: Chunk ids.
+        """
+        iterator = iter(chunks)
+        batch_size = max(batch_size, 1)
+
+        def _next_batch() -> List[Chunk]:
+            return list(itertools.islice(iterator, batch_size))
+
+        ids: List[str] = []
+        next_batch = asyncio.ensure_future(
+            blocking_func_to_async_no_executor(_next_batch)
+        )
+        try:
+            while True:
+                batch = await next_batch
+                if not batch:
+                    break
+                # Pull the next batch while loading the current one
+                next_batch = asyncio.ensure_future(
+                    blocking_func_to_async_no_executor(_next_batch)
+                )
+                selected = select(batch) if select else batch
+                batch_ids = (
+                    await self.aload_document_with_limit(
+                        selected, max_chunks_once_load, max_threads
+                    )
+                    if selected
+                    else []
+                )
+                ids.extend(batch_ids)
+                if on_batch:
+                    on_batch(batch, batch_ids)
+        finally:
+            if not next_batch.done():
+                # The pulling thread can't be cancelled, wait for it before the
+                # iterator is closed
+                await asyncio.gather(next_batch, return_exceptions=True)
+        return ids
+
     def similar_search(
         self, text: str, topk: int, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
@@ -1,8 +1,24 @@
 """Module for Knowledge Base."""
 
+import math
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from dbgpt.core import Document
 from dbgpt.rag.text_splitter.text_splitter import (
@@ -143,6 +159,147 @@ class ChunkStrategy(Enum):
         return self.value[0](*args, **kwargs)
 
 
+# The number of the characters in one document when a large text is loaded lazily
+STREAM_BLOCK_SIZE = 1024 * 1024
+
+
+def iter_text_blocks(
+    lines: Iterable[str],
+    block_size: int = STREAM_BLOCK_SIZE,
+    is_boundary: Optional[Callable[[str], bool]] = None,
+    max_block_size: Optional[int] = None,
+) -> Iterator[str]:
+    """Join the lines into the text blocks of about ``block_size`` characters.
+
+    Args:
+        lines (Iterable[str]): The lines with the line endings.
+        block_size (int): The size of a block to split it at the next boundary.
+        is_boundary (Optional[Callable[[str], bool]]): Whether a block can start with
+            the line, it is called for every line in order. Defaults to all the lines.
+        max_block_size (Optional[int]): The size of a block to split it at the next
+            line, even if the line is not a boundary.
+
+    Returns:
+        Iterator[str]: The text blocks, one empty block for no lines.
+    """
+    block: List[str] = []
+    size = 0
+    empty = True
+    for line in lines:
+        boundary = is_boundary(line) if is_boundary else True
+        if block and (
+            (size >= block_size and boundary)
+            or (max_block_size is not None and size >= max_block_size)
+        ):
+            yield "".join(block)
+            block, size = [], 0
+        block.append(line)
+        size += len(line)
+        empty = False
+    if block or empty:
+        yield "".join(block)
+
+
+T = TypeVar("T")
+
+# The process pools to extract the text of the documents, shared by all the documents
+# with the same number of the workers, so the worker processes are reused
+_EXTRACT_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_EXTRACT_POOLS_LOCK = threading.Lock()
+
+
+def get_extract_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Get the shared process pool to extract the text of the documents.
+
+    Args:
+        max_workers (int): The number of the worker processes.
+
+    Returns:
+        ProcessPoolExecutor: The process pool, it is created at the first call.
+    """
+    max_workers = max(max_workers, 1)
+    with _EXTRACT_POOLS_LOCK:
+        pool = _EXTRACT_POOLS.get(max_workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=max_workers)
+            _EXTRACT_POOLS[max_workers] = pool
+        return pool
+
+
+def _discard_extract_process_pool(pool: ProcessPoolExecutor) -> None:
+    with _EXTRACT_POOLS_LOCK:
+        for max_workers, cached_pool in list(_EXTRACT_POOLS.items()):
+            if cached_pool is pool:
+                del _EXTRACT_POOLS[max_workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_in_extract_process(max_workers: int, func: Callable[..., T], *args) -> T:
+    """Run the extraction function in the shared process pool.
+
+    Args:
+        max_workers (int): The number of the worker processes.
+        func (Callable[..., T]): The function, it must be defined at the module level
+            to be pickled.
+        *args: The arguments of the function.
+
+    Returns:
+        T: The result of the function.
+    """
+    pool = get_extract_process_pool(max_workers)
+    try:
+        return pool.submit(func, *args).result()
+    except BrokenProcessPool:
+        # A worker process died, create a new pool for the next extraction
+        _discard_extract_process_pool(pool)
+        raise
+
+
+def extract_ranges_in_processes(
+    func: Callable[[str, int, int], List[T]],
+    path: str,
+    total: int,
+    max_workers: int,
+    ranges_per_worker: int = 4,
+) -> Iterator[T]:
+    """Extract the items(e.g. the pages) of a file in ranges in the shared processes.
+
+    The items are split into the contiguous ranges, a few ranges for each worker to
+    balance the items of various sizes, and every range is extracted in a worker
+    process which opens the file itself.
+
+    Args:
+        func (Callable[[str, int, int], List[T]]): The function to extract the items
+            ``[start, end)`` of the file, it must be defined at the module level.
+        path (str): The file path.
+        total (int): The number of the items.
+        max_workers (int): The number of the worker processes, the items are
+            extracted in the current process if it is not greater than 1.
+        ranges_per_worker (int): The number of the ranges for each worker.
+
+    Returns:
+        Iterator[T]: The extracted items, in the order of the file.
+    """
+    if max_workers <= 1 or total <= 1:
+        yield from func(path, 0, total)
+        return
+    pool = get_extract_process_pool(max_workers)
+    range_size = math.ceil(total / (max_workers * max(ranges_per_worker, 1)))
+    futures = [
+        pool.submit(func, path, start, min(start + range_size, total))
+        for start in range(0, total, range_size)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    except BrokenProcessPool:
+        _discard_extract_process_pool(pool)
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
+
+
 class Knowledge(ABC):
     """Knowledge Base Class."""
 
@@ -165,6 +322,16 @@ class Knowledge(ABC):
         documents = self._load()
         return self._postprocess(documents)
 
+    def iter_load(self) -> Iterator[Document]:
+        """Load knowledge from data loader lazily.
+
+        The knowledge which can read its source incrementally yields the documents
+        one by one, so the whole source does not have to fit in memory. The others
+        yield the documents of :meth:`load`.
+        """
+        for document in self._iter_load():
+            yield from self._postprocess([document])
+
     def extract(self, documents: List[Document]) -> List[Document]:
         """Extract knowledge from text."""
         return documents
@@ -192,6 +359,10 @@ class Knowledge(ABC):
     def _load(self) -> List[Document]:
         """Preprocess knowledge from data loader."""
 
+    def _iter_load(self) -> Iterator[Document]:
+        """Preprocess knowledge from data loader lazily."""
+        yield from self._load()
+
     @classmethod
     def support_chunk_strategy(cls) -> List[ChunkStrategy]:
         """Return supported chunk strategy."""
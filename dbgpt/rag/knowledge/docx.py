@@ -9,6 +9,7 @@ from dbgpt.rag.knowledge.base import (
     DocumentType,
     Knowledge,
     KnowledgeType,
+    run_in_extract_process,
 )
 
 
@@ -22,6 +23,7 @@ class DocxKnowledge(Knowledge):
         encoding: Optional[str] = "utf-8",
         loader: Optional[Any] = None,
         metadata: Optional[Dict[str, Union[str, List[str]]]] = None,
+        extract_workers: int = 1,
         **kwargs: Any,
     ) -> None:
         """Create Docx Knowledge with Knowledge arguments.
@@ -31,6 +33,8 @@ class DocxKnowledge(Knowledge):
             knowledge_type(KnowledgeType, optional): knowledge type
             encoding(str, optional): csv encoding
             loader(Any, optional): loader
+            extract_workers(int, optional): the number of the shared processes to
+                extract the documents, 1 to extract them in the current process
         """
         super().__init__(
             path=file_path,
@@ -40,6 +44,7 @@ class DocxKnowledge(Knowledge):
             **kwargs,
         )
         self._encoding = encoding
+        self._extract_workers = extract_workers
 
     def _load(self) -> List[Document]:
         """Load docx document from loader."""
@@ -47,12 +52,14 @@ class DocxKnowledge(Knowledge):
             documents = self._loader.load()
         else:
             docs = []
-            doc = docx.Document(self._path)
-            content = []
-            for i in range(len(doc.paragraphs)):
-                para = doc.paragraphs[i]
-                text = para.text
-                content.append(text)
+            if self._extract_workers > 1:
+                # The paragraphs can't be parsed separately, the whole document is
+                # extracted in a worker process
+                content = run_in_extract_process(
+                    self._extract_workers, _extract_docx_paragraphs, self._path
+                )
+            else:
+                content = _extract_docx_paragraphs(self._path)
             metadata = {"source": self._path}
             if self._metadata:
                 metadata.update(self._metadata)  # type: ignore
@@ -83,3 +90,9 @@ class DocxKnowledge(Knowledge):
     def document_type(cls) -> DocumentType:
         """Return document type."""
         return DocumentType.DOCX
+
+
+def _extract_docx_paragraphs(path: str) -> List[str]:
+    """Extract the text of the paragraphs."""
+    doc = docx.Document(path)
+    return [para.text for para in doc.paragraphs]
@@ -1,5 +1,5 @@
 """Knowledge Factory to create knowledge from file path and url."""
-from typing import Dict, List, Optional, Type, Union
+from typing import Any, Dict, List, Optional, Type, Union
 
 from dbgpt.rag.knowledge.base import Knowledge, KnowledgeType
 from dbgpt.rag.knowledge.string import StringKnowledge
@@ -31,6 +31,7 @@ class KnowledgeFactory:
         datasource: str = "",
         knowledge_type: KnowledgeType = KnowledgeType.DOCUMENT,
         metadata: Optional[Dict[str, Union[str, List[str]]]] = None,
+        **kwargs: Any,
     ):
         """Create knowledge from file path, url or text.
 
@@ -38,6 +39,8 @@ class KnowledgeFactory:
              datasource: path of the file to convert
              knowledge_type: type of knowledge
              metadata: Optional[Dict[str, Union[str, List[str]]]]
+             kwargs: the other arguments of the document knowledge, e.g.
+                extract_workers
 
         Examples:
             .. code-block:: python
@@ -59,6 +62,7 @@ class KnowledgeFactory:
                     file_path=datasource,
                     knowledge_type=knowledge_type,
                     metadata=metadata,
+                    **kwargs,
                 )
             case KnowledgeType.URL:
                 return cls.from_url(url=datasource, knowledge_type=knowledge_type)
@@ -75,12 +79,14 @@ class KnowledgeFactory:
         file_path: str = "",
         knowledge_type: Optional[KnowledgeType] = KnowledgeType.DOCUMENT,
         metadata: Optional[Dict[str, Union[str, List[str]]]] = None,
+        **kwargs: Any,
     ) -> Knowledge:
         """Create knowledge from path.
 
         Args:
             param file_path: path of the file to convert
             param knowledge_type: type of knowledge
+            param kwargs: the other arguments of the document knowledge
 
         Examples:
             .. code-block:: python
@@ -95,7 +101,10 @@ class KnowledgeFactory:
         """
         factory = cls(file_path=file_path, knowledge_type=knowledge_type)
         return factory._select_document_knowledge(
-            file_path=file_path, knowledge_type=knowledge_type, metadata=metadata
+            file_path=file_path,
+            knowledge_type=knowledge_type,
+            metadata=metadata,
+            **kwargs,
         )
 
     @staticmethod
@@ -1,12 +1,14 @@
 """Markdown Knowledge."""
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 from dbgpt.core import Document
 from dbgpt.rag.knowledge.base import (
+    STREAM_BLOCK_SIZE,
     ChunkStrategy,
     DocumentType,
     Knowledge,
     KnowledgeType,
+    iter_text_blocks,
 )
 
 
@@ -55,6 +57,27 @@ class MarkdownKnowledge(Knowledge):
                 return documents
         return [Document.langchain2doc(lc_document) for lc_document in documents]
 
+    def _iter_load(self) -> Iterator[Document]:
+        """Load markdown document in text blocks.
+
+        The blocks start with the top level headers, so the headers of the sections
+        are kept for the header splitter. A section larger than 8 blocks is split at
+        the lines.
+        """
+        if self._loader or not self._path:
+            yield from self._load()
+            return
+        metadata = {"source": self._path}
+        if self._metadata:
+            metadata.update(self._metadata)  # type: ignore
+        with open(self._path, encoding=self._encoding, errors="ignore") as f:
+            for text in iter_text_blocks(
+                f,
+                is_boundary=_TopHeaderBoundary(),
+                max_block_size=STREAM_BLOCK_SIZE * 8,
+            ):
+                yield Document(content=text, metadata=dict(metadata))
+
     @classmethod
     def support_chunk_strategy(cls) -> List[ChunkStrategy]:
         """Return support chunk strategy."""
@@ -78,3 +101,19 @@ class MarkdownKnowledge(Knowledge):
     def document_type(cls) -> DocumentType:
         """Return document type."""
         return DocumentType.MARKDOWN
+
+
+class _TopHeaderBoundary:
+    """Whether a line is a top level header, which is not in a code block."""
+
+    def __init__(self):
+        self._in_code_block = False
+
+    def __call__(self, line: str) -> bool:
+        stripped_line = line.strip()
+        if stripped_line.startswith("```"):
+            self._in_code_block = not self._in_code_block
+            return False
+        return not self._in_code_block and (
+            stripped_line == "#" or stripped_line.startswith("# ")
+        )
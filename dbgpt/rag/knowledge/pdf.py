@@ -1,5 +1,5 @@
 """PDF Knowledge."""
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 from dbgpt.core import Document
 from dbgpt.rag.knowledge.base import (
@@ -7,6 +7,7 @@ from dbgpt.rag.knowledge.base import (
     DocumentType,
     Knowledge,
     KnowledgeType,
+    extract_ranges_in_processes,
 )
 
 
@@ -20,6 +21,7 @@ class PDFKnowledge(Knowledge):
         loader: Optional[Any] = None,
         language: Optional[str] = "zh",
         metadata: Optional[Dict[str, Union[str, List[str]]]] = None,
+        extract_workers: int = 1,
         **kwargs: Any,
     ) -> None:
         """Create PDF Knowledge with Knowledge arguments.
@@ -29,6 +31,8 @@ class PDFKnowledge(Knowledge):
             knowledge_type(KnowledgeType, optional): knowledge type
             loader(Any, optional): loader
             language(str, optional): language
+            extract_workers(int, optional): the number of the processes to extract
+                the pages in parallel, 1 to extract them in the current process
         """
         super().__init__(
             path=file_path,
@@ -38,45 +42,39 @@ class PDFKnowledge(Knowledge):
             **kwargs,
         )
         self._language = language
+        self._extract_workers = extract_workers
 
     def _load(self) -> List[Document]:
         """Load pdf document from loader."""
         if self._loader:
             documents = self._loader.load()
+            return [Document.langchain2doc(lc_document) for lc_document in documents]
+        return list(self._iter_pages())
+
+    def _iter_load(self) -> Iterator[Document]:
+        """Load pdf document page by page."""
+        if self._loader:
+            yield from self._load()
+        else:
+            yield from self._iter_pages()
+
+    def _iter_pages(self) -> Iterator[Document]:
+        if not self._path:
+            raise ValueError("file path is required")
+        if self._extract_workers > 1:
+            pages: Iterator[str] = extract_ranges_in_processes(
+                _extract_pdf_pages,
+                self._path,
+                _count_pdf_pages(self._path),
+                self._extract_workers,
+            )
         else:
-            import pypdf
-
-            pages = []
-            documents = []
-            if not self._path:
-                raise ValueError("file path is required")
-            with open(self._path, "rb") as file:
-                reader = pypdf.PdfReader(file)
-                for page_num in range(len(reader.pages)):
-                    _page = reader.pages[page_num]
-                    pages.append((_page.extract_text(), page_num))
-
-            # cleaned_pages = []
-            for page, page_num in pages:
-                lines = page.splitlines()
-
-                cleaned_lines = []
-                for line in lines:
-                    if self._language == "en":
-                        words = list(line)  # noqa: F841
-                    else:
-                        words = line.split()  # noqa: F841
-                    cleaned_lines.append(line)
-                page = "\n".join(cleaned_lines)
-                # cleaned_pages.append(page)
-                metadata = {"source": self._path, "page": page_num}
-                if self._metadata:
-                    metadata.update(self._metadata)  # type: ignore
-                # text = "\f".join(cleaned_pages)
-                document = Document(content=page, metadata=metadata)
-                documents.append(document)
-            return documents
-        return [Document.langchain2doc(lc_document) for lc_document in documents]
+            pages = _iter_pdf_pages(self._path)
+        for page_num, page in enumerate(pages):
+            metadata = {"source": self._path, "page": page_num}
+            if self._metadata:
+                metadata.update(self._metadata)  # type: ignore
+            yield Document(content=page, metadata=metadata)
 
     @classmethod
     def support_chunk_strategy(cls) -> List[ChunkStrategy]:
@@ -101,3 +99,29 @@ class PDFKnowledge(Knowledge):
     def document_type(cls) -> DocumentType:
         """Document type of PDF."""
         return DocumentType.PDF
+
+
+def _iter_pdf_pages(
+    path: str, start: int = 0, end: Optional[int] = None
+) -> Iterator[str]:
+    """Extract the text of the pages ``[start, end)`` one by one."""
+    import pypdf
+
+    with open(path, "rb") as file:
+        reader = pypdf.PdfReader(file)
+        end = len(reader.pages) if end is None else end
+        for page_num in range(start, end):
+            page = reader.pages[page_num].extract_text()
+            yield "\n".join(page.splitlines())
+
+
+def _extract_pdf_pages(path: str, start: int, end: int) -> List[str]:
+    """Extract the text of the pages ``[start, end)`` in a worker process."""
+    return list(_iter_pdf_pages(path, start, end))
+
+
+def _count_pdf_pages(path: str) -> int:
+    import pypdf
+
+    with open(path, "rb") as file:
+        return len(pypdf.PdfReader(file).pages)
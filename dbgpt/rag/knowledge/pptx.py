@@ -1,5 +1,5 @@
 """PPTX Knowledge."""
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 from dbgpt.core import Document
 from dbgpt.rag.knowledge.base import (
@@ -7,6 +7,7 @@ from dbgpt.rag.knowledge.base import (
     DocumentType,
     Knowledge,
     KnowledgeType,
+    extract_ranges_in_processes,
 )
 
 
@@ -20,6 +21,7 @@ class PPTXKnowledge(Knowledge):
         loader: Optional[Any] = None,
         language: Optional[str] = "zh",
         metadata: Optional[Dict[str, Union[str, List[str]]]] = None,
+        extract_workers: int = 1,
         **kwargs: Any,
     ) -> None:
         """Create PPTX knowledge with PDF Knowledge arguments.
@@ -28,6 +30,8 @@ class PPTXKnowledge(Knowledge):
             file_path:(Optional[str]) file path
             knowledge_type:(KnowledgeType) knowledge type
             loader:(Optional[Any]) loader
+            extract_workers:(int) the number of the processes to extract the slides
+                in parallel, 1 to extract them in the current process
         """
         super().__init__(
             path=file_path,
@@ -37,6 +41,7 @@ class PPTXKnowledge(Knowledge):
             **kwargs,
         )
         self._language = language
+        self._extract_workers = extract_workers
 
     def _load(self) -> List[Document]:
         """Load pdf document from loader."""
@@ -46,12 +51,17 @@ class PPTXKnowledge(Knowledge):
             from pptx import Presentation
 
             pr = Presentation(self._path)
+            if self._extract_workers > 1:
+                contents: Iterable[str] = extract_ranges_in_processes(
+                    _extract_pptx_slides,
+                    self._path,
+                    len(pr.slides),
+                    self._extract_workers,
+                )
+            else:
+                contents = (_slide_text(slide) for slide in pr.slides)
             docs = []
-            for slide in pr.slides:
-                content = ""
-                for shape in slide.shapes:
-                    if hasattr(shape, "text") and shape.text:
-                        content += shape.text
+            for content in contents:
                 metadata = {"source": self._path}
                 if self._metadata:
                     metadata.update(self._metadata)  # type: ignore
@@ -98,3 +108,17 @@ class PPTXKnowledge(Knowledge):
             DocumentType: document type
         """
         return DocumentType.PPTX
+
+
+def _slide_text(slide: Any) -> str:
+    return "".join(
+        shape.text for shape in slide.shapes if hasattr(shape, "text") and shape.text
+    )
+
+
+def _extract_pptx_slides(path: str, start: int, end: int) -> List[str]:
+    """Extract the text of the slides ``[start, end)`` in a worker process."""
+    from pptx import Presentation
+
+    slides = Presentation(path).slides
+    return [_slide_text(slides[i]) for i in range(start, end)]
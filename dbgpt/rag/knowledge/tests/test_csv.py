@@ -30,3 +30,15 @@ def test_load_from_csv(mock_file_open, mock_csv_dict_reader):
     knowledge = CSVKnowledge(file_path="test_data.csv", source_column="name")
     documents = knowledge._load()
     assert len(documents) == 3
+
+
+def test_iter_load_from_csv(tmp_path):
+    file_path = tmp_path / "test_data.csv"
+    file_path.write_text(MOCK_CSV_DATA)
+    knowledge = CSVKnowledge(file_path=str(file_path), source_column="name")
+    documents = knowledge.iter_load()
+
+    first = next(documents)
+    assert first.content == "id: 1\nname: John Doe\nage: 30"
+    assert first.metadata == {"source": "John Doe", "row": 0}
+    assert len(list(documents)) == 2
@@ -27,3 +27,22 @@ def test_load_from_docx(mock_docx_document):
         == "This is the first paragraph.\nThis is the second paragraph."
     )
     assert documents[0].metadata["source"] == file_path
+
+
+def test_load_from_docx_in_process(tmp_path):
+    import docx
+
+    document = docx.Document()
+    document.add_paragraph("This is the first paragraph.")
+    document.add_paragraph("This is the second paragraph.")
+    file_path = str(tmp_path / "test_document.docx")
+    document.save(file_path)
+
+    knowledge = DocxKnowledge(file_path=file_path, extract_workers=2)
+    documents = knowledge._load()
+
+    assert len(documents) == 1
+    assert (
+        documents[0].content
+        == "This is the first paragraph.\nThis is the second paragraph."
+    )
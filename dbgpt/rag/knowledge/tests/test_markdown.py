@@ -27,3 +27,35 @@ def test_load_from_markdown(mock_file_open):
     assert len(documents) == 1
     assert documents[0].content == MOCK_MARKDOWN_DATA
     assert documents[0].metadata["source"] == file_path
+
+
+def test_iter_load_from_markdown(tmp_path):
+    file_path = tmp_path / "test_document.md"
+    file_path.write_text(MOCK_MARKDOWN_DATA)
+    knowledge = MarkdownKnowledge(file_path=str(file_path))
+    documents = list(knowledge.iter_load())
+
+    assert len(documents) == 1
+    assert documents[0].content == MOCK_MARKDOWN_DATA
+    assert documents[0].metadata["source"] == str(file_path)
+
+
+def test_iter_text_blocks_split_at_top_headers():
+    from dbgpt.rag.knowledge.base import iter_text_blocks
+    from dbgpt.rag.knowledge.markdown import _TopHeaderBoundary
+
+    lines = [
+        "# A\n",
+        "text a\n",
+        "```\n",
+        "# comment in code\n",
+        "```\n",
+        "## B\n",
+        "# C\n",
+        "text c\n",
+    ]
+    blocks = list(
+        iter_text_blocks(lines, block_size=1, is_boundary=_TopHeaderBoundary())
+    )
+    assert blocks == ["".join(lines[:6]), "".join(lines[6:])]
+    assert list(iter_text_blocks([])) == [""]
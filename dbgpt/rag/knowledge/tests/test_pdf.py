@@ -35,3 +35,63 @@ def test_load_from_pdf(mock_pdf_open_and_reader):
         assert document.metadata["page"] == MOCK_PDF_PAGES[i][1]
 
     #
+
+
+def test_iter_load_from_pdf(mock_pdf_open_and_reader):
+    file_path = "test_document.pdf"
+    knowledge = PDFKnowledge(file_path=file_path)
+    documents = list(knowledge.iter_load())
+
+    assert [doc.metadata["page"] for doc in documents] == [0, 1]
+    assert documents[1].content == MOCK_PDF_PAGES[1][0]
+
+
+def _write_pdf(path, texts):
+    """Write a minimal PDF with one line of text on every page."""
+    n = len(texts)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(f"{4 + 2 * i} 0 R".encode() for i in range(n))
+        + f"] /Count {n} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> "
+            + f"/Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(
+            f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+        )
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(len(data))
+        data += f"{i + 1} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    data += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    data += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    path.write_bytes(data)
+
+
+def test_load_from_pdf_in_processes(tmp_path):
+    file_path = tmp_path / "test_document.pdf"
+    texts = [f"This is page {i}." for i in range(9)]
+    _write_pdf(file_path, texts)
+
+    serial_documents = PDFKnowledge(file_path=str(file_path))._load()
+    documents = PDFKnowledge(file_path=str(file_path), extract_workers=2)._load()
+
+    assert [doc.content for doc in documents] == texts
+    assert [doc.content for doc in serial_documents] == texts
+    assert [doc.metadata for doc in documents] == [
+        doc.metadata for doc in serial_documents
+    ]
+    assert documents[3].metadata["page"] == 3
@@ -0,0 +1,48 @@
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+
+from dbgpt.rag.knowledge.base import extract_ranges_in_processes
+from dbgpt.rag.knowledge.pptx import PPTXKnowledge
+
+
+@pytest.fixture
+def pptx_file(tmp_path):
+    pr = Presentation()
+    for i in range(10):
+        slide = pr.slides.add_slide(pr.slide_layouts[6])
+        text_box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1))
+        text_box.text_frame.text = f"This is slide {i}."
+    file_path = tmp_path / "test_document.pptx"
+    pr.save(str(file_path))
+    return str(file_path)
+
+
+def test_load_from_pptx(pptx_file):
+    knowledge = PPTXKnowledge(file_path=pptx_file)
+    documents = knowledge._load()
+
+    assert [doc.content for doc in documents] == [
+        f"This is slide {i}." for i in range(10)
+    ]
+    assert documents[0].metadata["source"] == pptx_file
+
+
+def test_load_from_pptx_in_processes(pptx_file):
+    knowledge = PPTXKnowledge(file_path=pptx_file, extract_workers=2)
+    documents = knowledge._load()
+
+    assert [doc.content for doc in documents] == [
+        f"This is slide {i}." for i in range(10)
+    ]
+    assert documents[0].metadata["source"] == pptx_file
+
+
+def _extract_range(path, start, end):
+    return [f"{path}:{i}" for i in range(start, end)]
+
+
+def test_extract_ranges_in_processes():
+    items = list(extract_ranges_in_processes(_extract_range, "file", 25, 3))
+    assert items == [f"file:{i}" for i in range(25)]
+    assert list(extract_ranges_in_processes(_extract_range, "file", 0, 3)) == []
@@ -1,7 +1,9 @@
+from functools import partial
 from unittest.mock import mock_open, patch
 
 import pytest
 
+from dbgpt.rag.knowledge.base import iter_text_blocks
 from dbgpt.rag.knowledge.txt import TXTKnowledge
 
 MOCK_TXT_CONTENT = b"Sample text content for testing.\nAnother line of text."
@@ -36,3 +38,42 @@ def test_load_from_txt(mock_file_open, mock_chardet_detect):
     mock_file_open.assert_called_once_with(file_path, "rb")
 
     mock_chardet_detect.assert_called_once()
+
+
+def test_iter_load_from_txt(tmp_path):
+    file_path = tmp_path / "test_document.txt"
+    file_path.write_bytes(MOCK_TXT_CONTENT)
+    knowledge = TXTKnowledge(file_path=str(file_path))
+    documents = list(knowledge.iter_load())
+
+    assert len(documents) == 1
+    assert documents[0].content == MOCK_TXT_CONTENT.decode("utf-8")
+    assert documents[0].metadata["source"] == str(file_path)
+
+
+def test_iter_load_from_large_txt(tmp_path):
+    lines = [f"line {i}\n" for i in range(100)]
+    file_path = tmp_path / "test_document.txt"
+    file_path.write_text("".join(lines))
+    knowledge = TXTKnowledge(file_path=str(file_path))
+    with patch(
+        "dbgpt.rag.knowledge.txt.iter_text_blocks",
+        partial(iter_text_blocks, block_size=64),
+    ):
+        documents = list(knowledge.iter_load())
+
+    assert len(documents) > 1
+    assert "".join(doc.content for doc in documents) == "".join(lines)
+    assert all(doc.content.endswith("\n") for doc in documents)
+
+
+def test_iter_load_non_ascii_after_head(tmp_path):
+    file_path = tmp_path / "test_document.txt"
+    file_path.write_bytes(b"ascii line\n" * 20 + "中文\n".encode("utf-8") + b"\xff\n")
+    knowledge = TXTKnowledge(file_path=str(file_path))
+    with patch("dbgpt.rag.knowledge.txt._DETECT_ENCODING_BYTES", 64):
+        documents = list(knowledge.iter_load())
+
+    assert "".join(doc.content for doc in documents) == (
+        "ascii line\n" * 20 + "中文\n\ufffd\n"
+    )
@@ -1,5 +1,5 @@
 """TXT Knowledge."""
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 import chardet
 
@@ -9,8 +9,12 @@ from dbgpt.rag.knowledge.base import (
     DocumentType,
     Knowledge,
     KnowledgeType,
+    iter_text_blocks,
 )
 
+# The number of the bytes to detect the encoding of a text file read lazily
+_DETECT_ENCODING_BYTES = 1024 * 1024
+
 
 class TXTKnowledge(Knowledge):
     """TXT Knowledge."""
@@ -59,6 +63,28 @@ class TXTKnowledge(Knowledge):
 
         return [Document.langchain2doc(lc_document) for lc_document in documents]
 
+    def _iter_load(self) -> Iterator[Document]:
+        """Load txt document in text blocks.
+
+        The encoding is detected from the head of the file, the bytes after the head
+        which can't be decoded are replaced.
+        """
+        if self._loader or not self._path:
+            yield from self._load()
+            return
+        with open(self._path, "rb") as f:
+            result = chardet.detect(f.read(_DETECT_ENCODING_BYTES))
+        encoding = result["encoding"] or "utf-8"
+        if encoding.lower() == "ascii":
+            # The non-ASCII text may be after the head, UTF-8 is a superset of ASCII
+            encoding = "utf-8"
+        metadata = {"source": self._path}
+        if self._metadata:
+            metadata.update(self._metadata)  # type: ignore
+        with open(self._path, encoding=encoding, errors="replace", newline="") as f:
+            for text in iter_text_blocks(f):
+                yield Document(content=text, metadata=dict(metadata))
+
     @classmethod
     def support_chunk_strategy(cls):
         """Return support chunk strategy."""
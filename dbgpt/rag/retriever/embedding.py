@@ -1,7 +1,7 @@
 """Embedding retriever."""
 
 from functools import reduce
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, Hashable, List, Optional, cast
 
 from dbgpt.core import Chunk
 from dbgpt.rag.index.base import IndexStoreBase
@@ -24,6 +24,7 @@ class EmbeddingRetriever(BaseRetriever):
         query_rewrite: Optional[QueryRewrite] = None,
         rerank: Optional[Ranker] = None,
         retrieve_strategy: Optional[RetrieverStrategy] = RetrieverStrategy.EMBEDDING,
+        concurrency_limit: Optional[int] = 5,
     ):
         """Create EmbeddingRetriever.
 
@@ -32,6 +33,9 @@ class EmbeddingRetriever(BaseRetriever):
             top_k (int): top k
             query_rewrite (Optional[QueryRewrite]): query rewrite
             rerank (Ranker): rerank
+            concurrency_limit (Optional[int]): The max number of the queries(the
+                original query and the rewritten queries) searched concurrently, None
+                means no limit.
 
         Examples:
             .. code-block:: python
@@ -69,6 +73,7 @@ class EmbeddingRetriever(BaseRetriever):
         self._index_store = index_store
         self._rerank = rerank or DefaultRanker(self._top_k)
         self._retrieve_strategy = retrieve_strategy
+        self._concurrency_limit = concurrency_limit
 
     def load_document(self, chunks: List[Chunk], **kwargs: Dict[str, Any]) -> List[str]:
         """Load document in vector database.
@@ -139,25 +144,28 @@ class EmbeddingRetriever(BaseRetriever):
             List[Chunk]: list of chunks
         """
         queries = [query]
+        candidates: List[List[Chunk]] = []
         if self._query_rewrite:
-            candidates_tasks = [
-                self._similarity_search(
-                    query, filters, root_tracer.get_current_span_id()
-                )
-                for query in queries
-            ]
-            chunks = await self._run_async_tasks(candidates_tasks)
+            # The chunks of the original query are reused as its candidates
+            chunks = await self._similarity_search(
+                query, filters, root_tracer.get_current_span_id()
+            )
+            candidates.append(chunks)
             context = "\n".join([chunk.content for chunk in chunks])
             new_queries = await self._query_rewrite.rewrite(
                 origin_query=query, context=context, nums=1
             )
             queries.extend(new_queries)
-        candidates = [
+        candidates_tasks = [
             self._similarity_search(query, filters, root_tracer.get_current_span_id())
-            for query in queries
+            for query in queries[len(candidates) :]
         ]
-        new_candidates = await run_async_tasks(tasks=candidates, concurrency_limit=1)
-        return new_candidates
+        candidates.extend(
+            await run_async_tasks(
+                tasks=candidates_tasks, concurrency_limit=self._concurrency_limit
+            )
+        )
+        return _fuse_candidates(candidates)
 
     async def _aretrieve_with_score(
         self,
@@ -175,18 +183,17 @@ class EmbeddingRetriever(BaseRetriever):
             List[Chunk]: list of chunks with score
         """
         queries = [query]
+        candidates_with_score: List[List[Chunk]] = []
         if self._query_rewrite:
             with root_tracer.start_span(
                 "dbgpt.rag.retriever.embeddings.query_rewrite.similarity_search",
                 metadata={"query": query, "score_threshold": score_threshold},
             ):
-                candidates_tasks = [
-                    self._similarity_search(
-                        query, filters, root_tracer.get_current_span_id()
-                    )
-                    for query in queries
-                ]
-                chunks = await self._run_async_tasks(candidates_tasks)
+                # The chunks of the original query are reused as its candidates
+                chunks = await self._similarity_search_with_score(
+                    query, score_threshold, filters, root_tracer.get_current_span_id()
+                )
+                candidates_with_score.append(chunks)
                 context = "\n".join([chunk.content for chunk in chunks])
             with root_tracer.start_span(
                 "dbgpt.rag.retriever.embeddings.query_rewrite.rewrite",
@@ -201,18 +208,18 @@ class EmbeddingRetriever(BaseRetriever):
             "dbgpt.rag.retriever.embeddings.similarity_search_with_score",
             metadata={"query": query, "score_threshold": score_threshold},
         ):
-            candidates_with_score = [
+            candidates_tasks = [
                 self._similarity_search_with_score(
                     query, score_threshold, filters, root_tracer.get_current_span_id()
                 )
-                for query in queries
+                for query in queries[len(candidates_with_score) :]
             ]
-            res_candidates_with_score = await run_async_tasks(
-                tasks=candidates_with_score, concurrency_limit=1
-            )
-            new_candidates_with_score = cast(
-                List[Chunk], reduce(lambda x, y: x + y, res_candidates_with_score)
+            candidates_with_score.extend(
+                await run_async_tasks(
+                    tasks=candidates_tasks, concurrency_limit=self._concurrency_limit
+                )
             )
+            new_candidates_with_score = _fuse_candidates(candidates_with_score)
 
         with root_tracer.start_span(
             "dbgpt.rag.retriever.embeddings.rerank",
@@ -247,7 +254,9 @@ class EmbeddingRetriever(BaseRetriever):
 
     async def _run_async_tasks(self, tasks) -> List[Chunk]:
         """Run async tasks."""
-        candidates = await run_async_tasks(tasks=tasks, concurrency_limit=1)
+        candidates = await run_async_tasks(
+            tasks=tasks, concurrency_limit=self._concurrency_limit
+        )
         candidates = reduce(lambda x, y: x + y, candidates)
         return cast(List[Chunk], candidates)
 
@@ -270,3 +279,30 @@ class EmbeddingRetriever(BaseRetriever):
             return await self._index_store.asimilar_search_with_scores(
                 query, self._top_k, score_threshold, filters
             )
+
+
+def _chunk_key(chunk: Chunk) -> Hashable:
+    """Return the key to identify the same chunk returned by different queries.
+
+    The chunk ids are generated again by most vector stores when searching, so
+    the chunks are identified by the content and the metadata.
+    """
+    metadata = tuple(sorted((k, str(v)) for k, v in chunk.metadata.items()))
+    return chunk.content, metadata
+
+
+def _fuse_candidates(candidates: List[List[Chunk]]) -> List[Chunk]:
+    """Fuse the candidates of multiple queries.
+
+    The duplicate chunks are removed, the one with the highest score is kept, and the
+    order of the first appearance is kept.
+    """
+    fused: Dict[Hashable, Chunk] = {}
+    for chunks in candidates:
+        for chunk in chunks:
+            key = _chunk_key(chunk)
+            exist_chunk = fused.get(key)
+            # Replacing the value keeps the position of the first appearance
+            if exist_chunk is None or chunk.score > exist_chunk.score:
+                fused[key] = chunk
+    return list(fused.values())
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -37,3 +37,79 @@ def test_retrieve(query, top_k, mock_vector_store_connector, embedding_retriever
     retrieved_chunks = embedding_retriever._retrieve(query)
 
     assert len(retrieved_chunks) == top_k
+
+
+class _SlowIndexStore:
+    """The index store which records the concurrent searches."""
+
+    def __init__(self, results):
+        self._results = results
+        self.queries = []
+        self.running = 0
+        self.max_running = 0
+
+    def similar_search(self, text, topk, filters=None):
+        return list(self._results[text])
+
+    async def asimilar_search_with_scores(self, text, topk, score_threshold, filters):
+        import asyncio
+
+        self.queries.append(text)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.05)
+        self.running -= 1
+        return list(self._results[text])
+
+
+@pytest.mark.asyncio
+async def test_aretrieve_with_score_concurrently():
+    shared = Chunk(content="shared", metadata={"source": "a"}, score=0.6)
+    results = {
+        "origin": [Chunk(content="origin", score=0.9), shared],
+        "rewrite1": [Chunk(content="shared", metadata={"source": "a"}, score=0.8)],
+        "rewrite2": [Chunk(content="rewrite2", score=0.5)],
+    }
+    index_store = _SlowIndexStore(results)
+    query_rewrite = MagicMock()
+    query_rewrite.rewrite = AsyncMock(return_value=["rewrite1", "rewrite2"])
+    retriever = EmbeddingRetriever(
+        index_store=index_store, top_k=4, query_rewrite=query_rewrite
+    )
+
+    chunks = await retriever._aretrieve_with_score("origin", 0.0)
+
+    # The original query is searched only once, before the rewrite
+    assert index_store.queries[0] == "origin"
+    assert sorted(index_store.queries) == ["origin", "rewrite1", "rewrite2"]
+    assert index_store.max_running == 2
+    # The duplicate chunk is fused, the highest score is kept
+    assert [(c.content, c.score) for c in chunks] == [
+        ("origin", 0.9),
+        ("shared", 0.8),
+        ("rewrite2", 0.5),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_aretrieve_reuse_origin_candidates():
+    results = {q: [Chunk(content=q)] for q in ["origin", "rewrite1", "rewrite2"]}
+    index_store = _SlowIndexStore(results)
+    retriever = EmbeddingRetriever(
+        index_store=index_store, top_k=4, concurrency_limit=1
+    )
+    retriever._query_rewrite = MagicMock()
+    retriever._query_rewrite.rewrite = AsyncMock(return_value=["rewrite1", "rewrite2"])
+    index_store.similar_search = MagicMock(
+        side_effect=lambda text, topk, filters=None: list(results[text])
+    )
+
+    chunks = await retriever._aretrieve("origin")
+
+    # The original query is searched only once
+    assert [c.args[0] for c in index_store.similar_search.call_args_list] == [
+        "origin",
+        "rewrite1",
+        "rewrite2",
+    ]
+    assert [c.content for c in chunks] == ["origin", "rewrite1", "rewrite2"]
@@ -2,12 +2,14 @@
 
 import logging
 import traceback
+from typing import Dict
 
 from dbgpt._private.config import Config
 from dbgpt.component import SystemApp
 from dbgpt.configs.model_config import EMBEDDING_MODEL_CONFIG
 from dbgpt.rag.summary.gdbms_db_summary import GdbmsSummary
 from dbgpt.rag.summary.rdbms_db_summary import RdbmsSummary
+from dbgpt.rag.summary.schema_profiler import TableProfile
 
 logger = logging.getLogger(__name__)
 
@@ -83,21 +85,21 @@ class DBSummaryClient:
     def init_db_profile(self, db_summary_client, dbname):
         """Initialize db summary profile.
 
+        The table profiles of a rdbms database are refreshed, only the tables whose
+        schema changed are embedded again.
+
         Args:
         db_summary_client(DBSummaryClient): DB Summary Client
         dbname(str): dbname
         """
         vector_store_name = dbname + "_profile"
-        from dbgpt.serve.rag.connector import VectorStoreConnector
-        from dbgpt.storage.vector_store.base import VectorStoreConfig
-
-        vector_store_config = VectorStoreConfig(name=vector_store_name)
-        vector_connector = VectorStoreConnector.from_default(
-            CFG.VECTOR_STORE_TYPE,
-            self.embeddings,
-            vector_store_config=vector_store_config,
-        )
-        if not vector_connector.vector_name_exists():
+        vector_connector = self._create_profile_connector(vector_store_name)
+        table_profiles = getattr(db_summary_client, "table_profiles", None)
+        if table_profiles is not None:
+            self._refresh_db_profile(
+                db_summary_client, dbname, table_profiles, vector_connector
+            )
+        elif not vector_connector.vector_name_exists():
             from dbgpt.rag.assembler.db_schema import DBSchemaAssembler
 
             db_assembler = DBSchemaAssembler.load_from_connection(
@@ -111,6 +113,72 @@ class DBSummaryClient:
             logger.info(f"Vector store name {vector_store_name} exist")
         logger.info("initialize db summary profile success...")
 
+    def _refresh_db_profile(
+        self,
+        db_summary_client: RdbmsSummary,
+        dbname: str,
+        table_profiles: Dict[str, TableProfile],
+        vector_connector,
+    ):
+        """Embed the summaries of the new and changed tables.
+
+        The DDL fingerprints and the vector ids of the embedded tables are saved, the
+        vectors of the changed and removed tables are deleted.
+        """
+        from dbgpt.core import Chunk
+        from dbgpt.datasource.manages.db_profile_db import DBSchemaProfileDao
+
+        profile_dao = DBSchemaProfileDao()
+        saved_profiles = profile_dao.get_profiles(dbname)
+        if not vector_connector.vector_name_exists():
+            saved_profiles = {}
+            profile_dao.delete_profiles(dbname)
+        elif not saved_profiles:
+            # The profile was embedded without the fingerprints, rebuild it
+            vector_store_name = dbname + "_profile"
+            vector_connector.delete_vector_name(vector_store_name)
+            vector_connector = self._create_profile_connector(vector_store_name)
+
+        changed = [
+            profile
+            for name, profile in table_profiles.items()
+            if saved_profiles.get(name, (None, None))[0] != profile.fingerprint
+        ]
+        removed = [name for name in saved_profiles if name not in table_profiles]
+        stale_ids = [
+            saved_profiles[name][1]
+            for name in [profile.name for profile in changed] + removed
+            if name in saved_profiles and saved_profiles[name][1]
+        ]
+        if changed:
+            chunks = [
+                Chunk(
+                    content=profile.summary(db_summary_client.summary_template),
+                    metadata={"source": "database"},
+                )
+                for profile in changed
+            ]
+            vector_ids = vector_connector.index_client.load_document_with_limit(
+                chunks, CFG.KNOWLEDGE_MAX_CHUNKS_ONCE_LOAD
+            )
+            profile_dao.save_profiles(
+                dbname,
+                [
+                    (profile.name, profile.fingerprint, vector_id)
+                    for profile, vector_id in zip(changed, vector_ids)
+                ],
+            )
+        # Delete the old vectors after the new ones are loaded, so the tables are
+        # always searchable
+        if stale_ids:
+            vector_connector.delete_by_ids(",".join(stale_ids))
+        if removed:
+            profile_dao.delete_profiles(dbname, removed)
+        logger.info(
+            f"Refresh db profile {dbname}: {len(changed)} tables embedded, "
+            f"{len(removed)} tables removed, {len(table_profiles)} tables in total"
+        )
+
     def delete_db_profile(self, dbname):
         """Delete db profile."""
         vector_store_name = dbname + "_profile"
@@ -124,8 +192,22 @@ class DBSummaryClient:
             vector_store_config=vector_store_config,
         )
         vector_connector.delete_vector_name(vector_store_name)
+        from dbgpt.datasource.manages.db_profile_db import DBSchemaProfileDao
+
+        DBSchemaProfileDao().delete_profiles(dbname)
         logger.info(f"delete db profile {dbname} success")
 
+    def _create_profile_connector(self, vector_store_name: str):
+        from dbgpt.serve.rag.connector import VectorStoreConnector
+        from dbgpt.storage.vector_store.base import VectorStoreConfig
+
+        vector_store_config = VectorStoreConfig(name=vector_store_name)
+        return VectorStoreConnector.from_default(
+            CFG.VECTOR_STORE_TYPE,
+            self.embeddings,
+            vector_store_config=vector_store_config,
+        )
+
     @staticmethod
     def create_summary_client(dbname: str, db_type: str):
         """
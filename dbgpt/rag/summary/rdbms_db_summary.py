@@ -1,10 +1,14 @@
 """Summary for rdbms database."""
-import re
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from dbgpt._private.config import Config
 from dbgpt.datasource import BaseConnector
 from dbgpt.rag.summary.db_summary import DBSummary
+from dbgpt.rag.summary.schema_profiler import (
+    SchemaProfiler,
+    TableProfile,
+    profile_table,
+)
 
 if TYPE_CHECKING:
     from dbgpt.datasource.manages import ConnectorManager
@@ -44,9 +48,11 @@ class RdbmsSummary(DBSummary):
             charset=self.db.get_charset(),
             collation=self.db.get_collation(),
         )
-        tables = self.db.get_table_names()
+        # All the tables are profiled in a few bulk queries
+        self.table_profiles: Dict[str, TableProfile] = SchemaProfiler(self.db).profile()
         self.table_info_summaries = [
-            self.get_table_summary(table_name) for table_name in tables
+            profile.summary(self.summary_template)
+            for profile in self.table_profiles.values()
         ]
 
     def get_table_summary(self, table_name):
@@ -56,6 +62,9 @@ class RdbmsSummary(DBSummary):
             table_name(column1(column1 comment),column2(column2 comment),
             column3(column3 comment) and index keys, and table comment: {table_comment})
         """
+        profile = self.table_profiles.get(table_name)
+        if profile is not None:
+            return profile.summary(self.summary_template)
         return _parse_table_summary(self.db, self.summary_template, table_name)
 
     def table_summaries(self):
@@ -72,12 +81,10 @@ def _parse_db_summary(
         conn (BaseConnector): database connection
         summary_template (str): summary template
     """
-    tables = conn.get_table_names()
-    table_info_summaries = [
-        _parse_table_summary(conn, summary_template, table_name)
-        for table_name in tables
+    return [
+        profile.summary(summary_template)
+        for profile in SchemaProfiler(conn).profile().values()
     ]
-    return table_info_summaries
 
 
 def _parse_table_summary(
@@ -94,36 +101,4 @@ def _parse_table_summary(
         table_name(column1(column1 comment),column2(column2 comment),
         column3(column3 comment) and index keys, and table comment: {table_comment})
     """
-    columns = []
-    for column in conn.get_columns(table_name):
-        if column.get("comment"):
-            columns.append(f"{column['name']} ({column.get('comment')})")
-        else:
-            columns.append(f"{column['name']}")
-
-    column_str = ", ".join(columns)
-    # Obtain index information
-    index_keys = []
-    raw_indexes = conn.get_indexes(table_name)
-    for index in raw_indexes:
-        if isinstance(index, tuple):  # Process tuple type index information
-            index_name, index_creation_command = index
-            # Extract column names using re
-            matched_columns = re.findall(r"\(([^)]+)\)", index_creation_command)
-            if matched_columns:
-                key_str = ", ".join(matched_columns)
-                index_keys.append(f"{index_name}(`{key_str}`) ")
-        else:
-            key_str = ", ".join(index["column_names"])
-            index_keys.append(f"{index['name']}(`{key_str}`) ")
-    table_str = summary_template.format(table_name=table_name, columns=column_str)
-    if len(index_keys) > 0:
-        index_key_str = ", ".join(index_keys)
-        table_str += f", and index keys: {index_key_str}"
-    try:
-        comment = conn.get_table_comment(table_name)
-    except Exception:
-        comment = dict(text=None)
-    if comment.get("text"):
-        table_str += f", and table comment: {comment.get('text')}"
-    return table_str
+    return profile_table(conn, table_name).summary(summary_template)
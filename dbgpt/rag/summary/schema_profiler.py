@@ -0,0 +1,292 @@
+"""Bulk schema profiler for rdbms database.
+
+The profiler reads the columns, comments and indexes of all the tables in a few bulk
+queries of the system catalog for MySQL, PostgreSQL and SQLite, instead of several
+queries for every table. The other dialects are profiled table by table.
+
+Every table profile has a fingerprint of its DDL, so the summary of a table is only
+embedded again when its schema changed.
+"""
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from dbgpt.datasource import BaseConnector
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ColumnProfile:
+    """The profile of a column."""
+
+    name: str
+    type: Optional[str] = None
+    nullable: Optional[bool] = None
+    default: Optional[str] = None
+    comment: Optional[str] = None
+
+
+@dataclass
+class TableProfile:
+    """The profile of a table."""
+
+    name: str
+    columns: List[ColumnProfile] = field(default_factory=list)
+    # The index name and the index keys
+    indexes: List[Tuple[str, str]] = field(default_factory=list)
+    comment: Optional[str] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Return the fingerprint of the table DDL."""
+        ddl = {
+            "name": self.name,
+            "columns": [
+                [c.name, c.type, c.nullable, c.default, c.comment] for c in self.columns
+            ],
+            "indexes": sorted(self.indexes),
+            "comment": self.comment,
+        }
+        return hashlib.sha256(
+            json.dumps(ddl, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def summary(self, summary_template: str = "{table_name}({columns})") -> str:
+        """Return the summary of the table.
+
+        Examples:
+            table_name(column1(column1 comment),column2(column2 comment),
+            column3(column3 comment) and index keys, and table comment: {table_comment})
+        """
+        columns = []
+        for column in self.columns:
+            if column.comment:
+                columns.append(f"{column.name} ({column.comment})")
+            else:
+                columns.append(f"{column.name}")
+        column_str = ", ".join(columns)
+        table_str = summary_template.format(table_name=self.name, columns=column_str)
+        if self.indexes:
+            index_key_str = ", ".join(
+                f"{index_name}(`{key_str}`) " for index_name, key_str in self.indexes
+            )
+            table_str += f", and index keys: {index_key_str}"
+        if self.comment:
+            table_str += f", and table comment: {self.comment}"
+        return table_str
+
+
+class SchemaProfiler:
+    """Profile the schema of all the tables of a rdbms database."""
+
+    def __init__(self, conn: BaseConnector):
+        """Create a new SchemaProfiler.
+
+        Args:
+            conn (BaseConnector): database connection
+        """
+        self._conn = conn
+
+    def profile(self) -> Dict[str, TableProfile]:
+        """Profile all the tables.
+
+        Returns:
+            Dict[str, TableProfile]: The table profiles by the table names, in the
+                order of the table names of the connection.
+        """
+        table_names = list(self._conn.get_table_names())
+        dialect = getattr(self._conn, "dialect", None)
+        bulk_profile = _BULK_PROFILERS.get(dialect) if dialect else None
+        if bulk_profile and table_names:
+            try:
+                profiles = bulk_profile(self._conn, set(table_names))
+            except Exception as e:
+                logger.warning(
+                    f"Bulk profile the {dialect} tables failed, profile the tables "
+                    f"one by one: {e}"
+                )
+            else:
+                # The tables not found by the bulk queries, e.g. the tables out of
+                # the current schema, are profiled one by one
+                return {
+                    name: profiles.get(name) or profile_table(self._conn, name)
+                    for name in table_names
+                }
+        return {name: profile_table(self._conn, name) for name in table_names}
+
+
+def profile_table(conn: BaseConnector, table_name: str) -> TableProfile:
+    """Profile one table with the inspector of the connection.
+
+    Args:
+        conn (BaseConnector): database connection
+        table_name (str): table name
+    """
+    columns = [
+        ColumnProfile(
+            name=column["name"],
+            type=str(column["type"]) if column.get("type") is not None else None,
+            nullable=column.get("nullable"),
+            default=column.get("default"),
+            comment=column.get("comment"),
+        )
+        for column in conn.get_columns(table_name)
+    ]
+    indexes = []
+    for index in conn.get_indexes(table_name):
+        if isinstance(index, tuple):  # Process tuple type index information
+            index_name, index_creation_command = index
+            # Extract column names using re
+            matched_columns = re.findall(r"\(([^)]+)\)", index_creation_command)
+            if matched_columns:
+                indexes.append((index_name, ", ".join(matched_columns)))
+        else:
+            indexes.append((index["name"], ", ".join(index["column_names"])))
+    try:
+        comment = conn.get_table_comment(table_name)
+    except Exception:
+        comment = dict(text=None)
+    return TableProfile(
+        name=table_name, columns=columns, indexes=indexes, comment=comment.get("text")
+    )
+
+
+def _execute(conn: Any, sql: str, params: Optional[Dict] = None) -> List[Tuple]:
+    from sqlalchemy import text
+
+    return conn.session.execute(text(sql), params or {}).fetchall()
+
+
+def _build_profiles(
+    table_names: Iterable[str],
+    table_rows: List[Tuple],
+    column_rows: List[Tuple],
+    index_rows: List[Tuple],
+) -> Dict[str, TableProfile]:
+    """Build the table profiles from the rows of the bulk queries.
+
+    The tables without any column rows are not in the profiles.
+
+    Args:
+        table_names (Iterable[str]): The tables to profile
+        table_rows (List[Tuple]): The table name and the table comment
+        column_rows (List[Tuple]): The table name, column name, type, nullable,
+            default and comment, in the order of the columns
+        index_rows (List[Tuple]): The table name, index name and column name, in the
+            order of the index columns
+    """
+    table_name_set = set(table_names)
+    profiles: Dict[str, TableProfile] = {}
+    for table_name, name, type_, nullable, default, comment in column_rows:
+        if table_name in table_name_set:
+            if table_name not in profiles:
+                profiles[table_name] = TableProfile(name=table_name)
+            profiles[table_name].columns.append(
+                ColumnProfile(
+                    name=name,
+                    type=type_,
+                    nullable=bool(nullable) if nullable is not None else None,
+                    default=str(default) if default is not None else None,
+                    comment=comment or None,
+                )
+            )
+    for table_name, comment in table_rows:
+        if table_name in profiles:
+            profiles[table_name].comment = comment or None
+    index_columns: Dict[Tuple[str, str], List[str]] = {}
+    for table_name, index_name, column_name in index_rows:
+        if table_name in profiles:
+            index_columns.setdefault((table_name, index_name), []).append(column_name)
+    for (table_name, index_name), columns in index_columns.items():
+        profiles[table_name].indexes.append((index_name, ", ".join(columns)))
+    return profiles
+
+
+def _profile_mysql(conn: Any, table_names: Iterable[str]) -> Dict[str, TableProfile]:
+    table_rows = _execute(
+        conn,
+        "SELECT TABLE_NAME, TABLE_COMMENT FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE()",
+    )
+    column_rows = _execute(
+        conn,
+        "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE = 'YES', "
+        "COLUMN_DEFAULT, COLUMN_COMMENT FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() ORDER BY TABLE_NAME, ORDINAL_POSITION",
+    )
+    # The primary keys are not in the indexes of the inspector either
+    index_rows = _execute(
+        conn,
+        "SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND INDEX_NAME != 'PRIMARY' "
+        "ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX",
+    )
+    return _build_profiles(table_names, table_rows, column_rows, index_rows)
+
+
+def _profile_postgresql(
+    conn: Any, table_names: Iterable[str]
+) -> Dict[str, TableProfile]:
+    relations = (
+        "FROM pg_catalog.pg_class c JOIN pg_catalog.pg_namespace n "
+        "ON n.oid = c.relnamespace WHERE n.nspname = current_schema() "
+        "AND c.relkind IN ('r', 'p', 'v', 'm', 'f')"
+    )
+    table_rows = _execute(
+        conn, f"SELECT c.relname, obj_description(c.oid, 'pg_class') {relations}"
+    )
+    column_rows = _execute(
+        conn,
+        "SELECT c.relname, a.attname, format_type(a.atttypid, a.atttypmod), "
+        "NOT a.attnotnull, pg_get_expr(d.adbin, d.adrelid), "
+        "col_description(c.oid, a.attnum) FROM pg_catalog.pg_class c "
+        "JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace "
+        "JOIN pg_catalog.pg_attribute a ON a.attrelid = c.oid "
+        "AND a.attnum > 0 AND NOT a.attisdropped "
+        "LEFT JOIN pg_catalog.pg_attrdef d ON d.adrelid = c.oid "
+        "AND d.adnum = a.attnum WHERE n.nspname = current_schema() "
+        "AND c.relkind IN ('r', 'p', 'v', 'm', 'f') ORDER BY c.relname, a.attnum",
+    )
+    # The primary keys are in the indexes of the inspector(pg_indexes)
+    index_rows = _execute(
+        conn,
+        "SELECT t.relname, i.relname, a.attname FROM pg_catalog.pg_index ix "
+        "JOIN pg_catalog.pg_class t ON t.oid = ix.indrelid "
+        "JOIN pg_catalog.pg_class i ON i.oid = ix.indexrelid "
+        "JOIN pg_catalog.pg_namespace n ON n.oid = t.relnamespace "
+        "JOIN LATERAL unnest(ix.indkey) WITH ORDINALITY AS k(attnum, ord) ON true "
+        "JOIN pg_catalog.pg_attribute a ON a.attrelid = t.oid "
+        "AND a.attnum = k.attnum WHERE n.nspname = current_schema() "
+        "ORDER BY t.relname, i.relname, k.ord",
+    )
+    return _build_profiles(table_names, table_rows, column_rows, index_rows)
+
+
+def _profile_sqlite(conn: Any, table_names: Iterable[str]) -> Dict[str, TableProfile]:
+    column_rows = _execute(
+        conn,
+        'SELECT m.name, p.name, p.type, NOT p."notnull", p.dflt_value, NULL '
+        "FROM sqlite_master m JOIN pragma_table_info(m.name) p "
+        "WHERE m.type IN ('table', 'view') ORDER BY m.name, p.cid",
+    )
+    index_rows = _execute(
+        conn,
+        "SELECT m.name, il.name, ii.name FROM sqlite_master m "
+        "JOIN pragma_index_list(m.name) il JOIN pragma_index_info(il.name) ii "
+        "WHERE m.type = 'table' AND il.origin != 'pk' "
+        "AND il.name NOT LIKE 'sqlite_autoindex%' ORDER BY m.name, il.name, ii.seqno",
+    )
+    # SQLite has no table comments
+    return _build_profiles(table_names, [], column_rows, index_rows)
+
+
+_BULK_PROFILERS: Dict[str, Callable[[Any, Iterable[str]], Dict[str, TableProfile]]] = {
+    "mysql": _profile_mysql,
+    "mariadb": _profile_mysql,
+    "postgresql": _profile_postgresql,
+    "sqlite": _profile_sqlite,
+}
@@ -0,0 +1,170 @@
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from dbgpt.datasource.manages.db_profile_db import DBSchemaProfileDao
+from dbgpt.datasource.rdbms.conn_sqlite import SQLiteTempConnector
+from dbgpt.rag.summary import schema_profiler
+from dbgpt.rag.summary.db_summary_client import DBSummaryClient
+from dbgpt.rag.summary.schema_profiler import (
+    ColumnProfile,
+    SchemaProfiler,
+    TableProfile,
+    profile_table,
+)
+from dbgpt.storage.metadata import db
+
+
+@pytest.fixture
+def conn():
+    connector = SQLiteTempConnector.create_temporary_db()
+    connector.create_temp_tables(
+        {
+            "user": {
+                "columns": {
+                    "id": "INTEGER PRIMARY KEY",
+                    "name": "TEXT NOT NULL",
+                    "age": "INTEGER DEFAULT 18",
+                },
+                "data": [(1, "Tom", 10)],
+            },
+            "orders": {
+                "columns": {"id": "INTEGER PRIMARY KEY", "user_id": "INTEGER"},
+                "data": [],
+            },
+        }
+    )
+    _execute(connector, 'CREATE INDEX idx_user_name_age ON "user" (name, age)')
+    yield connector
+
+
+def _execute(conn, sql: str):
+    from sqlalchemy import text
+
+    conn.session.execute(text(sql))
+    conn.session.commit()
+
+
+def test_bulk_profile_equals_table_profile(conn):
+    profiles = SchemaProfiler(conn).profile()
+    assert list(profiles) == list(conn.get_table_names())
+    for name, profile in profiles.items():
+        table_profile = profile_table(conn, name)
+        assert profile.summary() == table_profile.summary()
+        assert profile.fingerprint == table_profile.fingerprint
+
+
+def test_profile_summary(conn):
+    profile = SchemaProfiler(conn).profile()["user"]
+    assert [c.name for c in profile.columns] == ["id", "name", "age"]
+    assert profile.summary() == (
+        "user(id, name, age), and index keys: idx_user_name_age(`name, age`) "
+    )
+
+
+def test_fingerprint_changes_with_schema(conn):
+    before = SchemaProfiler(conn).profile()
+    _execute(conn, "ALTER TABLE orders ADD COLUMN amount REAL")
+    _execute(conn, 'CREATE INDEX idx_user_age ON "user" (age)')
+    after = SchemaProfiler(conn).profile()
+    assert before["orders"].fingerprint != after["orders"].fingerprint
+    assert before["user"].fingerprint != after["user"].fingerprint
+    assert SchemaProfiler(conn).profile()["user"].fingerprint == (
+        after["user"].fingerprint
+    )
+
+
+def test_bulk_profile_failed_fallback(conn):
+    def _failed(*args):
+        raise RuntimeError("not supported")
+
+    with patch.dict(schema_profiler._BULK_PROFILERS, {"sqlite": _failed}):
+        profiles = SchemaProfiler(conn).profile()
+    assert profiles["user"].summary() == profile_table(conn, "user").summary()
+
+
+def test_bulk_profile_missing_table_fallback(conn):
+    def _profile_user(conn, table_names):
+        # The other tables are out of the current schema
+        return schema_profiler._profile_sqlite(conn, {"user"})
+
+    with patch.dict(schema_profiler._BULK_PROFILERS, {"sqlite": _profile_user}):
+        profiles = SchemaProfiler(conn).profile()
+    assert list(profiles) == list(conn.get_table_names())
+    assert profiles["orders"].summary() == profile_table(conn, "orders").summary()
+    assert [c.name for c in profiles["orders"].columns] == ["id", "user_id"]
+
+
+class _MockIndexClient:
+    def __init__(self):
+        self.vectors = {}
+        self._next_id = 0
+
+    def load_document_with_limit(self, chunks, max_chunks_once_load=10):
+        ids = []
+        for chunk in chunks:
+            self._next_id += 1
+            self.vectors[str(self._next_id)] = chunk.content
+            ids.append(str(self._next_id))
+        return ids
+
+
+class _MockVectorConnector:
+    def __init__(self, index_client: _MockIndexClient):
+        self.index_client = index_client
+
+    def vector_name_exists(self):
+        return bool(self.index_client.vectors)
+
+    def delete_vector_name(self, vector_name: str):
+        self.index_client.vectors.clear()
+
+    def delete_by_ids(self, ids: str):
+        for vector_id in ids.split(","):
+            self.index_client.vectors.pop(vector_id, None)
+
+
+class _MockSummary:
+    summary_template = "{table_name}({columns})"
+
+    def __init__(self, profiles: List[TableProfile]):
+        self.table_profiles = {p.name: p for p in profiles}
+
+
+def _profile(name: str, *columns: str) -> TableProfile:
+    return TableProfile(name=name, columns=[ColumnProfile(name=c) for c in columns])
+
+
+def test_refresh_db_profile_embeds_changed_tables():
+    db.init_db("sqlite:///:memory:")
+    db.create_all()
+    index_client = _MockIndexClient()
+    client = DBSummaryClient.__new__(DBSummaryClient)
+    with patch.object(
+        DBSummaryClient,
+        "_create_profile_connector",
+        lambda self, name: _MockVectorConnector(index_client),
+    ):
+        client.init_db_profile(
+            _MockSummary([_profile("t1", "a"), _profile("t2", "b")]), "test_db"
+        )
+        assert sorted(index_client.vectors.values()) == ["t1(a)", "t2(b)"]
+        assert index_client._next_id == 2
+
+        # Nothing changed, nothing is embedded
+        client.init_db_profile(
+            _MockSummary([_profile("t1", "a"), _profile("t2", "b")]), "test_db"
+        )
+        assert index_client._next_id == 2
+
+        client.init_db_profile(
+            _MockSummary([_profile("t1", "a", "c"), _profile("t3", "d")]), "test_db"
+        )
+        assert index_client._next_id == 4
+        assert sorted(index_client.vectors.values()) == ["t1(a, c)", "t3(d)"]
+        saved = DBSchemaProfileDao().get_profiles("test_db")
+        assert sorted(saved) == ["t1", "t3"]
+        assert {vector_id for _, vector_id in saved.values()} == set(
+            index_client.vectors
+        )
@@ -1,7 +1,12 @@
-from dbgpt.core import Chunk
+from unittest.mock import MagicMock, patch
+
+from dbgpt.core import Chunk, Document
+from dbgpt.rag import chunk_manager
+from dbgpt.rag.chunk_manager import ChunkManager, ChunkParameters
 from dbgpt.rag.text_splitter.text_splitter import (
     CharacterTextSplitter,
     MarkdownHeaderTextSplitter,
+    RecursiveCharacterTextSplitter,
 )
 
 
@@ -63,3 +68,95 @@ def test_character_text_splitter_empty_doc() -> None:
     output = splitter.split_text(text)
     expected_output = ["db", "gpt"]
     assert output == expected_output
+
+
+def test_merge_splits_measures_once() -> None:
+    """Test every split is measured once when merging."""
+    measured = []
+
+    def length_function(text: str) -> int:
+        measured.append(text)
+        return len(text)
+
+    splitter = CharacterTextSplitter(
+        separator="", chunk_size=10, chunk_overlap=5, length_function=length_function
+    )
+    text = "abcdefghijklmnopqrstuvwxyz"
+    output = splitter.split_text(text)
+    assert output == [
+        "abcdefghij",
+        "fghijklmno",
+        "klmnopqrst",
+        "pqrstuvwxy",
+        "uvwxyz",
+    ]
+    # The separator is measured once, then each character once
+    assert len(measured) == len(text) + 1
+
+
+def test_recursive_character_text_splitter() -> None:
+    """Test splitting the long pieces with the remaining separators."""
+    text = "foo bar\nbazbazbazbaz qux"
+    splitter = RecursiveCharacterTextSplitter(chunk_size=8, chunk_overlap=0)
+    output = splitter.split_text(text)
+    assert output == ["foo bar", "bazbazba", "zbaz", "qux"]
+
+
+def test_recursive_character_text_splitter_no_separator() -> None:
+    """Test a long piece is kept when there is no separator to split it."""
+    splitter = RecursiveCharacterTextSplitter(
+        separators=["\n"], chunk_size=5, chunk_overlap=0
+    )
+    output = splitter.split_text("abc\nabcdefgh")
+    assert output == ["abc", "abcdefgh"]
+
+
+def test_split_documents_in_processes() -> None:
+    """Test splitting documents in processes keeps the order of the chunks."""
+    splitter = CharacterTextSplitter(separator=" ", chunk_size=7, chunk_overlap=3)
+    documents = [
+        Document(content=f"foo{i} bar{i} baz{i}", metadata={"i": i}) for i in range(9)
+    ]
+    expected_output = splitter.split_documents(documents)
+    output = splitter.split_documents_in_processes(documents, max_workers=2)
+    assert [chunk.content for chunk in output] == [
+        chunk.content for chunk in expected_output
+    ]
+    assert [chunk.metadata for chunk in output] == [
+        chunk.metadata for chunk in expected_output
+    ]
+
+
+def test_split_documents_in_processes_not_picklable() -> None:
+    """Test splitting documents in the current process with a lambda."""
+    splitter = CharacterTextSplitter(
+        separator=" ", chunk_size=7, chunk_overlap=3, length_function=lambda t: len(t)
+    )
+    documents = [Document(content=f"foo{i} bar{i}") for i in range(3)]
+    output = splitter.split_documents_in_processes(documents, max_workers=2)
+    assert [chunk.content for chunk in output] == [
+        "foo0",
+        "bar0",
+        "foo1",
+        "bar1",
+        "foo2",
+        "bar2",
+    ]
+
+
+def test_chunk_manager_split_large_documents_in_processes() -> None:
+    """Test the chunk manager splits the large documents in processes."""
+    splitter = CharacterTextSplitter(separator=" ", chunk_size=7, chunk_overlap=3)
+    manager = ChunkManager(MagicMock(), ChunkParameters(text_splitter=splitter))
+    documents = [Document(content=f"foo{i} bar{i} baz{i}") for i in range(9)]
+    expected_output = [chunk.content for chunk in manager.split(documents)]
+
+    with patch.object(chunk_manager, "_SPLIT_IN_PROCESSES_MIN_SIZE", 100), patch.object(
+        CharacterTextSplitter,
+        "split_documents_in_processes",
+        autospec=True,
+        side_effect=CharacterTextSplitter.split_documents_in_processes,
+    ) as split_in_processes:
+        output = manager.split(documents)
+    split_in_processes.assert_called_once()
+    assert [chunk.content for chunk in output] == expected_output
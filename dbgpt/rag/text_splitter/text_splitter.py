@@ -2,8 +2,25 @@
 
 import copy
 import logging
+import math
+import os
+import pickle
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, Iterable, List, Optional, TypedDict, Union, cast
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+    cast,
+)
 
 from dbgpt.core import Chunk, Document
 from dbgpt.core.awel.flow import Parameter, ResourceCategory, register_resource
@@ -73,6 +90,50 @@ class TextSplitter(ABC):
             metadatas.append(doc.metadata)
         return self.create_documents(texts, metadatas, **kwargs)
 
+    def split_documents_in_processes(
+        self,
+        documents: Iterable[Document],
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> List[Chunk]:
+        """Split documents across a process pool.
+
+        The documents are split in contiguous batches, so the chunks are in the same
+        order as :meth:`split_documents`. It falls back to :meth:`split_documents`
+        when there is only one worker or the text splitter can't be pickled, e.g. its
+        length function is a lambda.
+
+        Args:
+            documents (Iterable[Document]): The documents to split.
+            max_workers (Optional[int]): The max number of the processes, defaults to
+                the number of the CPUs.
+
+        Returns:
+            List[Chunk]: The chunks of all the documents.
+        """
+        docs = list(documents)
+        max_workers = min(max_workers or os.cpu_count() or 1, len(docs))
+        if max_workers <= 1:
+            return self.split_documents(docs, **kwargs)
+        try:
+            pickle.dumps(self)
+        except Exception as e:
+            logger.info(f"Split documents in the current process, {e}")
+            return self.split_documents(docs, **kwargs)
+        # Some batches for each process, to balance the documents of various sizes
+        batch_size = math.ceil(len(docs) / (max_workers * 4))
+        batches = [docs[i : i + batch_size] for i in range(0, len(docs), batch_size)]
+        chunks: List[Chunk] = []
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for batch_chunks in executor.map(
+                _split_documents_batch,
+                [self] * len(batches),
+                batches,
+                [kwargs] * len(batches),
+            ):
+                chunks.extend(batch_chunks)
+        return chunks
+
     def _join_docs(self, docs: List[str], separator: str, **kwargs) -> Optional[str]:
         text = separator.join(docs)
         text = text.strip()
@@ -90,6 +151,26 @@ class TextSplitter(ABC):
     ) -> List[str]:
         # We now want to combine these smaller pieces into medium size
         # chunks to send to the LLM.
+        sized_splits = (
+            (d, self._length_function(d)) for d in cast(Iterable[str], splits)
+        )
+        return self._merge_sized_splits(
+            sized_splits, separator, chunk_size, chunk_overlap
+        )
+
+    def _merge_sized_splits(
+        self,
+        sized_splits: Iterable[Tuple[str, int]],
+        separator: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+    ) -> List[str]:
+        """Merge the splits with their lengths into chunks.
+
+        The overlap window is a deque with the cached lengths of the splits, so every
+        split is measured once and popped in constant time, the merging is linear in
+        the number of the splits.
+        """
         if chunk_size is None:
             chunk_size = self._chunk_size
         if chunk_overlap is None:
@@ -99,39 +180,36 @@ class TextSplitter(ABC):
         separator_len = self._length_function(separator)
 
         docs = []
-        current_doc: List[str] = []
+        current_doc: Deque[str] = deque()
+        current_lens: Deque[int] = deque()
         total = 0
-        for s in splits:
-            d = cast(str, s)
-            _len = self._length_function(d)
-            if (
-                total + _len + (separator_len if len(current_doc) > 0 else 0)
-                > chunk_size
-            ):
+        for d, _len in sized_splits:
+            if total + _len + (separator_len if current_doc else 0) > chunk_size:
                 if total > chunk_size:
                     logger.warning(
                         f"Created a chunk of size {total}, "
                         f"which is longer than the specified {chunk_size}"
                     )
-                if len(current_doc) > 0:
-                    doc = self._join_docs(current_doc, separator)
+                if current_doc:
+                    doc = self._join_docs(list(current_doc), separator)
                     if doc is not None:
                         docs.append(doc)
                     # Keep on popping if:
                     # - we have a larger chunk than in the chunk overlap
                     # - or if we still have any chunks and the length is long
                     while total > chunk_overlap or (
-                        total + _len + (separator_len if len(current_doc) > 0 else 0)
+                        total + _len + (separator_len if current_doc else 0)
                         > chunk_size
                         and total > 0
                     ):
-                        total -= self._length_function(current_doc[0]) + (
+                        total -= current_lens.popleft() + (
                             separator_len if len(current_doc) > 1 else 0
                         )
-                        current_doc = current_doc[1:]
+                        current_doc.popleft()
             current_doc.append(d)
+            current_lens.append(_len)
             total += _len + (separator_len if len(current_doc) > 1 else 0)
-        doc = self._join_docs(current_doc, separator)
+        doc = self._join_docs(list(current_doc), separator)
         if doc is not None:
             docs.append(doc)
         return docs
@@ -202,6 +280,13 @@ class TextSplitter(ABC):
         return result, "output_1"
 
 
+def _split_documents_batch(
+    text_splitter: TextSplitter, documents: List[Document], kwargs: Dict[str, Any]
+) -> List[Chunk]:
+    """Split a batch of the documents in the worker process."""
+    return text_splitter.split_documents(documents, **kwargs)
+
+
 @register_resource(
     _("Character Text Splitter"),
     "character_text_splitter",
@@ -283,15 +368,38 @@ class RecursiveCharacterTextSplitter(TextSplitter):
         self, text: str, separator: Optional[str] = None, **kwargs
     ) -> List[str]:
         """Split incoming text and return chunks."""
+        return self._split_text(
+            text,
+            self._separators,
+            chunk_size=kwargs.get("chunk_size", None),
+            chunk_overlap=kwargs.get("chunk_overlap", None),
+        )
+
+    def _split_text(
+        self,
+        text: str,
+        separators: List[str],
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+    ) -> List[str]:
+        """Split the text by the first separator in it, then split the longer pieces.
+
+        The pieces do not contain the separators before the chosen one, so they are
+        split with the remaining separators only.
+        """
+        if chunk_size is None:
+            chunk_size = self._chunk_size
         final_chunks = []
         # Get appropriate separator to use
-        separator = self._separators[-1]
-        for _s in self._separators:
+        separator = separators[-1]
+        new_separators: List[str] = []
+        for i, _s in enumerate(separators):
             if _s == "":
                 separator = _s
                 break
             if _s in text:
                 separator = _s
+                new_separators = separators[i + 1 :]
                 break
         # Now that we have the separator, split the text
         if separator:
@@ -299,30 +407,32 @@ class RecursiveCharacterTextSplitter(TextSplitter):
         else:
             splits = list(text)
         # Now go merging things, recursively splitting longer texts.
-        _good_splits = []
+        _good_splits: List[Tuple[str, int]] = []
         for s in splits:
-            if self._length_function(s) < self._chunk_size:
-                _good_splits.append(s)
-            else:
-                if _good_splits:
-                    merged_text = self._merge_splits(
-                        _good_splits,
-                        separator,
-                        chunk_size=kwargs.get("chunk_size", None),
-                        chunk_overlap=kwargs.get("chunk_overlap", None),
+            _len = self._length_function(s)
+            if _len < chunk_size:
+                _good_splits.append((s, _len))
+                continue
+            if _good_splits:
+                final_chunks.extend(
+                    self._merge_sized_splits(
+                        _good_splits, separator, chunk_size, chunk_overlap
                     )
-                    final_chunks.extend(merged_text)
-                    _good_splits = []
-                other_info = self.split_text(s)
-                final_chunks.extend(other_info)
+                )
+                _good_splits = []
+            if new_separators:
+                final_chunks.extend(
+                    self._split_text(s, new_separators, chunk_size, chunk_overlap)
+                )
+            else:
+                # No separator to split it further
+                final_chunks.append(s)
         if _good_splits:
-            merged_text = self._merge_splits(
-                _good_splits,
-                separator,
-                chunk_size=kwargs.get("chunk_size", None),
-                chunk_overlap=kwargs.get("chunk_overlap", None),
+            final_chunks.extend(
+                self._merge_sized_splits(
+                    _good_splits, separator, chunk_size, chunk_overlap
+                )
             )
-            final_chunks.extend(merged_text)
         return final_chunks
 
 
@@ -681,58 +791,24 @@ class MarkdownHeaderTextSplitter(TextSplitter):
     ) -> List[str]:
         # We now want to combine these smaller pieces into medium size
         # chunks to send to the LLM.
-        if chunk_size is None:
-            chunk_size = self._chunk_size
-        if chunk_overlap is None:
-            chunk_overlap = self._chunk_overlap
         if separator is None:
             separator = self._separator
-        separator_len = self._length_function(separator)
 
-        docs = []
-        current_doc: List[str] = []
-        total = 0
-        for _doc in documents:
-            dict_doc = cast(dict, _doc)
-            if dict_doc["metadata"] != {}:
-                head = sorted(
-                    dict_doc["metadata"].items(), key=lambda x: x[0], reverse=True
-                )[0][1]
-                d = head + separator + dict_doc["page_content"]
-            else:
-                d = dict_doc["page_content"]
-            _len = self._length_function(d)
-            if (
-                total + _len + (separator_len if len(current_doc) > 0 else 0)
-                > chunk_size
-            ):
-                if total > chunk_size:
-                    logger.warning(
-                        f"Created a chunk of size {total}, "
-                        f"which is longer than the specified {chunk_size}"
-                    )
-                if len(current_doc) > 0:
-                    doc = self._join_docs(current_doc, separator)
-                    if doc is not None:
-                        docs.append(doc)
-                    # Keep on popping if:
-                    # - we have a larger chunk than in the chunk overlap
-                    # - or if we still have any chunks and the length is long
-                    while total > chunk_overlap or (
-                        total + _len + (separator_len if len(current_doc) > 0 else 0)
-                        > chunk_size
-                        and total > 0
-                    ):
-                        total -= self._length_function(current_doc[0]) + (
-                            separator_len if len(current_doc) > 1 else 0
-                        )
-                        current_doc = current_doc[1:]
-            current_doc.append(d)
-            total += _len + (separator_len if len(current_doc) > 1 else 0)
-        doc = self._join_docs(current_doc, separator)
-        if doc is not None:
-            docs.append(doc)
-        return docs
+        def _sized_splits() -> Iterable[Tuple[str, int]]:
+            for _doc in documents:
+                dict_doc = cast(dict, _doc)
+                if dict_doc["metadata"] != {}:
+                    head = sorted(
+                        dict_doc["metadata"].items(), key=lambda x: x[0], reverse=True
+                    )[0][1]
+                    d = head + separator + dict_doc["page_content"]
+                else:
+                    d = dict_doc["page_content"]
+                yield d, self._length_function(d)
+
+        return self._merge_sized_splits(
+            _sized_splits(), separator, chunk_size, chunk_overlap
+        )
 
     def run(
         self,
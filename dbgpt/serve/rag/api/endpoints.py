@@ -9,6 +9,7 @@ from dbgpt.serve.core import Result
 from dbgpt.serve.rag.api.schemas import (
     DocumentServeRequest,
     DocumentServeResponse,
+    KnowledgeSyncJobResponse,
     KnowledgeSyncRequest,
     SpaceServeRequest,
     SpaceServeResponse,
@@ -237,6 +238,25 @@ async def query(
     return Result.succ(service.get_document(request))
 
 
+@router.get(
+    "/documents/{document_id}/sync_job",
+    dependencies=[Depends(check_api_key)],
+    response_model=Result[KnowledgeSyncJobResponse],
+)
+async def query_sync_job(
+    document_id: int, service: Service = Depends(get_service)
+) -> Result[KnowledgeSyncJobResponse]:
+    """Query the latest sync job of the document, with the sync progress
+
+    Args:
+        document_id (int): The document id
+        service (Service): The service
+    Returns:
+        KnowledgeSyncJobResponse: The sync job
+    """
+    return Result.succ(service.get_document_sync_job(document_id))
+
+
 @router.get(
     "/documents",
     dependencies=[Depends(check_api_key)],
@@ -153,3 +153,34 @@ class KnowledgeConfigResponse(BaseModel):
     """Knowledge config response"""
 
     storage: List[KnowledgeStorageType] = Field(..., description="The storage types")
+
+
+class KnowledgeSyncJobResponse(BaseModel):
+    """The sync job of a document, with the progress of the embedding."""
+
+    id: int = Field(..., description="The job id")
+    doc_id: int = Field(..., description="The document id")
+    space_id: str = Field(..., description="The space id")
+    embedding_model: str = Field(..., description="The embedding model name")
+    status: str = Field(..., description="The job status")
+    chunk_parameters: Optional[str] = Field(
+        None, description="The chunk parameters in json"
+    )
+    total_chunks: int = Field(
+        0,
+        description="The number of the document chunks, 0 until the document is "
+        "fully read",
+    )
+    synced_chunks: int = Field(0, description="The number of the synced chunks")
+    vector_ids: List[str] = Field(
+        default_factory=list, description="The vector ids of the synced chunks"
+    )
+    progress: Optional[float] = Field(
+        0.0,
+        description="The progress of the job, 0 to 1, None if some chunks are synced "
+        "but the total is unknown until the document is fully read",
+    )
+    retry_times: int = Field(0, description="The retry times")
+    result: Optional[str] = Field(None, description="The job result")
+    gmt_created: Optional[str] = Field(None, description="The created time")
+    gmt_modified: Optional[str] = Field(None, description="The modified time")
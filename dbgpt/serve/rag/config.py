@@ -26,3 +26,39 @@ class ServeConfig(BaseServeConfig):
         default=None,
         metadata={"help": "Default system code for prompt"},
     )
+    max_sync_workers: int = field(
+        default=4,
+        metadata={"help": "The max number of the documents to sync at the same time"},
+    )
+    max_sync_workers_per_space: int = field(
+        default=2,
+        metadata={
+            "help": "The max number of the documents of one knowledge space to sync "
+            "at the same time"
+        },
+    )
+    max_sync_workers_per_model: int = field(
+        default=2,
+        metadata={
+            "help": "The max number of the documents using one embedding model to "
+            "sync at the same time"
+        },
+    )
+    sync_batch_size: int = field(
+        default=100,
+        metadata={
+            "help": "The number of the chunks to persist between two checkpoints of "
+            "the document sync job"
+        },
+    )
+    sync_max_retries: int = field(
+        default=2,
+        metadata={"help": "The max retry times of a failed document sync job"},
+    )
+    extract_workers: int = field(
+        default=1,
+        metadata={
+            "help": "The number of the processes to extract the pages of the PDF, "
+            "DOCX and PPTX documents, 1 to extract them in the server process"
+        },
+    )
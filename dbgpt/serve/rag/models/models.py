@@ -1,13 +1,25 @@
 from datetime import datetime
-from typing import Any, Dict, List, Union
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from sqlalchemy import Column, DateTime, Integer, String, Text
 
 from dbgpt._private.pydantic import model_to_dict
-from dbgpt.serve.rag.api.schemas import SpaceServeRequest, SpaceServeResponse
+from dbgpt.serve.rag.api.schemas import (
+    KnowledgeSyncJobResponse,
+    SpaceServeRequest,
+    SpaceServeResponse,
+)
 from dbgpt.storage.metadata import BaseDao, Model
 
 
+class SyncStatus(Enum):
+    TODO = "TODO"
+    FAILED = "FAILED"
+    RUNNING = "RUNNING"
+    FINISHED = "FINISHED"
+
+
 class KnowledgeSpaceEntity(Model):
     __tablename__ = "knowledge_space"
     id = Column(Integer, primary_key=True)
@@ -167,3 +179,320 @@ class KnowledgeSpaceDao(BaseDao):
             context=entity.context,
             domain_type=entity.domain_type,
         )
+
+
+class KnowledgeSyncJobEntity(Model):
+    __tablename__ = "knowledge_sync_job"
+    id = Column(Integer, primary_key=True)
+    doc_id = Column(Integer, index=True)
+    space_id = Column(String(100))
+    embedding_model = Column(String(255))
+    status = Column(String(50), index=True)
+    chunk_parameters = Column(Text)
+    total_chunks = Column(Integer, default=0)
+    synced_chunks = Column(Integer, default=0)
+    vector_ids = Column(Text)
+    retry_times = Column(Integer, default=0)
+    result = Column(Text)
+    gmt_created = Column(DateTime)
+    gmt_modified = Column(DateTime)
+
+    def __repr__(self):
+        return f"KnowledgeSyncJobEntity(id={self.id}, doc_id={self.doc_id}, space_id='{self.space_id}', embedding_model='{self.embedding_model}', status='{self.status}', total_chunks={self.total_chunks}, synced_chunks={self.synced_chunks}, retry_times={self.retry_times})"
+
+
+def _progress(total_chunks: int, synced_chunks: int) -> Optional[float]:
+    """The progress of a sync job, None if the total is unknown yet."""
+    if total_chunks:
+        return min(synced_chunks / total_chunks, 1.0)
+    return None if synced_chunks else 0.0
+
+
+class KnowledgeSyncJobDao(BaseDao):
+    """The dao of the document sync jobs.
+
+    A job is checkpointed after each batch of the chunks is persisted, so the job can
+    resume from the last checkpoint after the server restarts.
+    """
+
+    def create_job(
+        self,
+        doc_id: int,
+        space_id: str,
+        embedding_model: str,
+        chunk_parameters: Optional[str] = None,
+    ) -> KnowledgeSyncJobResponse:
+        """Create a sync job of the document"""
+        with self.session() as session:
+            job = KnowledgeSyncJobEntity(
+                doc_id=doc_id,
+                space_id=str(space_id),
+                embedding_model=embedding_model,
+                status=SyncStatus.TODO.name,
+                chunk_parameters=chunk_parameters,
+                total_chunks=0,
+                synced_chunks=0,
+                retry_times=0,
+                gmt_created=datetime.now(),
+                gmt_modified=datetime.now(),
+            )
+            session.add(job)
+            session.flush()
+            return self.to_response(job)
+
+    def get_job(self, job_id: int) -> Optional[KnowledgeSyncJobResponse]:
+        """Get the sync job by id"""
+        with self.session(commit=False) as session:
+            job = session.get(KnowledgeSyncJobEntity, job_id)
+            return self.to_response(job) if job else None
+
+    def get_latest_job(self, doc_id: int) -> Optional[KnowledgeSyncJobResponse]:
+        """Get the latest sync job of the document"""
+        with self.session(commit=False) as session:
+            job = (
+                session.query(KnowledgeSyncJobEntity)
+                .filter(KnowledgeSyncJobEntity.doc_id == doc_id)
+                .order_by(KnowledgeSyncJobEntity.id.desc())
+                .first()
+            )
+            return self.to_response(job) if job else None
+
+    def get_jobs_by_status(self, statuses: List[str]) -> List[KnowledgeSyncJobResponse]:
+        """Get the sync jobs in the statuses, in the creation order"""
+        with self.session(commit=False) as session:
+            jobs = (
+                session.query(KnowledgeSyncJobEntity)
+                .filter(KnowledgeSyncJobEntity.status.in_(statuses))
+                .order_by(KnowledgeSyncJobEntity.id)
+                .all()
+            )
+            return [self.to_response(job) for job in jobs]
+
+    def update_status(
+        self,
+        job_id: int,
+        status: str,
+        result: Optional[str] = None,
+        retry_times: Optional[int] = None,
+    ) -> None:
+        """Update the status of the sync job"""
+        with self.session() as session:
+            job = session.get(KnowledgeSyncJobEntity, job_id)
+            if job is None:
+                raise ValueError(f"Sync job {job_id} not found")
+            job.status = status
+            if result is not None:
+                job.result = result
+            if retry_times is not None:
+                job.retry_times = retry_times
+            job.gmt_modified = datetime.now()
+
+    def checkpoint(
+        self,
+        job_id: int,
+        total_chunks: int,
+        synced_chunks: int,
+        vector_ids: List[str],
+    ) -> None:
+        """Save the progress of the sync job.
+
+        Args:
+            job_id (int): The job id
+            total_chunks (int): The number of the document chunks
+            synced_chunks (int): The number of the chunks persisted so far
+            vector_ids (List[str]): The vector ids of the chunks persisted since the
+                last checkpoint, they are appended to the saved vector ids
+        """
+        with self.session() as session:
+            job = session.get(KnowledgeSyncJobEntity, job_id)
+            if job is None:
+                raise ValueError(f"Sync job {job_id} not found")
+            job.total_chunks = total_chunks
+            job.synced_chunks = synced_chunks
+            if vector_ids:
+                new_ids = ",".join(vector_ids)
+                job.vector_ids = (
+                    f"{job.vector_ids},{new_ids}" if job.vector_ids else new_ids
+                )
+            job.gmt_modified = datetime.now()
+
+    def delete_jobs(self, doc_id: int) -> None:
+        """Delete all the sync jobs of the document"""
+        with self.session() as session:
+            session.query(KnowledgeSyncJobEntity).filter(
+                KnowledgeSyncJobEntity.doc_id == doc_id
+            ).delete()
+
+    def from_request(
+        self, request: Union[KnowledgeSyncJobResponse, Dict[str, Any]]
+    ) -> KnowledgeSyncJobEntity:
+        """Convert the request to an entity
+
+        Args:
+            request (Union[KnowledgeSyncJobResponse, Dict[str, Any]]): The request
+
+        Returns:
+            T: The entity
+        """
+        request_dict = (
+            model_to_dict(request)
+            if isinstance(request, KnowledgeSyncJobResponse)
+            else dict(request)
+        )
+        request_dict.pop("progress", None)
+        vector_ids = request_dict.get("vector_ids")
+        if isinstance(vector_ids, list):
+            request_dict["vector_ids"] = ",".join(vector_ids) or None
+        return KnowledgeSyncJobEntity(**request_dict)
+
+    def to_response(self, entity: KnowledgeSyncJobEntity) -> KnowledgeSyncJobResponse:
+        """Convert the entity to a response
+
+        Args:
+            entity (T): The entity
+
+        Returns:
+            RES: The response
+        """
+        total_chunks = entity.total_chunks or 0
+        synced_chunks = entity.synced_chunks or 0
+        return KnowledgeSyncJobResponse(
+            id=entity.id,
+            doc_id=entity.doc_id,
+            space_id=entity.space_id,
+            embedding_model=entity.embedding_model,
+            status=entity.status,
+            chunk_parameters=entity.chunk_parameters,
+            total_chunks=total_chunks,
+            synced_chunks=synced_chunks,
+            vector_ids=entity.vector_ids.split(",") if entity.vector_ids else [],
+            progress=_progress(total_chunks, synced_chunks),
+            retry_times=entity.retry_times or 0,
+            result=entity.result,
+            gmt_created=entity.gmt_created.strftime("%Y-%m-%d %H:%M:%S")
+            if entity.gmt_created
+            else None,
+            gmt_modified=entity.gmt_modified.strftime("%Y-%m-%d %H:%M:%S")
+            if entity.gmt_modified
+            else None,
+        )
+
+
+class KnowledgeChunkVectorEntity(Model):
+    __tablename__ = "knowledge_chunk_vector"
+    id = Column(Integer, primary_key=True)
+    doc_id = Column(Integer, index=True)
+    chunk_hash = Column(String(64))
+    vector_id = Column(String(255))
+    sync_job_id = Column(Integer)
+    gmt_created = Column(DateTime)
+    gmt_modified = Column(DateTime)
+
+    def __repr__(self):
+        return f"KnowledgeChunkVectorEntity(id={self.id}, doc_id={self.doc_id}, chunk_hash='{self.chunk_hash}', vector_id='{self.vector_id}', sync_job_id={self.sync_job_id})"
+
+
+class KnowledgeChunkVectorDao(BaseDao):
+    """The dao of the vectors of the document chunks.
+
+    Every vector is saved with the fingerprint of its chunk and the sync job which
+    last confirmed it, so a re-sync only embeds the new or changed chunks, and the
+    vectors not confirmed by the job are stale.
+    """
+
+    def get_chunk_vectors(
+        self, doc_id: int, exclude_job_id: Optional[int] = None
+    ) -> List[Tuple[int, str, str]]:
+        """Get the chunk vectors of the document.
+
+        Args:
+            doc_id (int): The document id
+            exclude_job_id (Optional[int]): Exclude the vectors confirmed by the job
+
+        Returns:
+            List[Tuple[int, str, str]]: The row id, chunk hash and vector id
+        """
+        with self.session(commit=False) as session:
+            query = session.query(
+                KnowledgeChunkVectorEntity.id,
+                KnowledgeChunkVectorEntity.chunk_hash,
+                KnowledgeChunkVectorEntity.vector_id,
+            ).filter(KnowledgeChunkVectorEntity.doc_id == doc_id)
+            if exclude_job_id is not None:
+                query = query.filter(
+                    KnowledgeChunkVectorEntity.sync_job_id != exclude_job_id
+                )
+            return [
+                (row.id, row.chunk_hash, row.vector_id)
+                for row in query.order_by(KnowledgeChunkVectorEntity.id)
+            ]
+
+    def get_vector_ids(
+        self, doc_id: int, exclude_job_id: Optional[int] = None
+    ) -> List[str]:
+        """Get the vector ids of the document"""
+        return [
+            vector_id
+            for _, _, vector_id in self.get_chunk_vectors(doc_id, exclude_job_id)
+        ]
+
+    def save_chunk_vectors(
+        self,
+        doc_id: int,
+        job_id: int,
+        confirmed_ids: List[int],
+        chunk_vectors: List[Tuple[str, str]],
+    ) -> None:
+        """Save the chunk vectors of a batch in one transaction.
+
+        Args:
+            doc_id (int): The document id
+            job_id (int): The sync job id
+            confirmed_ids (List[int]): The row ids of the unchanged chunks
+            chunk_vectors (List[Tuple[str, str]]): The chunk hash and vector id of the
+                new chunks
+        """
+        now = datetime.now()
+        with self.session() as session:
+            if confirmed_ids:
+                session.query(KnowledgeChunkVectorEntity).filter(
+                    KnowledgeChunkVectorEntity.id.in_(confirmed_ids)
+                ).update(
+                    {
+                        KnowledgeChunkVectorEntity.sync_job_id: job_id,
+                        KnowledgeChunkVectorEntity.gmt_modified: now,
+                    },
+                    synchronize_session=False,
+                )
+            session.add_all(
+                [
+                    KnowledgeChunkVectorEntity(
+                        doc_id=doc_id,
+                        chunk_hash=chunk_hash,
+                        vector_id=vector_id,
+                        sync_job_id=job_id,
+                        gmt_created=now,
+                        gmt_modified=now,
+                    )
+                    for chunk_hash, vector_id in chunk_vectors
+                ]
+            )
+
+    def delete_chunk_vectors(
+        self, doc_id: int, exclude_job_id: Optional[int] = None
+    ) -> None:
+        """Delete the chunk vectors of the document.
+
+        Args:
+            doc_id (int): The document id
+            exclude_job_id (Optional[int]): Keep the vectors confirmed by the job
+        """
+        with self.session() as session:
+            query = session.query(KnowledgeChunkVectorEntity).filter(
+                KnowledgeChunkVectorEntity.doc_id == doc_id
+            )
+            if exclude_job_id is not None:
+                query = query.filter(
+                    KnowledgeChunkVectorEntity.sync_job_id != exclude_job_id
+                )
+            query.delete(synchronize_session=False)
@@ -1,16 +1,17 @@
-import asyncio
+import hashlib
 import json
 import logging
 import os
 import shutil
 import tempfile
+from collections import defaultdict
 from datetime import datetime
-from enum import Enum
-from typing import List, Optional, cast
+from typing import Dict, List, Optional, cast
 
 from fastapi import HTTPException
 
 from dbgpt._private.config import Config
+from dbgpt._private.pydantic import model_to_json
 from dbgpt.app.knowledge.chunk_db import DocumentChunkDao, DocumentChunkEntity
 from dbgpt.app.knowledge.document_db import (
     KnowledgeDocumentDao,
@@ -23,7 +24,7 @@ from dbgpt.configs.model_config import (
     EMBEDDING_MODEL_CONFIG,
     KNOWLEDGE_UPLOAD_ROOT_PATH,
 )
-from dbgpt.core import LLMClient
+from dbgpt.core import Chunk, LLMClient
 from dbgpt.model import DefaultLLMClient
 from dbgpt.model.cluster import WorkerManagerFactory
 from dbgpt.rag.assembler import EmbeddingAssembler
@@ -43,24 +44,25 @@ from ..api.schemas import (
     DocumentServeRequest,
     DocumentServeResponse,
     DocumentVO,
+    KnowledgeSyncJobResponse,
     KnowledgeSyncRequest,
     SpaceServeRequest,
     SpaceServeResponse,
 )
 from ..config import SERVE_CONFIG_KEY_PREFIX, SERVE_SERVICE_COMPONENT_NAME, ServeConfig
-from ..models.models import KnowledgeSpaceDao, KnowledgeSpaceEntity
+from ..models.models import (
+    KnowledgeChunkVectorDao,
+    KnowledgeSpaceDao,
+    KnowledgeSpaceEntity,
+    KnowledgeSyncJobDao,
+    SyncStatus,
+)
+from .sync_scheduler import DocumentSyncScheduler
 
 logger = logging.getLogger(__name__)
 CFG = Config()
 
 
-class SyncStatus(Enum):
-    TODO = "TODO"
-    FAILED = "FAILED"
-    RUNNING = "RUNNING"
-    FINISHED = "FINISHED"
-
-
 class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeResponse]):
     """The service class for Flow"""
 
@@ -72,11 +74,16 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         dao: Optional[KnowledgeSpaceDao] = None,
         document_dao: Optional[KnowledgeDocumentDao] = None,
         chunk_dao: Optional[DocumentChunkDao] = None,
+        sync_job_dao: Optional[KnowledgeSyncJobDao] = None,
+        chunk_vector_dao: Optional[KnowledgeChunkVectorDao] = None,
     ):
         self._system_app = system_app
         self._dao: KnowledgeSpaceDao = dao
         self._document_dao: KnowledgeDocumentDao = document_dao
         self._chunk_dao: DocumentChunkDao = chunk_dao
+        self._sync_job_dao: KnowledgeSyncJobDao = sync_job_dao
+        self._chunk_vector_dao: KnowledgeChunkVectorDao = chunk_vector_dao
+        self._sync_scheduler: Optional[DocumentSyncScheduler] = None
 
         super().__init__(system_app)
 
@@ -93,8 +100,26 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         self._dao = self._dao or KnowledgeSpaceDao()
         self._document_dao = self._document_dao or KnowledgeDocumentDao()
         self._chunk_dao = self._chunk_dao or DocumentChunkDao()
+        self._sync_job_dao = self._sync_job_dao or KnowledgeSyncJobDao()
+        self._chunk_vector_dao = self._chunk_vector_dao or KnowledgeChunkVectorDao()
+        self._sync_scheduler = DocumentSyncScheduler(
+            self._sync_job_dao,
+            self._run_sync_job,
+            on_failed=self._on_sync_job_failed,
+            max_workers=self._serve_config.max_sync_workers,
+            max_workers_per_space=self._serve_config.max_sync_workers_per_space,
+            max_workers_per_model=self._serve_config.max_sync_workers_per_model,
+            max_retries=self._serve_config.sync_max_retries,
+        )
         self._system_app = system_app
 
+    async def async_after_start(self):
+        """Resume the unfinished document sync jobs after the server restarts"""
+        try:
+            self._sync_scheduler.resume()
+        except Exception as e:
+            logger.error(f"Resume document sync jobs failed: {e}")
+
     @property
     def dao(
         self,
@@ -218,10 +243,9 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
                     f"there are document called, doc_id: {sync_request.doc_id}"
                 )
             doc = docs[0]
-            if (
-                doc.status == SyncStatus.RUNNING.name
-                or doc.status == SyncStatus.FINISHED.name
-            ):
+            # A finished document can be synced again, only its changed chunks are
+            # embedded
+            if doc.status == SyncStatus.RUNNING.name:
                 raise Exception(
                     f" doc:{doc.doc_name} status is {doc.status}, can not sync"
                 )
@@ -298,6 +322,9 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         # delete chunks
         documents = self._document_dao.get_documents(document_query)
         for document in documents:
+            self._sync_scheduler.cancel(document.id)
+            self._sync_job_dao.delete_jobs(document.id)
+            self._chunk_vector_dao.delete_chunk_vectors(document.id)
             self._chunk_dao.raw_delete(document.id)
         # delete documents
         self._document_dao.raw_delete(document_query)
@@ -328,8 +355,16 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
             raise Exception(f"invalid space name: {docuemnt.space}")
         space = spaces[0]
 
-        vector_ids = docuemnt.vector_ids
-        if vector_ids is not None:
+        # cancel the sync job before deleting the vectors
+        self._sync_scheduler.cancel(docuemnt.id)
+        # the vectors of the document, including the vectors persisted by the
+        # unfinished sync job, and the vectors synced before they are saved in the
+        # chunk vector table
+        vector_ids = ",".join(
+            self._chunk_vector_dao.get_vector_ids(docuemnt.id)
+            + _split_vector_ids(docuemnt.vector_ids)
+        )
+        if vector_ids:
             config = VectorStoreConfig(
                 name=space.name, llm_client=self.llm_client, model_name=None
             )
@@ -338,6 +373,9 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
             )
             # delete vector by ids
             vector_store_connector.delete_by_ids(vector_ids)
+        # delete sync jobs and chunk vectors
+        self._sync_job_dao.delete_jobs(docuemnt.id)
+        self._chunk_vector_dao.delete_chunk_vectors(docuemnt.id)
         # delete chunks
         self._chunk_dao.raw_delete(docuemnt.id)
         # delete document
@@ -406,10 +444,9 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
                     f"there are document called, doc_id: {sync_request.doc_id}"
                 )
             doc = docs[0]
-            if (
-                doc.status == SyncStatus.RUNNING.name
-                or doc.status == SyncStatus.FINISHED.name
-            ):
+            # A finished document can be synced again, only its changed chunks are
+            # embedded
+            if doc.status == SyncStatus.RUNNING.name:
                 raise Exception(
                     f" doc:{doc.doc_name} status is {doc.status}, can not sync"
                 )
@@ -436,18 +473,50 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         doc_vo: DocumentVO,
         chunk_parameters: ChunkParameters,
     ) -> None:
-        """sync knowledge document chunk into vector store"""
+        """sync knowledge document chunk into vector store
+
+        The sync job is persisted, then it runs in the document sync scheduler.
+        """
+        doc = KnowledgeDocumentEntity.from_document_vo(doc_vo)
+        space = self.get({"id": space_id})
+        if space is None:
+            raise Exception(f"space id:{space_id} not found")
+        doc.status = SyncStatus.RUNNING.name
+        doc.gmt_modified = datetime.now()
+        self._document_dao.update_knowledge_document(doc)
+        job = self._sync_job_dao.create_job(
+            doc_id=doc.id,
+            space_id=str(space_id),
+            embedding_model=CFG.EMBEDDING_MODEL,
+            chunk_parameters=model_to_json(
+                chunk_parameters, exclude={"text_splitter"}, exclude_none=True
+            ),
+        )
+        self._sync_scheduler.submit(job)
+        logger.info(f"begin save document chunks, doc:{doc.doc_name}, job:{job.id}")
+
+    def get_document_sync_job(
+        self, document_id: int
+    ) -> Optional[KnowledgeSyncJobResponse]:
+        """Get the latest sync job of the document, with the sync progress
+
+        Args:
+            document_id (int): The document id
+
+        Returns:
+            Optional[KnowledgeSyncJobResponse]: The sync job
+        """
+        return self._sync_job_dao.get_latest_job(int(document_id))
+
+    def _create_vector_store_connector(
+        self, space: SpaceServeResponse, embedding_model: str
+    ) -> VectorStoreConnector:
         embedding_factory = CFG.SYSTEM_APP.get_component(
             "embedding_factory", EmbeddingFactory
         )
         embedding_fn = embedding_factory.create(
-            model_name=EMBEDDING_MODEL_CONFIG[CFG.EMBEDDING_MODEL]
+            model_name=EMBEDDING_MODEL_CONFIG[embedding_model]
         )
-        from dbgpt.storage.vector_store.base import VectorStoreConfig
-
-        doc = KnowledgeDocumentEntity.from_document_vo(doc_vo)
-
-        space = self.get({"id": space_id})
         config = VectorStoreConfig(
             name=space.name,
             embedding_fn=embedding_fn,
@@ -455,97 +524,183 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
             llm_client=self.llm_client,
             model_name=None,
         )
-        vector_store_connector = VectorStoreConnector(
+        return VectorStoreConnector(
             vector_store_type=space.vector_type, vector_store_config=config
         )
-        knowledge = None
-        if not space.domain_type or (
-            space.domain_type == BusinessFieldType.NORMAL.value
-        ):
-            knowledge = KnowledgeFactory.create(
-                datasource=doc.content,
-                knowledge_type=KnowledgeType.get_by_value(doc.doc_type),
-            )
-        doc.status = SyncStatus.RUNNING.name
-
-        doc.gmt_modified = datetime.now()
-        self._document_dao.update_knowledge_document(doc)
-        asyncio.create_task(
-            self.async_doc_embedding(
-                knowledge, chunk_parameters, vector_store_connector, doc, space
-            )
-        )
-        logger.info(f"begin save document chunks, doc:{doc.doc_name}")
 
     @trace("async_doc_embedding")
-    async def async_doc_embedding(
-        self, knowledge, chunk_parameters, vector_store_connector, doc, space
-    ):
-        """async document embedding into vector db
-        Args:
-            - knowledge: Knowledge
-            - chunk_parameters: ChunkParameters
-            - vector_store_connector: vector_store_connector
-            - doc: doc
+    async def _run_sync_job(self, job: KnowledgeSyncJobResponse) -> None:
+        """Embed the document of the job into the vector store
+
+        The chunks are persisted batch by batch, the job is checkpointed after each
+        batch, so a resumed job skips the chunks which have been persisted. The
+        chunking is deterministic, so the resumed job gets the same chunks.
+
+        Every chunk is fingerprinted by its content and the chunk parameters, only
+        the chunks without a vector of the same fingerprint are embedded. The vectors
+        which are not confirmed by the job are deleted after all the chunks are
+        persisted.
         """
+        docs = self._document_dao.documents_by_ids([job.doc_id])
+        if len(docs) == 0:
+            raise Exception(f"there are no document called, doc_id: {job.doc_id}")
+        doc = KnowledgeDocumentEntity.from_document_vo(docs[0])
+        space = self.get({"id": job.space_id})
+        if space is None:
+            raise Exception(f"space id:{job.space_id} not found")
+        chunk_parameters = (
+            ChunkParameters(**json.loads(job.chunk_parameters))
+            if job.chunk_parameters
+            else None
+        )
+        vector_store_connector = self._create_vector_store_connector(
+            space, job.embedding_model
+        )
+        logger.info(
+            f"async doc persist sync, doc:{doc.doc_name}, job:{job.id}, "
+            f"synced chunks:{job.synced_chunks}"
+        )
+        params_fingerprint = _params_fingerprint(job)
+        with root_tracer.start_span(
+            "app.knowledge.assembler.persist",
+            metadata={"doc": doc.doc_name},
+        ):
+            from dbgpt.core.awel import BaseOperator
 
-        logger.info(f"async doc persist sync, doc:{doc.doc_name}")
-        try:
-            with root_tracer.start_span(
-                "app.knowledge.assembler.persist",
-                metadata={"doc": doc.doc_name},
-            ):
-                from dbgpt.core.awel import BaseOperator
-                from dbgpt.serve.flow.service.service import Service as FlowService
-
-                dags = self.dag_manager.get_dags_by_tag(
-                    TAG_KEY_KNOWLEDGE_FACTORY_DOMAIN_TYPE, space.domain_type
+            dags = self.dag_manager.get_dags_by_tag(
+                TAG_KEY_KNOWLEDGE_FACTORY_DOMAIN_TYPE, space.domain_type
+            )
+            if dags and dags[0].leaf_nodes:
+                # The dag persists the chunks itself, it can't be checkpointed
+                end_task = cast(BaseOperator, dags[0].leaf_nodes[0])
+                logger.info(
+                    f"Found dag by tag key: {TAG_KEY_KNOWLEDGE_FACTORY_DOMAIN_TYPE}"
+                    f" and value: {space.domain_type}, dag: {dags[0]}"
                 )
-                if dags and dags[0].leaf_nodes:
-                    end_task = cast(BaseOperator, dags[0].leaf_nodes[0])
-                    logger.info(
-                        f"Found dag by tag key: {TAG_KEY_KNOWLEDGE_FACTORY_DOMAIN_TYPE}"
-                        f" and value: {space.domain_type}, dag: {dags[0]}"
+                db_name, chunk_docs = await end_task.call(
+                    {"file_path": doc.content, "space": doc.space}
+                )
+                vector_ids = [chunk.chunk_id for chunk in chunk_docs]
+                chunk_size = len(chunk_docs)
+                self._chunk_dao.raw_delete(doc.id)
+                self._save_document_chunks(doc, chunk_docs)
+                self._chunk_vector_dao.save_chunk_vectors(
+                    doc.id,
+                    job.id,
+                    [],
+                    [
+                        (_chunk_fingerprint(chunk, params_fingerprint), chunk.chunk_id)
+                        for chunk in chunk_docs
+                    ],
+                )
+                self._sync_job_dao.checkpoint(
+                    job.id, chunk_size, chunk_size, vector_ids
+                )
+            else:
+                knowledge = None
+                if not space.domain_type or (
+                    space.domain_type == BusinessFieldType.NORMAL.value
+                ):
+                    knowledge = KnowledgeFactory.create(
+                        datasource=doc.content,
+                        knowledge_type=KnowledgeType.get_by_value(doc.doc_type),
+                        extract_workers=self._serve_config.extract_workers,
                     )
-                    db_name, chunk_docs = await end_task.call(
-                        {"file_path": doc.content, "space": doc.space}
+                if knowledge is None:
+                    raise ValueError(
+                        f"knowledge of domain type {space.domain_type} not found"
                     )
-                    doc.chunk_size = len(chunk_docs)
-                    vector_ids = [chunk.chunk_id for chunk in chunk_docs]
-                else:
-                    assembler = await EmbeddingAssembler.aload_from_knowledge(
-                        knowledge=knowledge,
-                        index_store=vector_store_connector.index_client,
-                        chunk_parameters=chunk_parameters,
+                # Remove the chunk details saved after the last checkpoint, they are
+                # saved again by the resumed batches
+                self._chunk_dao.truncate_document_chunks(doc.id, job.synced_chunks)
+                chunk_size = job.synced_chunks
+                # The vectors of the previous syncs, by the chunk fingerprint
+                reusable_vectors: Dict[str, List[int]] = defaultdict(list)
+                for row_id, chunk_hash, _ in self._chunk_vector_dao.get_chunk_vectors(
+                    doc.id, exclude_job_id=job.id
+                ):
+                    reusable_vectors[chunk_hash].append(row_id)
+                confirmed_ids: List[int] = []
+                new_hashes: List[str] = []
+
+                def _select(batch: List[Chunk]) -> List[Chunk]:
+                    confirmed_ids.clear()
+                    new_hashes.clear()
+                    new_chunks = []
+                    for chunk in batch:
+                        chunk_hash = _chunk_fingerprint(chunk, params_fingerprint)
+                        if reusable_vectors.get(chunk_hash):
+                            confirmed_ids.append(reusable_vectors[chunk_hash].pop())
+                        else:
+                            new_chunks.append(chunk)
+                            new_hashes.append(chunk_hash)
+                    return new_chunks
+
+                def _on_batch(batch: List[Chunk], batch_ids: List[str]):
+                    nonlocal chunk_size
+                    self._chunk_vector_dao.save_chunk_vectors(
+                        doc.id, job.id, confirmed_ids, list(zip(new_hashes, batch_ids))
                     )
+                    self._save_document_chunks(doc, batch)
+                    chunk_size += len(batch)
+                    # The total is unknown until the document is fully read
+                    self._sync_job_dao.checkpoint(job.id, 0, chunk_size, batch_ids)
+
+                # Stream the document through the loading, splitting and embedding,
+                # only one batch of chunks is kept in memory
+                await EmbeddingAssembler.apersist_stream(
+                    knowledge,
+                    vector_store_connector.index_client,
+                    chunk_parameters=chunk_parameters,
+                    batch_size=max(self._serve_config.sync_batch_size, 1),
+                    max_chunks_once_load=CFG.KNOWLEDGE_MAX_CHUNKS_ONCE_LOAD,
+                    skip_chunks=job.synced_chunks,
+                    on_batch=_on_batch,
+                    select=_select,
+                )
+                self._sync_job_dao.checkpoint(job.id, chunk_size, chunk_size, [])
+        # Delete the vectors of the removed or changed chunks, and the vectors synced
+        # before the chunk vector table
+        stale_ids = self._chunk_vector_dao.get_vector_ids(
+            doc.id, exclude_job_id=job.id
+        ) + _split_vector_ids(doc.vector_ids)
+        if stale_ids:
+            logger.info(f"delete {len(stale_ids)} stale vectors of doc:{doc.doc_name}")
+            vector_store_connector.delete_by_ids(",".join(stale_ids))
+        self._chunk_vector_dao.delete_chunk_vectors(doc.id, exclude_job_id=job.id)
+        doc.chunk_size = chunk_size
+        doc.status = SyncStatus.FINISHED.name
+        doc.result = "document persist into index store success"
+        # The vector ids are saved in the chunk vector table
+        doc.vector_ids = None
+        self._document_dao.update_knowledge_document(doc)
+        logger.info(f"async document persist index store success:{doc.doc_name}")
 
-                    chunk_docs = assembler.get_chunks()
-                    doc.chunk_size = len(chunk_docs)
-                    vector_ids = await assembler.apersist()
-            doc.status = SyncStatus.FINISHED.name
-            doc.result = "document persist into index store success"
-            if vector_ids is not None:
-                doc.vector_ids = ",".join(vector_ids)
-            logger.info(f"async document persist index store success:{doc.doc_name}")
-            # save chunk details
-            chunk_entities = [
+    def _save_document_chunks(self, doc: KnowledgeDocumentEntity, chunks: List[Chunk]):
+        """Save the chunk details of the document"""
+        self._chunk_dao.create_documents_chunks(
+            [
                 DocumentChunkEntity(
                     doc_name=doc.doc_name,
                     doc_type=doc.doc_type,
                     document_id=doc.id,
-                    content=chunk_doc.content,
-                    meta_info=str(chunk_doc.metadata),
-                    gmt_created=datetime.now(),
-                    gmt_modified=datetime.now(),
+                    content=chunk.content,
+                    meta_info=str(chunk.metadata),
                 )
-                for chunk_doc in chunk_docs
+                for chunk in chunks
             ]
-            self._chunk_dao.create_documents_chunks(chunk_entities)
-        except Exception as e:
-            doc.status = SyncStatus.FAILED.name
-            doc.result = "document embedding failed" + str(e)
-            logger.error(f"document embedding, failed:{doc.doc_name}, {str(e)}")
-        return self._document_dao.update_knowledge_document(doc)
+        )
+
+    def _on_sync_job_failed(self, job: KnowledgeSyncJobResponse, e: Exception):
+        """Mark the document failed when its sync job failed after all the retries"""
+        docs = self._document_dao.documents_by_ids([job.doc_id])
+        if len(docs) == 0:
+            return
+        doc = KnowledgeDocumentEntity.from_document_vo(docs[0])
+        doc.status = SyncStatus.FAILED.name
+        doc.result = "document embedding failed" + str(e)
+        logger.error(f"document embedding, failed:{doc.doc_name}, {str(e)}")
+        self._document_dao.update_knowledge_document(doc)
 
     def get_space_context(self, space_id):
         """get space contect
@@ -560,3 +715,22 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         if space.context is not None:
             return json.loads(space.context)
         return None
+
+
+def _split_vector_ids(vector_ids: Optional[str]) -> List[str]:
+    return vector_ids.split(",") if vector_ids else []
+
+
+def _params_fingerprint(job: KnowledgeSyncJobResponse) -> str:
+    """The fingerprint of the embedding model and the chunk parameters of the job"""
+    return hashlib.sha256(
+        f"{job.embedding_model}\n{job.chunk_parameters or ''}".encode("utf-8")
+    ).hexdigest()
+
+
+def _chunk_fingerprint(chunk: Chunk, params_fingerprint: str) -> str:
+    """The fingerprint of the chunk content and metadata, with the chunk parameters"""
+    metadata = json.dumps(chunk.metadata, sort_keys=True, default=str)
+    return hashlib.sha256(
+        f"{params_fingerprint}\n{metadata}\n{chunk.content}".encode("utf-8")
+    ).hexdigest()
@@ -0,0 +1,208 @@
+"""The scheduler of the document sync jobs.
+
+The sync jobs are persisted in the job table before they are scheduled, and run in a
+bounded worker pool, the number of the running jobs is limited globally, per knowledge
+space and per embedding model. So bulk uploading documents does not flood the embedding
+workers, and the unfinished jobs are resumed after the server restarts.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+from ..api.schemas import KnowledgeSyncJobResponse
+from ..models.models import KnowledgeSyncJobDao, SyncStatus
+
+logger = logging.getLogger(__name__)
+
+RunJobFunc = Callable[[KnowledgeSyncJobResponse], Awaitable[None]]
+FailJobFunc = Callable[[KnowledgeSyncJobResponse, Exception], None]
+
+
+class DocumentSyncScheduler:
+    """Run the document sync jobs with the bounded concurrency.
+
+    The jobs wait in a FIFO queue, a job is started when all of its limits have free
+    slots, the jobs blocked by a busy space or model do not block the others.
+
+    A failed job is retried up to ``max_retries`` times, it resumes from its last
+    checkpoint, then ``on_failed`` is called if it still fails.
+    """
+
+    def __init__(
+        self,
+        job_dao: KnowledgeSyncJobDao,
+        run_job: RunJobFunc,
+        on_failed: Optional[FailJobFunc] = None,
+        max_workers: int = 4,
+        max_workers_per_space: int = 2,
+        max_workers_per_model: int = 2,
+        max_retries: int = 2,
+    ):
+        """Create a new DocumentSyncScheduler.
+
+        Args:
+            job_dao (KnowledgeSyncJobDao): The dao of the sync jobs.
+            run_job (RunJobFunc): The function to run one job.
+            on_failed (Optional[FailJobFunc]): Called when a job failed after all the
+                retries.
+            max_workers (int): The max number of the running jobs.
+            max_workers_per_space (int): The max number of the running jobs of one
+                knowledge space.
+            max_workers_per_model (int): The max number of the running jobs of one
+                embedding model.
+            max_retries (int): The max retry times of a failed job.
+        """
+        self._job_dao = job_dao
+        self._run_job = run_job
+        self._on_failed = on_failed
+        self._max_workers = max(max_workers, 1)
+        self._max_workers_per_space = max(max_workers_per_space, 1)
+        self._max_workers_per_model = max(max_workers_per_model, 1)
+        self._max_retries = max(max_retries, 0)
+        self._pending: Deque[KnowledgeSyncJobResponse] = deque()
+        self._running: Dict[int, "asyncio.Task[None]"] = {}
+        self._running_docs: Dict[int, int] = {}
+        self._space_running: Dict[str, int] = defaultdict(int)
+        self._model_running: Dict[str, int] = defaultdict(int)
+
+    @property
+    def pending_count(self) -> int:
+        """Return the number of the waiting jobs."""
+        return len(self._pending)
+
+    @property
+    def running_count(self) -> int:
+        """Return the number of the running jobs."""
+        return len(self._running)
+
+    def submit(self, job: KnowledgeSyncJobResponse) -> None:
+        """Submit a persisted job, it runs when the worker pool has a free slot.
+
+        It must be called in the event loop.
+        """
+        self._pending.append(job)
+        self._dispatch()
+
+    def resume(self) -> int:
+        """Submit all the unfinished jobs in the job table.
+
+        The jobs which were running when the server stopped continue from their last
+        checkpoint.
+
+        Returns:
+            int: The number of the resumed jobs.
+        """
+        scheduled = {job.id for job in self._pending} | set(self._running)
+        jobs = self._job_dao.get_jobs_by_status(
+            [SyncStatus.TODO.name, SyncStatus.RUNNING.name]
+        )
+        resumed = 0
+        for job in jobs:
+            if job.id in scheduled:
+                continue
+            if job.status == SyncStatus.RUNNING.name:
+                self._job_dao.update_status(job.id, SyncStatus.TODO.name)
+            self._pending.append(job)
+            resumed += 1
+        if resumed:
+            logger.info(f"Resume {resumed} document sync jobs")
+        self._dispatch()
+        return resumed
+
+    def cancel(self, doc_id: int) -> None:
+        """Cancel the waiting and running jobs of the document."""
+        self._pending = deque(job for job in self._pending if job.doc_id != doc_id)
+        for job_id, job_doc_id in list(self._running_docs.items()):
+            if job_doc_id == doc_id:
+                self._running[job_id].cancel()
+
+    async def join(self) -> None:
+        """Wait until all the submitted jobs are done."""
+        while self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        if not self._pending or len(self._running) >= self._max_workers:
+            return
+        waiting: Deque[KnowledgeSyncJobResponse] = deque()
+        while self._pending and len(self._running) < self._max_workers:
+            job = self._pending.popleft()
+            if (
+                self._space_running[job.space_id] >= self._max_workers_per_space
+                or self._model_running[job.embedding_model]
+                >= self._max_workers_per_model
+            ):
+                waiting.append(job)
+                continue
+            self._start(job)
+        # Keep the skipped jobs ahead of the others
+        waiting.extend(self._pending)
+        self._pending = waiting
+
+    def _start(self, job: KnowledgeSyncJobResponse) -> None:
+        self._space_running[job.space_id] += 1
+        self._model_running[job.embedding_model] += 1
+        self._running[job.id] = asyncio.create_task(self._run(job))
+        self._running_docs[job.id] = job.doc_id
+
+    async def _run(self, job: KnowledgeSyncJobResponse) -> None:
+        try:
+            # The queued job may be stale, a retried job resumes from the checkpoint
+            # saved by its last run
+            latest_job = self._job_dao.get_job(job.id)
+            if latest_job is None:
+                logger.info(
+                    f"Document sync job {job.id} of doc {job.doc_id} is deleted"
+                )
+                return
+            job = latest_job
+            self._job_dao.update_status(job.id, SyncStatus.RUNNING.name)
+            await self._run_job(job)
+            self._job_dao.update_status(
+                job.id, SyncStatus.FINISHED.name, result="success"
+            )
+        except asyncio.CancelledError:
+            logger.info(f"Document sync job {job.id} of doc {job.doc_id} cancelled")
+        except Exception as e:
+            self._handle_failure(job, e)
+        finally:
+            self._running.pop(job.id, None)
+            self._running_docs.pop(job.id, None)
+            self._release(self._space_running, job.space_id)
+            self._release(self._model_running, job.embedding_model)
+            self._dispatch()
+
+    def _handle_failure(self, job: KnowledgeSyncJobResponse, e: Exception) -> None:
+        if self._job_dao.get_job(job.id) is None:
+            # The job is deleted with its document
+            logger.info(f"Document sync job {job.id} of doc {job.doc_id} is deleted")
+            return
+        retry_times = job.retry_times + 1
+        if retry_times <= self._max_retries:
+            logger.warning(
+                f"Document sync job {job.id} of doc {job.doc_id} failed, retry "
+                f"{retry_times}/{self._max_retries}: {e}"
+            )
+            self._job_dao.update_status(
+                job.id, SyncStatus.TODO.name, result=str(e), retry_times=retry_times
+            )
+            job.retry_times = retry_times
+            self._pending.append(job)
+            return
+        logger.error(f"Document sync job {job.id} of doc {job.doc_id} failed: {e}")
+        self._job_dao.update_status(job.id, SyncStatus.FAILED.name, result=str(e))
+        if self._on_failed:
+            try:
+                self._on_failed(job, e)
+            except Exception as callback_error:
+                logger.error(
+                    f"Failed to handle the failed job {job.id}: {callback_error}"
+                )
+
+    @staticmethod
+    def _release(counter: Dict[str, int], key: str) -> None:
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
@@ -0,0 +1,115 @@
+import pytest
+
+from dbgpt.storage.metadata import db
+
+from ..models.models import (
+    KnowledgeChunkVectorDao,
+    KnowledgeSyncJobDao,
+    KnowledgeSyncJobEntity,
+    SyncStatus,
+)
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    db.init_db("sqlite:///:memory:")
+    db.create_all()
+
+    yield
+
+
+@pytest.fixture
+def dao():
+    return KnowledgeSyncJobDao()
+
+
+def test_table_exist():
+    assert KnowledgeSyncJobEntity.__tablename__ in db.metadata.tables
+
+
+def test_create_job(dao):
+    job = dao.create_job(1, "2", "text2vec", '{"chunk_size": 512}')
+    assert job.id is not None
+    assert job.doc_id == 1
+    assert job.space_id == "2"
+    assert job.embedding_model == "text2vec"
+    assert job.status == SyncStatus.TODO.name
+    assert job.chunk_parameters == '{"chunk_size": 512}'
+    assert job.synced_chunks == 0
+    assert job.vector_ids == []
+    assert job.progress == 0.0
+    assert dao.get_job(job.id) == job
+
+
+def test_checkpoint(dao):
+    job = dao.create_job(1, "2", "text2vec")
+    # The total is unknown until the document is fully read
+    dao.checkpoint(job.id, 0, 1, [])
+    assert dao.get_job(job.id).progress is None
+
+    dao.checkpoint(job.id, 5, 2, ["a", "b"])
+    job = dao.get_job(job.id)
+    assert job.total_chunks == 5
+    assert job.synced_chunks == 2
+    assert job.vector_ids == ["a", "b"]
+    assert job.progress == 0.4
+
+    dao.checkpoint(job.id, 5, 5, ["c", "d", "e"])
+    job = dao.get_job(job.id)
+    assert job.vector_ids == ["a", "b", "c", "d", "e"]
+    assert job.progress == 1.0
+
+    with pytest.raises(ValueError):
+        dao.checkpoint(job.id + 1, 5, 5, [])
+
+
+def test_update_status(dao):
+    job = dao.create_job(1, "2", "text2vec")
+    dao.update_status(job.id, SyncStatus.FAILED.name, result="error", retry_times=2)
+    job = dao.get_job(job.id)
+    assert job.status == SyncStatus.FAILED.name
+    assert job.result == "error"
+    assert job.retry_times == 2
+
+
+def test_get_jobs_by_status(dao):
+    job1 = dao.create_job(1, "1", "text2vec")
+    job2 = dao.create_job(2, "1", "text2vec")
+    job3 = dao.create_job(3, "1", "text2vec")
+    dao.update_status(job1.id, SyncStatus.RUNNING.name)
+    dao.update_status(job2.id, SyncStatus.FINISHED.name)
+    jobs = dao.get_jobs_by_status([SyncStatus.TODO.name, SyncStatus.RUNNING.name])
+    assert [job.id for job in jobs] == [job1.id, job3.id]
+
+
+def test_get_latest_job_and_delete(dao):
+    dao.create_job(1, "1", "text2vec")
+    job2 = dao.create_job(1, "1", "text2vec")
+    other = dao.create_job(2, "1", "text2vec")
+    assert dao.get_latest_job(1).id == job2.id
+    dao.delete_jobs(1)
+    assert dao.get_latest_job(1) is None
+    assert dao.get_latest_job(2).id == other.id
+
+
+def test_save_chunk_vectors():
+    vector_dao = KnowledgeChunkVectorDao()
+    vector_dao.save_chunk_vectors(1, 10, [], [("h1", "v1"), ("h2", "v2"), ("h2", "v3")])
+    vector_dao.save_chunk_vectors(2, 10, [], [("h1", "v4")])
+    rows = vector_dao.get_chunk_vectors(1)
+    assert [(chunk_hash, vector_id) for _, chunk_hash, vector_id in rows] == [
+        ("h1", "v1"),
+        ("h2", "v2"),
+        ("h2", "v3"),
+    ]
+
+    # The next sync confirms the unchanged chunk h2 and adds a new chunk h3
+    vector_dao.save_chunk_vectors(1, 11, [rows[1][0]], [("h3", "v5")])
+    assert vector_dao.get_vector_ids(1, exclude_job_id=11) == ["v1", "v3"]
+
+    vector_dao.delete_chunk_vectors(1, exclude_job_id=11)
+    assert vector_dao.get_vector_ids(1) == ["v2", "v5"]
+    assert vector_dao.get_vector_ids(2) == ["v4"]
+
+    vector_dao.delete_chunk_vectors(1)
+    assert vector_dao.get_vector_ids(1) == []
@@ -0,0 +1,160 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from dbgpt.storage.metadata import db
+
+from ..api.schemas import KnowledgeSyncJobResponse
+from ..models.models import KnowledgeSyncJobDao, SyncStatus
+from ..service.sync_scheduler import DocumentSyncScheduler
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    db.init_db("sqlite:///:memory:")
+    db.create_all()
+
+    yield
+
+
+@pytest.fixture
+def dao():
+    return KnowledgeSyncJobDao()
+
+
+class _Runner:
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.running: List[KnowledgeSyncJobResponse] = []
+        self.max_running = 0
+        self.max_running_per_space = 0
+        self.done: List[int] = []
+
+    async def __call__(self, job: KnowledgeSyncJobResponse):
+        self.running.append(job)
+        self.max_running = max(self.max_running, len(self.running))
+        self.max_running_per_space = max(
+            self.max_running_per_space,
+            sum(1 for j in self.running if j.space_id == job.space_id),
+        )
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running.remove(job)
+        self.done.append(job.doc_id)
+
+
+@pytest.mark.asyncio
+async def test_bounded_concurrency(dao):
+    runner = _Runner()
+    scheduler = DocumentSyncScheduler(
+        dao, runner, max_workers=3, max_workers_per_space=2, max_workers_per_model=3
+    )
+    for i in range(20):
+        scheduler.submit(dao.create_job(i, str(i % 2), "text2vec"))
+    assert scheduler.running_count == 3
+    assert scheduler.pending_count == 17
+    await scheduler.join()
+    assert sorted(runner.done) == list(range(20))
+    assert runner.max_running == 3
+    assert runner.max_running_per_space == 2
+    assert not dao.get_jobs_by_status([SyncStatus.TODO.name, SyncStatus.RUNNING.name])
+
+
+@pytest.mark.asyncio
+async def test_model_limit(dao):
+    runner = _Runner()
+    scheduler = DocumentSyncScheduler(
+        dao, runner, max_workers=4, max_workers_per_space=4, max_workers_per_model=1
+    )
+    for i in range(4):
+        scheduler.submit(dao.create_job(i, str(i), "text2vec"))
+    # The job of the other model is not blocked by the busy model
+    scheduler.submit(dao.create_job(4, "4", "bge"))
+    assert scheduler.running_count == 2
+    await scheduler.join()
+    assert sorted(runner.done) == list(range(5))
+    assert runner.done[:2] == [0, 4]
+
+
+@pytest.mark.asyncio
+async def test_retry_and_fail(dao):
+    attempts = []
+    failed = []
+
+    async def run_job(job: KnowledgeSyncJobResponse):
+        attempts.append(job.retry_times)
+        raise ValueError("embedding error")
+
+    scheduler = DocumentSyncScheduler(
+        dao,
+        run_job,
+        on_failed=lambda job, e: failed.append((job.doc_id, str(e))),
+        max_retries=2,
+    )
+    job = dao.create_job(1, "1", "text2vec")
+    scheduler.submit(job)
+    await scheduler.join()
+    assert attempts == [0, 1, 2]
+    assert failed == [(1, "embedding error")]
+    job = dao.get_job(job.id)
+    assert job.status == SyncStatus.FAILED.name
+    assert job.retry_times == 2
+    assert job.result == "embedding error"
+
+
+@pytest.mark.asyncio
+async def test_retry_from_checkpoint(dao):
+    attempts = []
+
+    async def run_job(job: KnowledgeSyncJobResponse):
+        attempts.append((job.retry_times, job.synced_chunks))
+        if not job.retry_times:
+            dao.checkpoint(job.id, 10, 4, ["a", "b", "c", "d"])
+            raise ValueError("embedding error")
+
+    scheduler = DocumentSyncScheduler(dao, run_job, max_retries=1)
+    job = dao.create_job(1, "1", "text2vec")
+    scheduler.submit(job)
+    await scheduler.join()
+    assert attempts == [(0, 0), (1, 4)]
+    assert dao.get_job(job.id).status == SyncStatus.FINISHED.name
+
+
+@pytest.mark.asyncio
+async def test_resume(dao):
+    finished = dao.create_job(1, "1", "text2vec")
+    dao.update_status(finished.id, SyncStatus.FINISHED.name)
+    interrupted = dao.create_job(2, "1", "text2vec")
+    dao.update_status(interrupted.id, SyncStatus.RUNNING.name)
+    dao.checkpoint(interrupted.id, 10, 4, ["a", "b", "c", "d"])
+    todo = dao.create_job(3, "1", "text2vec")
+
+    resumed = []
+
+    async def run_job(job: KnowledgeSyncJobResponse):
+        resumed.append((job.doc_id, job.synced_chunks))
+
+    scheduler = DocumentSyncScheduler(dao, run_job)
+    assert scheduler.resume() == 2
+    # The scheduled jobs are not resumed twice
+    assert scheduler.resume() == 0
+    await scheduler.join()
+    assert resumed == [(2, 4), (3, 0)]
+    assert dao.get_job(interrupted.id).status == SyncStatus.FINISHED.name
+    assert dao.get_job(todo.id).status == SyncStatus.FINISHED.name
+
+
+@pytest.mark.asyncio
+async def test_cancel(dao):
+    runner = _Runner(delay=10)
+    scheduler = DocumentSyncScheduler(dao, runner, max_workers=1)
+    scheduler.submit(dao.create_job(1, "1", "text2vec"))
+    scheduler.submit(dao.create_job(2, "1", "text2vec"))
+    await asyncio.sleep(0)
+    scheduler.cancel(1)
+    scheduler.cancel(2)
+    await scheduler.join()
+    assert runner.done == []
+    assert scheduler.pending_count == 0
@@ -1 +1,219 @@
-"""Embeddings cache."""
+"""Embeddings cache.
+
+Cache the embedding results by the content of the texts, so the unchanged chunks need
+not be embedded again when re-ingesting the documents.
+
+The cache has two tiers, a LRU memory tier and an optional disk tier(rocksdb), the
+entries are keyed by the model name and the hash of the text.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import msgpack
+
+from dbgpt.core import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# The embeddings of the query and the document may be different(e.g. instruction
+# embeddings), so they are cached separately.
+_DOCUMENT_NAMESPACE = b"d"
+_QUERY_NAMESPACE = b"q"
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper with a content-addressed cache.
+
+    Only the texts missed in the cache will be sent to the wrapped embeddings, the
+    same texts in one batch will be embedded only once.
+
+    Examples:
+        .. code-block:: python
+
+            from dbgpt.rag.embedding import DefaultEmbeddingFactory
+            from dbgpt.storage.cache.embedding_cache import CachedEmbeddings
+
+            embeddings = DefaultEmbeddingFactory.default("text2vec-large-chinese")
+            cached_embeddings = CachedEmbeddings(
+                embeddings, persist_dir="/tmp/embedding_cache"
+            )
+            vectors = cached_embeddings.embed_documents(["hello", "world"])
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: Optional[str] = None,
+        max_memory_items: int = 10000,
+        persist_dir: Optional[str] = None,
+        mem_table_buffer_mb: int = 64,
+    ):
+        """Create a new CachedEmbeddings.
+
+        Args:
+            embeddings (Embeddings): The embeddings to wrap.
+            model_name (Optional[str]): The model name used in the cache key, if None,
+                use the ``model_name`` attribute of the embeddings or its class name.
+            max_memory_items (int): The max number of the vectors in memory tier.
+            persist_dir (Optional[str]): The directory of the disk tier, if None,
+                only the memory tier is used.
+            mem_table_buffer_mb (int): The mem-table size of the rocksdb in MB.
+        """
+        self._embeddings = embeddings
+        self._model_name = (
+            model_name
+            or getattr(embeddings, "model_name", None)
+            or embeddings.__class__.__name__
+        )
+        self._key_prefix = self._model_name.encode("utf-8") + b"\x00"
+        self._max_memory_items = max_memory_items
+        self._memory: "OrderedDict[bytes, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[Any] = None
+        if persist_dir:
+            from rocksdict import Rdict
+
+            from .storage.disk.disk_storage import db_options
+
+            self._db = Rdict(
+                persist_dir, db_options(mem_table_buffer_mb=mem_table_buffer_mb)
+            )
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def embeddings(self) -> Embeddings:
+        """Return the wrapped embeddings."""
+        return self._embeddings
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return the hits and misses of the cache."""
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses}
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed search docs, only the missed texts are embedded."""
+        keys, results, missing = self._lookup(_DOCUMENT_NAMESPACE, texts)
+        if missing:
+            missing_texts = list(missing.keys())
+            vectors = self._embeddings.embed_documents(missing_texts)
+            self._fill(keys, results, missing, vectors)
+        return results  # type: ignore
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed query text."""
+        keys, results, missing = self._lookup(_QUERY_NAMESPACE, [text])
+        if missing:
+            vector = self._embeddings.embed_query(text)
+            self._fill(keys, results, missing, [vector])
+        return results[0]  # type: ignore
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous embed search docs, only the missed texts are embedded."""
+        keys, results, missing = self._lookup(_DOCUMENT_NAMESPACE, texts)
+        if missing:
+            missing_texts = list(missing.keys())
+            vectors = await self._embeddings.aembed_documents(missing_texts)
+            self._fill(keys, results, missing, vectors)
+        return results  # type: ignore
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Asynchronous embed query text."""
+        keys, results, missing = self._lookup(_QUERY_NAMESPACE, [text])
+        if missing:
+            vector = await self._embeddings.aembed_query(text)
+            self._fill(keys, results, missing, [vector])
+        return results[0]  # type: ignore
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _build_key(self, namespace: bytes, text: str) -> bytes:
+        text_hash = hashlib.sha256(text.encode("utf-8")).digest()
+        return namespace + self._key_prefix + text_hash
+
+    def _lookup(
+        self, namespace: bytes, texts: List[str]
+    ) -> Tuple[List[bytes], List[Optional[List[float]]], Dict[str, List[int]]]:
+        """Look up the texts in the cache.
+
+        Returns:
+            Tuple[List[bytes], List[Optional[List[float]]], Dict[str, List[int]]]: The
+                cache keys, the results(None if missed) and the missed texts to their
+                positions.
+        """
+        keys = [self._build_key(namespace, text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        disk_positions = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    results[i] = vector
+                else:
+                    disk_positions.append(i)
+        if disk_positions and self._db is not None:
+            values = self._db.get([keys[i] for i in disk_positions])
+            loaded = []
+            for i, value in zip(disk_positions, values):
+                if value is not None:
+                    results[i] = msgpack.unpackb(value)
+                    loaded.append(i)
+            if loaded:
+                with self._lock:
+                    for i in loaded:
+                        self._put_memory(keys[i], results[i])  # type: ignore
+        missing: Dict[str, List[int]] = {}
+        for i, result in enumerate(results):
+            if result is None:
+                missing.setdefault(texts[i], []).append(i)
+        with self._lock:
+            self._hits += len(texts) - sum(len(pos) for pos in missing.values())
+            self._misses += len(missing)
+        return keys, results, missing
+
+    def _fill(
+        self,
+        keys: List[bytes],
+        results: List[Optional[List[float]]],
+        missing: Dict[str, List[int]],
+        vectors: List[List[float]],
+    ) -> None:
+        """Save the new vectors to the cache and fill them to the results."""
+        if len(vectors) != len(missing):
+            raise ValueError(
+                f"The embeddings returned {len(vectors)} vectors for {len(missing)} "
+                "texts"
+            )
+        new_entries = []
+        for positions, vector in zip(missing.values(), vectors):
+            if not isinstance(vector, list):
+                # Such as numpy array
+                vector = vector.tolist()
+            for i in positions:
+                results[i] = vector
+            new_entries.append((keys[positions[0]], vector))
+        with self._lock:
+            for key, vector in new_entries:
+                self._put_memory(key, vector)
+        if self._db is not None:
+            from rocksdict import WriteBatch
+
+            batch = WriteBatch()
+            for key, vector in new_entries:
+                batch.put(key, msgpack.packb(vector))
+            self._db.write(batch)
+
+    def _put_memory(self, key: bytes, vector: List[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_memory_items:
+            self._memory.popitem(last=False)
@@ -6,7 +6,14 @@ from concurrent.futures import Executor
 from typing import Optional, Type, cast
 
 from dbgpt.component import BaseComponent, ComponentType, SystemApp
-from dbgpt.core import CacheConfig, CacheKey, CacheValue, Serializable, Serializer
+from dbgpt.core import (
+    CacheConfig,
+    CacheKey,
+    CacheValue,
+    Embeddings,
+    Serializable,
+    Serializer,
+)
 from dbgpt.core.interface.cache import K, V
 from dbgpt.util.executor_utils import ExecutorFactory, blocking_func_to_async
 
@@ -110,15 +117,24 @@ class LocalCacheManager(CacheManager):
 
 
 def initialize_cache(
-    system_app: SystemApp, storage_type: str, max_memory_mb: int, persist_dir: str
+    system_app: SystemApp,
+    storage_type: str,
+    max_memory_mb: int,
+    persist_dir: str,
+    embeddings: Optional[Embeddings] = None,
+    similarity_threshold: float = 0.95,
 ):
     """Initialize cache manager.
 
     Args:
         system_app (SystemApp): The system app.
-        storage_type (str): The storage type.
+        storage_type (str): The storage type, "memory", "disk" or "semantic".
         max_memory_mb (int): The max memory in MB.
         persist_dir (str): The persist directory.
+        embeddings (Optional[Embeddings]): The embeddings to embed the prompts, only
+            used by the semantic storage.
+        similarity_threshold (float): The minimum cosine similarity of a cache hit,
+            only used by the semantic storage.
     """
     from dbgpt.util.serialization.json_serialization import JsonSerializer
 
@@ -137,7 +153,19 @@ def initialize_cache(
                 f"message: {str(e)}"
             )
             cache_storage = MemoryCacheStorage(max_memory_mb=max_memory_mb)
+    elif storage_type == "semantic" and embeddings:
+        from .storage.semantic_storage import SemanticCacheStorage
+
+        cache_storage = SemanticCacheStorage(
+            embeddings,
+            similarity_threshold=similarity_threshold,
+            max_memory_mb=max_memory_mb,
+        )
     else:
+        if storage_type == "semantic":
+            logger.warning(
+                "No embeddings for SemanticCacheStorage, use MemoryCacheStorage"
+            )
         cache_storage = MemoryCacheStorage(max_memory_mb=max_memory_mb)
     system_app.register(
         LocalCacheManager, serializer=JsonSerializer(), storage=cache_storage
@@ -2,7 +2,7 @@
 import logging
 from typing import AsyncIterator, Dict, List, Optional, Union, cast
 
-from dbgpt.core import ModelOutput, ModelRequest
+from dbgpt.core import ModelOutput, ModelOutputAccumulator, ModelRequest
 from dbgpt.core.awel import (
     BaseOperator,
     BranchFunc,
@@ -190,13 +190,20 @@ class ModelStreamSaveCacheOperator(
         """
         llm_cache_key: Optional[LLMCacheKey] = None
         outputs = []
+        accumulator = ModelOutputAccumulator()
+        has_incremental = False
         async for out in input_value:
             if not llm_cache_key:
                 llm_cache_key = await self.current_dag_context.get_from_share_data(
                     _LLM_MODEL_INPUT_VALUE_KEY
                 )
             outputs.append(out)
+            accumulator.add(out)
+            has_incremental = has_incremental or out.incremental
             yield out
+        if has_incremental and accumulator.output:
+            # Cache the full output only, it can be replayed in both stream modes
+            outputs = [accumulator.output]
         if llm_cache_key and _is_success_model_output(outputs):
             llm_cache_value: LLMCacheValue = self._client.new_value(output=outputs)
             await self._client.set(llm_cache_key, llm_cache_value)
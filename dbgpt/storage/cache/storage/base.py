@@ -1,9 +1,12 @@
 """Base cache storage class."""
+import heapq
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
 from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 import msgpack
 
@@ -190,14 +193,82 @@ class CacheStorage(ABC):
         raise NotImplementedError
 
 
+@dataclass
+class CacheStats:
+    """The statistics of a cache storage."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    item_count: int = 0
+    memory_usage: int = 0
+    max_memory: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the hit rate of the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _MemoryCacheEntry:
+    """The entry of the memory cache, the size is calculated only once."""
+
+    __slots__ = ("item", "size", "expire_at", "freq")
+
+    def __init__(self, item: StorageItem, size: int, expire_at: Optional[float]):
+        self.item = item
+        self.size = size
+        self.expire_at = expire_at
+        self.freq = 1
+
+    def is_expired(self, now: float) -> bool:
+        return self.expire_at is not None and self.expire_at <= now
+
+
 class MemoryCacheStorage(CacheStorage):
-    """A simple in-memory cache storage implementation."""
+    """An in-memory cache storage with size-accounted eviction.
 
-    def __init__(self, max_memory_mb: int = 256):
-        """Create a new instance of MemoryCacheStorage."""
-        self.cache: OrderedDict = OrderedDict()
+    Every entry is tracked in an insertion order list(FIFO), a recency list(LRU) and
+    frequency buckets(LFU), so the victim of any :class:`CachePolicy` can be found in
+    O(1). The entries with TTL are also pushed to a heap, the expired entries are
+    removed lazily when reading and before evicting the live entries.
+    """
+
+    def __init__(
+        self,
+        max_memory_mb: int = 256,
+        cache_policy: CachePolicy = CachePolicy.LRU,
+        default_ttl: Optional[float] = None,
+    ):
+        """Create a new instance of MemoryCacheStorage.
+
+        Args:
+            max_memory_mb (int): The memory budget of the cache in MB.
+            cache_policy (CachePolicy): The default eviction policy, used when the
+                cache config of the request does not specify one.
+            default_ttl (Optional[float]): The default time to live of the entries in
+                seconds, None means never expire.
+        """
         self.max_memory = max_memory_mb * 1024 * 1024
         self.current_memory_usage = 0
+        self._cache_policy = cache_policy
+        self._default_ttl = default_ttl
+        self._lock = threading.Lock()
+        # Insertion order, used by FIFO
+        self.cache: "OrderedDict[int, _MemoryCacheEntry]" = OrderedDict()
+        # Access order, used by LRU
+        self._recency: "OrderedDict[int, None]" = OrderedDict()
+        # Access frequency to keys(in access order), used by LFU
+        self._freq_buckets: Dict[int, "OrderedDict[int, None]"] = {}
+        self._min_freq = 0
+        # (expire_at, key_hash), some of them may be stale
+        self._expire_heap: List[Tuple[float, int]] = []
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
 
     def check_config(
         self,
@@ -223,14 +294,22 @@ class MemoryCacheStorage(CacheStorage):
         self.check_config(cache_config, raise_error=True)
         # Exact match retrieval
         key_hash = hash(key)
-        item: Optional[StorageItem] = self.cache.get(key_hash)
-        logger.debug(f"MemoryCacheStorage get key {key}, hash {key_hash}, item: {item}")
-
-        if not item:
-            return None
-        # Move the item to the end of the OrderedDict to signify recent use.
-        self.cache.move_to_end(key_hash)
-        return item
+        with self._lock:
+            entry = self.cache.get(key_hash)
+            if entry and entry.is_expired(time.time()):
+                self._remove(key_hash)
+                self._expirations += 1
+                entry = None
+            if not entry:
+                self._misses += 1
+                logger.debug(f"MemoryCacheStorage miss key {key}, hash {key_hash}")
+                return None
+            self._hits += 1
+            self._touch(key_hash, entry)
+        logger.debug(
+            f"MemoryCacheStorage get key {key}, hash {key_hash}, item: {entry.item}"
+        )
+        return entry.item
 
     def set(
         self,
@@ -241,15 +320,40 @@ class MemoryCacheStorage(CacheStorage):
         """Set a value in the cache for the provided key."""
         key_hash = hash(key)
         item = StorageItem.build_from_kv(key, value)
-        # Calculate memory size of the new entry
-        new_entry_size = _get_object_bytes(item)
-        # Evict entries if necessary
-        while self.current_memory_usage + new_entry_size > self.max_memory:
-            self._apply_cache_policy(cache_config)
-
-        # Store the item in the cache.
-        self.cache[key_hash] = item
-        self.current_memory_usage += new_entry_size
+        # The length of the storage item is the memory size of the new entry
+        new_entry_size = item.length
+        if new_entry_size > self.max_memory:
+            logger.warning(
+                f"MemoryCacheStorage skip key {key}, the size {new_entry_size} is "
+                f"larger than the max memory {self.max_memory}"
+            )
+            return
+        ttl = (
+            cache_config.ttl
+            if cache_config and cache_config.ttl is not None
+            else self._default_ttl
+        )
+        now = time.time()
+        expire_at = now + ttl if ttl is not None else None
+        policy = self._get_policy(cache_config)
+        with self._lock:
+            if key_hash in self.cache:
+                # Replace the old value
+                self._remove(key_hash)
+            self._purge_expired(now)
+            # Evict entries if necessary
+            while self.current_memory_usage + new_entry_size > self.max_memory:
+                self._evict(policy)
+
+            # Store the item in the cache.
+            entry = _MemoryCacheEntry(item, new_entry_size, expire_at)
+            self.cache[key_hash] = entry
+            self._recency[key_hash] = None
+            self._freq_buckets.setdefault(1, OrderedDict())[key_hash] = None
+            self._min_freq = 1
+            if expire_at is not None:
+                heapq.heappush(self._expire_heap, (expire_at, key_hash))
+            self.current_memory_usage += new_entry_size
         logger.debug(f"MemoryCacheStorage set key {key}, hash {key_hash}, item: {item}")
 
     def exists(
@@ -258,9 +362,73 @@ class MemoryCacheStorage(CacheStorage):
         """Check if the key exists in the cache."""
         return self.get(key, cache_config) is not None
 
+    def stats(self) -> CacheStats:
+        """Return the statistics of current cache."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                item_count=len(self.cache),
+                memory_usage=self.current_memory_usage,
+                max_memory=self.max_memory,
+            )
+
+    def _get_policy(self, cache_config: Optional[CacheConfig] = None) -> CachePolicy:
+        if cache_config and cache_config.cache_policy:
+            return cache_config.cache_policy
+        return self._cache_policy
+
+    def _touch(self, key_hash: int, entry: _MemoryCacheEntry) -> None:
+        """Record an access of the entry."""
+        self._recency.move_to_end(key_hash)
+        bucket = self._freq_buckets[entry.freq]
+        del bucket[key_hash]
+        if not bucket:
+            del self._freq_buckets[entry.freq]
+            if self._min_freq == entry.freq:
+                self._min_freq = entry.freq + 1
+        entry.freq += 1
+        self._freq_buckets.setdefault(entry.freq, OrderedDict())[key_hash] = None
+
+    def _remove(self, key_hash: int) -> None:
+        """Remove the entry from all the indexes and release its memory."""
+        entry = self.cache.pop(key_hash)
+        del self._recency[key_hash]
+        bucket = self._freq_buckets[entry.freq]
+        del bucket[key_hash]
+        if not bucket:
+            del self._freq_buckets[entry.freq]
+        self.current_memory_usage -= entry.size
+
+    def _purge_expired(self, now: float) -> None:
+        heap = self._expire_heap
+        while heap and heap[0][0] <= now:
+            expire_at, key_hash = heapq.heappop(heap)
+            entry = self.cache.get(key_hash)
+            # The entry may be removed or replaced
+            if entry and entry.expire_at == expire_at:
+                self._remove(key_hash)
+                self._expirations += 1
+
+    def _evict(self, policy: CachePolicy) -> None:
+        if policy == CachePolicy.FIFO:
+            key_hash = next(iter(self.cache))
+        elif policy == CachePolicy.LFU:
+            if self._min_freq not in self._freq_buckets:
+                self._min_freq = min(self._freq_buckets)
+            # The least recently used one of the least frequently used entries
+            key_hash = next(iter(self._freq_buckets[self._min_freq]))
+        else:
+            # Default is LRU, evict the least recently used entry
+            key_hash = next(iter(self._recency))
+        self._remove(key_hash)
+        self._evictions += 1
+
     def _apply_cache_policy(self, cache_config: Optional[CacheConfig] = None):
-        # Remove the oldest/newest item based on the cache policy.
-        if cache_config and cache_config.cache_policy == CachePolicy.FIFO:
-            self.cache.popitem(last=False)
-        else:  # Default is LRU
-            self.cache.popitem(last=True)
+        # Remove one item based on the cache policy.
+        with self._lock:
+            if not self.cache:
+                return
+            self._evict(self._get_policy(cache_config))
@@ -0,0 +1,285 @@
+"""Semantic cache storage.
+
+Cache the LLM results by the similarity of the prompts, so the paraphrased repeat
+questions can hit the cache.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple, cast
+
+import numpy as np
+
+from dbgpt.core import Embeddings
+from dbgpt.core.interface.cache import (
+    CacheConfig,
+    CacheKey,
+    CacheValue,
+    K,
+    RetrievalPolicy,
+    V,
+)
+
+from ..llm_cache import LLMCacheKeyData
+from .base import CacheStorage, MemoryCacheStorage, StorageItem
+
+logger = logging.getLogger(__name__)
+
+_EXACT_MATCH_CONFIG = CacheConfig(retrieval_policy=RetrievalPolicy.EXACT_MATCH)
+
+
+class _PromptIndex:
+    """The in-process vector index of the cached prompts in one group.
+
+    The normalized vectors are stored in a contiguous float32 matrix, so the cosine
+    similarity of all the cached prompts can be calculated with one matrix-vector
+    product.
+
+    The rows of the removed prompts are reused by the new prompts, and the insertion
+    order is kept in an ordered dict, so dropping the oldest prompt does not move the
+    other rows.
+    """
+
+    def __init__(self, dim: int, max_size: int, init_capacity: int = 64):
+        self._max_size = max_size
+        capacity = min(init_capacity, max_size)
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._used = np.zeros(capacity, dtype=bool)
+        self._keys: List[Optional[CacheKey]] = [None] * capacity
+        # The row of the prompts, in the insertion order
+        self._key_to_pos: "OrderedDict[bytes, int]" = OrderedDict()
+        self._free: List[int] = []
+        # The rows below it have been used
+        self._high_water = 0
+
+    def __len__(self) -> int:
+        return len(self._key_to_pos)
+
+    def add(self, key: CacheKey, vector: np.ndarray) -> None:
+        key_hash = key.get_hash_bytes()
+        if key_hash in self._key_to_pos:
+            self._vectors[self._key_to_pos[key_hash]] = vector
+            return
+        if len(self._key_to_pos) >= self._max_size:
+            # Drop the oldest prompt
+            self.remove(next(iter(self._key_to_pos)))
+        pos = self._allocate()
+        self._vectors[pos] = vector
+        self._used[pos] = True
+        self._keys[pos] = key
+        self._key_to_pos[key_hash] = pos
+
+    def remove(self, key_hash: bytes) -> None:
+        pos = self._key_to_pos.pop(key_hash, None)
+        if pos is None:
+            return
+        self._used[pos] = False
+        self._keys[pos] = None
+        self._free.append(pos)
+
+    def search(self, vector: np.ndarray) -> Optional[Tuple[CacheKey, float]]:
+        if not self._key_to_pos:
+            return None
+        size = self._high_water
+        scores = self._vectors[:size] @ vector
+        scores[~self._used[:size]] = -np.inf
+        pos = int(np.argmax(scores))
+        return cast(CacheKey, self._keys[pos]), float(scores[pos])
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._high_water >= self._vectors.shape[0]:
+            capacity = self._vectors.shape[0]
+            new_capacity = min(capacity * 2, self._max_size)
+            new_vectors = np.zeros(
+                (new_capacity, self._vectors.shape[1]), dtype=np.float32
+            )
+            new_vectors[:capacity] = self._vectors
+            self._vectors = new_vectors
+            new_used = np.zeros(new_capacity, dtype=bool)
+            new_used[:capacity] = self._used
+            self._used = new_used
+            self._keys.extend([None] * (new_capacity - capacity))
+        pos = self._high_water
+        self._high_water += 1
+        return pos
+
+
+class SemanticCacheStorage(CacheStorage):
+    """Cache storage which can retrieve the LLM results by prompt similarity.
+
+    The storage items are saved in another cache storage(memory storage by default),
+    this storage only keeps the embeddings of the cached prompts, grouped by the model
+    and the other parameters of :class:`LLMCacheKeyData`, the prompts are matched only
+    in the same group.
+
+    The similarity match is used when the cache config is None or its retrieval policy
+    is ``SIMILARITY_MATCH``, the exact match is always tried first.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        similarity_threshold: float = 0.95,
+        storage: Optional[CacheStorage] = None,
+        max_prompts_per_group: int = 10000,
+        max_memory_mb: int = 256,
+        embedding_cache_size: int = 1024,
+    ):
+        """Create a new instance of SemanticCacheStorage.
+
+        Args:
+            embeddings (Embeddings): The embeddings to embed the prompts.
+            similarity_threshold (float): The minimum cosine similarity to be regarded
+                as a cache hit.
+            storage (Optional[CacheStorage]): The storage to save the storage items,
+                it must support the exact match retrieval. If None, use a
+                :class:`MemoryCacheStorage`.
+            max_prompts_per_group (int): The maximum number of prompts indexed for one
+                model and parameters, the oldest one will be dropped when exceeded.
+            max_memory_mb (int): The memory budget of the default memory storage.
+            embedding_cache_size (int): The number of the recent prompt embeddings to
+                keep, the prompt missed in :meth:`get` will be saved by :meth:`set`
+                later, so it need not be embedded twice.
+        """
+        if not 0 < similarity_threshold <= 1:
+            raise ValueError(
+                f"similarity_threshold must be in (0, 1], got {similarity_threshold}"
+            )
+        self._embeddings = embeddings
+        self._similarity_threshold = similarity_threshold
+        self._storage = storage or MemoryCacheStorage(max_memory_mb=max_memory_mb)
+        self._storage.check_config(_EXACT_MATCH_CONFIG, raise_error=True)
+        self._max_prompts_per_group = max_prompts_per_group
+        self._embedding_cache_size = embedding_cache_size
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._indexes: Dict[str, _PromptIndex] = {}
+        self._lock = threading.Lock()
+
+    def check_config(
+        self,
+        cache_config: Optional[CacheConfig] = None,
+        raise_error: Optional[bool] = True,
+    ) -> bool:
+        """Check whether the CacheConfig is legal."""
+        if cache_config and cache_config.retrieval_policy not in (
+            RetrievalPolicy.EXACT_MATCH,
+            RetrievalPolicy.SIMILARITY_MATCH,
+        ):
+            if raise_error:
+                raise ValueError(
+                    "SemanticCacheStorage only supports 'EXACT_MATCH' and "
+                    "'SIMILARITY_MATCH' retrieval policy"
+                )
+            return False
+        return True
+
+    def get(
+        self, key: CacheKey[K], cache_config: Optional[CacheConfig] = None
+    ) -> Optional[StorageItem]:
+        """Retrieve a storage item from the cache using the provided key."""
+        self.check_config(cache_config, raise_error=True)
+        item = self._storage.get(key, self._exact_config(cache_config))
+        if item or not self._is_similarity_match(cache_config):
+            return item
+        group_and_prompt = _parse_group_and_prompt(key)
+        if not group_and_prompt:
+            return None
+        group, prompt = group_and_prompt
+        with self._lock:
+            if group not in self._indexes:
+                return None
+        vector = self._embed(prompt)
+        with self._lock:
+            index = self._indexes.get(group)
+            result = index.search(vector) if index else None
+        if not result:
+            return None
+        similar_key, score = result
+        if score < self._similarity_threshold:
+            logger.debug(
+                f"SemanticCacheStorage miss, the max similarity {score} is less than "
+                f"{self._similarity_threshold}"
+            )
+            return None
+        item = self._storage.get(similar_key, self._exact_config(cache_config))
+        if not item:
+            # The item has been evicted from the underlying storage
+            with self._lock:
+                index = self._indexes.get(group)
+                if index:
+                    index.remove(similar_key.get_hash_bytes())
+            return None
+        logger.debug(f"SemanticCacheStorage hit key {similar_key}, similarity {score}")
+        return item
+
+    def set(
+        self,
+        key: CacheKey[K],
+        value: CacheValue[V],
+        cache_config: Optional[CacheConfig] = None,
+    ) -> None:
+        """Set a value in the cache for the provided key."""
+        self._storage.set(key, value, self._exact_config(cache_config))
+        group_and_prompt = _parse_group_and_prompt(key)
+        if not group_and_prompt:
+            return
+        group, prompt = group_and_prompt
+        vector = self._embed(prompt)
+        with self._lock:
+            index = self._indexes.get(group)
+            if not index:
+                index = _PromptIndex(len(vector), self._max_prompts_per_group)
+                self._indexes[group] = index
+            index.add(key, vector)
+
+    def _is_similarity_match(self, cache_config: Optional[CacheConfig]) -> bool:
+        return (
+            not cache_config
+            or cache_config.retrieval_policy == RetrievalPolicy.SIMILARITY_MATCH
+        )
+
+    def _exact_config(self, cache_config: Optional[CacheConfig]) -> CacheConfig:
+        if not cache_config:
+            return _EXACT_MATCH_CONFIG
+        return CacheConfig(
+            retrieval_policy=RetrievalPolicy.EXACT_MATCH,
+            cache_policy=cache_config.cache_policy,
+            ttl=cache_config.ttl,
+        )
+
+    def _embed(self, prompt: str) -> np.ndarray:
+        """Embed the prompt and normalize the vector."""
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        with self._lock:
+            vector = self._embedding_cache.get(prompt_hash)
+            if vector is not None:
+                self._embedding_cache.move_to_end(prompt_hash)
+                return vector
+        vector = np.asarray(self._embeddings.embed_query(prompt), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        with self._lock:
+            self._embedding_cache[prompt_hash] = vector
+            if len(self._embedding_cache) > self._embedding_cache_size:
+                self._embedding_cache.popitem(last=False)
+        return vector
+
+
+def _parse_group_and_prompt(key: CacheKey) -> Optional[Tuple[str, str]]:
+    """Split the LLM cache key to the group key and the prompt.
+
+    Return None if the key is not a LLM cache key, only exact match is supported for
+    it.
+    """
+    key_data = key.get_value()
+    if not isinstance(key_data, LLMCacheKeyData):
+        return None
+    params = asdict(key_data)
+    prompt = params.pop("prompt")
+    group = "|".join(f"{k}={v}" for k, v in sorted(params.items()))
+    return group, prompt
@@ -0,0 +1,100 @@
+from typing import List
+
+import numpy as np
+
+from dbgpt.core import Embeddings
+from dbgpt.core.interface.cache import CacheConfig, RetrievalPolicy
+from dbgpt.util.serialization.json_serialization import JsonSerializer
+
+from ...llm_cache import LLMCacheKey, LLMCacheValue
+from ..semantic_storage import SemanticCacheStorage, _PromptIndex
+
+_VECTORS = {
+    "What is DB-GPT?": [1.0, 0.0, 0.0],
+    "what's DB-GPT": [0.99, 0.05, 0.0],
+    "How to install it?": [0.0, 1.0, 0.0],
+}
+
+
+class MockEmbeddings(Embeddings):
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.calls += 1
+        return _VECTORS[text]
+
+
+def _new_key(prompt: str, model_name: str = "vicuna") -> LLMCacheKey:
+    key = LLMCacheKey(prompt=prompt, model_name=model_name)
+    key.set_serializer(JsonSerializer())
+    return key
+
+
+def _new_value(text: str) -> LLMCacheValue:
+    value = LLMCacheValue(output={"text": text, "error_code": 0})
+    value.set_serializer(JsonSerializer())
+    return value
+
+
+def test_similarity_match():
+    embeddings = MockEmbeddings()
+    storage = SemanticCacheStorage(embeddings, similarity_threshold=0.9)
+    assert storage.get(_new_key("What is DB-GPT?")) is None
+    storage.set(_new_key("What is DB-GPT?"), _new_value("An AI native data app"))
+    assert embeddings.calls == 1
+
+    item = storage.get(_new_key("what's DB-GPT"))
+    assert item is not None
+    assert embeddings.calls == 2
+    assert item.value_data == _new_value("An AI native data app").serialize()
+    assert storage.get(_new_key("How to install it?")) is None
+    storage.set(_new_key("How to install it?"), _new_value("pip install dbgpt"))
+    # The embedding of the missed prompt is reused
+    assert embeddings.calls == 3
+    # Only match the prompts of the same model
+    assert storage.get(_new_key("what's DB-GPT", model_name="chatglm")) is None
+    # Exact match only
+    exact_config = CacheConfig(retrieval_policy=RetrievalPolicy.EXACT_MATCH)
+    assert storage.get(_new_key("what's DB-GPT"), exact_config) is None
+    assert storage.get(_new_key("What is DB-GPT?"), exact_config) is not None
+
+
+def test_similarity_threshold():
+    storage = SemanticCacheStorage(MockEmbeddings(), similarity_threshold=0.999)
+    storage.set(_new_key("What is DB-GPT?"), _new_value("An AI native data app"))
+    assert storage.get(_new_key("what's DB-GPT")) is None
+
+
+def test_prompt_index_drop_oldest():
+    index = _PromptIndex(dim=2, max_size=3, init_capacity=2)
+    keys = [_new_key(f"prompt {i}") for i in range(5)]
+    vectors = [np.array(v, dtype=np.float32) for v in _unit_vectors(5)]
+    for key, vector in zip(keys, vectors):
+        index.add(key, vector)
+    assert len(index) == 3
+    # The two oldest prompts are dropped, their rows are reused
+    for i in range(2):
+        assert index.search(vectors[i])[0] != keys[i]
+    for i in range(2, 5):
+        key, score = index.search(vectors[i])
+        assert key == keys[i]
+        assert score > 0.999
+
+    index.remove(keys[3].get_hash_bytes())
+    assert len(index) == 2
+    assert index.search(vectors[3])[0] != keys[3]
+    index.add(keys[0], vectors[0])
+    assert index.search(vectors[0])[0] == keys[0]
+    # The oldest one is still dropped first
+    index.add(keys[1], vectors[1])
+    assert len(index) == 3
+    assert index.search(vectors[2])[0] != keys[2]
+
+
+def _unit_vectors(n: int) -> List[List[float]]:
+    angles = np.linspace(0, np.pi / 2, n)
+    return [[float(np.cos(a)), float(np.sin(a))] for a in angles]
@@ -1,6 +1,39 @@
+import time
+
+from dbgpt.core.interface.cache import CacheConfig, CachePolicy
 from dbgpt.util.memory_utils import _get_object_bytes
 
-from ..base import StorageItem
+from ..base import MemoryCacheStorage, StorageItem
+
+
+class MockKey:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def get_hash_bytes(self):
+        return self.name.encode()
+
+    def serialize(self):
+        return self.name.encode()
+
+
+class MockValue:
+    def __init__(self, size: int = 100):
+        self.data = b"v" * size
+
+    def serialize(self):
+        return self.data
+
+
+def _new_storage(num_items: int, **kwargs) -> MemoryCacheStorage:
+    storage = MemoryCacheStorage(**kwargs)
+    item_size = StorageItem.build_from_kv(MockKey("k0"), MockValue()).length
+    # Only num_items entries can be stored
+    storage.max_memory = item_size * num_items
+    return storage
 
 
 def test_build_from():
@@ -51,3 +84,72 @@ def test_serialize_deserialize():
     assert deserialized.key_data == item.key_data
     assert deserialized.value_data == item.value_data
     assert deserialized.length == item.length
+
+
+def test_memory_storage_lru():
+    storage = _new_storage(2)
+    storage.set(MockKey("k0"), MockValue())
+    storage.set(MockKey("k1"), MockValue())
+    assert storage.get(MockKey("k0"))
+    storage.set(MockKey("k2"), MockValue())
+
+    # k1 is the least recently used one
+    assert storage.get(MockKey("k1")) is None
+    assert storage.get(MockKey("k0"))
+    assert storage.get(MockKey("k2"))
+    stats = storage.stats()
+    assert stats.evictions == 1
+    assert stats.item_count == 2
+    assert stats.hits == 3
+    assert stats.misses == 1
+    assert stats.memory_usage == storage.current_memory_usage <= storage.max_memory
+
+
+def test_memory_storage_fifo_and_lfu():
+    fifo_config = CacheConfig(cache_policy=CachePolicy.FIFO)
+    storage = _new_storage(2)
+    storage.set(MockKey("k0"), MockValue(), fifo_config)
+    storage.set(MockKey("k1"), MockValue(), fifo_config)
+    assert storage.get(MockKey("k0"))
+    storage.set(MockKey("k2"), MockValue(), fifo_config)
+    assert storage.get(MockKey("k0")) is None
+    assert storage.get(MockKey("k1"))
+
+    storage = _new_storage(2, cache_policy=CachePolicy.LFU)
+    storage.set(MockKey("k0"), MockValue())
+    storage.set(MockKey("k1"), MockValue())
+    for _ in range(3):
+        assert storage.get(MockKey("k0"))
+    assert storage.get(MockKey("k1"))
+    storage.set(MockKey("k2"), MockValue())
+    assert storage.get(MockKey("k1")) is None
+    assert storage.get(MockKey("k0"))
+
+
+def test_memory_storage_size_accounting():
+    storage = _new_storage(3)
+    for i in range(20):
+        storage.set(MockKey(f"k{i}"), MockValue())
+        # Overwrite the same key
+        storage.set(MockKey(f"k{i}"), MockValue())
+        assert storage.current_memory_usage <= storage.max_memory
+    assert storage.current_memory_usage == sum(
+        entry.size for entry in storage.cache.values()
+    )
+    assert storage.stats().item_count == 3
+    assert storage.stats().evictions == 17
+
+    # Too large to store
+    storage.set(MockKey("large"), MockValue(storage.max_memory))
+    assert storage.get(MockKey("large")) is None
+
+
+def test_memory_storage_ttl():
+    storage = _new_storage(3, default_ttl=100)
+    storage.set(MockKey("k0"), MockValue(), CacheConfig(ttl=0.01))
+    storage.set(MockKey("k1"), MockValue())
+    time.sleep(0.02)
+    assert storage.get(MockKey("k0")) is None
+    assert storage.get(MockKey("k1"))
+    assert storage.stats().expirations == 1
+    assert storage.stats().evictions == 0
@@ -0,0 +1,76 @@
+from typing import List
+
+import pytest
+
+from dbgpt.core import Embeddings
+
+from ..embedding_cache import CachedEmbeddings
+
+
+class MockEmbeddings(Embeddings):
+    model_name = "mock-embedding"
+
+    def __init__(self):
+        self.embedded_texts: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded_texts.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.embedded_texts.append(text)
+        return [float(len(text)), 0.0]
+
+
+def test_only_embed_missed_texts():
+    embeddings = MockEmbeddings()
+    cached = CachedEmbeddings(embeddings)
+    assert cached.embed_documents(["a", "bb", "a"]) == [
+        [1.0, 1.0],
+        [2.0, 1.0],
+        [1.0, 1.0],
+    ]
+    assert embeddings.embedded_texts == ["a", "bb"]
+
+    assert cached.embed_documents(["bb", "ccc", "a"]) == [
+        [2.0, 1.0],
+        [3.0, 1.0],
+        [1.0, 1.0],
+    ]
+    assert embeddings.embedded_texts == ["a", "bb", "ccc"]
+    # The query embeddings are cached separately
+    assert cached.embed_query("a") == [1.0, 0.0]
+    assert cached.embed_query("a") == [1.0, 0.0]
+    assert embeddings.embedded_texts == ["a", "bb", "ccc", "a"]
+    assert cached.stats == {"hits": 3, "misses": 4}
+
+
+@pytest.mark.asyncio
+async def test_async_embed_documents():
+    embeddings = MockEmbeddings()
+    cached = CachedEmbeddings(embeddings, max_memory_items=2)
+    assert await cached.aembed_documents(["a", "bb", "ccc"]) == [
+        [1.0, 1.0],
+        [2.0, 1.0],
+        [3.0, 1.0],
+    ]
+    # "a" has been evicted from the memory
+    await cached.aembed_documents(["a", "ccc"])
+    assert embeddings.embedded_texts == ["a", "bb", "ccc", "a"]
+
+
+def test_disk_cache(tmp_path):
+    embeddings = MockEmbeddings()
+    cached = CachedEmbeddings(embeddings, persist_dir=str(tmp_path / "cache"))
+    cached.embed_documents(["a", "bb"])
+    cached.close()
+
+    new_embeddings = MockEmbeddings()
+    cached = CachedEmbeddings(new_embeddings, persist_dir=str(tmp_path / "cache"))
+    assert cached.embed_documents(["bb", "a"]) == [[2.0, 1.0], [1.0, 1.0]]
+    assert new_embeddings.embedded_texts == []
+    # Keyed by model name
+    other = CachedEmbeddings(MockEmbeddings(), model_name="other")
+    other.embed_documents(["a"])
+    assert other.stats["misses"] == 1
+    cached.close()
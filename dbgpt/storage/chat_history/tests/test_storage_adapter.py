@@ -2,7 +2,13 @@ from typing import List
 
 import pytest
 
-from dbgpt.core.interface.message import AIMessage, HumanMessage, StorageConversation
+from dbgpt.core.interface.message import (
+    AIMessage,
+    HumanMessage,
+    MessageIdentifier,
+    MessageStorageItem,
+    StorageConversation,
+)
 from dbgpt.core.interface.storage import QuerySpec
 from dbgpt.storage.chat_history.chat_history_db import (
     ChatHistoryEntity,
@@ -218,3 +224,89 @@ def test_query_with_page(
     assert page_result.page_size == 2
     assert len(page_result.items) == 2
     assert page_result.items[0].conv_uid == "conv0"
+
+
+def _count_selects(db_manager):
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+    return statements, lambda: event.remove(
+        db_manager.engine, "before_cursor_execute", before_cursor_execute
+    )
+
+
+def test_load_messages_in_one_query(
+    conversation: StorageConversation, conv_storage, message_storage, db_manager
+):
+    for i in range(20):
+        conversation.start_new_round()
+        conversation.add_user_message(f"hello {i}")
+        conversation.add_ai_message(f"hi {i}")
+        conversation.end_current_round()
+
+    statements, remove_listener = _count_selects(db_manager)
+    try:
+        saved_conversation = StorageConversation(
+            conversation.conv_uid,
+            conv_storage=conv_storage,
+            message_storage=message_storage,
+        )
+    finally:
+        remove_listener()
+    # One for the conversation, one for all the messages
+    assert len(statements) == 2
+    assert len(saved_conversation.messages) == 40
+    assert [m.content for m in saved_conversation.messages[:4]] == [
+        "hello 0",
+        "hi 0",
+        "hello 1",
+        "hi 1",
+    ]
+    assert saved_conversation.messages[-1].content == "hi 19"
+
+
+def test_bulk_message_operations(
+    conversation: StorageConversation, message_storage, db_manager
+):
+    conversation.start_new_round()
+    conversation.add_user_message("hello")
+    conversation.add_ai_message("hi")
+    conversation.end_current_round()
+    message_ids = conversation._message_ids
+
+    # Load in the given order, skip the missing ones
+    identifiers = [MessageIdentifier.from_str_identifier(i) for i in message_ids]
+    missing = MessageIdentifier(conversation.conv_uid, 100)
+    loaded = message_storage.load_list(
+        [identifiers[1], missing, identifiers[0]], MessageStorageItem
+    )
+    assert [item.to_message().content for item in loaded] == ["hi", "hello"]
+
+    # Update the existing one and insert the new one in one transaction
+    updated = MessageStorageItem(
+        conversation.conv_uid, 1, AIMessage(content="hi again", index=1).to_dict()
+    )
+    new_item = MessageStorageItem(
+        conversation.conv_uid, 2, HumanMessage(content="bye", index=2).to_dict()
+    )
+    message_storage.save_or_update_list([updated, new_item])
+    loaded = message_storage.load_list(
+        identifiers + [new_item.identifier], MessageStorageItem
+    )
+    assert [item.to_message().content for item in loaded] == [
+        "hello",
+        "hi again",
+        "bye",
+    ]
+
+    message_storage.delete_list([identifiers[0], new_item.identifier])
+    loaded = message_storage.load_list(
+        identifiers + [new_item.identifier], MessageStorageItem
+    )
+    assert [item.to_message().content for item in loaded] == ["hi again"]
@@ -32,6 +32,15 @@ class GraphStoreBase(ABC):
     def insert_triplet(self, sub: str, rel: str, obj: str):
         """Add triplet."""
 
+    def insert_triplets(self, triplets: List[Tuple[str, str, str]]):
+        """Add triplets in bulk.
+
+        The default implementation adds the triplets one by one, the graph stores
+        should override it to write the triplets in batches.
+        """
+        for triplet in triplets:
+            self.insert_triplet(*triplet)
+
     @abstractmethod
     def get_triplets(self, sub: str) -> List[Tuple[str, str]]:
         """Get triplets."""
@@ -0,0 +1,437 @@
+"""Compact in-memory graph.
+
+The vertex ids and the edge labels are interned to integers, and the edges are kept in
+CSR(compressed sparse row) arrays, so every edge costs about 20 bytes instead of a
+Python ``Edge`` object in two nested dicts.
+
+The new edges are appended to the small adjacency lists first, and merged into the CSR
+arrays by :meth:`CompactMemoryGraph.compact`. The CSR arrays can be saved to a
+snapshot directory, and memory-mapped when the snapshot is loaded.
+"""
+import itertools
+import json
+import os
+import weakref
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from dbgpt.storage.graph_store.graph import (
+    Direction,
+    Edge,
+    Graph,
+    MemoryGraph,
+    Vertex,
+    search_graph,
+)
+
+_VERTICES_FILE = "vertices.json"
+_LABELS_FILE = "labels.json"
+_VERTEX_PROPS_FILE = "vertex_props.json"
+_ARRAYS = (
+    "out_offsets",
+    "out_targets",
+    "out_labels",
+    "in_offsets",
+    "in_sources",
+    "in_edges",
+)
+
+# (neighbor vertex, label) of an edge
+_Adjacency = Tuple[int, int]
+
+
+class CompactMemoryGraph(Graph):
+    """Graph with interned vertex ids and CSR adjacency arrays.
+
+    Only the label property is kept for the edges, and the duplicated edges(the same
+    source, target and label) are ignored.
+    """
+
+    def __init__(self, vertex_label: Optional[str] = None, edge_label: str = "label"):
+        """Create an empty graph."""
+        assert edge_label, "Edge label is needed"
+        self._vertex_label = vertex_label
+        self._edge_label = edge_label
+        self._vertex_prop_keys = {vertex_label} if vertex_label else set()
+
+        # interned vertex ids, the deleted vertices are None
+        self._vids: List[Optional[str]] = []
+        self._vid_index: Dict[str, int] = {}
+        self._vertex_props: Dict[int, Dict[str, Any]] = {}
+        # interned edge labels
+        self._labels: List[str] = []
+        self._label_index: Dict[str, int] = {}
+
+        # the edges merged into the CSR arrays, the edge id is the index of out arrays
+        self._out_offsets = np.zeros(1, dtype=np.int64)
+        self._out_targets = np.zeros(0, dtype=np.int32)
+        self._out_labels = np.zeros(0, dtype=np.int32)
+        self._in_offsets = np.zeros(1, dtype=np.int64)
+        self._in_sources = np.zeros(0, dtype=np.int32)
+        self._in_edges = np.zeros(0, dtype=np.int64)
+        self._deleted: Set[int] = set()
+
+        # the edges appended after the last compaction
+        self._delta_out: Dict[int, List[_Adjacency]] = defaultdict(list)
+        self._delta_in: Dict[int, List[_Adjacency]] = defaultdict(list)
+        self._delta_count = 0
+
+        self._edge_count = 0
+        # Return the same Edge object for the same edge while it is referenced, the
+        # subgraph search deduplicates the edges by object
+        self._edge_objects: Any = weakref.WeakValueDictionary()
+
+    @property
+    def vertex_label(self):
+        """Return the label for vertices."""
+        return self._vertex_label
+
+    @property
+    def edge_label(self):
+        """Return the label for edges."""
+        return self._edge_label
+
+    @property
+    def vertex_count(self) -> int:
+        """Return the number of vertices in the graph."""
+        return len(self._vid_index)
+
+    @property
+    def edge_count(self) -> int:
+        """Return the count of edges in the graph."""
+        return self._edge_count
+
+    @property
+    def delta_count(self) -> int:
+        """Return the number of edges appended after the last compaction."""
+        return self._delta_count
+
+    def upsert_vertex(self, vertex: Vertex):
+        """Insert or update a vertex based on its ID."""
+        idx = self._intern_vertex(vertex.vid)
+        if vertex.props:
+            self._vertex_props.setdefault(idx, {}).update(vertex.props)
+            self._vertex_prop_keys.update(vertex.props.keys())
+
+    def append_edge(self, edge: Edge) -> bool:
+        """Append an edge if it doesn't exist; requires edge label."""
+        if self._edge_label not in edge.props.keys():
+            raise ValueError(f"Edge prop '{self._edge_label}' is needed")
+        if len(edge.props) > 1:
+            raise ValueError(
+                f"Only the edge prop '{self._edge_label}' is supported by "
+                "CompactMemoryGraph"
+            )
+        sid = self._intern_vertex(edge.sid)
+        tid = self._intern_vertex(edge.tid)
+        label = self._intern_label(str(edge.get_prop(self._edge_label)))
+        if self._has_edge(sid, tid, label):
+            return False
+        self._delta_out[sid].append((tid, label))
+        self._delta_in[tid].append((sid, label))
+        self._delta_count += 1
+        self._edge_count += 1
+        return True
+
+    def has_vertex(self, vid: str) -> bool:
+        """Check vertex exists."""
+        return vid in self._vid_index
+
+    def get_vertex(self, vid: str) -> Vertex:
+        """Retrieve a vertex by ID."""
+        idx = self._vid_index[vid]
+        return Vertex(vid, **self._vertex_props.get(idx, {}))
+
+    def get_neighbor_edges(
+        self,
+        vid: str,
+        direction: Direction = Direction.OUT,
+        limit: Optional[int] = None,
+    ) -> Iterator[Edge]:
+        """Get edges connected to a vertex by direction."""
+        idx = self._vid_index.get(vid)
+        if idx is None:
+            return iter([])
+        if direction == Direction.OUT:
+            es = (self._edge(idx, t, lb) for t, lb in self._out_adjacency(idx))
+        elif direction == Direction.IN:
+            es = (self._edge(s, idx, lb) for s, lb in self._in_adjacency(idx))
+        elif direction == Direction.BOTH:
+            oes = ((idx, t, lb) for t, lb in self._out_adjacency(idx))
+            # The self loops are already in the out edges
+            ies = ((s, idx, lb) for s, lb in self._in_adjacency(idx) if s != idx)
+            tuples = itertools.zip_longest(oes, ies)
+            es = (self._edge(*e) for t in tuples for e in t if e is not None)
+        else:
+            raise ValueError(f"Invalid direction: {direction}")
+        return itertools.islice(es, limit) if limit else es
+
+    def vertices(self) -> Iterator[Vertex]:
+        """Return vertices."""
+        return (self.get_vertex(vid) for vid in list(self._vid_index.keys()))
+
+    def edges(self) -> Iterator[Edge]:
+        """Return edges."""
+        return (
+            self._edge(sid, tid, label)
+            for sid in range(len(self._vids))
+            for tid, label in self._out_adjacency(sid)
+        )
+
+    def del_vertices(self, *vids: str):
+        """Delete specified vertices and their neighbor edges."""
+        for vid in vids:
+            if vid not in self._vid_index:
+                continue
+            self.del_neighbor_edges(vid, Direction.BOTH)
+            idx = self._vid_index.pop(vid)
+            self._vids[idx] = None
+            self._vertex_props.pop(idx, None)
+
+    def del_edges(self, sid: str, tid: str, **props):
+        """Delete edges(sid -> tid) matches props."""
+        s, t = self._vid_index.get(sid), self._vid_index.get(tid)
+        if s is None or t is None:
+            return
+        label: Optional[int] = None
+        if props:
+            if set(props.keys()) != {self._edge_label}:
+                # The edges have no other props
+                return
+            label = self._label_index.get(str(props[self._edge_label]))
+            if label is None:
+                return
+        self._del_matches(
+            s, lambda target, lb: target == t and (label is None or lb == label)
+        )
+
+    def del_neighbor_edges(self, vid: str, direction: Direction = Direction.OUT):
+        """Delete all neighbor edges."""
+        idx = self._vid_index.get(vid)
+        if idx is None:
+            return
+        if direction in [Direction.OUT, Direction.BOTH]:
+            self._del_matches(idx, lambda target, lb: True)
+        if direction in [Direction.IN, Direction.BOTH]:
+            for s in {s for s, _ in self._in_adjacency(idx)}:
+                self._del_matches(s, lambda target, lb: target == idx)
+
+    def search(
+        self,
+        vids: List[str],
+        direct: Direction = Direction.OUT,
+        depth: Optional[int] = None,
+        fan: Optional[int] = None,
+        limit: Optional[int] = None,
+        hop_fans: Optional[Sequence[int]] = None,
+        score_fn: Optional[Callable[[Edge, int], float]] = None,
+    ) -> MemoryGraph:
+        """Search the graph from the vertices with specified parameters."""
+        return search_graph(
+            self, vids, direct, depth, fan, limit, hop_fans=hop_fans, score_fn=score_fn
+        )
+
+    def schema(self) -> Dict[str, Any]:
+        """Return schema."""
+        return {
+            "schema": [
+                {
+                    "type": "VERTEX",
+                    "label": f"{self._vertex_label}",
+                    "properties": [{"name": k} for k in self._vertex_prop_keys],
+                },
+                {
+                    "type": "EDGE",
+                    "label": f"{self._edge_label}",
+                    "properties": [{"name": self._edge_label}],
+                },
+            ]
+        }
+
+    def format(self) -> str:
+        """Format graph to string."""
+        vs_str = "\n".join(v.format(self.vertex_label) for v in self.vertices())
+        es_str = "\n".join(
+            f"{self.get_vertex(e.sid).format(self.vertex_label)}"
+            f"{e.format(self.edge_label)}"
+            f"{self.get_vertex(e.tid).format(self.vertex_label)}"
+            for e in self.edges()
+        )
+        return f"Vertices:\n{vs_str}\n\nEdges:\n{es_str}"
+
+    def compact(self) -> None:
+        """Merge the appended edges into the CSR arrays, drop the deleted edges."""
+        n = len(self._vids)
+        base_sources = np.repeat(
+            np.arange(len(self._out_offsets) - 1, dtype=np.int32),
+            np.diff(self._out_offsets),
+        )
+        alive = np.ones(len(self._out_targets), dtype=bool)
+        if self._deleted:
+            alive[np.fromiter(self._deleted, dtype=np.int64)] = False
+        delta = [
+            (s, t, lb)
+            for s, adjacency in self._delta_out.items()
+            for t, lb in adjacency
+        ]
+        delta_arr = np.array(delta, dtype=np.int32).reshape(-1, 3)
+        sources = np.concatenate([base_sources[alive], delta_arr[:, 0]])
+        targets = np.concatenate([self._out_targets[alive], delta_arr[:, 1]])
+        labels = np.concatenate([self._out_labels[alive], delta_arr[:, 2]])
+
+        order = np.argsort(sources, kind="stable")
+        sources, targets, labels = sources[order], targets[order], labels[order]
+        in_edges = np.argsort(targets, kind="stable").astype(np.int64)
+
+        self._out_offsets = _offsets(sources, n)
+        self._out_targets = targets.astype(np.int32)
+        self._out_labels = labels.astype(np.int32)
+        self._in_offsets = _offsets(targets, n)
+        self._in_sources = sources[in_edges].astype(np.int32)
+        self._in_edges = in_edges
+        self._deleted = set()
+        self._delta_out = defaultdict(list)
+        self._delta_in = defaultdict(list)
+        self._delta_count = 0
+        self._edge_count = len(self._out_targets)
+
+    def save_snapshot(self, path: str) -> None:
+        """Compact the graph and save it to the snapshot directory."""
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, _VERTICES_FILE), "w", encoding="utf-8") as f:
+            json.dump(self._vids, f, ensure_ascii=False)
+        with open(os.path.join(path, _LABELS_FILE), "w", encoding="utf-8") as f:
+            json.dump(self._labels, f, ensure_ascii=False)
+        with open(os.path.join(path, _VERTEX_PROPS_FILE), "w", encoding="utf-8") as f:
+            json.dump(
+                {str(k): v for k, v in self._vertex_props.items()},
+                f,
+                ensure_ascii=False,
+                default=str,
+            )
+        for name in _ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, f"_{name}"))
+
+    @classmethod
+    def load_snapshot(
+        cls,
+        path: str,
+        vertex_label: Optional[str] = None,
+        edge_label: str = "label",
+    ) -> "CompactMemoryGraph":
+        """Load the graph from the snapshot directory.
+
+        The CSR arrays are memory-mapped, they are read from the disk on demand.
+        """
+        graph = cls(vertex_label=vertex_label, edge_label=edge_label)
+        with open(os.path.join(path, _VERTICES_FILE), encoding="utf-8") as f:
+            graph._vids = json.load(f)
+        with open(os.path.join(path, _LABELS_FILE), encoding="utf-8") as f:
+            graph._labels = json.load(f)
+        with open(os.path.join(path, _VERTEX_PROPS_FILE), encoding="utf-8") as f:
+            graph._vertex_props = {int(k): v for k, v in json.load(f).items()}
+        graph._vid_index = {
+            vid: idx for idx, vid in enumerate(graph._vids) if vid is not None
+        }
+        graph._label_index = {label: idx for idx, label in enumerate(graph._labels)}
+        for props in graph._vertex_props.values():
+            graph._vertex_prop_keys.update(props.keys())
+        for name in _ARRAYS:
+            setattr(graph, f"_{name}", _load_array(os.path.join(path, f"{name}.npy")))
+        graph._edge_count = len(graph._out_targets)
+        return graph
+
+    def _intern_vertex(self, vid: str) -> int:
+        idx = self._vid_index.get(vid)
+        if idx is None:
+            idx = len(self._vids)
+            self._vids.append(vid)
+            self._vid_index[vid] = idx
+        return idx
+
+    def _intern_label(self, label: str) -> int:
+        idx = self._label_index.get(label)
+        if idx is None:
+            idx = len(self._labels)
+            self._labels.append(label)
+            self._label_index[label] = idx
+        return idx
+
+    def _edge(self, sid: int, tid: int, label: int) -> Edge:
+        key = (sid, tid, label)
+        edge = self._edge_objects.get(key)
+        if edge is None:
+            edge = Edge(
+                self._vids[sid],  # type: ignore
+                self._vids[tid],  # type: ignore
+                **{self._edge_label: self._labels[label]},
+            )
+            self._edge_objects[key] = edge
+        return edge
+
+    def _base_out(self, idx: int) -> Iterator[Tuple[int, int, int]]:
+        """Yield (edge id, target, label) of the out edges in the CSR arrays."""
+        if idx >= len(self._out_offsets) - 1:
+            return
+        start, end = int(self._out_offsets[idx]), int(self._out_offsets[idx + 1])
+        targets = self._out_targets[start:end].tolist()
+        labels = self._out_labels[start:end].tolist()
+        for eid, target, label in zip(range(start, end), targets, labels):
+            if eid not in self._deleted:
+                yield eid, target, label
+
+    def _out_adjacency(self, idx: int) -> Iterator[_Adjacency]:
+        for _, target, label in self._base_out(idx):
+            yield target, label
+        yield from list(self._delta_out.get(idx, []))
+
+    def _in_adjacency(self, idx: int) -> Iterator[_Adjacency]:
+        if idx < len(self._in_offsets) - 1:
+            start, end = int(self._in_offsets[idx]), int(self._in_offsets[idx + 1])
+            sources = self._in_sources[start:end].tolist()
+            eids = self._in_edges[start:end].tolist()
+            for eid, source in zip(eids, sources):
+                if eid not in self._deleted:
+                    yield source, int(self._out_labels[eid])
+        yield from list(self._delta_in.get(idx, []))
+
+    def _has_edge(self, sid: int, tid: int, label: int) -> bool:
+        if (tid, label) in self._delta_out.get(sid, []):
+            return True
+        return any(t == tid and lb == label for _, t, lb in self._base_out(sid))
+
+    def _del_matches(self, sid: int, match) -> None:
+        """Delete the out edges of the vertex which match(target, label)."""
+        for eid, target, label in list(self._base_out(sid)):
+            if match(target, label):
+                self._deleted.add(eid)
+                self._edge_count -= 1
+        adjacency = self._delta_out.get(sid)
+        if not adjacency:
+            return
+        kept = []
+        for target, label in adjacency:
+            if match(target, label):
+                self._delta_in[target].remove((sid, label))
+                self._delta_count -= 1
+                self._edge_count -= 1
+            else:
+                kept.append((target, label))
+        self._delta_out[sid] = kept
+
+
+def _offsets(ids: np.ndarray, n: int) -> np.ndarray:
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ids, minlength=n), out=offsets[1:])
+    return offsets
+
+
+def _load_array(path: str) -> np.ndarray:
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        # The empty array can not be memory-mapped
+        return np.load(path)
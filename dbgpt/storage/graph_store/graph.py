@@ -6,7 +6,18 @@ import re
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from enum import Enum
-from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 import networkx as nx
 
@@ -192,8 +203,10 @@ class Graph(ABC):
         depth: Optional[int] = None,
         fan: Optional[int] = None,
         limit: Optional[int] = None,
+        hop_fans: Optional[Sequence[int]] = None,
+        score_fn: Optional[Callable[[Edge, int], float]] = None,
     ) -> "Graph":
-        """Search on graph."""
+        """Search on graph, see :func:`search_graph` for the arguments."""
 
     @abstractmethod
     def schema(self) -> Dict[str, Any]:
@@ -386,52 +399,13 @@ class MemoryGraph(Graph):
         depth: Optional[int] = None,
         fan: Optional[int] = None,
         limit: Optional[int] = None,
+        hop_fans: Optional[Sequence[int]] = None,
+        score_fn: Optional[Callable[[Edge, int], float]] = None,
     ) -> "MemoryGraph":
-        """Search the graph from a vertex with specified parameters."""
-        subgraph = MemoryGraph()
-
-        for vid in vids:
-            self.__search(vid, direct, depth, fan, limit, 0, set(), subgraph)
-
-        return subgraph
-
-    def __search(
-        self,
-        vid: str,
-        direct: Direction,
-        depth: Optional[int],
-        fan: Optional[int],
-        limit: Optional[int],
-        _depth: int,
-        _visited: Set,
-        _subgraph: "MemoryGraph",
-    ):
-        if vid in _visited or depth and _depth >= depth:
-            return
-
-        # visit vertex
-        if not self.has_vertex(vid):
-            return
-        _subgraph.upsert_vertex(self.get_vertex(vid))
-        _visited.add(vid)
-
-        # visit edges
-        nids = set()
-        for edge in self.get_neighbor_edges(vid, direct, fan):
-            if limit and _subgraph.edge_count >= limit:
-                return
-
-            # append edge success then visit new vertex
-            if _subgraph.append_edge(edge):
-                nid = edge.nid(vid)
-                if nid not in _visited:
-                    nids.add(nid)
-
-        # next hop
-        for nid in nids:
-            self.__search(
-                nid, direct, depth, fan, limit, _depth + 1, _visited, _subgraph
-            )
+        """Search the graph from the vertices with specified parameters."""
+        return search_graph(
+            self, vids, direct, depth, fan, limit, hop_fans=hop_fans, score_fn=score_fn
+        )
 
     def schema(self) -> Dict[str, Any]:
         """Return schema."""
@@ -475,3 +449,121 @@ class MemoryGraph(Graph):
         digraph = digraph.replace('digraph ""', f"digraph {name}")
         digraph = re.sub(r"key=\d+,?\s*", "", digraph)
         return digraph
+
+
+def search_graph(
+    graph: Graph,
+    vids: List[str],
+    direct: Direction = Direction.OUT,
+    depth: Optional[int] = None,
+    fan: Optional[int] = None,
+    limit: Optional[int] = None,
+    hop_fans: Optional[Sequence[int]] = None,
+    score_fn: Optional[Callable[[Edge, int], float]] = None,
+) -> MemoryGraph:
+    """Search the subgraph from the vertices, it works on any graph.
+
+    The graph is explored breadth-first from all the seed vertices at once, one hop
+    at a time. In every hop the seeds take turns to add an edge, so every seed gets
+    its share of the ``limit``, and the deep graphs do not exhaust the recursion
+    limit.
+
+    Args:
+        graph (Graph): The graph to search.
+        vids (List[str]): The seed vertices.
+        direct (Direction): The direction of the edges to follow.
+        depth (Optional[int]): The max number of the hops, no limit if not set.
+        fan (Optional[int]): The max number of the edges to follow from a vertex.
+        limit (Optional[int]): The max number of the edges of the subgraph, the
+            search stops as soon as it is reached.
+        hop_fans (Optional[Sequence[int]]): The fan of every hop, overrides ``fan``
+            for the first ``len(hop_fans)`` hops.
+        score_fn (Optional[Callable[[Edge, int], float]]): Score an edge at a hop. If
+            set, all the edges of a vertex are scored before its fan is applied, and
+            every seed follows its edges of a hop in the descending order of the path
+            score(the sum of the edge scores from the seed), so the best paths are
+            kept when the fan or the ``limit`` is reached.
+
+    Returns:
+        MemoryGraph: The subgraph.
+    """
+    subgraph = MemoryGraph()
+    # The frontier vertices reached from every seed with their path scores, a vertex
+    # belongs to the seed which reaches it first
+    frontiers: List[Dict[str, float]] = [
+        {vid: 0.0} for vid in dict.fromkeys(vids) if graph.has_vertex(vid)
+    ]
+    visited: Set[str] = {vid for frontier in frontiers for vid in frontier}
+    hop = 0
+    while any(frontiers) and not (depth and hop >= depth):
+        # visit vertices
+        for frontier in frontiers:
+            for vid in frontier:
+                subgraph.upsert_vertex(graph.get_vertex(vid))
+
+        # visit edges, the new vertices are the frontier of the next hop
+        hop_fan = hop_fans[hop] if hop_fans and hop < len(hop_fans) else fan
+        seed_edges = [
+            _hop_edges(graph, frontier, direct, hop, hop_fan, score_fn)
+            for frontier in frontiers
+        ]
+        next_frontiers: List[Dict[str, float]] = [{} for _ in frontiers]
+        for seed, (vid, edge, score) in _round_robin(seed_edges):
+            if limit and subgraph.edge_count >= limit:
+                return subgraph
+            if subgraph.append_edge(edge):
+                nid = edge.nid(vid)
+                if nid not in visited:
+                    visited.add(nid)
+                    next_frontiers[seed][nid] = score
+        frontiers = next_frontiers
+        hop += 1
+
+    return subgraph
+
+
+def _hop_edges(
+    graph: Graph,
+    frontier: Dict[str, float],
+    direct: Direction,
+    hop: int,
+    fan: Optional[int],
+    score_fn: Optional[Callable[[Edge, int], float]],
+) -> Iterator[Tuple[str, Edge, float]]:
+    """Return the edges to follow from the frontier of a seed in a hop."""
+    if not score_fn:
+        return (
+            (vid, edge, score)
+            for vid, score in frontier.items()
+            for edge in graph.get_neighbor_edges(vid, direct, fan)
+        )
+    candidates: List[Tuple[str, Edge, float]] = []
+    for vid, score in frontier.items():
+        # Score all the edges of the vertex, then keep the best ones by the fan
+        scored = sorted(
+            (
+                (vid, edge, score + score_fn(edge, hop))
+                for edge in graph.get_neighbor_edges(vid, direct)
+            ),
+            key=lambda c: c[2],
+            reverse=True,
+        )
+        candidates.extend(scored[:fan] if fan else scored)
+    candidates.sort(key=lambda c: c[2], reverse=True)
+    return iter(candidates)
+
+
+_T = TypeVar("_T")
+
+
+def _round_robin(iterators: List[Iterator[_T]]) -> Iterator[Tuple[int, _T]]:
+    """Take one item from every iterator in turn, with the index of the iterator."""
+    active = list(enumerate(iterators))
+    while active:
+        remaining = []
+        for i, iterator in active:
+            for item in iterator:
+                yield i, item
+                remaining.append((i, iterator))
+                break
+        active = remaining
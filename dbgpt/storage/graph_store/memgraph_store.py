@@ -1,14 +1,28 @@
 """Graph store base class."""
 import json
 import logging
-from typing import List, Optional, Tuple
+import os
+import shutil
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from dbgpt._private.pydantic import ConfigDict, Field
 from dbgpt.storage.graph_store.base import GraphStoreBase, GraphStoreConfig
+from dbgpt.storage.graph_store.compact_graph import CompactMemoryGraph
 from dbgpt.storage.graph_store.graph import Direction, Edge, Graph, MemoryGraph
 
+try:
+    import fcntl
+except ImportError:
+    # Windows, the writes are only serialized in the process
+    fcntl = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
+_CURRENT_FILE = "CURRENT"
+
 
 class MemoryGraphStoreConfig(GraphStoreConfig):
     """Memory graph store config."""
@@ -19,19 +33,60 @@ class MemoryGraphStoreConfig(GraphStoreConfig):
         default="label",
         description="The label of edge name, `label` by default.",
     )
+    persist_path: Optional[str] = Field(
+        default=os.getenv("MEMORY_GRAPH_PERSIST_PATH", None),
+        description="The persist path of the graph, the graph is only kept in memory "
+        "if it is not set.",
+    )
+    snapshot_interval: int = Field(
+        default=10000,
+        description="Write a new snapshot of the graph after this number of the "
+        "changes, the changes after the last snapshot are replayed from the log.",
+    )
 
 
 class MemoryGraphStore(GraphStoreBase):
-    """Memory graph store."""
+    """Memory graph store.
+
+    The graph is kept in a :class:`CompactMemoryGraph`. If the persist path is set,
+    the files in the persist directory are:
+
+    - ``CURRENT``: the generation of the current snapshot and log.
+    - ``snapshot-<generation>``: the snapshot of the graph, its arrays are
+      memory-mapped when the store is opened.
+    - ``log-<generation>.jsonl``: the append-only log of the changes after the
+      snapshot.
+
+    All the stores of the same persist directory in the process share one graph, and
+    the writes hold a file lock and catch up with the snapshot and the log first, so
+    the stores in the other processes do not lose the changes of each other.
+    """
 
     def __init__(self, graph_store_config: MemoryGraphStoreConfig):
         """Initialize MemoryGraphStore with a memory graph."""
         self._edge_name_key = graph_store_config.edge_name_key
-        self._graph = MemoryGraph(edge_label=self._edge_name_key)
+        snapshot_interval = max(graph_store_config.snapshot_interval, 1)
+        if graph_store_config.persist_path:
+            persist_dir = os.path.join(
+                graph_store_config.persist_path, graph_store_config.name + ".memgraph"
+            )
+            self._graph_files = _get_graph_files(
+                persist_dir, self._edge_name_key, snapshot_interval
+            )
+        else:
+            self._graph_files = _GraphFiles(
+                None, self._edge_name_key, snapshot_interval
+            )
 
     def insert_triplet(self, sub: str, rel: str, obj: str):
         """Insert a triplet into the graph."""
-        self._graph.append_edge(Edge(sub, obj, **{self._edge_name_key: rel}))
+        self.insert_triplets([(sub, rel, obj)])
+
+    def insert_triplets(self, triplets: List[Tuple[str, str, str]]):
+        """Insert triplets into the graph in bulk."""
+        self._graph_files.update(
+            [{"op": "add", "triplet": [sub, rel, obj]} for sub, rel, obj in triplets]
+        )
 
     def get_triplets(self, sub: str) -> List[Tuple[str, str]]:
         """Retrieve triplets originating from a subject."""
@@ -40,30 +95,32 @@ class MemoryGraphStore(GraphStoreBase):
 
     def delete_triplet(self, sub: str, rel: str, obj: str):
         """Delete a specific triplet from the graph."""
-        self._graph.del_edges(sub, obj, **{self._edge_name_key: rel})
+        self._graph_files.update([{"op": "delete", "triplet": [sub, rel, obj]}])
 
     def drop(self):
         """Drop graph."""
-        self._graph = None
+        self._graph_files.drop()
 
     def get_schema(self, refresh: bool = False) -> str:
         """Return the graph schema as a JSON string."""
-        return json.dumps(self._graph.schema())
+        with self._graph_files.read() as graph:
+            return json.dumps(graph.schema())
 
-    def get_full_graph(self, limit: Optional[int] = None) -> MemoryGraph:
+    def get_full_graph(self, limit: Optional[int] = None) -> Graph:
         """Return self."""
-        if not limit:
-            return self._graph
-
-        subgraph = MemoryGraph()
-        for count, edge in enumerate(self._graph.edges()):
-            if count >= limit:
-                break
-            subgraph.upsert_vertex(self._graph.get_vertex(edge.sid))
-            subgraph.upsert_vertex(self._graph.get_vertex(edge.tid))
-            subgraph.append_edge(edge)
-            count += 1
-        return subgraph
+        with self._graph_files.read() as graph:
+            if not limit:
+                return graph
+
+            subgraph = MemoryGraph()
+            for count, edge in enumerate(graph.edges()):
+                if count >= limit:
+                    break
+                subgraph.upsert_vertex(graph.get_vertex(edge.sid))
+                subgraph.upsert_vertex(graph.get_vertex(edge.tid))
+                subgraph.append_edge(edge)
+                count += 1
+            return subgraph
 
     def explore(
         self,
@@ -74,8 +131,259 @@ class MemoryGraphStore(GraphStoreBase):
         limit: Optional[int] = None,
     ) -> MemoryGraph:
         """Explore the graph from given subjects up to a depth."""
-        return self._graph.search(subs, direct, depth, fan, limit)
+        with self._graph_files.read() as graph:
+            return graph.search(subs, direct, depth, fan, limit)
 
     def query(self, query: str, **args) -> Graph:
         """Execute a query on graph."""
         raise NotImplementedError("Query memory graph not allowed")
+
+    def persist(self) -> None:
+        """Compact the graph and write a new snapshot."""
+        self._graph_files.persist()
+
+
+# The shared graphs of the persist directories in the process
+_GRAPH_FILES: "weakref.WeakValueDictionary[str, _GraphFiles]" = (
+    weakref.WeakValueDictionary()
+)
+_GRAPH_FILES_LOCK = threading.Lock()
+
+
+def _get_graph_files(
+    persist_dir: str, edge_label: str, snapshot_interval: int
+) -> "_GraphFiles":
+    """Get the shared graph of the persist directory, open it if not opened."""
+    key = os.path.realpath(persist_dir)
+    with _GRAPH_FILES_LOCK:
+        graph_files = _GRAPH_FILES.get(key)
+        if graph_files is None:
+            graph_files = _GraphFiles(key, edge_label, snapshot_interval)
+            _GRAPH_FILES[key] = graph_files
+        elif graph_files.edge_label != edge_label:
+            logger.warning(
+                f"Memory graph {persist_dir} is opened with the edge label "
+                f"{graph_files.edge_label}, ignore the edge label {edge_label}"
+            )
+        return graph_files
+
+
+class _GraphFiles:
+    """The graph of one persist directory, or a graph only kept in memory."""
+
+    def __init__(
+        self, persist_dir: Optional[str], edge_label: str, snapshot_interval: int
+    ):
+        self.persist_dir = persist_dir
+        self.edge_label = edge_label
+        self._snapshot_interval = snapshot_interval
+        self._lock = threading.RLock()
+        self._file_lock_depth = 0
+        self._reset()
+        if persist_dir:
+            with self._lock, self._file_lock():
+                self._load()
+            logger.info(
+                f"Open memory graph {persist_dir}, {self.graph.edge_count} edges"
+            )
+
+    def _reset(self) -> None:
+        self.graph = CompactMemoryGraph(edge_label=self.edge_label)
+        self._generation = 0
+        # The files read, a replaced file is loaded again
+        self._current_ino: Optional[int] = None
+        self._log_ino: Optional[int] = None
+        # The number of the records and the bytes read from the log
+        self._log_size = 0
+        self._log_offset = 0
+
+    @contextmanager
+    def read(self) -> Iterator[CompactMemoryGraph]:
+        """Hold the lock and catch up with the changes of the other processes."""
+        with self._lock:
+            if self.persist_dir and self._changed():
+                with self._file_lock():
+                    self._load()
+            yield self.graph
+
+    def update(self, records: List[Dict[str, Any]]) -> None:
+        """Apply the change records to the graph and append the changed to the log."""
+        with self._lock:
+            if not self.persist_dir:
+                for record in records:
+                    self._apply_record(record)
+                if self.graph.delta_count >= self._snapshot_interval:
+                    self.graph.compact()
+                return
+            with self._file_lock():
+                self._load()
+                records = [r for r in records if self._apply_record(r)]
+                if not records:
+                    return
+                self._append_log(records)
+                if self._log_size >= self._snapshot_interval:
+                    self._write_snapshot()
+
+    def persist(self) -> None:
+        """Compact the graph and write a new snapshot."""
+        with self._lock:
+            if not self.persist_dir:
+                self.graph.compact()
+                return
+            with self._file_lock():
+                self._load()
+                self._write_snapshot()
+
+    def drop(self) -> None:
+        with self._lock:
+            if not self.persist_dir:
+                self._reset()
+                return
+            with self._file_lock():
+                if os.path.exists(self.persist_dir):
+                    shutil.rmtree(self.persist_dir)
+                self._reset()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.persist_dir, name)  # type: ignore
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold the file lock of the persist directory, it is reentrant.
+
+        It must be called with the thread lock held. The lock file is out of the
+        persist directory, so it is not removed by :meth:`drop`.
+        """
+        if fcntl is None or self._file_lock_depth:
+            self._file_lock_depth += 1
+            try:
+                yield
+            finally:
+                self._file_lock_depth -= 1
+            return
+        os.makedirs(os.path.dirname(self.persist_dir), exist_ok=True)  # type: ignore
+        with open(self.persist_dir + ".lock", "a") as f:  # type: ignore
+            fcntl.flock(f, fcntl.LOCK_EX)
+            self._file_lock_depth = 1
+            try:
+                yield
+            finally:
+                self._file_lock_depth = 0
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _stat(self, name: str) -> Tuple[Optional[int], int]:
+        try:
+            stat = os.stat(self._path(name))
+            return stat.st_ino, stat.st_size
+        except FileNotFoundError:
+            return None, 0
+
+    def _changed(self) -> bool:
+        """Whether the files are changed by the other processes, without reading."""
+        current_ino, _ = self._stat(_CURRENT_FILE)
+        log_ino, log_size = self._stat(f"log-{self._generation}.jsonl")
+        return (
+            current_ino != self._current_ino
+            or log_ino != self._log_ino
+            or log_size > self._log_offset
+        )
+
+    def _load(self) -> None:
+        """Catch up with the snapshot and the log, with the file lock held.
+
+        The graph is loaded again if a new snapshot is written or the graph is dropped
+        by the other processes, otherwise only the new records of the log are read.
+        """
+        current_ino, _ = self._stat(_CURRENT_FILE)
+        generation = 0
+        if current_ino is not None:
+            with open(self._path(_CURRENT_FILE)) as f:
+                generation = json.load(f)["generation"]
+        log_file = f"log-{generation}.jsonl"
+        log_ino, log_size = self._stat(log_file)
+        if (
+            current_ino != self._current_ino
+            or generation != self._generation
+            or (self._log_ino is not None and log_ino != self._log_ino)
+            or log_size < self._log_offset
+        ):
+            self._reset()
+            self._generation = generation
+            self._current_ino = current_ino
+            snapshot_dir = self._path(f"snapshot-{generation}")
+            if os.path.exists(snapshot_dir):
+                self.graph = CompactMemoryGraph.load_snapshot(
+                    snapshot_dir, edge_label=self.edge_label
+                )
+        self._log_ino = log_ino
+        if log_size <= self._log_offset:
+            return
+        with open(self._path(log_file), "rb") as f:
+            f.seek(self._log_offset)
+            data = f.read(log_size - self._log_offset)
+        # The last line may be broken by a crash, it is truncated at the next write
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skip a broken record of the memory graph")
+                continue
+            self._apply_record(record)
+            self._log_size += 1
+        self._log_offset += end
+
+    def _append_log(self, records: List[Dict[str, Any]]) -> None:
+        os.makedirs(self.persist_dir, exist_ok=True)  # type: ignore
+        log_file = self._path(f"log-{self._generation}.jsonl")
+        with open(log_file, "ab") as f:
+            # Drop the broken last line left by a crash
+            f.truncate(self._log_offset)
+            f.write(
+                "".join(
+                    json.dumps(r, ensure_ascii=False) + "\n" for r in records
+                ).encode("utf-8")
+            )
+        self._log_ino, self._log_offset = self._stat(log_file)
+        self._log_size += len(records)
+
+    def _write_snapshot(self) -> None:
+        """Write the next generation, with the file lock held and the log read."""
+        os.makedirs(self.persist_dir, exist_ok=True)  # type: ignore
+        generation = self._generation + 1
+        snapshot_dir = self._path(f"snapshot-{generation}")
+        if os.path.exists(snapshot_dir):
+            # Left by a crash before switching to it
+            shutil.rmtree(snapshot_dir)
+        self.graph.save_snapshot(snapshot_dir)
+        log_file = self._path(f"log-{generation}.jsonl")
+        open(log_file, "w").close()
+        tmp_file = self._path(f"{_CURRENT_FILE}.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump({"generation": generation}, f)
+        os.replace(tmp_file, self._path(_CURRENT_FILE))
+
+        old_snapshot = self._path(f"snapshot-{self._generation}")
+        old_log = self._path(f"log-{self._generation}.jsonl")
+        self._generation = generation
+        self._current_ino, _ = self._stat(_CURRENT_FILE)
+        self._log_ino, self._log_offset = self._stat(f"log-{generation}.jsonl")
+        self._log_size = 0
+        if os.path.exists(old_snapshot):
+            shutil.rmtree(old_snapshot)
+        if os.path.exists(old_log):
+            os.remove(old_log)
+        logger.info(
+            f"Save memory graph snapshot {snapshot_dir}, "
+            f"{self.graph.edge_count} edges"
+        )
+
+    def _apply_record(self, record: Dict[str, Any]) -> bool:
+        """Apply the change record to the graph, return whether it is changed."""
+        sub, rel, obj = record["triplet"]
+        if record["op"] == "add":
+            return self.graph.append_edge(Edge(sub, obj, **{self.edge_label: rel}))
+        elif record["op"] == "delete":
+            self.graph.del_edges(sub, obj, **{self.edge_label: rel})
+            return True
+        return False
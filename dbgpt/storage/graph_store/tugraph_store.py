@@ -44,6 +44,15 @@ class TuGraphStoreConfig(GraphStoreConfig):
         default="label",
         description="The label of edge name, `label` by default.",
     )
+    triplet_batch_size: int = Field(
+        default=100,
+        description="The max number of triplets to write in one query.",
+    )
+
+
+def _escape_quotes(value: str) -> str:
+    """Escape single and double quotes in a string for queries."""
+    return value.replace("'", "\\'").replace('"', '\\"')
 
 
 class TuGraphStore(GraphStoreBase):
@@ -65,6 +74,7 @@ class TuGraphStore(GraphStoreBase):
             os.getenv("TUGRAPH_EDGE_NAME_KEY", "label") or config.edge_name_key
         )
         self._graph_name = config.name
+        self._triplet_batch_size = max(config.triplet_batch_size, 1)
         self.conn = TuGraphConnector.from_uri_db(
             host=self._host,
             port=self._port,
@@ -108,14 +118,9 @@ class TuGraphStore(GraphStoreBase):
 
     def insert_triplet(self, subj: str, rel: str, obj: str) -> None:
         """Add triplet."""
-
-        def escape_quotes(value: str) -> str:
-            """Escape single and double quotes in a string for queries."""
-            return value.replace("'", "\\'").replace('"', '\\"')
-
-        subj_escaped = escape_quotes(subj)
-        rel_escaped = escape_quotes(rel)
-        obj_escaped = escape_quotes(obj)
+        subj_escaped = _escape_quotes(subj)
+        rel_escaped = _escape_quotes(rel)
+        obj_escaped = _escape_quotes(obj)
 
         subj_query = f"MERGE (n1:{self._node_label} {{id:'{subj_escaped}'}})"
         obj_query = f"MERGE (n1:{self._node_label} {{id:'{obj_escaped}'}})"
@@ -128,6 +133,22 @@ class TuGraphStore(GraphStoreBase):
         self.conn.run(query=obj_query)
         self.conn.run(query=rel_query)
 
+    def insert_triplets(self, triplets: List[Tuple[str, str, str]]) -> None:
+        """Add triplets in batches, one query for every batch."""
+        for i in range(0, len(triplets), self._triplet_batch_size):
+            rows = ",".join(
+                f"{{s:'{_escape_quotes(subj)}',r:'{_escape_quotes(rel)}',"
+                f"o:'{_escape_quotes(obj)}'}}"
+                for subj, rel, obj in triplets[i : i + self._triplet_batch_size]
+            )
+            query = (
+                f"UNWIND [{rows}] AS t "
+                f"MERGE (n1:{self._node_label} {{id:t.s}}) "
+                f"MERGE (n2:{self._node_label} {{id:t.o}}) "
+                f"MERGE (n1)-[r:{self._edge_label} {{id:t.r}}]->(n2)"
+            )
+            self.conn.run(query=query)
+
     def drop(self):
         """Delete Graph."""
         self.conn.delete_graph(self._graph_name)
@@ -2,7 +2,7 @@
 import asyncio
 import logging
 import os
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from dbgpt._private.pydantic import ConfigDict, Field
 from dbgpt.core import Chunk, LLMClient
@@ -13,6 +13,7 @@ from dbgpt.storage.graph_store.factory import GraphStoreFactory
 from dbgpt.storage.graph_store.graph import Graph
 from dbgpt.storage.knowledge_graph.base import KnowledgeGraphBase, KnowledgeGraphConfig
 from dbgpt.storage.vector_store.filters import MetadataFilters
+from dbgpt.util.executor_utils import blocking_func_to_async
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,16 @@ class BuiltinKnowledgeGraphConfig(KnowledgeGraphConfig):
         default="TuGraph", description="The type of graph store."
     )
 
+    max_concurrent_extractions: int = Field(
+        default=5,
+        description="The max number of chunks to extract triplets from concurrently.",
+    )
+
+    max_triplets_once_write: int = Field(
+        default=100,
+        description="The max number of triplets to write to graph store at once.",
+    )
+
 
 class BuiltinKnowledgeGraph(KnowledgeGraphBase):
     """Builtin knowledge graph class."""
@@ -59,37 +70,54 @@ class BuiltinKnowledgeGraph(KnowledgeGraphBase):
 
     def load_document(self, chunks: List[Chunk]) -> List[str]:
         """Extract and persist triplets to graph store."""
-
-        async def process_chunk(chunk):
-            triplets = await self._triplet_extractor.extract(chunk.content)
-            for triplet in triplets:
-                self._graph_store.insert_triplet(*triplet)
-            logger.info(f"load {len(triplets)} triplets from chunk {chunk.chunk_id}")
-            return chunk.chunk_id
-
         # wait async tasks completed
-        tasks = [process_chunk(chunk) for chunk in chunks]
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(asyncio.gather(*tasks))
-        loop.close()
-        return result
+        try:
+            return loop.run_until_complete(self.aload_document(chunks))
+        finally:
+            loop.close()
 
     async def aload_document(self, chunks: List[Chunk]) -> List[str]:  # type: ignore
         """Extract and persist triplets to graph store.
 
+        The triplets are extracted from the chunks concurrently, and written to the
+        graph store in batches while the extraction is in progress.
+
         Args:
             chunks: List[Chunk]: document chunks.
         Return:
             List[str]: chunk ids.
         """
-        for chunk in chunks:
-            triplets = await self._triplet_extractor.extract(chunk.content)
-            for triplet in triplets:
-                self._graph_store.insert_triplet(*triplet)
+        semaphore = asyncio.Semaphore(max(self._config.max_concurrent_extractions, 1))
+        batch_size = max(self._config.max_triplets_once_write, 1)
+
+        async def extract(chunk: Chunk) -> List[Tuple[str, str, str]]:
+            async with semaphore:
+                triplets = await self._triplet_extractor.extract(chunk.content)
             logger.info(f"load {len(triplets)} triplets from chunk {chunk.chunk_id}")
+            return triplets
+
+        tasks = [asyncio.create_task(extract(chunk)) for chunk in chunks]
+        pending: List[Tuple[str, str, str]] = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                pending.extend(await next_done)
+                while len(pending) >= batch_size:
+                    await self._insert_triplets(pending[:batch_size])
+                    pending = pending[batch_size:]
+            if pending:
+                await self._insert_triplets(pending)
+        finally:
+            for task in tasks:
+                task.cancel()
         return [chunk.chunk_id for chunk in chunks]
 
+    async def _insert_triplets(self, triplets: List[Tuple[str, str, str]]):
+        await blocking_func_to_async(
+            self._executor, self._graph_store.insert_triplets, triplets
+        )
+
     def similar_search_with_scores(
         self,
         text,
@@ -113,7 +141,10 @@ class BuiltinKnowledgeGraph(KnowledgeGraphBase):
 
         # extract keywords and explore graph store
         keywords = await self._keyword_extractor.extract(text)
-        subgraph = self._graph_store.explore(keywords, limit=topk)
+        # All the keywords are explored at once, breadth-first
+        subgraph = await blocking_func_to_async(
+            self._executor, self._graph_store.explore, keywords, limit=topk
+        )
         logger.info(f"Search subgraph from {len(keywords)} keywords")
 
         content = (
@@ -1,8 +1,8 @@
 """Database storage implementation using SQLAlchemy."""
 from contextlib import contextmanager
-from typing import Dict, Iterator, List, Optional, Type, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
 
-from sqlalchemy import URL
+from sqlalchemy import URL, tuple_
 from sqlalchemy.orm import DeclarativeMeta, Session
 
 from dbgpt.core import Serializer
@@ -16,6 +16,10 @@ from dbgpt.core.interface.storage import (
 
 from .db_manager import BaseModel, BaseQuery, DatabaseManager
 
+# The max number of the identifiers in one IN clause, keep it under the limit of the
+# bound parameters of the databases(e.g. 999 in old SQLite)
+_MAX_IDENTIFIERS_PER_QUERY = 500
+
 
 def _copy_public_properties(src: BaseModel, dest: BaseModel):
     """Copy public properties from src to dest."""
@@ -107,6 +111,140 @@ class SQLAlchemyStorage(StorageInterface[T, BaseModel]):
             if model_instance:
                 session.delete(model_instance)
 
+    def save_list(self, data: List[T]) -> None:
+        """Save the data list to the storage in one transaction."""
+        if not data:
+            return
+        with self.session() as session:
+            session.add_all([self.adapter.to_storage_format(d) for d in data])
+
+    def save_or_update_list(self, data: List[T]) -> None:
+        """Save or update the data list to the storage in one transaction.
+
+        The existing rows are loaded with set-based queries, then the new rows are
+        inserted and the existing ones are updated in one flush.
+        """
+        if not data:
+            return
+        columns, keys = self._identifier_keys([d.identifier for d in data])
+        if columns is None:
+            super().save_or_update_list(data)
+            return
+        with self.session() as session:
+            exist_instances = self._load_by_keys(session, columns, keys)
+            for d, key in zip(data, keys):
+                new_instance = self.adapter.to_storage_format(d)
+                model_instance = exist_instances.get(key)
+                if model_instance is not None:
+                    _copy_public_properties(new_instance, model_instance)
+                else:
+                    session.add(new_instance)
+                    # The same identifier may appear more than once
+                    exist_instances[key] = new_instance
+
+    def load_list(self, resource_id: List[ResourceIdentifier], cls: Type[T]) -> List[T]:
+        """Load the data list by identifiers with set-based queries.
+
+        The order of the result is the same as the identifiers, the data which does
+        not exist is skipped.
+        """
+        if not resource_id:
+            return []
+        columns, keys = self._identifier_keys(resource_id)
+        if columns is None:
+            return super().load_list(resource_id, cls)
+        with self.session() as session:
+            model_instances = self._load_by_keys(session, columns, keys)
+            result = []
+            for key in keys:
+                model_instance = model_instances.get(key)
+                if model_instance is not None:
+                    result.append(self.adapter.from_storage_format(model_instance))
+            return result
+
+    def delete_list(self, resource_id: List[ResourceIdentifier]) -> None:
+        """Delete the data list by identifiers in one transaction."""
+        if not resource_id:
+            return
+        columns, keys = self._identifier_keys(resource_id)
+        if columns is None:
+            super().delete_list(resource_id)
+            return
+        with self.session() as session:
+            for chunk in _chunks(list(dict.fromkeys(keys))):
+                session.query(self._model_class).filter(
+                    *self._build_conditions(columns, chunk)
+                ).delete(synchronize_session=False)
+
+    def _identifier_keys(
+        self, resource_ids: List[ResourceIdentifier]
+    ) -> Tuple[Optional[List[str]], List[Tuple]]:
+        """Map the identifiers to the values of the table columns.
+
+        Returns:
+            Tuple[Optional[List[str]], List[Tuple]]: The column names and the column
+                values of each identifier, the column names is None if the identifiers
+                can't be mapped to the columns exactly, then the single-item
+                operations should be used.
+        """
+        table_columns = self._model_class.__table__.columns  # type: ignore
+        columns: Optional[List[str]] = None
+        keys = []
+        for resource_id in resource_ids:
+            values = {}
+            for key, value in resource_id.to_dict().items():
+                if key == "identifier_type":
+                    continue
+                if key not in table_columns or value is None:
+                    return None, []
+                values[key] = value
+            if columns is None:
+                columns = list(values.keys())
+            if not columns or list(values.keys()) != columns:
+                return None, []
+            keys.append(tuple(values[c] for c in columns))
+        return columns, keys
+
+    def _build_conditions(self, columns: List[str], keys: List[Tuple]) -> List[Any]:
+        """Build the conditions to match the rows of the keys.
+
+        The columns with the same value in all the keys are matched by equality, and
+        the others are matched by one IN clause.
+        """
+        conditions = []
+        varying = []
+        for i, column in enumerate(columns):
+            values = {key[i] for key in keys}
+            if len(values) == 1:
+                conditions.append(getattr(self._model_class, column) == keys[0][i])
+            else:
+                varying.append(i)
+        if len(varying) == 1:
+            i = varying[0]
+            column = getattr(self._model_class, columns[i])
+            conditions.append(column.in_(list({key[i] for key in keys})))
+        elif varying:
+            conditions.append(
+                tuple_(*[getattr(self._model_class, columns[i]) for i in varying]).in_(
+                    [tuple(key[i] for i in varying) for key in keys]
+                )
+            )
+        return conditions
+
+    def _load_by_keys(
+        self, session: Session, columns: List[str], keys: List[Tuple]
+    ) -> Dict[Tuple, BaseModel]:
+        """Load the rows of the keys, return the rows by their keys."""
+        model_instances = {}
+        for chunk in _chunks(list(dict.fromkeys(keys))):
+            query = session.query(self._model_class).filter(
+                *self._build_conditions(columns, chunk)
+            )
+            for model_instance in query.all():
+                key = tuple(getattr(model_instance, c) for c in columns)
+                model_instances[key] = model_instance
+        return model_instances
+
     def query(self, spec: QuerySpec, cls: Type[T]) -> List[T]:
         """Query data from the storage.
 
@@ -142,3 +280,8 @@ class SQLAlchemyStorage(StorageInterface[T, BaseModel]):
                 if value is not None:
                     query = query.filter(getattr(self._model_class, key) == value)
             return query.count()
+
+
+def _chunks(keys: List[Tuple]) -> Iterator[List[Tuple]]:
+    for i in range(0, len(keys), _MAX_IDENTIFIERS_PER_QUERY):
+        yield keys[i : i + _MAX_IDENTIFIERS_PER_QUERY]
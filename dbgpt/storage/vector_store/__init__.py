@@ -47,6 +47,15 @@ def _import_elastic() -> Tuple[Type, Type]:
     return ElasticStore, ElasticsearchVectorConfig
 
 
+def _import_native() -> Tuple[Type, Type]:
+    from dbgpt.storage.vector_store.native_store import (
+        NativeVectorConfig,
+        NativeVectorStore,
+    )
+
+    return NativeVectorStore, NativeVectorConfig
+
+
 def _import_builtin_knowledge_graph() -> Tuple[Type, Type]:
     from dbgpt.storage.knowledge_graph.knowledge_graph import (
         BuiltinKnowledgeGraph,
@@ -84,6 +93,8 @@ def __getattr__(name: str) -> Tuple[Type, Type]:
         return _import_oceanbase()
     elif name == "ElasticSearch":
         return _import_elastic()
+    elif name == "Native":
+        return _import_native()
     elif name == "KnowledgeGraph":
         return _import_builtin_knowledge_graph()
     elif name == "OpenSPG":
@@ -101,6 +112,7 @@ __vector_store__ = [
     "OceanBase",
     "PGVector",
     "ElasticSearch",
+    "Native",
 ]
 
 __knowledge_graph__ = ["KnowledgeGraph", "OpenSPG"]
@@ -0,0 +1,771 @@
+"""Native in-process vector store.
+
+The vectors are kept in a memory-mapped float32 matrix, so no external service is
+needed and opening a persisted store does not read the vectors into memory.
+
+Two index types are supported:
+
+- ``flat``: brute-force search with one matrix-vector product, exact results.
+- ``hnsw``: approximate search with a HNSW graph, it needs the ``hnswlib`` package.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from dbgpt._private.pydantic import ConfigDict, Field
+from dbgpt.configs.model_config import PILOT_PATH
+from dbgpt.core import Chunk
+from dbgpt.core.awel.flow import Parameter, ResourceCategory, register_resource
+from dbgpt.util.i18n_utils import _
+
+from .base import _COMMON_PARAMETERS, VectorStoreBase, VectorStoreConfig
+from .filters import FilterCondition, FilterOperator, MetadataFilter, MetadataFilters
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, the writes are only serialized in the process
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+_VECTORS_FILE = "vectors.f32"
+_DOCS_FILE = "docs.jsonl"
+_META_FILE = "index.json"
+_HNSW_FILE = "hnsw.bin"
+_HNSW_META_FILE = "hnsw.json"
+_INIT_CAPACITY = 1024
+# Compact the data files when the deleted rows are more than it and the alive rows
+_COMPACT_MIN_DEAD_ROWS = 1024
+
+
+@register_resource(
+    _("Native Vector Store"),
+    "native_vector_store",
+    category=ResourceCategory.VECTOR_STORE,
+    description=_("Native in-process vector store."),
+    parameters=[
+        *_COMMON_PARAMETERS,
+        Parameter.build_from(
+            _("Persist Path"),
+            "persist_path",
+            str,
+            description=_("the persist path of vector store."),
+            optional=True,
+            default=None,
+        ),
+        Parameter.build_from(
+            _("Index Type"),
+            "index_type",
+            str,
+            description=_(
+                "The index type of vector store, 'flat' for exact brute-force search, "
+                "'hnsw' for approximate search."
+            ),
+            optional=True,
+            default="flat",
+        ),
+    ],
+)
+class NativeVectorConfig(VectorStoreConfig):
+    """Native vector store config."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    persist_path: Optional[str] = Field(
+        default=os.getenv("NATIVE_VECTOR_PERSIST_PATH", None),
+        description="the persist path of vector store.",
+    )
+    index_type: str = Field(
+        default=os.getenv("NATIVE_VECTOR_INDEX_TYPE", "flat"),
+        description="The index type of vector store, 'flat' or 'hnsw'.",
+    )
+    hnsw_m: int = Field(
+        default=16,
+        description="The number of the bi-directional links of each node in HNSW.",
+    )
+    hnsw_ef_construction: int = Field(
+        default=200,
+        description="The size of the dynamic candidate list when building HNSW.",
+    )
+    hnsw_ef_search: int = Field(
+        default=64,
+        description="The size of the dynamic candidate list when searching HNSW.",
+    )
+    hnsw_save_interval: int = Field(
+        default=1000,
+        description="Save the HNSW graph after this number of the changes, the "
+        "changes after the last save are replayed when opening the store.",
+    )
+
+
+class NativeVectorStore(VectorStoreBase):
+    """Native in-process vector store.
+
+    The files in the persist directory:
+
+    - ``index.json``: the dimension and the names of the current data files.
+    - ``vectors.f32``: the normalized vectors, a memory-mapped float32 matrix.
+    - ``docs.jsonl``: the append-only log of the added and deleted documents.
+    - ``hnsw.bin``: the HNSW graph, only for the ``hnsw`` index type.
+
+    All the stores of the same persist directory in the process share one index, and
+    the writes hold a file lock and catch up with the log first, so the stores in the
+    other processes stay in line. The rows of the deleted documents are only marked
+    as deleted, the data files are compacted when the deleted rows are more than the
+    alive ones.
+    """
+
+    def __init__(self, vector_store_config: NativeVectorConfig) -> None:
+        """Create a NativeVectorStore instance."""
+        super().__init__()
+        if vector_store_config.index_type not in ("flat", "hnsw"):
+            raise ValueError(
+                f"Unknown index type {vector_store_config.index_type}, only 'flat' "
+                "and 'hnsw' are supported"
+            )
+        self._config = vector_store_config
+        self.embeddings = vector_store_config.embedding_fn
+        persist_path = vector_store_config.persist_path or os.path.join(
+            PILOT_PATH, "data"
+        )
+        self.persist_dir = os.path.join(
+            persist_path, vector_store_config.name + ".nativevec"
+        )
+        self._index = _get_index(self.persist_dir, vector_store_config)
+
+    @property
+    def count(self) -> int:
+        """Return the number of the documents."""
+        return self._index.count
+
+    def vector_name_exists(self) -> bool:
+        """Whether vector name exists."""
+        return self.count > 0
+
+    def load_document(self, chunks: List[Chunk]) -> List[str]:
+        """Load document to vector store.
+
+        The documents with the existing ids are replaced.
+        """
+        if not chunks:
+            return []
+        if self.embeddings is None:
+            raise ValueError("NativeVectorStore Embeddings is None")
+        vectors = np.asarray(
+            self.embeddings.embed_documents([chunk.content for chunk in chunks]),
+            dtype=np.float32,
+        )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1)
+        self._index.add(chunks, vectors)
+        return [chunk.chunk_id for chunk in chunks]
+
+    def similar_search(
+        self, text, topk, filters: Optional[MetadataFilters] = None
+    ) -> List[Chunk]:
+        """Search similar documents."""
+        return self.similar_search_with_scores(text, topk, -1.0, filters)
+
+    def similar_search_with_scores(
+        self, text, topk, score_threshold, filters: Optional[MetadataFilters] = None
+    ) -> List[Chunk]:
+        """Search similar documents with scores.
+
+        The score is the cosine similarity of the query and the document.
+
+        Args:
+            text(str): query text
+            topk(int): return docs nums.
+            score_threshold(float): the minimum score of the returned docs.
+            filters(MetadataFilters): metadata filters, the documents are filtered
+                before the vector search.
+        """
+        if not text or topk <= 0:
+            return []
+        if self.embeddings is None:
+            raise ValueError("NativeVectorStore Embeddings is None")
+        query = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+        return self._index.search(query, topk, score_threshold, filters)
+
+    def delete_by_ids(self, ids: str) -> List[str]:
+        """Delete vector by ids.
+
+        Args:
+            ids(str): The vector ids to delete, separated by comma.
+        """
+        return self._index.delete(ids.split(","))
+
+    def delete_vector_name(self, vector_name: str):
+        """Delete vector name."""
+        logger.info(f"native vector_name:{vector_name} begin delete...")
+        self._index.drop()
+        return True
+
+    def persist(self) -> None:
+        """Save the HNSW graph, the other files are always persisted."""
+        self._index.persist()
+
+    def compact(self) -> None:
+        """Rewrite the data files without the deleted rows."""
+        self._index.compact()
+
+
+# The shared indexes of the persist directories in the process
+_INDEXES: "weakref.WeakValueDictionary[str, _NativeIndex]" = (
+    weakref.WeakValueDictionary()
+)
+_INDEXES_LOCK = threading.Lock()
+
+
+def _get_index(persist_dir: str, config: NativeVectorConfig) -> "_NativeIndex":
+    """Get the shared index of the persist directory, open it if not opened."""
+    key = os.path.realpath(persist_dir)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _NativeIndex(key, config)
+            _INDEXES[key] = index
+        elif index.index_type != config.index_type:
+            logger.warning(
+                f"Native vector store {persist_dir} is opened with the index type "
+                f"{index.index_type}, ignore the index type {config.index_type}"
+            )
+        return index
+
+
+class _NativeIndex:
+    """The vectors and the documents of one persist directory.
+
+    The rows are numbered by the order of the add records in the log, so every
+    process which replays the same log gets the same rows.
+    """
+
+    def __init__(self, persist_dir: str, config: NativeVectorConfig):
+        self.persist_dir = persist_dir
+        self.index_type = config.index_type
+        self._config = config
+        self._lock = threading.RLock()
+        self._file_lock_depth = 0
+        self._reset()
+        with self._lock:
+            self._open()
+
+    def _reset(self) -> None:
+        self._dim: Optional[int] = None
+        self._generation = 0
+        self._vectors_file = _VECTORS_FILE
+        self._docs_file = _DOCS_FILE
+        self._meta_ino: Optional[int] = None
+        self._vectors: Optional[np.memmap] = None
+        self._count = 0
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids: List[str] = []
+        self._contents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._id_to_row: Dict[str, int] = {}
+        # The number of the records and the bytes read from the log
+        self._log_size = 0
+        self._log_offset = 0
+        self._hnsw: Optional[Any] = None
+        self._hnsw_unsaved = 0
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._id_to_row)
+
+    def add(self, chunks: List[Chunk], vectors: np.ndarray) -> None:
+        with self._lock, self._file_lock():
+            self._refresh()
+            if self._dim is None:
+                self._init_files(vectors.shape[1])
+            if vectors.shape[1] != self._dim:
+                raise ValueError(
+                    f"The dimension of the embeddings is {vectors.shape[1]}, but the "
+                    f"vector store is {self._dim}"
+                )
+            self._truncate_broken_log()
+            start = self._count
+            self._map_vectors(start + len(chunks))
+            self._vectors[start : start + len(chunks)] = vectors  # type: ignore
+            self._vectors.flush()  # type: ignore
+            records = [
+                {
+                    "op": "add",
+                    "id": chunk.chunk_id,
+                    "content": chunk.content,
+                    "metadata": chunk.metadata,
+                }
+                for chunk in chunks
+            ]
+            # Write the log after the vectors, so the rows in the log are always valid
+            self._append_log(records)
+            replaced = self._apply_records(records)
+            if self._hnsw is not None:
+                self._hnsw_apply(start, start + len(chunks), replaced)
+            self._maybe_compact()
+
+    def search(
+        self,
+        query: np.ndarray,
+        topk: int,
+        score_threshold: Optional[float],
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        with self._lock:
+            self._refresh()
+            if not self._id_to_row:
+                return []
+            if filters and filters.filters:
+                rows = np.fromiter(
+                    (
+                        i
+                        for i in np.flatnonzero(self._alive[: self._count])
+                        if _match_filters(self._metadatas[i], filters)
+                    ),
+                    dtype=np.int64,
+                )
+                results = self._search_rows(query, topk, rows)
+            elif self._hnsw is not None:
+                results = self._search_hnsw(query, topk)
+            else:
+                results = self._search_rows(query, topk, None)
+            return [
+                Chunk(
+                    content=self._contents[row],
+                    metadata=self._metadatas[row],
+                    score=score,
+                    chunk_id=self._ids[row],
+                )
+                for row, score in results
+                if score_threshold is None or score >= score_threshold
+            ]
+
+    def delete(self, ids: List[str]) -> List[str]:
+        with self._lock, self._file_lock():
+            self._refresh()
+            delete_ids = [i for i in ids if i in self._id_to_row]
+            if not delete_ids:
+                return []
+            self._truncate_broken_log()
+            records = [{"op": "delete", "id": i} for i in delete_ids]
+            self._append_log(records)
+            deleted = self._apply_records(records)
+            if self._hnsw is not None:
+                self._hnsw_apply(self._count, self._count, deleted)
+            self._maybe_compact()
+        return delete_ids
+
+    def drop(self) -> None:
+        with self._lock, self._file_lock():
+            self._close()
+            if os.path.exists(self.persist_dir):
+                shutil.rmtree(self.persist_dir)
+            self._reset()
+
+    def persist(self) -> None:
+        with self._lock:
+            if self._hnsw is not None and self._hnsw_unsaved:
+                self._save_hnsw()
+
+    def compact(self) -> None:
+        with self._lock, self._file_lock():
+            self._refresh()
+            if self._dim is not None and self._count > len(self._id_to_row):
+                self._compact()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.persist_dir, name)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold the file lock of the persist directory, it is reentrant.
+
+        It must be called with the thread lock held. The lock file is out of the
+        persist directory, so it is not removed by :meth:`drop`.
+        """
+        if fcntl is None or self._file_lock_depth:
+            self._file_lock_depth += 1
+            try:
+                yield
+            finally:
+                self._file_lock_depth -= 1
+            return
+        os.makedirs(os.path.dirname(self.persist_dir), exist_ok=True)
+        with open(self.persist_dir + ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            self._file_lock_depth = 1
+            try:
+                yield
+            finally:
+                self._file_lock_depth = 0
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _open(self) -> None:
+        """Open the persisted store."""
+        meta_path = self._path(_META_FILE)
+        try:
+            # Stat before reading, a replaced meta file is reloaded at the next refresh
+            self._meta_ino = os.stat(meta_path).st_ino
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return
+        self._dim = meta["dim"]
+        self._generation = meta.get("generation", 0)
+        self._vectors_file = meta.get("vectors_file", _VECTORS_FILE)
+        self._docs_file = meta.get("docs_file", _DOCS_FILE)
+        self._map_vectors(0)
+        self._read_log()
+        if self.index_type == "hnsw":
+            self._open_hnsw()
+        logger.info(
+            f"Open native vector store {self.persist_dir}, "
+            f"{len(self._id_to_row)} documents"
+        )
+
+    def _close(self) -> None:
+        if self._vectors is not None:
+            self._vectors.flush()
+        self._vectors = None
+        self._hnsw = None
+
+    def _refresh(self) -> None:
+        """Catch up with the changes written by the other processes."""
+        try:
+            meta_ino = os.stat(self._path(_META_FILE)).st_ino
+        except FileNotFoundError:
+            if self._dim is not None:
+                # Dropped by another process
+                self._close()
+                self._reset()
+            return
+        if meta_ino != self._meta_ino:
+            # Created or compacted by another process
+            self._close()
+            self._reset()
+            self._open()
+            return
+        try:
+            log_size = os.path.getsize(self._path(self._docs_file))
+        except FileNotFoundError:
+            return
+        if log_size > self._log_offset:
+            self._read_log()
+
+    def _read_log(self) -> None:
+        """Read and apply the complete records after the read offset of the log."""
+        try:
+            with open(self._path(self._docs_file), "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        # The last line may be being written by another process, or broken by a crash
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return
+        records = []
+        for line in data[:end].splitlines():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning("Skip a broken record of the native store")
+        self._log_offset += end
+        self._log_size += len(records)
+        start = self._count
+        self._map_vectors(start + sum(1 for r in records if r["op"] == "add"))
+        deleted = self._apply_records(records)
+        if self._hnsw is not None:
+            self._hnsw_apply(start, self._count, deleted)
+
+    def _truncate_broken_log(self) -> None:
+        """Remove the incomplete last record left by a crash.
+
+        It must be called with the file lock held after refreshing, all the complete
+        records have been read.
+        """
+        path = self._path(self._docs_file)
+        if os.path.exists(path) and os.path.getsize(path) > self._log_offset:
+            with open(path, "ab") as f:
+                f.truncate(self._log_offset)
+
+    def _write_meta(self) -> None:
+        meta = {
+            "dim": self._dim,
+            "generation": self._generation,
+            "vectors_file": self._vectors_file,
+            "docs_file": self._docs_file,
+        }
+        tmp_path = self._path(_META_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._path(_META_FILE))
+        self._meta_ino = os.stat(self._path(_META_FILE)).st_ino
+
+    def _init_files(self, dim: int) -> None:
+        os.makedirs(self.persist_dir, exist_ok=True)
+        self._dim = dim
+        self._map_vectors(_INIT_CAPACITY)
+        self._write_meta()
+        if self.index_type == "hnsw":
+            self._hnsw = self._new_hnsw(self._alive.shape[0])
+
+    def _map_vectors(self, size: int) -> None:
+        """Map the vectors file, extend the file if it has less than size rows."""
+        capacity = self._alive.shape[0]
+        if self._vectors is not None and size <= capacity:
+            return
+        path = self._path(self._vectors_file)
+        row_bytes = self._dim * 4  # type: ignore
+        file_capacity = (
+            os.path.getsize(path) // row_bytes if os.path.exists(path) else 0
+        )
+        if file_capacity < size:
+            file_capacity = max(capacity * 2, size, _INIT_CAPACITY)
+            # Extend the file with zeros, the written rows are kept
+            with open(path, "ab") as f:
+                f.truncate(file_capacity * row_bytes)
+        if self._vectors is not None:
+            self._vectors.flush()
+        self._vectors = np.memmap(
+            path, dtype=np.float32, mode="r+", shape=(file_capacity, self._dim)
+        )
+        alive = np.zeros(file_capacity, dtype=bool)
+        alive[:capacity] = self._alive
+        self._alive = alive
+        if self._hnsw is not None:
+            self._hnsw.resize_index(file_capacity)
+
+    def _append_log(self, records: List[Dict[str, Any]]) -> None:
+        data = "".join(
+            json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records
+        ).encode("utf-8")
+        with open(self._path(self._docs_file), "ab") as f:
+            f.write(data)
+        self._log_offset += len(data)
+        self._log_size += len(records)
+
+    def _apply_records(self, records: List[Dict[str, Any]]) -> List[int]:
+        """Apply the log records to the memory, return the rows deleted."""
+        deleted = []
+        for record in records:
+            row = self._id_to_row.pop(record["id"], None)
+            if row is not None:
+                self._alive[row] = False
+                deleted.append(row)
+            if record["op"] == "add":
+                row = self._count
+                self._count += 1
+                self._ids.append(record["id"])
+                self._contents.append(record["content"])
+                self._metadatas.append(record.get("metadata") or {})
+                self._id_to_row[record["id"]] = row
+                self._alive[row] = True
+        return deleted
+
+    def _maybe_compact(self) -> None:
+        dead = self._count - len(self._id_to_row)
+        if dead >= _COMPACT_MIN_DEAD_ROWS and dead > len(self._id_to_row):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the alive rows to the new data files.
+
+        The new files are switched to by replacing the meta file atomically, so a
+        crash leaves either the old files or the new files. It must be called with
+        the file lock held.
+        """
+        rows = np.flatnonzero(self._alive[: self._count])
+        old_files = [self._vectors_file, self._docs_file, _HNSW_FILE, _HNSW_META_FILE]
+        generation = self._generation + 1
+        vectors_file = f"vectors.{generation}.f32"
+        docs_file = f"docs.{generation}.jsonl"
+        capacity = max(len(rows), _INIT_CAPACITY)
+        vectors = np.memmap(
+            self._path(vectors_file),
+            dtype=np.float32,
+            mode="w+",
+            shape=(capacity, self._dim),  # type: ignore
+        )
+        for i in range(0, len(rows), _INIT_CAPACITY):
+            batch = rows[i : i + _INIT_CAPACITY]
+            vectors[i : i + len(batch)] = self._vectors[batch]  # type: ignore
+        vectors.flush()
+        del vectors
+        with open(self._path(docs_file), "w", encoding="utf-8") as f:
+            for row in rows:
+                record = {
+                    "op": "add",
+                    "id": self._ids[row],
+                    "content": self._contents[row],
+                    "metadata": self._metadatas[row],
+                }
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        logger.info(
+            f"Compact native vector store {self.persist_dir}, {self._count} rows to "
+            f"{len(rows)} rows"
+        )
+        self._generation = generation
+        self._vectors_file = vectors_file
+        self._docs_file = docs_file
+        self._write_meta()
+        self._close()
+        for name in old_files:
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                # Not created, or still mapped on Windows
+                pass
+        self._reset()
+        self._open()
+
+    def _search_rows(
+        self, query: np.ndarray, topk: int, rows: Optional[np.ndarray]
+    ) -> List[Tuple[int, float]]:
+        """Brute-force search in the given rows, or all the alive rows."""
+        if rows is None:
+            scores = self._vectors[: self._count] @ query  # type: ignore
+            scores[~self._alive[: self._count]] = -np.inf
+            rows = np.arange(self._count)
+        elif not len(rows):
+            return []
+        else:
+            scores = self._vectors[rows] @ query  # type: ignore
+        k = min(topk, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(rows[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    def _new_hnsw(self, max_elements: int):
+        try:
+            import hnswlib
+        except ImportError:
+            raise ImportError(
+                "Please install hnswlib to use the hnsw index type: "
+                "`pip install hnswlib`"
+            )
+        index = hnswlib.Index(space="ip", dim=self._dim)
+        index.init_index(
+            max_elements=max_elements,
+            ef_construction=self._config.hnsw_ef_construction,
+            M=self._config.hnsw_m,
+        )
+        index.set_ef(self._config.hnsw_ef_search)
+        return index
+
+    def _open_hnsw(self) -> None:
+        """Load the HNSW graph and replay the changes after the last save."""
+        capacity = self._alive.shape[0]
+        meta: Dict[str, Any] = {}
+        if os.path.exists(self._path(_HNSW_META_FILE)):
+            with open(self._path(_HNSW_META_FILE)) as f:
+                meta = json.load(f)
+        index = self._new_hnsw(capacity)
+        if (
+            meta.get("generation", 0) == self._generation
+            and 0 < meta.get("rows", 0) <= self._count
+            and os.path.exists(self._path(_HNSW_FILE))
+        ):
+            index.load_index(self._path(_HNSW_FILE), max_elements=capacity)
+            index.set_ef(self._config.hnsw_ef_search)
+        self._hnsw = index
+        # Replay the changes after the last save, the rows are appended only, and the
+        # rows deleted before the last save are marked again harmlessly
+        start = index.get_current_count()
+        dead_rows = np.flatnonzero(~self._alive[: self._count]).tolist()
+        self._hnsw_apply(start, self._count, dead_rows)
+
+    def _hnsw_apply(self, start: int, end: int, deleted: List[int]) -> None:
+        index = self._hnsw
+        if end > start:
+            index.add_items(  # type: ignore
+                np.asarray(self._vectors[start:end]),  # type: ignore
+                np.arange(start, end),
+            )
+        for row in deleted:
+            try:
+                index.mark_deleted(row)  # type: ignore
+            except RuntimeError:
+                # Already marked as deleted
+                pass
+        self._hnsw_unsaved += (end - start) + len(deleted)
+        if self._hnsw_unsaved >= self._config.hnsw_save_interval:
+            self._save_hnsw()
+
+    def _save_hnsw(self) -> None:
+        with self._file_lock():
+            tmp_path = self._path(_HNSW_FILE + ".tmp")
+            self._hnsw.save_index(tmp_path)  # type: ignore
+            os.replace(tmp_path, self._path(_HNSW_FILE))
+            meta = {"generation": self._generation, "rows": self._count}
+            with open(self._path(_HNSW_META_FILE + ".tmp"), "w") as f:
+                json.dump(meta, f)
+            os.replace(
+                self._path(_HNSW_META_FILE + ".tmp"), self._path(_HNSW_META_FILE)
+            )
+        self._hnsw_unsaved = 0
+
+    def _search_hnsw(self, query: np.ndarray, topk: int) -> List[Tuple[int, float]]:
+        k = min(topk, len(self._id_to_row))
+        if k <= 0:
+            return []
+        index = self._hnsw
+        index.set_ef(max(self._config.hnsw_ef_search, k))  # type: ignore
+        labels, distances = index.knn_query(query, k=k)  # type: ignore
+        # The distance of the inner product space is 1 - the inner product
+        return [
+            (int(row), float(1 - distance))
+            for row, distance in zip(labels[0], distances[0])
+        ]
+
+
+def _match_filters(metadata: Dict[str, Any], filters: MetadataFilters) -> bool:
+    """Check whether the metadata matches the filters."""
+    results = (_match_filter(metadata, f) for f in filters.filters)
+    if filters.condition == FilterCondition.OR:
+        return any(results)
+    return all(results)
+
+
+def _match_filter(metadata: Dict[str, Any], metadata_filter: MetadataFilter) -> bool:
+    operator = metadata_filter.operator
+    if operator == FilterOperator.EXISTS:
+        return (metadata_filter.key in metadata) == bool(metadata_filter.value)
+    if metadata_filter.key not in metadata:
+        return operator == FilterOperator.NIN or operator == FilterOperator.NE
+    value = metadata[metadata_filter.key]
+    expected = metadata_filter.value
+    try:
+        if operator == FilterOperator.EQ:
+            return value == expected
+        elif operator == FilterOperator.NE:
+            return value != expected
+        elif operator == FilterOperator.GT:
+            return value > expected
+        elif operator == FilterOperator.LT:
+            return value < expected
+        elif operator == FilterOperator.GTE:
+            return value >= expected
+        elif operator == FilterOperator.LTE:
+            return value <= expected
+        elif operator == FilterOperator.IN:
+            return value in expected  # type: ignore
+        elif operator == FilterOperator.NIN:
+            return value not in expected  # type: ignore
+    except TypeError:
+        # Can't compare the values of different types
+        return False
+    raise ValueError(f"NativeVectorStore filter operator {operator} not supported")
@@ -0,0 +1,215 @@
+import gc
+import os
+from typing import List
+
+import numpy as np
+import pytest
+
+from dbgpt.core import Chunk, Embeddings
+from dbgpt.storage.vector_store import native_store
+from dbgpt.storage.vector_store.filters import (
+    FilterCondition,
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+from dbgpt.storage.vector_store.native_store import (
+    NativeVectorConfig,
+    NativeVectorStore,
+    _NativeIndex,
+)
+
+_WORDS = ["apple", "banana", "cherry", "dog", "egg", "fish", "grape", "house"]
+
+
+class _MockEmbeddings(Embeddings):
+    """Each word is a direction, the text is the sum of its words."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = np.full(len(_WORDS), 0.01)
+        for word in text.split():
+            vector[_WORDS.index(word)] += 1.0
+        return vector.tolist()
+
+
+def _new_store(tmp_path, index_type: str = "flat", **kwargs) -> NativeVectorStore:
+    config = NativeVectorConfig(
+        name="test",
+        persist_path=str(tmp_path),
+        embedding_fn=_MockEmbeddings(),
+        index_type=index_type,
+        **kwargs,
+    )
+    return NativeVectorStore(config)
+
+
+def _chunks() -> List[Chunk]:
+    return [
+        Chunk(content=word, chunk_id=f"id-{i}", metadata={"n": i, "even": i % 2 == 0})
+        for i, word in enumerate(_WORDS)
+    ]
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_search(tmp_path, index_type):
+    store = _new_store(tmp_path, index_type)
+    assert not store.vector_name_exists()
+    assert store.load_document(_chunks()) == [f"id-{i}" for i in range(8)]
+    assert store.vector_name_exists()
+
+    results = store.similar_search_with_scores("cherry", 2, 0.0)
+    assert results[0].content == "cherry"
+    assert results[0].chunk_id == "id-2"
+    assert results[0].score > results[1].score
+    assert store.similar_search_with_scores("cherry", 8, 0.5)[0].content == "cherry"
+    assert len(store.similar_search_with_scores("cherry", 8, 0.5)) == 1
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_filters(tmp_path, index_type):
+    store = _new_store(tmp_path, index_type)
+    store.load_document(_chunks())
+    filters = MetadataFilters(
+        filters=[MetadataFilter(key="even", value=True)],
+    )
+    results = store.similar_search("dog", 8, filters)
+    assert {c.content for c in results} == {"apple", "cherry", "egg", "grape"}
+
+    filters = MetadataFilters(
+        condition=FilterCondition.OR,
+        filters=[
+            MetadataFilter(key="n", operator=FilterOperator.GTE, value=6),
+            MetadataFilter(key="n", operator=FilterOperator.IN, value=[0, 1]),
+        ],
+    )
+    results = store.similar_search("house", 8, filters)
+    assert results[0].content == "house"
+    assert {c.content for c in results} == {"apple", "banana", "grape", "house"}
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_delete_and_replace(tmp_path, index_type):
+    store = _new_store(tmp_path, index_type)
+    store.load_document(_chunks())
+    assert store.delete_by_ids("id-2,not-exist") == ["id-2"]
+    assert store.count == 7
+    assert all(c.content != "cherry" for c in store.similar_search("cherry", 8))
+
+    # Replace the content of an existing id
+    store.load_document([Chunk(content="cherry", chunk_id="id-0")])
+    assert store.count == 7
+    results = store.similar_search("cherry", 1)
+    assert results[0].chunk_id == "id-0"
+    assert all(c.content != "apple" for c in store.similar_search("apple", 8))
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_persist_and_reopen(tmp_path, index_type):
+    store = _new_store(tmp_path, index_type, hnsw_save_interval=4)
+    store.load_document(_chunks()[:4])
+    store.load_document(_chunks()[4:])
+    store.delete_by_ids("id-7")
+    # Close the shared index, so it is opened from the files again
+    del store
+    gc.collect()
+
+    reopened = _new_store(tmp_path, index_type)
+    assert reopened.count == 7
+    assert reopened.similar_search("fish", 1)[0].chunk_id == "id-5"
+    assert all(c.content != "house" for c in reopened.similar_search("house", 8))
+    # Incremental adds after reopening
+    reopened.load_document([Chunk(content="house", chunk_id="id-8")])
+    assert reopened.similar_search("house", 1)[0].chunk_id == "id-8"
+
+
+def test_grow_capacity(tmp_path):
+    store = _new_store(tmp_path, "hnsw")
+    chunks = [
+        Chunk(content=_WORDS[i % len(_WORDS)], chunk_id=f"id-{i}") for i in range(1500)
+    ]
+    store.load_document(chunks)
+    assert store.count == 1500
+    assert store.similar_search("egg", 1)[0].content == "egg"
+    assert _new_store(tmp_path, "flat").count == 1500
+
+
+def test_delete_vector_name(tmp_path):
+    store = _new_store(tmp_path)
+    store.load_document(_chunks())
+    store.delete_vector_name("test")
+    assert not store.vector_name_exists()
+    assert store.similar_search("apple", 1) == []
+    store.load_document(_chunks()[:1])
+    assert store.count == 1
+
+
+def test_stores_share_index(tmp_path):
+    s1 = _new_store(tmp_path)
+    s1.load_document([Chunk(content="apple", chunk_id="a")])
+    s2 = _new_store(tmp_path)
+    s1.load_document([Chunk(content="banana", chunk_id="b")])
+    s2.load_document([Chunk(content="cherry", chunk_id="c")])
+    del s1, s2
+    gc.collect()
+
+    store = _new_store(tmp_path)
+    assert store.count == 3
+    for word, chunk_id in [("apple", "a"), ("banana", "b"), ("cherry", "c")]:
+        result = store.similar_search_with_scores(word, 1, 0.0)[0]
+        assert (result.chunk_id, result.content) == (chunk_id, word)
+        assert result.score > 0.99
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_catch_up_other_process(tmp_path, index_type):
+    store = _new_store(tmp_path, index_type)
+    store.load_document(_chunks()[:4])
+    # The index of another process on the same directory
+    config = NativeVectorConfig(name="test", index_type=index_type)
+    other = _NativeIndex(store.persist_dir, config)
+    embeddings = _MockEmbeddings()
+    chunks = _chunks()[4:]
+    vectors = np.asarray(embeddings.embed_documents([c.content for c in chunks]))
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    other.add(chunks, vectors.astype(np.float32))
+    other.delete(["id-0"])
+
+    assert store.count == 7
+    assert store.similar_search("fish", 1)[0].chunk_id == "id-5"
+    assert all(c.chunk_id != "id-0" for c in store.similar_search("apple", 8))
+    store.load_document([Chunk(content="apple", chunk_id="id-8")])
+    assert other.count == 8
+
+
+def test_compact(tmp_path, monkeypatch):
+    monkeypatch.setattr(native_store, "_COMPACT_MIN_DEAD_ROWS", 4)
+    store = _new_store(tmp_path, "hnsw")
+    store.load_document(_chunks())
+    # Replace the documents, the old rows are deleted
+    store.load_document(_chunks()[:3])
+    store.delete_by_ids("id-3,id-4")
+    assert os.path.exists(os.path.join(store.persist_dir, "docs.jsonl"))
+    store.delete_by_ids("id-5")
+    # 6 deleted rows and 5 alive rows, compacted
+    assert not os.path.exists(os.path.join(store.persist_dir, "docs.jsonl"))
+    assert store.count == 5
+    assert store._index._count == 5
+    assert store.similar_search("banana", 1)[0].chunk_id == "id-1"
+    del store
+    gc.collect()
+
+    reopened = _new_store(tmp_path)
+    assert reopened.count == 5
+    assert {c.chunk_id for c in reopened.similar_search("apple", 8)} == {
+        "id-0",
+        "id-1",
+        "id-2",
+        "id-6",
+        "id-7",
+    }
+    reopened.compact()
+    reopened.load_document([Chunk(content="dog", chunk_id="id-3")])
+    assert reopened.similar_search("dog", 1)[0].chunk_id == "id-3"
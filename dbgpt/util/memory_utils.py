@@ -1,3 +1,4 @@
+import sys
 from typing import Any
 
 from pympler import asizeof
@@ -9,4 +10,7 @@ def _get_object_bytes(obj: Any) -> int:
     Args:
         obj (Any): The object to return the bytes
     """
+    if type(obj) is bytes:
+        # Fast path for bytes, same as asizeof(8 bytes aligned) but much faster
+        return (sys.getsizeof(obj) + 7) & ~7
     return asizeof.asizeof(obj)
@@ -0,0 +1,39 @@
+import pytest
+
+from dbgpt.util.embedding_utils import (
+    decode_embedding_base64,
+    decode_embeddings,
+    encode_embedding_base64,
+    encode_embeddings,
+)
+
+
+def test_encode_decode_embeddings():
+    embeddings = [[0.5, -1.25, 2.0], [3.0, 0.0, -0.125]]
+    data = encode_embeddings(embeddings)
+    # 8 bytes shape header and 4 bytes per value
+    assert len(data) == 8 + 6 * 4
+    assert decode_embeddings(data) == embeddings
+
+
+def test_encode_decode_empty_embeddings():
+    assert decode_embeddings(encode_embeddings([])) == []
+
+
+def test_encode_embeddings_with_different_dimensions():
+    with pytest.raises(ValueError):
+        encode_embeddings([[1.0, 2.0], [1.0]])
+
+
+def test_decode_invalid_embeddings():
+    data = encode_embeddings([[1.0, 2.0]])
+    with pytest.raises(ValueError):
+        decode_embeddings(data[:-1])
+    with pytest.raises(ValueError):
+        decode_embeddings(data[:4])
+
+
+def test_encode_decode_embedding_base64():
+    # Base64 of the little-endian float32 values
+    assert encode_embedding_base64([1.0, -2.0]) == "AACAPwAAAMA="
+    assert decode_embedding_base64("AACAPwAAAMA=") == [1.0, -2.0]
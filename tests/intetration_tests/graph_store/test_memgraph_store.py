@@ -3,6 +3,7 @@ import pytest
 from dbgpt.storage.graph_store.memgraph_store import (
     MemoryGraphStore,
     MemoryGraphStoreConfig,
+    _GraphFiles,
 )
 
 
@@ -39,3 +40,69 @@ def test_graph_store(graph_store):
     schema = graph_store.get_schema()
     print(f"\nSchema: {schema}")
     assert len(schema) == 138
+
+
+def test_insert_triplets(graph_store):
+    graph_store.insert_triplets([("A", "0", "B"), ("B", "1", "C"), ("C", "2", "A")])
+    subgraph = graph_store.explore(["A"])
+    assert subgraph.edge_count == 3
+    assert graph_store.get_triplets("A") == [("0", "B")]
+
+
+def test_persist_graph_store(tmp_path):
+    config = MemoryGraphStoreConfig(persist_path=str(tmp_path), snapshot_interval=3)
+    graph_store = MemoryGraphStore(config)
+    graph_store.insert_triplets([("A", "0", "B"), ("B", "1", "C")])
+    graph_store.insert_triplet("C", "2", "A")
+    # Snapshot is written, then changes are appended to the log
+    graph_store.insert_triplet("C", "3", "D")
+    graph_store.delete_triplet("A", "0", "B")
+
+    reopened = MemoryGraphStore(config)
+    assert reopened.get_full_graph().edge_count == 3
+    assert reopened.get_triplets("A") == []
+    assert sorted(reopened.get_triplets("C")) == [("2", "A"), ("3", "D")]
+
+    reopened.drop()
+    assert MemoryGraphStore(config).get_full_graph().edge_count == 0
+
+
+def test_stores_share_graph(tmp_path):
+    config = MemoryGraphStoreConfig(persist_path=str(tmp_path), snapshot_interval=2)
+    store1 = MemoryGraphStore(config)
+    store2 = MemoryGraphStore(config)
+    store1.insert_triplet("A", "0", "B")
+    store2.insert_triplet("B", "1", "C")
+    store1.insert_triplet("C", "2", "D")
+    store2.persist()
+    store1.persist()
+    assert store1.get_full_graph().edge_count == 3
+    assert MemoryGraphStore(config).get_full_graph().edge_count == 3
+
+
+def test_catch_up_other_process(tmp_path):
+    persist_dir = str(tmp_path / "test.memgraph")
+    # The graphs of the two processes
+    graph1 = _GraphFiles(persist_dir, "label", 3)
+    graph2 = _GraphFiles(persist_dir, "label", 3)
+    graph1.update([{"op": "add", "triplet": ["A", "0", "B"]}])
+    graph2.update([{"op": "add", "triplet": ["B", "1", "C"]}])
+    # The stale graph reads the log before writing the snapshot
+    graph1.persist()
+    graph2.update(
+        [
+            {"op": "add", "triplet": ["C", "2", "D"]},
+            {"op": "delete", "triplet": ["A", "0", "B"]},
+        ]
+    )
+    graph1.update([{"op": "add", "triplet": ["D", "3", "E"]}])
+    graph2.persist()
+
+    with graph1.read() as graph:
+        assert graph.edge_count == 3
+    with _GraphFiles(persist_dir, "label", 3).read() as graph:
+        assert sorted((e.sid, e.tid) for e in graph.edges()) == [
+            ("B", "C"),
+            ("C", "D"),
+            ("D", "E"),
+        ]
@@ -0,0 +1,120 @@
+import pytest
+
+from dbgpt.storage.graph_store.compact_graph import CompactMemoryGraph
+from dbgpt.storage.graph_store.graph import Direction, Edge, MemoryGraph, Vertex
+
+_EDGES = [
+    ("A", "A", "0"),
+    ("A", "A", "1"),
+    ("A", "B", "2"),
+    ("B", "C", "3"),
+    ("B", "D", "4"),
+    ("C", "D", "5"),
+    ("B", "E", "6"),
+    ("F", "E", "7"),
+    ("E", "F", "8"),
+]
+
+
+def _build(g):
+    for sid, tid, label in _EDGES:
+        g.append_edge(Edge(sid, tid, label=label))
+    g.upsert_vertex(Vertex("G"))
+    return g
+
+
+@pytest.fixture(params=[False, True], ids=["delta", "compacted"])
+def g(request):
+    g = _build(CompactMemoryGraph())
+    if request.param:
+        g.compact()
+    yield g
+
+
+def _triplets(g):
+    return sorted((e.sid, e.tid, e.get_prop(g.edge_label)) for e in g.edges())
+
+
+def test_build(g):
+    assert g.vertex_count == 7
+    assert g.edge_count == 9
+    assert _triplets(g) == sorted(_EDGES)
+    assert not g.append_edge(Edge("A", "B", label="2"))
+    assert g.edge_count == 9
+
+
+@pytest.mark.parametrize(
+    "vids, dir, depth, fan, limit",
+    [
+        (["B"], Direction.OUT, None, None, None),
+        (["A"], Direction.IN, None, None, None),
+        (["F"], Direction.IN, None, None, None),
+        (["B"], Direction.BOTH, None, None, None),
+        (["A", "G"], Direction.BOTH, None, None, None),
+        (["B"], Direction.BOTH, None, None, 5),
+        (["B"], Direction.OUT, None, 2, None),
+        (["A"], Direction.OUT, 2, None, None),
+        (["B"], Direction.BOTH, 1, None, None),
+    ],
+)
+def test_search_same_as_memory_graph(g, vids, dir, depth, fan, limit):
+    expected = _build(MemoryGraph()).search(vids, dir, depth, fan, limit)
+    subgraph = g.search(vids, dir, depth, fan, limit)
+    assert subgraph.vertex_count == expected.vertex_count
+    assert subgraph.edge_count == expected.edge_count
+
+
+def test_search_scored_same_as_memory_graph(g):
+    def score_fn(edge, hop):
+        return float(edge.get_prop("label"))
+
+    expected = _build(MemoryGraph()).search(
+        ["A", "B"], Direction.OUT, limit=4, hop_fans=[2, 1], score_fn=score_fn
+    )
+    subgraph = g.search(
+        ["A", "B"], Direction.OUT, limit=4, hop_fans=[2, 1], score_fn=score_fn
+    )
+    assert {e.get_prop("label") for e in subgraph.edges()} == {
+        e.get_prop("label") for e in expected.edges()
+    }
+
+
+@pytest.mark.parametrize(
+    "action, vc, ec",
+    [
+        (lambda g: g.del_vertices("G", "G"), 6, 9),
+        (lambda g: g.del_vertices("C"), 6, 7),
+        (lambda g: g.del_vertices("A", "G"), 5, 6),
+        (lambda g: g.del_edges("E", "F", label="8"), 7, 8),
+        (lambda g: g.del_edges("A", "B"), 7, 8),
+        (lambda g: g.del_neighbor_edges("A", Direction.IN), 7, 7),
+    ],
+)
+def test_delete(g, action, vc, ec):
+    action(g)
+    assert g.vertex_count == vc
+    assert g.edge_count == ec
+    assert len(list(g.edges())) == ec
+    g.compact()
+    assert g.edge_count == ec
+    assert len(list(g.edges())) == ec
+
+
+def test_snapshot(g, tmp_path):
+    g.del_edges("B", "C", label="3")
+    g.upsert_vertex(Vertex("G", name="g"))
+    g.save_snapshot(str(tmp_path))
+
+    loaded = CompactMemoryGraph.load_snapshot(str(tmp_path))
+    assert loaded.vertex_count == 7
+    assert _triplets(loaded) == _triplets(g)
+    assert loaded.get_vertex("G").get_prop("name") == "g"
+    assert loaded.search(["B"], Direction.OUT).edge_count == 4
+
+    loaded.append_edge(Edge("G", "A", label="9"))
+    assert loaded.search(["G"], Direction.OUT, depth=1).edge_count == 1
+
+
+def test_only_label_prop():
+    with pytest.raises(ValueError):
+        CompactMemoryGraph().append_edge(Edge("A", "B", label="0", weight=1))
@@ -99,3 +99,52 @@ def test_search_depth_limit(g, vids, dir, dep, ec):
     subgraph = g.search(vids, dir, depth=dep)
     print(f"\n{subgraph.graphviz()}")
     assert subgraph.edge_count == ec
+
+
+def test_search_seeds_share_limit(g):
+    subgraph = g.search(["A", "F"], Direction.OUT, limit=4)
+    assert subgraph.edge_count == 4
+    # The first hop of both seeds is explored before the second hop
+    assert {e.get_prop("label") for e in subgraph.edges()} == {"0", "1", "2", "7"}
+    # The seeds take turns to add an edge
+    subgraph = g.search(["A", "F"], Direction.OUT, limit=2)
+    assert sorted(e.sid for e in subgraph.edges()) == ["A", "F"]
+
+
+def test_search_hop_fans(g):
+    subgraph = g.search(["B"], Direction.OUT, depth=2, hop_fans=[3, 1])
+    assert subgraph.edge_count == 3 + 2
+    subgraph = g.search(["B"], Direction.OUT, hop_fans=[1], fan=1)
+    assert subgraph.edge_count == 1 + 1
+
+
+def _label_score(edge, hop):
+    return float(edge.get_prop("label"))
+
+
+def test_search_score_paths(g):
+    subgraph = g.search(["B"], Direction.OUT, limit=2, score_fn=_label_score)
+    assert {e.get_prop("label") for e in subgraph.edges()} == {"6", "4"}
+    # The seeds take turns, each follows its best edge first
+    subgraph = g.search(["A", "B"], Direction.OUT, limit=2, score_fn=_label_score)
+    assert {e.get_prop("label") for e in subgraph.edges()} == {"2", "6"}
+
+
+def test_search_score_before_fan(g):
+    # All the edges of a vertex are scored before the fan is applied
+    subgraph = g.search(
+        ["B"], Direction.OUT, depth=1, hop_fans=[1], score_fn=_label_score
+    )
+    assert [e.get_prop("label") for e in subgraph.edges()] == ["6"]
+    subgraph = g.search(
+        ["B"], Direction.OUT, depth=2, hop_fans=[2, 1], score_fn=_label_score
+    )
+    assert {e.get_prop("label") for e in subgraph.edges()} == {"6", "4", "8"}
+
+
+def test_search_deep_graph():
+    g = MemoryGraph()
+    for i in range(5000):
+        g.append_edge(Edge(f"v{i}", f"v{i + 1}", label="next"))
+    assert g.search(["v0"], Direction.OUT).edge_count == 5000
+    assert g.search(["v0"], Direction.OUT, depth=10).edge_count == 10